@@ -194,6 +194,13 @@ class FaceDetectionConfig:
                                        # Allows people with 2+ photos to form a cluster
                                        # Single-photo outliers will be marked as noise
                                        # Previous: 3 (too high, missed people with only 2 photos)
+        "clustering_backend": "auto",  # DBSCAN backend: "exact" (sklearn, metric='cosine'),
+                                       # "graph" (sparse cosine radius graph via FAISS/numpy),
+                                       # "auto" (graph from clustering_graph_min_faces faces)
+        "clustering_graph_min_faces": 5000,
+        "clustering_quality_mode": "async",  # Quality metrics after clustering: "sync", "async"
+                                             # (after results are committed) or "off"
+        "clustering_quality_max_samples": 5000,  # Silhouette sample size (0 = every face)
         "auto_cluster_after_scan": True,
 
         # Performance
@@ -373,6 +380,20 @@ class FaceDetectionConfig:
             "min_samples": self.config.get("clustering_min_samples", 2),
         }
 
+    def get_clustering_backend(self) -> Dict[str, Any]:
+        """Get the DBSCAN backend selection (see services/face_clustering_backend.py)."""
+        return {
+            "backend": self.config.get("clustering_backend", "auto"),
+            "graph_min_faces": self.config.get("clustering_graph_min_faces", 5000),
+        }
+
+    def get_clustering_quality_params(self) -> Dict[str, Any]:
+        """Get clustering quality analysis settings (mode and silhouette sample size)."""
+        return {
+            "mode": self.config.get("clustering_quality_mode", "async"),
+            "max_samples": self.config.get("clustering_quality_max_samples", 5000),
+        }
+
     def get_optimal_clustering_params(self, face_count: int, project_id: Optional[int] = None) -> Dict[str, Any]:
         """
         Get optimal clustering parameters based on dataset size.
@@ -84,6 +84,18 @@ class SearchDefaults:
     THRESHOLD_BACKOFF_STEP: float = 0.04  # Lower by this amount per retry
     THRESHOLD_BACKOFF_MAX_RETRIES: int = 2  # Max retries before giving up
 
+    # ── ANN Index (FAISS) ──
+
+    # Index type: "auto" (exact below ANN_APPROX_THRESHOLD, IVF above),
+    # "flat" (always exact), "ivf" or "hnsw" (always approximate)
+    ANN_INDEX_MODE: str = "auto"
+
+    # Vector count at which "auto" switches from exact to IVF
+    ANN_APPROX_THRESHOLD: int = 50000
+
+    # IVF lists probed per query (higher = better recall, slower)
+    ANN_IVF_NPROBE: int = 16
+
 
 class SearchConfig:
     """
@@ -576,3 +588,70 @@ class SearchConfig:
             return True
         except Exception:
             return False
+
+    # ── ANN Index Parameters ──
+
+    @classmethod
+    def get_ann_index_mode(cls) -> str:
+        """Get ANN index mode: auto, flat, ivf or hnsw."""
+        try:
+            from settings_manager_qt import SettingsManager
+            settings = SettingsManager()
+            value = settings.get("search_ann_index_mode", None)
+            if value in ("auto", "flat", "ivf", "hnsw"):
+                return value
+        except Exception:
+            pass
+        return SearchDefaults.ANN_INDEX_MODE
+
+    @classmethod
+    def set_ann_index_mode(cls, mode: str) -> bool:
+        if mode not in ("auto", "flat", "ivf", "hnsw"):
+            return False
+        try:
+            from settings_manager_qt import SettingsManager
+            SettingsManager().set("search_ann_index_mode", mode)
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def get_ann_approx_threshold(cls) -> int:
+        """Get vector count at which auto mode switches to an approximate index."""
+        try:
+            from settings_manager_qt import SettingsManager
+            settings = SettingsManager()
+            value = settings.get("search_ann_approx_threshold", None)
+            if value is not None:
+                v = int(value)
+                if 5000 <= v <= 10_000_000:
+                    return v
+        except Exception:
+            pass
+        return SearchDefaults.ANN_APPROX_THRESHOLD
+
+    @classmethod
+    def set_ann_approx_threshold(cls, v: int) -> bool:
+        if not 5000 <= v <= 10_000_000:
+            return False
+        try:
+            from settings_manager_qt import SettingsManager
+            SettingsManager().set("search_ann_approx_threshold", v)
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def get_ann_ivf_nprobe(cls) -> int:
+        """Get number of IVF lists probed per ANN query."""
+        try:
+            from settings_manager_qt import SettingsManager
+            settings = SettingsManager()
+            value = settings.get("search_ann_ivf_nprobe", None)
+            if value is not None:
+                v = int(value)
+                if 1 <= v <= 1024:
+                    return v
+        except Exception:
+            pass
+        return SearchDefaults.ANN_IVF_NPROBE
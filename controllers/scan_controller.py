@@ -326,6 +326,7 @@ class ScanController(QObject):
 
                 self.worker.finished.connect(self._on_finished, Qt.QueuedConnection)
                 self.worker.error.connect(self._on_error, Qt.QueuedConnection)
+                self.worker.committed.connect(self._on_committed, Qt.QueuedConnection)
                 self.thread.started.connect(self.worker.run)
                 self.worker.finished.connect(lambda f, p, v=0: self.thread.quit())
                 self.thread.finished.connect(self._cleanup)
@@ -892,13 +893,14 @@ class ScanController(QObject):
                                 clustered=clusters,
                             ))
 
-                            # Rebuild search_asset_features so face_count is
-                            # visible to SearchOrchestrator (fixes 0% coverage).
+                            # Sync search_asset_features so face_count is visible to
+                            # SearchOrchestrator (fixes 0% coverage). Incremental:
+                            # verification pass + dirty journal, no full rebuild.
                             try:
                                 from repository.search_feature_repository import SearchFeatureRepository
                                 repo = SearchFeatureRepository()
                                 if repo.table_exists():
-                                    repo.refresh_project(pid)
+                                    repo.sync_project(pid)
                             except Exception:
                                 pass
                             try:
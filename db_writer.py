@@ -39,6 +39,11 @@ class DBWriter(QObject):
 
     - Use enqueue_upserts(rows) to queue up rows.
     - Use enqueue_shutdown() to request a clean shutdown (flush + quit) from the writer thread.
+
+    Upserts are applied by the database's shared write queue
+    (repository/write_queue.py), so scan writes are coalesced with face,
+    embedding and backfill writes instead of competing for the lock; this
+    QThread only batches rows and emits the Qt signals.
     """
     error = Signal(str)
     started = Signal()
@@ -269,28 +274,25 @@ class DBWriter(QObject):
             with db.get_connection() as conn:
                 has_created = self._photo_metadata_has_created_cols(conn)
 
-                cur = conn.cursor()
-                if has_created:
-                    try:
-                        cur.executemany(sql_with_created, params_with_created)
-                        logger.info(f"Committed {len(params_with_created)} rows (with created_* fields)")
-                        self.committed.emit(len(params_with_created))
-                        return
-                    except Exception as e:
-                        tb = traceback.format_exc()
-                        logger.warning(f"Upsert with created_* fields failed, falling back to legacy: {e}")
-                        conn.rollback()
-                        # fall through to legacy attempt
-                # legacy attempt
+            queue = db.write_queue()
+            if has_created:
                 try:
-                    cur.executemany(sql_legacy, params_legacy)
-                    logger.info(f"Committed {len(params_legacy)} rows (legacy mode)")
-                    self.committed.emit(len(params_legacy))
+                    written = queue.submit_rows("photo_metadata", sql_with_created, params_with_created).result()
+                    logger.info(f"Committed {written} rows (with created_* fields)")
+                    self.committed.emit(written)
+                    return
                 except Exception as e:
-                    tb = traceback.format_exc()
-                    logger.error(f"Legacy upsert failed: {e}", exc_info=True)
-                    conn.rollback()
-                    self.error.emit(f"DBWriter upsert failed: {e}\n{tb}")
+                    # The failed batch was rolled back on its own by the queue
+                    logger.warning(f"Upsert with created_* fields failed, falling back to legacy: {e}")
+            # legacy attempt
+            try:
+                written = queue.submit_rows("photo_metadata", sql_legacy, params_legacy).result()
+                logger.info(f"Committed {written} rows (legacy mode)")
+                self.committed.emit(written)
+            except Exception as e:
+                tb = traceback.format_exc()
+                logger.error(f"Legacy upsert failed: {e}", exc_info=True)
+                self.error.emit(f"DBWriter upsert failed: {e}\n{tb}")
 
         except Exception as e:
             tb = traceback.format_exc()
@@ -5679,6 +5679,10 @@ class MediaLightbox(QDialog, VideoEditorMixin):
                 """, (value, photo_id))
                 conn.commit()
 
+            if column in ("rating", "flag"):
+                from repository.search_feature_repository import SearchFeatureRepository
+                SearchFeatureRepository().apply_photo_changes([photo_id], column)
+
             self._lb_save_status.setText("✓ Saved")
             QTimer.singleShot(2000, lambda: self._lb_save_status.setText("")
                               if hasattr(self, '_lb_save_status') else None)
@@ -3268,8 +3268,10 @@ class GooglePhotosLayout(BaseLayout):
                             centroid_vec = np.frombuffer(r[0], dtype=np.float32) if r and r[0] else None
                             mean_sim = 0.0
                             if centroid_vec is not None:
-                                cur2.execute("SELECT embedding FROM face_crops WHERE project_id = ? AND branch_key = ? AND embedding IS NOT NULL LIMIT 30", (self.project_id, branch_key))
-                                embs = [np.frombuffer(e[0], dtype=np.float32) for e in cur2.fetchall() if e and e[0]]
+                                from services.face_embedding_matrix_store import get_face_embedding_matrix_store
+                                cur2.execute("SELECT id FROM face_crops WHERE project_id = ? AND branch_key = ? AND embedding IS NOT NULL LIMIT 30", (self.project_id, branch_key))
+                                face_ids = [e[0] for e in cur2.fetchall()]
+                                embs = get_face_embedding_matrix_store(self.project_id).get_vectors(face_ids).values()
                                 sims = []
                                 for vec in embs:
                                     denom = (np.linalg.norm(centroid_vec) * np.linalg.norm(vec))
@@ -4537,15 +4539,17 @@ class GooglePhotosLayout(BaseLayout):
                 row = cur.fetchone()
                 person_name = (row[0] if row and row[0] else branch_key)
                 centroid_vec = np.frombuffer(row[1], dtype=np.float32) if row and row[1] else None
-                # Fetch crops
-                cur.execute("SELECT id, crop_path, embedding FROM face_crops WHERE project_id = ? AND branch_key = ?", (self.project_id, branch_key))
+                # Fetch crops (embeddings come from the packed face matrix)
+                cur.execute("SELECT id, crop_path FROM face_crops WHERE project_id = ? AND branch_key = ?", (self.project_id, branch_key))
                 crops = cur.fetchall() or []
+            from services.face_embedding_matrix_store import get_face_embedding_matrix_store
+            vectors = get_face_embedding_matrix_store(self.project_id).get_vectors(rid for rid, _ in crops)
             # Build list with confidence
             items = []
-            for rid, crop_path, emb in crops:
+            for rid, crop_path in crops:
                 sim = 0.0
-                if centroid_vec is not None and emb:
-                    vec = np.frombuffer(emb, dtype=np.float32)
+                vec = vectors.get(rid)
+                if centroid_vec is not None and vec is not None:
                     denom = (np.linalg.norm(centroid_vec) * np.linalg.norm(vec))
                     if denom > 0:
                         sim = float(np.dot(centroid_vec, vec) / denom)
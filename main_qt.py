@@ -224,6 +224,10 @@ atexit.register(log_shutdown)
 
 
 if __name__ == "__main__":
+    # Must run first: in the frozen (PyInstaller) build, process-pool workers
+    # re-launch this executable and exit here instead of starting the GUI
+    import multiprocessing
+    multiprocessing.freeze_support()
 
     # CRITICAL: Qt 6 has built-in high-DPI support enabled by default
     # The AA_EnableHighDpiScaling and AA_UseHighDpiPixmaps attributes are deprecated
@@ -1107,15 +1107,15 @@ class MainWindow(QMainWindow):
                     self.statusBar().showMessage(
                         "Face pipeline complete — no faces detected", 5000
                     )
-                # Rebuild search_asset_features so face_count is available
-                # to SearchOrchestrator, then invalidate its metadata cache.
+                # Sync search_asset_features (incrementally) so face_count is
+                # available to SearchOrchestrator, then invalidate its metadata cache.
                 try:
                     from repository.search_feature_repository import SearchFeatureRepository
                     repo = SearchFeatureRepository()
                     if repo.table_exists():
-                        repo.refresh_project(pid)
+                        repo.sync_project(pid)
                 except Exception as e:
-                    print(f"[MainWindow] search_asset_features rebuild after face pipeline failed: {e}")
+                    print(f"[MainWindow] search_asset_features sync after face pipeline failed: {e}")
                 try:
                     from services.search_orchestrator import get_search_orchestrator
                     orch = get_search_orchestrator(pid)
@@ -4973,6 +4973,15 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"[Shutdown] Thumb cache clear error: {e}")
 
+        # 4b. Persist ANN index deltas (only saved on a timer while searching)
+        try:
+            orchestrator_module = sys.modules.get("services.search_orchestrator")
+            saved = orchestrator_module.SearchOrchestrator.flush_ann_indexes() if orchestrator_module else 0
+            if saved:
+                print(f"[Shutdown] Saved {saved} ANN index(es).")
+        except Exception as e:
+            print(f"[Shutdown] ANN index save error: {e}")
+
         # 5. Close DB connections
         try:
             db = getattr(self, "db", None)
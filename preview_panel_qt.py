@@ -2841,6 +2841,10 @@ class LightboxDialog(QDialog):
                 """, (value, photo_id))
                 conn.commit()
 
+            if column in ("rating", "flag"):
+                from repository.search_feature_repository import SearchFeatureRepository
+                SearchFeatureRepository().apply_photo_changes([photo_id], column)
+
             if hasattr(self, '_meta_edit_save_status'):
                 self._meta_edit_save_status.setText("✓ Saved")
                 QTimer.singleShot(2000, lambda: self._meta_edit_save_status.setText("")
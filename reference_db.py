@@ -29,6 +29,8 @@ ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 from db_config import get_db_filename
+from repository.connection_pool import get_connection_pool, close_all_pools
+from repository.write_queue import get_write_queue, shutdown_write_queues
 
 DB_FILE = get_db_filename()
 
@@ -41,9 +43,6 @@ class ReferenceDB:
     # for different project databases (supporting multi-project portability).
     _instances = {}
     _lock = threading.Lock()
-    _connection_pool = {}
-    _pool_lock = threading.Lock()
-    _max_pool_size = 10  # Maximum number of pooled connections
     
     def __new__(cls, db_file=None):
         """
@@ -509,9 +508,10 @@ class ReferenceDB:
         """
         CRITICAL FIX: Thread-safe connection pooling.
         
-        Provides a context-managed database connection from the connection pool.
-        Connections are reused across queries to minimize overhead and prevent
-        connection proliferation.
+        Provides a context-managed database connection from the shared
+        SQLiteConnectionPool (repository/connection_pool.py). Connections are
+        reused across queries to minimize overhead and prevent connection
+        proliferation.
         
         Usage:
             with self._connect() as conn:
@@ -522,68 +522,10 @@ class ReferenceDB:
             sqlite3.Connection: A connection from the pool with foreign keys enabled
                                and Row factory configured.
         """
-        thread_id = threading.get_ident()
-        conn = None
-
-        with self._pool_lock:
-            # Try to get existing connection for this thread
-            if thread_id in self._connection_pool:
-                conn = self._connection_pool[thread_id]
-
-                # Verify connection is still valid
-                try:
-                    conn.execute("SELECT 1")
-                except sqlite3.Error:
-                    # Connection is broken, remove it and create new one
-                    try:
-                        conn.close()
-                    except sqlite3.Error as e:
-                        print(f"[ReferenceDB] Failed to close broken connection: {e}")
-                    conn = None
-                    del self._connection_pool[thread_id]
-
-            # Create new connection if needed — INSIDE the lock to prevent
-            # concurrent sqlite3.connect() calls which cause access violations
-            # on Windows (Python 3.11 + WAL mode race condition).
-            if conn is None:
-                conn = sqlite3.connect(self.db_file, check_same_thread=False)
-                conn.execute("PRAGMA foreign_keys = ON")
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA busy_timeout=30000")
-                conn.row_factory = sqlite3.Row
-
-                # Evict oldest connection if pool is full.
-                # Only evict entries for threads that are NO LONGER ALIVE
-                # to avoid closing a connection still in use by another thread.
-                if len(self._connection_pool) >= self._max_pool_size:
-                    dead_thread = None
-                    for tid in self._connection_pool:
-                        # Check if thread is still alive
-                        alive = False
-                        for t in threading.enumerate():
-                            if t.ident == tid:
-                                alive = True
-                                break
-                        if not alive:
-                            dead_thread = tid
-                            break
-
-                    evict_tid = dead_thread if dead_thread else next(iter(self._connection_pool))
-                    try:
-                        self._connection_pool[evict_tid].close()
-                    except sqlite3.Error as e:
-                        print(f"[ReferenceDB] Failed to close pooled connection: {e}")
-                    del self._connection_pool[evict_tid]
-
-                self._connection_pool[thread_id] = conn
-        
-        try:
+        # Shared with repository.DatabaseConnection: same per-thread
+        # connections, configured once, auto-commit/rollback on exit.
+        with get_connection_pool(self.db_file).connection(row_factory=sqlite3.Row) as conn:
             yield conn
-            conn.commit()  # Auto-commit on successful context exit
-        except Exception:
-            conn.rollback()  # Auto-rollback on exception
-            raise
 
     def get_connection(self):
         """Compatibility shim — delegates to _connect().
@@ -594,23 +536,27 @@ class ReferenceDB:
         """
         return self._connect()
 
+    def write_queue(self):
+        """Shared single-writer queue for this database (see repository/write_queue.py)."""
+        return get_write_queue(self.db_file)
+
     @classmethod
     def close_all_connections(cls):
         """
         Close all pooled connections for graceful shutdown.
 
         Call this method when the application is shutting down to ensure
-        all database connections are properly closed.
+        all database connections are properly closed. Queued writes are
+        committed first.
         """
-        with cls._pool_lock:
-            for thread_id, conn in list(cls._connection_pool.items()):
-                try:
-                    conn.close()
-                    print(f"[ReferenceDB] Closed connection for thread {thread_id}")
-                except Exception as e:
-                    print(f"[ReferenceDB] Warning: Failed to close connection for thread {thread_id}: {e}")
-            cls._connection_pool.clear()
-            print(f"[ReferenceDB] All {len(cls._connection_pool)} connections closed")
+        shutdown_write_queues()
+        close_all_pools()
+        print("[ReferenceDB] All pooled connections closed")
+
+    @classmethod
+    def pool_stats(cls, db_file=None) -> dict:
+        """Connection pool counters (opens, reuses, overflow, ...) for a database."""
+        return get_connection_pool(os.path.abspath(db_file or get_db_filename())).stats()
 
     def close(self):
         """
@@ -619,17 +565,7 @@ class ReferenceDB:
         For singleton ReferenceDB, this closes the current thread's pooled connection.
         Use close_all_connections() for full shutdown.
         """
-        import threading
-        thread_id = threading.current_thread().ident
-
-        with self._pool_lock:
-            if thread_id in self._connection_pool:
-                try:
-                    self._connection_pool[thread_id].close()
-                    del self._connection_pool[thread_id]
-                    print(f"[ReferenceDB] Closed connection for thread {thread_id}")
-                except Exception as e:
-                    print(f"[ReferenceDB] Warning: Failed to close connection: {e}")
+        get_connection_pool(self.db_file).release_thread()
 
     def __enter__(self):
         """Context manager entry for 'with ReferenceDB() as db:' pattern."""
@@ -3543,6 +3479,8 @@ class ReferenceDB:
         import logging
         import os
         import platform
+        from repository.schema import ensure_gps_cell_column
+        from services.gps_spatial_index import gps_cell
         logger = logging.getLogger(__name__)
 
         # CRITICAL FIX: Normalize path before updating (database stores normalized paths)
@@ -3561,13 +3499,16 @@ class ReferenceDB:
                 cur.execute("ALTER TABLE photo_metadata ADD COLUMN gps_longitude REAL")
             if 'location_name' not in existing_cols:
                 cur.execute("ALTER TABLE photo_metadata ADD COLUMN location_name TEXT")
+            if 'gps_cell' not in existing_cols:
+                ensure_gps_cell_column(conn)
 
-            # Update the photo record (using normalized path)
+            # Update the photo record (using normalized path); gps_cell keeps
+            # the location-clustering grid index in step with the coordinates
             cur.execute("""
                 UPDATE photo_metadata
-                SET gps_latitude = ?, gps_longitude = ?, location_name = ?
+                SET gps_latitude = ?, gps_longitude = ?, gps_cell = ?, location_name = ?
                 WHERE path = ?
-            """, (latitude, longitude, location_name, normalized_path))
+            """, (latitude, longitude, gps_cell(latitude, longitude), location_name, normalized_path))
 
             rows_updated = cur.rowcount
             conn.commit()
@@ -3581,21 +3522,28 @@ class ReferenceDB:
     
     def get_photos_by_location(self, project_id: int | None = None, radius_km: float = 5.0) -> dict[str, list[dict]]:
         """Group photos by location proximity.
-        
+
+        Photos are visited in (lat, lon) order and join the first cluster whose
+        first photo is within radius_km, otherwise they start a new one. The
+        search only looks at neighbouring gps_cell buckets
+        (services/gps_spatial_index.py).
+
         Returns:
             dict mapping location_key to list of photo dicts with path, lat, lon, location_name
         """
+        from services.gps_spatial_index import cluster_by_proximity
+
         with self._connect() as conn:
             cur = conn.cursor()
             # First check if GPS columns exist
             existing_cols = [r['name'] for r in cur.execute("PRAGMA table_info(photo_metadata)")]
             if 'gps_latitude' not in existing_cols or 'gps_longitude' not in existing_cols:
                 return {}
-            
+
             # Query all photos with GPS data
             if project_id:
                 cur.execute("""
-                    SELECT p.path, p.gps_latitude, p.gps_longitude, p.location_name, f.path as folder_path
+                    SELECT p.path, p.gps_latitude, p.gps_longitude, p.location_name, p.gps_cell
                     FROM photo_metadata p
                     JOIN photo_folders f ON f.id = p.folder_id
                     WHERE p.gps_latitude IS NOT NULL 
@@ -3605,7 +3553,7 @@ class ReferenceDB:
                 """, (project_id,))
             else:
                 cur.execute("""
-                    SELECT p.path, p.gps_latitude, p.gps_longitude, p.location_name, f.path as folder_path
+                    SELECT p.path, p.gps_latitude, p.gps_longitude, p.location_name, p.gps_cell
                     FROM photo_metadata p
                     JOIN photo_folders f ON f.id = p.folder_id
                     WHERE p.gps_latitude IS NOT NULL AND p.gps_longitude IS NOT NULL
@@ -3613,37 +3561,27 @@ class ReferenceDB:
                 """)
             
             rows = cur.fetchall()
-            
-            # Group by proximity using simple clustering
+            if not rows:
+                return {}
+
+            paths, lats, lons, names, cells = zip(*rows)
+            labels = cluster_by_proximity(lats, lons, radius_km, cells=cells).tolist()
+
+            # Labels are seed row indices: key clusters by seed, in creation order
+            members = {}
+            for i, seed in enumerate(labels):
+                members.setdefault(seed, []).append({
+                    'path': paths[i],
+                    'lat': lats[i],
+                    'lon': lons[i],
+                    'location_name': names[i] or 'Unknown Location'
+                })
+
             locations = {}
-            for row in rows:
-                photo = {
-                    'path': row[0],
-                    'lat': row[1],
-                    'lon': row[2],
-                    'location_name': row[3] or 'Unknown Location'
-                }
-                
-                # Find nearest existing cluster
-                found_cluster = None
-                for loc_key, photos in locations.items():
-                    first = photos[0]
-                    dist = self._haversine_distance(
-                        photo['lat'], photo['lon'],
-                        first['lat'], first['lon']
-                    )
-                    if dist <= radius_km:
-                        found_cluster = loc_key
-                        break
-                
-                if found_cluster:
-                    locations[found_cluster].append(photo)
-                else:
-                    # Create new cluster
-                    loc_name = photo['location_name']
-                    loc_key = f"{loc_name}_{len(locations)}"
-                    locations[loc_key] = [photo]
-            
+            for seed in sorted(members):
+                photos = members[seed]
+                locations[f"{photos[0]['location_name']}_{len(locations)}"] = photos
+
             return locations
     
     def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -3762,6 +3700,8 @@ class ReferenceDB:
         Returns:
             branch_key: The created/updated branch key (e.g., "location_37.7749_-122.4194")
         """
+        import numpy as np
+        from services.gps_spatial_index import cell_ranges, haversine_km
         from settings_manager_qt import SettingsManager
         sm = SettingsManager()
         radius_km = float(sm.get("gps_clustering_radius_km", 5.0))
@@ -3777,28 +3717,30 @@ class ReferenceDB:
             if 'gps_latitude' not in existing_cols or 'gps_longitude' not in existing_cols:
                 return branch_key
 
-            # Find all photos within radius of this location
-            cur.execute("""
+            # Find all photos within radius of this location: the gps_cell
+            # ranges narrow the scan to the grid rows around it (rows without
+            # a cell yet are kept and left to the distance filter)
+            ranges = cell_ranges(lat, lon, radius_km)
+            cell_filter = " OR ".join(["p.gps_cell BETWEEN ? AND ?"] * len(ranges))
+            cur.execute(f"""
                 SELECT p.path, p.gps_latitude, p.gps_longitude
                 FROM photo_metadata p
                 JOIN photo_folders f ON f.id = p.folder_id
                 WHERE p.gps_latitude IS NOT NULL
                   AND p.gps_longitude IS NOT NULL
+                  AND ({cell_filter} OR p.gps_cell IS NULL)
                   AND f.path LIKE (SELECT folder || '%' FROM projects WHERE id = ?)
-            """, (project_id,))
+            """, [bound for r in ranges for bound in r] + [project_id])
 
             rows = cur.fetchall()
 
             # Filter photos by distance
             location_photos = []
-            for row in rows:
-                photo_path = row[0]
-                photo_lat = row[1]
-                photo_lon = row[2]
-
-                dist = self._haversine_distance(lat, lon, photo_lat, photo_lon)
-                if dist <= radius_km:
-                    location_photos.append(photo_path)
+            if rows:
+                paths, lats, lons = zip(*rows)
+                near = haversine_km(lat, lon, np.asarray(lats, dtype=np.float64),
+                                    np.asarray(lons, dtype=np.float64)) <= radius_km
+                location_photos = [path for path, keep in zip(paths, near.tolist()) if keep]
 
             # Link photos to branch (create branch entries in project_images)
             if location_photos:
@@ -3822,6 +3764,16 @@ class ReferenceDB:
 
     def cache_location_name(self, latitude: float, longitude: float, location_name: str):
         """Cache a reverse-geocoded location name to reduce API calls."""
+        self.cache_location_names([(latitude, longitude, location_name)])
+
+    def cache_location_names(self, entries: list[tuple[float, float, str]]):
+        """Cache many reverse-geocoded location names in one transaction.
+
+        Args:
+            entries: (latitude, longitude, location_name) tuples
+        """
+        if not entries:
+            return
         with self._connect() as conn:
             cur = conn.cursor()
             # Create cache table if it doesn't exist
@@ -3836,10 +3788,10 @@ class ReferenceDB:
                 )
             """)
             # Insert or update
-            cur.execute("""
+            cur.executemany("""
                 INSERT OR REPLACE INTO gps_location_cache (latitude, longitude, location_name)
                 VALUES (?, ?, ?)
-            """, (latitude, longitude, location_name))
+            """, entries)
             conn.commit()
     
     def get_cached_location_name(self, latitude: float, longitude: float, tolerance: float = 0.001) -> str | None:
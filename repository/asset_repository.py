@@ -85,6 +85,64 @@ class AssetRepository(BaseRepository):
                 WHERE project_id = ? AND asset_id = ?
             """, (perceptual_hash, project_id, asset_id))
 
+    def create_assets_bulk(self, project_id: int, content_hashes: List[str]) -> Dict[str, int]:
+        """
+        Set-based create_asset_if_missing for many hashes.
+
+        Returns:
+            {content_hash: asset_id} for every given hash
+        """
+        unique = list(dict.fromkeys(content_hashes))
+        result: Dict[str, int] = {}
+        with self.connection() as conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO media_asset (project_id, content_hash)
+                VALUES (?, ?)
+            """, [(project_id, h) for h in unique])
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                cur = conn.execute(f"""
+                    SELECT asset_id, content_hash FROM media_asset
+                    WHERE project_id = ? AND content_hash IN ({','.join('?' * len(chunk))})
+                """, (project_id, *chunk))
+                result.update((row["content_hash"], int(row["asset_id"])) for row in cur.fetchall())
+        missing = len(unique) - len(result)
+        if missing:
+            raise RuntimeError(f"Failed to create {missing} media_asset rows")
+        return result
+
+    def get_assets_without_representative(self, project_id: int,
+                                          asset_ids: List[int]) -> Dict[int, List[int]]:
+        """
+        Assets among ``asset_ids`` with no representative photo yet.
+
+        Returns:
+            {asset_id: [photo_id, ...]} with the photo ids of all their instances
+        """
+        result: Dict[int, List[int]] = {}
+        ids = list(dict.fromkeys(asset_ids))
+        with self.connection(read_only=True) as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                cur = conn.execute(f"""
+                    SELECT a.asset_id, i.photo_id
+                    FROM media_asset a
+                    JOIN media_instance i ON i.asset_id = a.asset_id AND i.project_id = a.project_id
+                    WHERE a.project_id = ? AND a.representative_photo_id IS NULL
+                      AND a.asset_id IN ({','.join('?' * len(chunk))})
+                """, (project_id, *chunk))
+                for row in cur.fetchall():
+                    result.setdefault(int(row["asset_id"]), []).append(int(row["photo_id"]))
+        return result
+
+    def set_representative_photos(self, project_id: int, pairs: List[Tuple[int, int]]) -> None:
+        """Bulk set_representative_photo for (asset_id, photo_id) pairs."""
+        with self.connection() as conn:
+            conn.executemany("""
+                UPDATE media_asset SET representative_photo_id = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE project_id = ? AND asset_id = ?
+            """, [(photo_id, project_id, asset_id) for asset_id, photo_id in pairs])
+
     # ── Instance Operations ───────────────────────────────────────────────
 
     def link_instance(self, project_id: int, asset_id: int, photo_id: int,
@@ -101,6 +159,21 @@ class AssetRepository(BaseRepository):
             """, (project_id, asset_id, photo_id, source_device_id, source_path,
                   import_session_id, file_size))
 
+    def link_instances_bulk(self, project_id: int, rows: List[Tuple]) -> None:
+        """
+        Bulk link_instance.
+
+        Args:
+            rows: (asset_id, photo_id, source_path, file_size) tuples
+        """
+        with self.connection() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO media_instance
+                (project_id, asset_id, photo_id, source_device_id, source_path,
+                 import_session_id, file_size)
+                VALUES (?, ?, ?, NULL, ?, NULL, ?)
+            """, [(project_id, *row) for row in rows])
+
     def get_instance_by_photo(self, project_id: int, photo_id: int) -> Optional[Dict[str, Any]]:
         sql = """
             SELECT instance_id, project_id, asset_id, photo_id, source_device_id,
@@ -9,6 +9,8 @@ from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from typing import Optional, List, Dict, Any, Generator
 from logging_config import get_logger
+from .connection_pool import get_connection_pool
+from .write_queue import get_write_queue, DatabaseWriteQueue
 
 logger = get_logger(__name__)
 
@@ -20,7 +22,7 @@ class DatabaseConnection:
     This singleton class ensures:
     - One instance per database file (singleton per path)
     - Connections are properly configured (foreign keys, WAL mode)
-    - Thread-safe access
+    - Thread-safe access (per-thread connections from SQLiteConnectionPool)
     - Proper connection cleanup
     """
 
@@ -49,6 +51,7 @@ class DatabaseConnection:
         import os
         self._db_path = os.path.abspath(db_path)
         self._auto_init = auto_init
+        self._pool = get_connection_pool(self._db_path)
         self._initialized = True
 
         # Auto-initialize schema if requested
@@ -73,79 +76,24 @@ class DatabaseConnection:
                 cur = conn.cursor()
                 cur.execute("SELECT * FROM photos")
         """
-        conn = None
         try:
-            # FIX: SQLite URIs require forward slashes, even on Windows
-            # Convert backslashes to forward slashes for URI mode
-            if read_only:
-                uri_path = self._db_path.replace('\\', '/')
-                uri = f"file:{uri_path}?mode=ro"
-                conn = sqlite3.connect(uri, uri=True, timeout=10.0, check_same_thread=False)
-            else:
-                conn = sqlite3.connect(self._db_path, timeout=10.0, check_same_thread=False)
-
-            # CRITICAL: Enable foreign key constraints (required for CASCADE deletes)
-            # SQLite does NOT enforce foreign keys by default!
-            conn.execute("PRAGMA foreign_keys = ON")
-
-            # CRITICAL: Verify foreign keys are actually enabled
-            fk_check = conn.execute("PRAGMA foreign_keys").fetchone()
-            if not fk_check or fk_check[0] != 1:
-                raise RuntimeError(
-                    "CRITICAL: Failed to enable foreign key constraints! "
-                    "This will break CASCADE deletes and data integrity."
-                )
-
-            # Set busy timeout to avoid "database is locked" errors under concurrent access
-            # This gives SQLite up to 30 seconds to acquire a lock before failing
-            conn.execute("PRAGMA busy_timeout = 30000")
-
-            # Configure journal mode with graceful fallback
-            # Priority: WAL > DELETE > PERSIST (based on performance and reliability)
-            if not read_only:
-                journal_modes = ['WAL', 'DELETE', 'PERSIST']
-                journal_set = False
-
-                for mode in journal_modes:
-                    try:
-                        result = conn.execute(f"PRAGMA journal_mode={mode}").fetchone()
-                        if result and result[0].upper() == mode:
-                            logger.debug(f"Journal mode set to {mode}")
-                            journal_set = True
-                            break
-                    except sqlite3.OperationalError as e:
-                        logger.debug(f"Could not set journal mode {mode}: {e}")
-                        continue
-
-                if not journal_set:
-                    logger.warning("Could not set any journal mode, using default")
-
-            # Return dictionary-like rows for easier access
-            conn.row_factory = self._dict_factory
-
-            if read_only:
+            # Per-thread pooled connections: foreign keys (verified), busy
+            # timeout and journal mode are configured once when the pool
+            # opens them. Write checkouts commit on success and roll back
+            # on error; nested write checkouts use savepoints.
+            with self._pool.connection(read_only=read_only, row_factory=self._dict_factory) as conn:
                 yield conn
-            else:
-                # CRITICAL: Use transaction context manager for write connections
-                # This ensures that all operations are committed automatically
-                # or rolled back on error.
-                with conn:
-                    yield conn
-
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}", exc_info=True)
-            if conn:
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
             raise
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except Exception as e:
-                    logger.warning(f"Error closing connection: {e}")
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Connection pool counters (opens, reuses, overflow, ...) for this database."""
+        return self._pool.stats()
+
+    def write_queue(self) -> DatabaseWriteQueue:
+        """Shared single-writer queue for this database (see repository/write_queue.py)."""
+        return get_write_queue(self._db_path)
 
     @staticmethod
     def _dict_factory(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
@@ -367,6 +315,10 @@ class BaseRepository(ABC):
         with self._db_connection.get_connection(read_only=read_only) as conn:
             yield conn
 
+    def write_queue(self) -> DatabaseWriteQueue:
+        """Single-writer queue of this repository's database."""
+        return self._db_connection.write_queue()
+
     @abstractmethod
     def _table_name(self) -> str:
         """Return the primary table name this repository manages."""
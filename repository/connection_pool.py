@@ -0,0 +1,366 @@
+# repository/connection_pool.py
+# Thread-aware SQLite connection pool shared by DatabaseConnection and ReferenceDB
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Generator, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class DeferrableConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose commit/rollback can be handed to an enclosing owner.
+
+    While ``defer_commit`` is set (the write queue runs a coalesced
+    transaction), commit() is a no-op and rollback() only records the
+    request, so code written for standalone transactions cannot end the
+    shared one early.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.defer_commit = False
+        self.rollback_requested = False
+
+    def commit(self):
+        if self.defer_commit:
+            return
+        super().commit()
+
+    def rollback(self):
+        if self.defer_commit:
+            self.rollback_requested = True
+            return
+        super().rollback()
+
+
+class _PooledConnection:
+    """A pooled connection plus its checkout state."""
+
+    __slots__ = ("conn", "read_only", "depth", "users")
+
+    def __init__(self, conn: sqlite3.Connection, read_only: bool):
+        self.conn = conn
+        self.read_only = read_only
+        self.depth = 0   # nesting level of the owning thread's checkouts
+        self.users = 0   # active checkouts (reserved under the pool lock)
+
+
+class SQLiteConnectionPool:
+    """
+    Per-thread reusable SQLite connections for one database file.
+
+    Each thread gets at most one writer and one reader connection. They are
+    configured once when opened (foreign keys, busy timeout, synchronous,
+    journal mode negotiated once per pool) and reused by every later
+    checkout on that thread, instead of paying connect + PRAGMAs per call.
+
+    Checkout semantics:
+    - Writer: the outermost checkout commits on success and rolls back on
+      error; nested checkouts on the same thread run inside a SAVEPOINT so
+      they join the outer transaction without committing it early.
+    - Reader: opened with ``mode=ro``; no transaction handling. A reader
+      checkout made while the thread's writer is checked out reuses the
+      writer, so it sees the pending transaction's own writes.
+
+    Health checks on reuse: closed connections are replaced, transactions
+    left open outside a checkout are rolled back, and all connections are
+    dropped when the database file is replaced (different inode).
+
+    Limits: at most ``max_connections`` pooled connections. When full,
+    connections of dead threads are evicted first; if every owner is alive,
+    the checkout gets a one-off connection that is closed afterwards.
+    """
+
+    JOURNAL_MODES = ('WAL', 'DELETE', 'PERSIST')
+
+    def __init__(self,
+                 db_path: str,
+                 max_connections: int = 32,
+                 timeout: float = 10.0,
+                 busy_timeout_ms: int = 30000):
+        self.db_path = os.path.abspath(db_path)
+        self.max_connections = max(1, int(max_connections))
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._lock = threading.Lock()
+        self._slots: Dict[Tuple[int, bool], _PooledConnection] = {}
+        self._file_identity: Optional[Tuple[int, int]] = None
+        self._journal_mode: Optional[str] = None
+        self._counters = {
+            'opens': 0,
+            'reuses': 0,
+            'overflow': 0,
+            'evictions': 0,
+            'health_failures': 0,
+            'file_resets': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @contextmanager
+    def connection(self,
+                   read_only: bool = False,
+                   row_factory: Optional[Callable] = None) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Check out this thread's connection as a context manager.
+
+        Args:
+            read_only: Use the thread's read-only connection
+            row_factory: Row factory to apply for this checkout
+        """
+        slot, pooled = self._checkout(read_only)
+        conn = slot.conn
+        # Nested checkouts may come from a caller expecting other row types
+        outer_row_factory = conn.row_factory
+        conn.row_factory = row_factory
+        try:
+            if read_only:
+                slot.depth += 1
+                try:
+                    yield conn
+                finally:
+                    slot.depth -= 1
+            elif slot.depth == 0:
+                slot.depth = 1
+                try:
+                    yield conn
+                    conn.commit()
+                except BaseException:
+                    self._safe_rollback(conn)
+                    raise
+                finally:
+                    slot.depth = 0
+            else:
+                savepoint = f"pool_sp_{slot.depth}"
+                if not conn.in_transaction:
+                    # Otherwise RELEASE would commit the outer checkout's work
+                    conn.execute("BEGIN")
+                conn.execute(f"SAVEPOINT {savepoint}")
+                slot.depth += 1
+                try:
+                    yield conn
+                except BaseException:
+                    # The block may already have committed (releasing the savepoint)
+                    if conn.in_transaction:
+                        try:
+                            conn.execute(f"ROLLBACK TO {savepoint}")
+                            conn.execute(f"RELEASE {savepoint}")
+                        except sqlite3.Error:
+                            self._safe_rollback(conn)
+                    raise
+                else:
+                    if conn.in_transaction:
+                        try:
+                            conn.execute(f"RELEASE {savepoint}")
+                        except sqlite3.OperationalError:
+                            pass
+                finally:
+                    slot.depth -= 1
+        finally:
+            conn.row_factory = outer_row_factory
+            slot.users -= 1
+            if not pooled:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+
+    def release_thread(self, thread_id: Optional[int] = None):
+        """Close the pooled connections owned by a thread (default: current)."""
+        thread_id = thread_id if thread_id is not None else threading.get_ident()
+        with self._lock:
+            for key in [(thread_id, False), (thread_id, True)]:
+                slot = self._slots.pop(key, None)
+                if slot is not None:
+                    self._close(slot.conn)
+
+    def close_all(self):
+        """Close every pooled connection (application shutdown, file replacement)."""
+        with self._lock:
+            self._close_all_locked()
+
+    def stats(self) -> Dict[str, int]:
+        """Pool counters: opens, reuses, overflow, evictions, health_failures, file_resets, pooled."""
+        with self._lock:
+            out = dict(self._counters)
+            out['pooled'] = len(self._slots)
+            return out
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _checkout(self, read_only: bool) -> Tuple[_PooledConnection, bool]:
+        """Return (slot, pooled) for the current thread."""
+        key = (threading.get_ident(), read_only)
+        with self._lock:
+            self._check_file_identity()
+
+            if read_only:
+                # Reads inside this thread's own write checkout must see its
+                # uncommitted writes (e.g. write-queue tasks calling repositories)
+                writer = self._slots.get((key[0], False))
+                if writer is not None and writer.depth > 0:
+                    self._counters['reuses'] += 1
+                    writer.users += 1
+                    return writer, True
+
+            slot = self._slots.get(key)
+            if slot is not None:
+                if self._healthy(slot):
+                    self._counters['reuses'] += 1
+                    slot.users += 1
+                    return slot, True
+                self._counters['health_failures'] += 1
+                del self._slots[key]
+                self._close(slot.conn)
+
+            # Connect INSIDE the lock: concurrent sqlite3.connect() calls cause
+            # access violations on Windows (Python 3.11 + WAL mode race condition).
+            conn = self._open(read_only)
+            self._counters['opens'] += 1
+            slot = _PooledConnection(conn, read_only)
+            slot.users = 1
+
+            if len(self._slots) >= self.max_connections and not self._evict_dead_thread():
+                self._counters['overflow'] += 1
+                return slot, False
+
+            self._slots[key] = slot
+            return slot, True
+
+    def _healthy(self, slot: _PooledConnection) -> bool:
+        try:
+            slot.conn.total_changes  # raises ProgrammingError once closed
+        except sqlite3.Error:
+            return False
+        if slot.users == 0 and slot.conn.in_transaction:
+            logger.debug("[ConnectionPool] Rolling back transaction left open outside a checkout")
+            self._safe_rollback(slot.conn)
+        return True
+
+    def _check_file_identity(self):
+        """Drop every connection if the database file was deleted or replaced."""
+        try:
+            st = os.stat(self.db_path)
+            identity = (st.st_dev, st.st_ino)
+        except OSError:
+            identity = None
+        if identity != self._file_identity:
+            if self._slots:
+                self._counters['file_resets'] += 1
+                self._close_all_locked()
+            self._journal_mode = None
+            self._file_identity = identity
+
+    def _open(self, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            # SQLite URIs require forward slashes, even on Windows
+            uri = f"file:{self.db_path.replace(chr(92), '/')}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False,
+                                   factory=DeferrableConnection)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                                   factory=DeferrableConnection)
+
+        try:
+            # CRITICAL: Enable foreign key constraints (required for CASCADE deletes)
+            conn.execute("PRAGMA foreign_keys = ON")
+            fk_check = conn.execute("PRAGMA foreign_keys").fetchone()
+            if not fk_check or fk_check[0] != 1:
+                raise RuntimeError(
+                    "CRITICAL: Failed to enable foreign key constraints! "
+                    "This will break CASCADE deletes and data integrity."
+                )
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+
+            if not read_only:
+                conn.execute("PRAGMA synchronous = NORMAL")
+                if self._journal_mode is None:
+                    self._journal_mode = self._negotiate_journal_mode(conn)
+                    # A new file only exists on disk after the first connect
+                    try:
+                        st = os.stat(self.db_path)
+                        self._file_identity = (st.st_dev, st.st_ino)
+                    except OSError:
+                        pass
+        except Exception:
+            self._close(conn)
+            raise
+        return conn
+
+    def _negotiate_journal_mode(self, conn: sqlite3.Connection) -> str:
+        """Pick the journal mode once per pool (it persists in the database file)."""
+        for mode in self.JOURNAL_MODES:
+            try:
+                result = conn.execute(f"PRAGMA journal_mode={mode}").fetchone()
+                if result and str(result[0]).upper() == mode:
+                    logger.debug(f"[ConnectionPool] Journal mode set to {mode}")
+                    return mode
+            except sqlite3.OperationalError as e:
+                logger.debug(f"[ConnectionPool] Could not set journal mode {mode}: {e}")
+        logger.warning("[ConnectionPool] Could not set any journal mode, using default")
+        return 'DEFAULT'
+
+    def _evict_dead_thread(self) -> bool:
+        """Evict an idle connection of a thread that no longer exists."""
+        alive = {t.ident for t in threading.enumerate()}
+        for key, slot in list(self._slots.items()):
+            if key[0] not in alive and slot.users == 0:
+                del self._slots[key]
+                self._close(slot.conn)
+                self._counters['evictions'] += 1
+                return True
+        return False
+
+    def _close_all_locked(self):
+        # Connections checked out right now are only unpooled; closing them
+        # under their owner would break its in-flight statements
+        for slot in self._slots.values():
+            if slot.users == 0:
+                self._close(slot.conn)
+        self._slots.clear()
+
+    @staticmethod
+    def _close(conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"[ConnectionPool] Error closing connection: {e}")
+
+    @staticmethod
+    def _safe_rollback(conn: sqlite3.Connection):
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+
+
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str) -> SQLiteConnectionPool:
+    """Return the process-wide pool for a database file (keyed by absolute path)."""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SQLiteConnectionPool(key)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close every pooled connection in every pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
@@ -56,6 +56,13 @@ class JobHistoryRow:
     error: Optional[str] = None
     canceled: int = 0
 
+    @property
+    def queue_wait_seconds(self) -> Optional[float]:
+        """Seconds the job spent queued before it started."""
+        if self.started_ts is None:
+            return None
+        return max(0.0, self.started_ts - self.created_ts)
+
 
 class JobHistoryRepository:
     """
@@ -81,8 +88,9 @@ class JobHistoryRepository:
 
     # ── Writes ───────────────────────────────────────────────────────────
 
-    def upsert_start(self, *, job_id: str, job_type: str, title: str) -> None:
-        """Record that a tracked job has started."""
+    def upsert_start(self, *, job_id: str, job_type: str, title: str,
+                     queued_ts: Optional[float] = None) -> None:
+        """Record that a job has started (queued_ts: when it was enqueued, default now)."""
         now = time.time()
         with self._db.get_connection() as conn:
             conn.execute(
@@ -91,7 +99,7 @@ class JobHistoryRepository:
                     (job_id, job_type, title, status, created_ts, started_ts, progress)
                 VALUES (?, ?, ?, 'running', ?, ?, 0.0)
                 """,
-                (job_id, job_type, title, now, now),
+                (job_id, job_type, title, queued_ts if queued_ts is not None else now, now),
             )
             conn.commit()
 
@@ -798,6 +798,23 @@ VALUES ('14.0.0', 'UX-11: Identity layer, merge candidates, cluster governance,
 )
 
 
+# Migration v14.1.0: Spatial grid cell for location clustering
+# Adds photo_metadata.gps_cell and backfills it for geotagged rows, so the
+# location read paths never have to ALTER or UPDATE the table themselves.
+MIGRATION_14_1_0 = Migration(
+    version="14.1.0",
+    description="GPS grid cell: spatial index for location clustering",
+    sql="""
+-- Migration v14.1.0: photo_metadata.gps_cell
+-- NOTE: ALTER TABLE ADD COLUMN, index and backfill are handled in Python code below.
+
+INSERT OR REPLACE INTO schema_version (version, description, applied_at)
+VALUES ('14.1.0', 'GPS grid cell: spatial index for location clustering', CURRENT_TIMESTAMP);
+""",
+    rollback_sql=""
+)
+
+
 # Ordered list of all migrations
 ALL_MIGRATIONS = [
     MIGRATION_1_5_0,
@@ -819,6 +836,7 @@ ALL_MIGRATIONS = [
     MIGRATION_12_1_0,
     MIGRATION_13_0_0,
     MIGRATION_14_0_0,
+    MIGRATION_14_1_0,
 ]
 
 
@@ -1018,6 +1036,10 @@ class MigrationManager:
                     # Apply migration v13.0: extend search_asset_features
                     from repository.schema import ensure_search_features_table
                     ensure_search_features_table(conn)
+                elif migration.version == "14.1.0":
+                    # Apply migration v14.1: add and backfill photo_metadata.gps_cell
+                    from repository.schema import ensure_gps_cell_column
+                    ensure_gps_cell_column(conn)
 
                 # Execute migration SQL (version tracking)
                 conn.executescript(migration.sql)
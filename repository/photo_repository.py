@@ -2,7 +2,7 @@
 # Version 02.01.00.01 dated 20260127
 # Repository for photo_metadata table operations
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from .base_repository import BaseRepository, DatabaseConnection
 from logging_config import get_logger
 
@@ -220,6 +220,7 @@ class PhotoRepository(BaseRepository):
             Photo ID (newly inserted or existing)
         """
         import time
+        from services.gps_spatial_index import gps_cell
 
         # Normalize path for consistent storage (prevents duplicates on Windows)
         normalized_path = self._normalize_path(path)
@@ -244,6 +245,9 @@ class PhotoRepository(BaseRepository):
             if 'image_content_hash' not in existing_cols:
                 cur.execute("ALTER TABLE photo_metadata ADD COLUMN image_content_hash TEXT")
                 missing_cols.append('image_content_hash')
+            if 'gps_cell' not in existing_cols:
+                cur.execute("ALTER TABLE photo_metadata ADD COLUMN gps_cell INTEGER")
+                missing_cols.append('gps_cell')
             if missing_cols:
                 self.logger.warning(f"[PhotoRepository] Defensive fallback: added missing columns {missing_cols} - check migration system")
                 conn.commit()
@@ -251,11 +255,13 @@ class PhotoRepository(BaseRepository):
         # BUG FIX #7: Include created_ts, created_date, created_year for date hierarchy queries
         # LONG-TERM FIX (2026-01-08): Include gps_latitude, gps_longitude for Locations section
         # v9.3.0: Include image_content_hash for pixel-based embedding staleness detection
+        # gps_cell: spatial grid cell for location clustering, follows the coordinates
         sql = """
             INSERT INTO photo_metadata
                 (path, folder_id, project_id, size_kb, modified, width, height, date_taken, tags, updated_at,
-                 created_ts, created_date, created_year, gps_latitude, gps_longitude, image_content_hash)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 created_ts, created_date, created_year, gps_latitude, gps_longitude, image_content_hash,
+                 gps_cell)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(path, project_id) DO UPDATE SET
                 folder_id = excluded.folder_id,
                 size_kb = excluded.size_kb,
@@ -270,13 +276,19 @@ class PhotoRepository(BaseRepository):
                 created_year = excluded.created_year,
                 gps_latitude = COALESCE(excluded.gps_latitude, photo_metadata.gps_latitude),
                 gps_longitude = COALESCE(excluded.gps_longitude, photo_metadata.gps_longitude),
-                image_content_hash = COALESCE(excluded.image_content_hash, photo_metadata.image_content_hash)
+                image_content_hash = COALESCE(excluded.image_content_hash, photo_metadata.image_content_hash),
+                gps_cell = CASE
+                    WHEN excluded.gps_latitude IS NULL AND excluded.gps_longitude IS NULL
+                    THEN photo_metadata.gps_cell
+                    ELSE excluded.gps_cell
+                END
         """
 
         with self.connection() as conn:
             cur = conn.cursor()
             cur.execute(sql, (normalized_path, folder_id, project_id, size_kb, modified, width, height,
-                            date_taken, tags, now, created_ts, created_date, created_year, gps_latitude, gps_longitude, image_content_hash))
+                            date_taken, tags, now, created_ts, created_date, created_year, gps_latitude, gps_longitude, image_content_hash,
+                            gps_cell(gps_latitude, gps_longitude)))
             conn.commit()
 
             # Get the ID of the inserted/updated row
@@ -304,6 +316,7 @@ class PhotoRepository(BaseRepository):
             return 0
 
         import time
+        from services.gps_spatial_index import gps_cell
         now = time.strftime("%Y-%m-%d %H:%M:%S")
 
         # DEFENSIVE FALLBACK: GPS/hash columns should be added by migration v9.2.0/v9.3.0 at app startup.
@@ -324,6 +337,9 @@ class PhotoRepository(BaseRepository):
             if 'image_content_hash' not in existing_cols:
                 cur.execute("ALTER TABLE photo_metadata ADD COLUMN image_content_hash TEXT")
                 missing_cols.append('image_content_hash')
+            if 'gps_cell' not in existing_cols:
+                cur.execute("ALTER TABLE photo_metadata ADD COLUMN gps_cell INTEGER")
+                missing_cols.append('gps_cell')
             if missing_cols:
                 self.logger.warning(f"[PhotoRepository] Defensive fallback: added missing columns {missing_cols} - check migration system")
                 conn.commit()
@@ -338,8 +354,9 @@ class PhotoRepository(BaseRepository):
             normalized_path = self._normalize_path(path)
             # Rebuild tuple with normalized path and project_id
             # Output: (path, folder_id, project_id, size_kb, modified, width, height, date_taken, tags,
-            #          updated_at, created_ts, created_date, created_year, gps_latitude, gps_longitude, image_content_hash)
-            normalized_row = (normalized_path, row[1], project_id) + row[2:8] + (now,) + row[8:]
+            #          updated_at, created_ts, created_date, created_year, gps_latitude, gps_longitude, image_content_hash,
+            #          gps_cell)
+            normalized_row = (normalized_path, row[1], project_id) + row[2:8] + (now,) + row[8:] + (gps_cell(row[11], row[12]),)
             rows_normalized.append(normalized_row)
 
         rows_with_timestamp = rows_normalized
@@ -347,11 +364,13 @@ class PhotoRepository(BaseRepository):
         # BUG FIX #7: Include created_ts, created_date, created_year in INSERT
         # LONG-TERM FIX (2026-01-08): Include gps_latitude, gps_longitude for Locations section
         # v9.3.0: Include image_content_hash for pixel-based embedding staleness detection
+        # gps_cell: spatial grid cell for location clustering, follows the coordinates
         sql = """
             INSERT INTO photo_metadata
                 (path, folder_id, project_id, size_kb, modified, width, height, date_taken, tags, updated_at,
-                 created_ts, created_date, created_year, gps_latitude, gps_longitude, image_content_hash)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 created_ts, created_date, created_year, gps_latitude, gps_longitude, image_content_hash,
+                 gps_cell)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(path, project_id) DO UPDATE SET
                 folder_id = excluded.folder_id,
                 size_kb = excluded.size_kb,
@@ -366,7 +385,12 @@ class PhotoRepository(BaseRepository):
                 created_year = excluded.created_year,
                 gps_latitude = COALESCE(excluded.gps_latitude, photo_metadata.gps_latitude),
                 gps_longitude = COALESCE(excluded.gps_longitude, photo_metadata.gps_longitude),
-                image_content_hash = COALESCE(excluded.image_content_hash, photo_metadata.image_content_hash)
+                image_content_hash = COALESCE(excluded.image_content_hash, photo_metadata.image_content_hash),
+                gps_cell = CASE
+                    WHEN excluded.gps_latitude IS NULL AND excluded.gps_longitude IS NULL
+                    THEN photo_metadata.gps_cell
+                    ELSE excluded.gps_cell
+                END
         """
 
         with self.connection() as conn:
@@ -421,6 +445,22 @@ class PhotoRepository(BaseRepository):
 
         self.logger.debug(f"Updated file_hash for photo {photo_id}")
 
+    def update_photo_hashes(self, pairs: List[Tuple[int, str]]):
+        """
+        Bulk update_photo_hash.
+
+        Args:
+            pairs: (photo_id, file_hash) tuples
+        """
+        with self.connection() as conn:
+            conn.executemany(
+                "UPDATE photo_metadata SET file_hash = ? WHERE id = ?",
+                [(file_hash, photo_id) for photo_id, file_hash in pairs]
+            )
+            conn.commit()
+
+        self.logger.debug(f"Updated file_hash for {len(pairs)} photos")
+
     def get_missing_metadata(self, project_id: int, max_failures: int = 3, limit: Optional[int] = None) -> List[str]:
         """
         Get photos that need metadata extraction for a specific project.
@@ -19,7 +19,7 @@ Schema Version: 2.0.0
 - Adds schema_version tracking table
 """
 
-SCHEMA_VERSION = "14.0.0"
+SCHEMA_VERSION = "14.1.0"
 
 # Complete schema SQL - executed as a script for new databases
 SCHEMA_SQL = """
@@ -290,6 +290,7 @@ CREATE TABLE IF NOT EXISTS photo_metadata (
     -- GPS coordinates for location-based browsing (v9.2.0)
     gps_latitude REAL,
     gps_longitude REAL,
+    gps_cell INTEGER,    -- Spatial grid cell (services/gps_spatial_index.py)
     location_name TEXT,  -- Reverse-geocoded location name
     -- Perceptual hash for pixel-based embedding staleness detection (v9.3.0)
     -- Uses dHash (difference hash) which is resilient to metadata-only changes
@@ -653,6 +654,8 @@ CREATE INDEX IF NOT EXISTS idx_photo_metadata_hash ON photo_metadata(file_hash);
 -- Photo metadata indexes (GPS for location-based browsing v9.2.0)
 CREATE INDEX IF NOT EXISTS idx_photo_metadata_gps ON photo_metadata(project_id, gps_latitude, gps_longitude)
     WHERE gps_latitude IS NOT NULL AND gps_longitude IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_photo_metadata_gps_cell ON photo_metadata(gps_cell)
+    WHERE gps_cell IS NOT NULL;
 
 -- Tag indexes (v3.1.0: Added project_id indexes)
 CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name);
@@ -803,6 +806,17 @@ CREATE INDEX IF NOT EXISTS idx_search_features_gps
 CREATE INDEX IF NOT EXISTS idx_search_features_media_type
     ON search_asset_features(media_type);
 
+-- Dirty-row journal: paths whose search_asset_features row must be
+-- re-derived (written by change hooks and the verification pass,
+-- drained by SearchFeatureRepository.process_dirty)
+CREATE TABLE IF NOT EXISTS search_feature_dirty (
+    project_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    reason TEXT,
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (project_id, path)
+);
+
 -- ============================================================================
 -- ASSET RETRIEVAL TABLES (v13.0.0 - Family-first Hybrid Retrieval)
 -- ============================================================================
@@ -971,6 +985,9 @@ CREATE TABLE IF NOT EXISTS review_queue_state (
 
 INSERT OR IGNORE INTO schema_version (version, description)
 VALUES ('14.0.0', 'UX-11: Identity layer, merge candidates, cluster governance, action log');
+
+INSERT OR IGNORE INTO schema_version (version, description)
+VALUES ('14.1.0', 'GPS grid cell: spatial index for location clustering');
 """
 
 
@@ -1104,6 +1121,7 @@ def get_expected_indexes() -> list[str]:
         "idx_photo_metadata_project_folder",
         "idx_photo_metadata_project_date",
         "idx_photo_metadata_gps",
+        "idx_photo_metadata_gps_cell",
         "idx_video_metadata_project_folder",
         "idx_video_metadata_project_date",
         "idx_project_images_project_branch",
@@ -1339,6 +1357,8 @@ def ensure_gps_columns(conn) -> bool:
         VALUES ('9.2.0', 'Add GPS columns to photo_metadata for location-based browsing')
     """)
 
+    ensure_gps_cell_column(conn)
+
     conn.commit()
 
     if columns_added:
@@ -1347,6 +1367,46 @@ def ensure_gps_columns(conn) -> bool:
     return columns_added
 
 
+def ensure_gps_cell_column(conn) -> None:
+    """
+    Ensure photo_metadata.gps_cell exists, is indexed and is filled in.
+
+    gps_cell is the spatial grid cell used by location clustering
+    (services/gps_spatial_index.py). It is written together with the
+    coordinates; rows geotagged before the column existed (or by writers
+    that predate it) are backfilled here in SQL. Runs once, from the
+    v14.1.0 migration; read paths must not call it.
+    Safe to call multiple times (idempotent). Does not commit.
+
+    Args:
+        conn: SQLite connection object
+    """
+    from services.gps_spatial_index import GPS_CELL_SQL
+
+    cur = conn.cursor()
+    existing_cols = {r['name'] if isinstance(r, dict) else r[1]
+                     for r in cur.execute("PRAGMA table_info(photo_metadata)")}
+    if 'gps_latitude' not in existing_cols or 'gps_longitude' not in existing_cols:
+        return
+
+    if 'gps_cell' not in existing_cols:
+        import logging
+        logging.getLogger(__name__).info("[Schema] Adding gps_cell column to photo_metadata")
+        cur.execute("ALTER TABLE photo_metadata ADD COLUMN gps_cell INTEGER")
+
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_photo_metadata_gps_cell
+        ON photo_metadata(gps_cell)
+        WHERE gps_cell IS NOT NULL
+    """)
+    cur.execute(f"""
+        UPDATE photo_metadata SET gps_cell = {GPS_CELL_SQL}
+        WHERE gps_cell IS NULL
+          AND gps_latitude BETWEEN -90 AND 90
+          AND gps_longitude BETWEEN -180 AND 180
+    """)
+
+
 def ensure_groups_tables(conn) -> bool:
     """
     Ensure People Groups tables exist (v10.0.0 migration).
@@ -1538,6 +1598,17 @@ def ensure_search_features_table(conn) -> bool:
         "ON search_asset_features(media_type)"
     )
 
+    # Dirty-row journal for incremental feature updates
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS search_feature_dirty (
+            project_id INTEGER NOT NULL,
+            path TEXT NOT NULL,
+            reason TEXT,
+            queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (project_id, path)
+        )
+    """)
+
     # Update schema version
     cur.execute("""
         INSERT OR IGNORE INTO schema_version (version, description)
@@ -15,15 +15,25 @@ Usage:
     from repository.search_feature_repository import SearchFeatureRepository
 
     repo = SearchFeatureRepository()
+    repo.apply_changes(project_id, paths, "scan")  # journal + upsert changed rows
+    repo.sync_project(project_id)      # verification pass + drain the journal
     repo.refresh_project(project_id)   # full rebuild
-    repo.refresh_asset(path)           # single-asset update
     meta = repo.get_project_meta(project_id)  # {path: {...}}
+
+Freshness is change-driven: writers (scan batches, face batches, flag and
+rating edits, OCR, duplicate linking) call apply_changes() with the paths
+they touched. The paths are first recorded in the search_feature_dirty
+journal and then re-derived from photo_metadata/face_crops/media_instance
+with executemany; a path leaves the journal only once its row is written,
+so a failed upsert is retried by the next sync_project().
 """
 
 import os
 import re
+import sqlite3
 import time
-from typing import Dict, Optional, List
+from concurrent.futures import Future
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
 
 from repository.base_repository import DatabaseConnection
 from logging_config import get_logger
@@ -54,6 +64,43 @@ _SCREENSHOT_FILENAME_RE = re.compile(
     r'|schermopname|captura|snip|clip\d)',
 )
 
+_VIDEO_EXTENSIONS = frozenset({
+    ".mp4", ".mov", ".avi", ".mkv", ".wmv", ".webm", ".m4v", ".flv",
+})
+
+# Paths per IN (...) query; face lookups bind each path twice (raw + normpath)
+# and older SQLite builds cap host parameters at 999
+_PATH_CHUNK = 400
+
+_DIRTY_JOURNAL_SQL = """
+    CREATE TABLE IF NOT EXISTS search_feature_dirty (
+        project_id INTEGER NOT NULL,
+        path TEXT NOT NULL,
+        reason TEXT,
+        queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (project_id, path)
+    )
+"""
+
+_UPSERT_SQL = """
+    INSERT OR REPLACE INTO search_asset_features
+    (path, project_id, media_type, width, height, has_gps,
+     face_count, is_screenshot, screenshot_confidence,
+     flag, ext, date_taken, duplicate_group_id, ocr_text,
+     rating, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+# Pre-migration tables lack screenshot_confidence/duplicate_group_id/ocr_text
+_UPSERT_SQL_LEGACY = """
+    INSERT OR REPLACE INTO search_asset_features
+    (path, project_id, media_type, width, height, has_gps,
+     face_count, is_screenshot, flag, ext, date_taken,
+     rating, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+_LEGACY_COLUMNS = (0, 1, 2, 3, 4, 5, 6, 7, 9, 10, 11, 14)
+
 # Camera EXIF markers — their ABSENCE is a weak screenshot hint
 _CAMERA_EXIF_EXTENSIONS = frozenset({
     '.jpg', '.jpeg', '.heic', '.heif', '.cr2', '.nef', '.arw', '.dng',
@@ -143,11 +190,74 @@ def _detect_screenshot(path: str, width, height) -> bool:
     return False
 
 
+def _chunks(items: List[str], size: int = _PATH_CHUNK) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _placeholders(n: int) -> str:
+    return ",".join("?" * n)
+
+
+# Verification pass: photo_metadata rows without a feature row
+_MISSING_SQL = """
+    SELECT pm.path FROM photo_metadata pm
+    WHERE pm.project_id = ?
+      AND NOT EXISTS (SELECT 1 FROM search_asset_features f
+                      WHERE f.path = pm.path AND f.project_id = pm.project_id)
+"""
+
+# Verification pass: feature rows whose photo is gone
+_ORPHANED_SQL = """
+    SELECT f.path FROM search_asset_features f
+    WHERE f.project_id = ?
+      AND NOT EXISTS (SELECT 1 FROM photo_metadata pm
+                      WHERE pm.path = f.path AND pm.project_id = f.project_id)
+"""
+
+# Verification pass: feature rows that disagree with their sources.
+# Each query is tried on its own (face_crops/media_instance/ocr_text may
+# not exist on older databases).
+_STALE_SQL = (
+    """
+    SELECT f.path FROM search_asset_features f
+    JOIN photo_metadata pm ON pm.path = f.path AND pm.project_id = f.project_id
+    WHERE f.project_id = ?
+      AND (pm.width IS NOT f.width OR pm.height IS NOT f.height
+           OR pm.flag IS NOT f.flag OR COALESCE(pm.rating, 0) IS NOT f.rating
+           OR COALESCE(NULLIF(pm.created_date, ''), pm.date_taken) IS NOT f.date_taken
+           OR COALESCE(pm.ocr_text, '') IS NOT f.ocr_text
+           OR (CASE WHEN pm.gps_latitude IS NOT NULL AND pm.gps_longitude IS NOT NULL
+                     AND pm.gps_latitude != 0 AND pm.gps_longitude != 0
+                    THEN 1 ELSE 0 END) IS NOT f.has_gps)
+    """,
+    """
+    SELECT f.path FROM search_asset_features f
+    JOIN (SELECT image_path, COUNT(*) AS cnt FROM face_crops
+          WHERE project_id = ? GROUP BY image_path) fc ON fc.image_path = f.path
+    WHERE f.project_id = ? AND fc.cnt IS NOT f.face_count
+    """,
+    """
+    SELECT f.path FROM search_asset_features f
+    WHERE f.project_id = ? AND f.face_count > 0
+      AND NOT EXISTS (SELECT 1 FROM face_crops fc
+                      WHERE fc.project_id = f.project_id AND fc.image_path = f.path)
+    """,
+    """
+    SELECT f.path FROM search_asset_features f
+    JOIN photo_metadata pm ON pm.path = f.path AND pm.project_id = f.project_id
+    LEFT JOIN media_instance mi ON mi.photo_id = pm.id AND mi.project_id = pm.project_id
+    WHERE f.project_id = ? AND mi.asset_id IS NOT f.duplicate_group_id
+    """,
+)
+
+
 class SearchFeatureRepository:
     """Read/write the search_asset_features flattened index."""
 
     def __init__(self, db: Optional[DatabaseConnection] = None):
         self.db = db or DatabaseConnection()
+        self._journal_ready = False
 
     def table_exists(self) -> bool:
         """Check if search_asset_features table exists."""
@@ -161,122 +271,227 @@ class SearchFeatureRepository:
         except Exception:
             return False
 
+    # ------------------------------------------------------------------
+    # Change-driven updates
+    # ------------------------------------------------------------------
+    def apply_changes(self, project_id: int, paths: Iterable[str],
+                      reason: str = "") -> Optional[Future]:
+        """
+        Journal changed assets and upsert their rows on the write queue.
+
+        Does not wait for the write. Returns the queue's Future (resolving to
+        the number of rows written), or None when there is nothing to do.
+        """
+        paths = sorted({p for p in paths if p})
+        if not paths:
+            return None
+
+        def _apply(conn):
+            self.mark_dirty(project_id, paths, reason)
+            return self.upsert_paths(project_id, paths)
+
+        return self._submit(_apply, len(paths))
+
+    def apply_photo_changes(self, photo_ids: Iterable[int], reason: str = "") -> Optional[Future]:
+        """apply_changes() for callers that only know photo_metadata ids."""
+        photo_ids = sorted({int(i) for i in photo_ids if i is not None})
+        if not photo_ids:
+            return None
+
+        def _apply(conn):
+            written = 0
+            for project_id, paths in self._paths_for_photo_ids(photo_ids).items():
+                self.mark_dirty(project_id, paths, reason)
+                written += self.upsert_paths(project_id, paths)
+            return written
+
+        return self._submit(_apply, len(photo_ids))
+
+    def mark_dirty(self, project_id: int, paths: Iterable[str], reason: str = "") -> int:
+        """Record paths whose feature rows must be re-derived. Returns paths journaled."""
+        paths = [p for p in dict.fromkeys(paths) if p]
+        if not paths:
+            return 0
+        try:
+            with self.db.get_connection() as conn:
+                self._ensure_journal(conn)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO search_feature_dirty "
+                    "(project_id, path, reason, queued_at) "
+                    "VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+                    [(project_id, p, reason) for p in paths]
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"[SearchFeatureRepo] mark_dirty failed: {e}")
+            return 0
+        return len(paths)
+
+    def upsert_paths(self, project_id: int, paths: Iterable[str]) -> int:
+        """
+        Re-derive the feature rows of the given paths with executemany.
+
+        Paths no longer in photo_metadata lose their row. Written paths are
+        removed from the dirty journal in the same transaction; on failure
+        they stay journaled for the next process_dirty().
+
+        Returns the number of rows written.
+        """
+        paths = [p for p in dict.fromkeys(paths) if p]
+        if not paths:
+            return 0
+        written = 0
+        try:
+            with self.db.get_connection() as conn:
+                self._ensure_journal(conn)
+                for chunk in _chunks(paths):
+                    rows = self._build_rows(conn, project_id, chunk)
+                    present = {r[0] for r in rows}
+                    gone = [(p, project_id) for p in chunk if p not in present]
+                    if gone:
+                        conn.executemany(
+                            "DELETE FROM search_asset_features WHERE path = ? AND project_id = ?",
+                            gone
+                        )
+                    self._write_rows(conn, rows)
+                    conn.executemany(
+                        "DELETE FROM search_feature_dirty WHERE path = ? AND project_id = ?",
+                        [(p, project_id) for p in chunk]
+                    )
+                    written += len(rows)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"[SearchFeatureRepo] upsert_paths failed for {len(paths)} paths: {e}")
+            return 0
+        return written
+
+    def process_dirty(self, project_id: Optional[int] = None) -> int:
+        """Upsert every journaled path (optionally of one project). Returns rows written."""
+        try:
+            with self.db.get_connection() as conn:
+                self._ensure_journal(conn)
+                if project_id is None:
+                    rows = conn.execute(
+                        "SELECT project_id, path FROM search_feature_dirty"
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        "SELECT project_id, path FROM search_feature_dirty WHERE project_id = ?",
+                        (project_id,)
+                    ).fetchall()
+        except Exception as e:
+            logger.warning(f"[SearchFeatureRepo] process_dirty failed: {e}")
+            return 0
+
+        pending: Dict[int, List[str]] = {}
+        for row in rows:
+            pending.setdefault(row['project_id'], []).append(row['path'])
+        return sum(self.upsert_paths(pid, paths) for pid, paths in pending.items())
+
+    def verify_project(self, project_id: int) -> Dict[str, int]:
+        """
+        Fast consistency check of a project's feature rows.
+
+        Set-based anti-joins find photos without a row, rows without a photo
+        and rows whose source columns, face counts or duplicate links
+        changed behind the hooks' back. Orphaned rows are deleted; the rest
+        are journaled for process_dirty(). Nothing is re-derived here.
+
+        Returns:
+            Dict with missing, orphaned and stale counts
+        """
+        counts = {"missing": 0, "orphaned": 0, "stale": 0}
+        try:
+            with self.db.get_connection() as conn:
+                self._ensure_journal(conn)
+                missing = [r['path'] for r in conn.execute(_MISSING_SQL, (project_id,))]
+                orphaned = [r['path'] for r in conn.execute(_ORPHANED_SQL, (project_id,))]
+                stale = self._stale_paths(conn, project_id)
+
+                if orphaned:
+                    conn.executemany(
+                        "DELETE FROM search_asset_features WHERE path = ? AND project_id = ?",
+                        [(p, project_id) for p in orphaned]
+                    )
+                dirty = list(dict.fromkeys(missing + stale))
+                if dirty:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO search_feature_dirty "
+                        "(project_id, path, reason, queued_at) "
+                        "VALUES (?, ?, 'verify', CURRENT_TIMESTAMP)",
+                        [(project_id, p) for p in dirty]
+                    )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"[SearchFeatureRepo] verify_project failed: {e}")
+            return counts
+
+        counts["missing"] = len(missing)
+        counts["orphaned"] = len(orphaned)
+        counts["stale"] = len(set(stale) - set(missing))
+        return counts
+
+    def sync_project(self, project_id: int) -> int:
+        """
+        Bring a project's feature rows up to date incrementally.
+
+        Runs verify_project() and process_dirty() as one write-queue task.
+        Returns the number of rows written.
+        """
+        start = time.time()
+
+        def _sync(conn):
+            return self.verify_project(project_id), self.process_dirty(project_id)
+
+        future = self._submit(_sync, 1)
+        if future is None:
+            return 0
+        try:
+            counts, written = future.result()
+        except Exception as e:
+            logger.error(f"[SearchFeatureRepo] sync_project failed: {e}")
+            return 0
+
+        elapsed = (time.time() - start) * 1000
+        logger.info(
+            f"[SearchFeatureRepo] Synced project {project_id}: {written} rows upserted "
+            f"({counts['missing']} missing, {counts['stale']} stale, "
+            f"{counts['orphaned']} orphaned removed) in {elapsed:.0f}ms"
+        )
+        return written
+
     def refresh_project(self, project_id: int) -> int:
         """
         Full rebuild of search_asset_features for a project.
 
         Joins photo_metadata + face_crops to produce the flattened row.
-        Returns the number of rows written.
+        Prefer sync_project() once the project has rows; this is for the
+        first build and explicit rebuilds. Returns the number of rows written.
         """
         start = time.time()
-        count = 0
 
-        try:
+        def _rebuild(_queue_conn):
             with self.db.get_connection() as conn:
                 # Delete existing rows for project
                 conn.execute(
                     "DELETE FROM search_asset_features WHERE project_id = ?",
                     (project_id,)
                 )
-
-                # Fetch photo metadata
-                rows = conn.execute("""
-                    SELECT id, path, width, height,
-                           gps_latitude, gps_longitude,
-                           flag, rating,
-                           created_date, date_taken,
-                           ocr_text
-                    FROM photo_metadata
-                    WHERE project_id = ?
-                """, (project_id,)).fetchall()
-
-                # Fetch face counts
-                face_counts: Dict[str, int] = {}
-                try:
-                    face_rows = conn.execute("""
-                        SELECT image_path, COUNT(*) as cnt
-                        FROM face_crops
-                        WHERE project_id = ?
-                        GROUP BY image_path
-                    """, (project_id,)).fetchall()
-                    for fr in face_rows:
-                        if fr['image_path']:
-                            face_counts[fr['image_path']] = fr['cnt']
-                            # Also store normalized key
-                            face_counts[os.path.normpath(fr['image_path'])] = fr['cnt']
-                except Exception:
-                    pass  # face_crops may not exist yet
-
-                # Fetch duplicate group mapping when available
-                duplicate_groups: Dict[str, int] = {}
-                try:
-                    from repository.asset_repository import AssetRepository
-                    asset_repo = AssetRepository(self.db)
-                    duplicate_groups = asset_repo.get_path_to_asset_map(project_id)
-                except Exception:
-                    pass
-
-                # Insert flattened rows
-                for row in rows:
-                    path = row['path']
-                    w = row['width']
-                    h = row['height']
-                    lat = row['gps_latitude']
-                    lon = row['gps_longitude']
-                    has_gps = 1 if (lat is not None and lon is not None
-                                    and lat != 0 and lon != 0) else 0
-
-                    ocr_text = row["ocr_text"] or ""
-
-                    ss_conf = _compute_screenshot_confidence(path, w, h, ocr_text=ocr_text)
-                    is_ss = 1 if ss_conf >= 0.50 else 0
-                    ext = os.path.splitext(path)[1].lower() if path else None
-                    date = row['created_date'] or row['date_taken']
-
-                    # Face count: try exact path, then normalized
-                    fc = face_counts.get(path, 0)
-                    if fc == 0:
-                        fc = face_counts.get(os.path.normpath(path), 0)
-
-                    media_type = "video" if (path and os.path.splitext(path)[1].lower() in {
-                        ".mp4", ".mov", ".avi", ".mkv", ".wmv", ".webm", ".m4v", ".flv"
-                    }) else "photo"
-
-                    duplicate_group_id = duplicate_groups.get(path)
-                    if duplicate_group_id is None:
-                        duplicate_group_id = duplicate_groups.get(os.path.normpath(path))
-
-                    # Try to store screenshot_confidence if column exists
-                    try:
-                        conn.execute("""
-                            INSERT OR REPLACE INTO search_asset_features
-                            (path, project_id, media_type, width, height, has_gps,
-                             face_count, is_screenshot, screenshot_confidence,
-                             flag, ext, date_taken, duplicate_group_id, ocr_text,
-                             rating, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        """, (
-                            path, project_id, media_type, w, h, has_gps,
-                            fc, is_ss, ss_conf, row['flag'], ext, date,
-                            duplicate_group_id, ocr_text, row['rating'] or 0,
-                        ))
-                    except Exception:
-                        # Fallback: column doesn't exist yet (pre-migration)
-                        conn.execute("""
-                            INSERT OR REPLACE INTO search_asset_features
-                            (path, project_id, media_type, width, height, has_gps,
-                             face_count, is_screenshot, flag, ext, date_taken,
-                             rating, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        """, (
-                            path, project_id, media_type, w, h, has_gps,
-                            fc, is_ss, row['flag'], ext, date,
-                            row['rating'] or 0,
-                        ))
-                    count += 1
-
+                rows = self._build_rows(conn, project_id)
+                self._write_rows(conn, rows)
+                self._ensure_journal(conn)
+                conn.execute(
+                    "DELETE FROM search_feature_dirty WHERE project_id = ?",
+                    (project_id,)
+                )
                 conn.commit()
+            return len(rows)
 
+        future = self._submit(_rebuild, 1)
+        if future is None:
+            return 0
+        try:
+            count = future.result()
         except Exception as e:
             logger.error(f"[SearchFeatureRepo] refresh_project failed: {e}")
             return 0
@@ -328,6 +543,38 @@ class SearchFeatureRepository:
 
         return result
 
+    def iter_project_rows(self, project_id: int, updated_since: Optional[str] = None,
+                          batch_size: int = 5000) -> Iterator[Dict]:
+        """
+        Stream a project's feature rows (plus photo_id), batch by batch.
+
+        Args:
+            project_id: Project ID
+            updated_since: Only rows with updated_at >= this timestamp
+            batch_size: Rows fetched per round trip
+        """
+        sql = """
+            SELECT f.path, f.media_type, f.width, f.height, f.has_gps,
+                   f.face_count, f.is_screenshot, f.flag, f.ext,
+                   f.date_taken, f.duplicate_group_id, f.ocr_text,
+                   f.rating, f.updated_at, pm.id AS photo_id
+            FROM search_asset_features f
+            LEFT JOIN photo_metadata pm
+                   ON pm.path = f.path AND pm.project_id = f.project_id
+            WHERE f.project_id = ?
+        """
+        params: List = [project_id]
+        if updated_since is not None:
+            sql += " AND f.updated_at >= ?"
+            params.append(updated_since)
+        with self.db.get_connection(read_only=True) as conn:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
     def update_face_count(self, path: str, face_count: int):
         """Update face_count for a single asset (after face detection)."""
         try:
@@ -376,3 +623,158 @@ class SearchFeatureRepository:
         if count > 0:
             return count
         return self.refresh_project(project_id)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _submit(self, fn, weight: int) -> Optional[Future]:
+        try:
+            return self.db.write_queue().submit("search_features", fn, weight=weight)
+        except Exception as e:
+            logger.warning(f"[SearchFeatureRepo] Could not queue feature write: {e}")
+            return None
+
+    def _ensure_journal(self, conn):
+        """Create the dirty journal on databases that predate it."""
+        if not self._journal_ready:
+            conn.execute(_DIRTY_JOURNAL_SQL)
+            self._journal_ready = True
+
+    def _paths_for_photo_ids(self, photo_ids: List[int]) -> Dict[int, List[str]]:
+        """Group photo paths by project for a list of photo_metadata ids."""
+        by_project: Dict[int, List[str]] = {}
+        with self.db.get_connection(read_only=True) as conn:
+            for chunk in _chunks(photo_ids):
+                rows = conn.execute(
+                    f"SELECT project_id, path FROM photo_metadata "
+                    f"WHERE id IN ({_placeholders(len(chunk))})",
+                    chunk
+                ).fetchall()
+                for row in rows:
+                    by_project.setdefault(row['project_id'], []).append(row['path'])
+        return by_project
+
+    def _build_rows(self, conn, project_id: int,
+                    paths: Optional[List[str]] = None) -> List[Tuple]:
+        """Flattened rows for a project, or for the given paths of it."""
+        sql = """
+            SELECT id, path, width, height,
+                   gps_latitude, gps_longitude,
+                   flag, rating,
+                   created_date, date_taken,
+                   ocr_text
+            FROM photo_metadata
+            WHERE project_id = ?
+        """
+        params: List = [project_id]
+        if paths is not None:
+            sql += f" AND path IN ({_placeholders(len(paths))})"
+            params.extend(paths)
+        photos = conn.execute(sql, params).fetchall()
+        if not photos:
+            return []
+
+        face_counts = self._face_counts(conn, project_id, paths)
+        duplicate_groups = self._duplicate_groups(conn, project_id, paths)
+        return [self._feature_row(project_id, row, face_counts, duplicate_groups)
+                for row in photos]
+
+    @staticmethod
+    def _face_counts(conn, project_id: int, paths: Optional[List[str]]) -> Dict[str, int]:
+        sql = "SELECT image_path, COUNT(*) as cnt FROM face_crops WHERE project_id = ?"
+        params: List = [project_id]
+        if paths is not None:
+            keys = list(dict.fromkeys(paths + [os.path.normpath(p) for p in paths]))
+            sql += f" AND image_path IN ({_placeholders(len(keys))})"
+            params.extend(keys)
+        sql += " GROUP BY image_path"
+
+        face_counts: Dict[str, int] = {}
+        try:
+            face_rows = conn.execute(sql, params).fetchall()
+        except sqlite3.Error:
+            return face_counts  # face_crops may not exist yet
+        for fr in face_rows:
+            if fr['image_path']:
+                face_counts[fr['image_path']] = fr['cnt']
+                # Also store normalized key
+                face_counts[os.path.normpath(fr['image_path'])] = fr['cnt']
+        return face_counts
+
+    @staticmethod
+    def _duplicate_groups(conn, project_id: int, paths: Optional[List[str]]) -> Dict[str, int]:
+        """Path -> asset_id from media_instance (duplicate group mapping)."""
+        sql = """
+            SELECT pm.path, mi.asset_id
+            FROM media_instance mi
+            JOIN photo_metadata pm ON pm.id = mi.photo_id
+            WHERE pm.project_id = ?
+        """
+        params: List = [project_id]
+        if paths is not None:
+            sql += f" AND pm.path IN ({_placeholders(len(paths))})"
+            params.extend(paths)
+        try:
+            return {r['path']: r['asset_id'] for r in conn.execute(sql, params) if r['path']}
+        except sqlite3.Error:
+            return {}
+
+    @staticmethod
+    def _feature_row(project_id: int, row, face_counts: Dict[str, int],
+                     duplicate_groups: Dict[str, int]) -> Tuple:
+        """One search_asset_features row, in _UPSERT_SQL column order."""
+        path = row['path']
+        w = row['width']
+        h = row['height']
+        lat = row['gps_latitude']
+        lon = row['gps_longitude']
+        has_gps = 1 if (lat is not None and lon is not None
+                        and lat != 0 and lon != 0) else 0
+
+        ocr_text = row["ocr_text"] or ""
+
+        ss_conf = _compute_screenshot_confidence(path, w, h, ocr_text=ocr_text)
+        is_ss = 1 if ss_conf >= 0.50 else 0
+        ext = os.path.splitext(path)[1].lower() if path else None
+        date = row['created_date'] or row['date_taken']
+
+        # Face count: try exact path, then normalized
+        fc = face_counts.get(path, 0)
+        if fc == 0:
+            fc = face_counts.get(os.path.normpath(path), 0)
+
+        media_type = "video" if ext in _VIDEO_EXTENSIONS else "photo"
+
+        duplicate_group_id = duplicate_groups.get(path)
+        if duplicate_group_id is None:
+            duplicate_group_id = duplicate_groups.get(os.path.normpath(path))
+
+        return (
+            path, project_id, media_type, w, h, has_gps,
+            fc, is_ss, ss_conf, row['flag'], ext, date,
+            duplicate_group_id, ocr_text, row['rating'] or 0,
+        )
+
+    @staticmethod
+    def _write_rows(conn, rows: List[Tuple]):
+        if not rows:
+            return
+        try:
+            conn.executemany(_UPSERT_SQL, rows)
+        except sqlite3.OperationalError:
+            # Fallback: columns don't exist yet (pre-migration)
+            conn.executemany(
+                _UPSERT_SQL_LEGACY,
+                [tuple(r[i] for i in _LEGACY_COLUMNS) for r in rows]
+            )
+
+    @staticmethod
+    def _stale_paths(conn, project_id: int) -> List[str]:
+        stale: List[str] = []
+        for sql in _STALE_SQL:
+            try:
+                params = (project_id,) * sql.count("?")
+                stale.extend(r['path'] for r in conn.execute(sql, params))
+            except sqlite3.OperationalError as e:
+                logger.debug(f"[SearchFeatureRepo] Skipping verification query: {e}")
+        return stale
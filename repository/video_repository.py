@@ -2,7 +2,7 @@
 # Version 1.0.0 dated 2025-11-09
 # Repository for video_metadata, project_videos, and video_tags table operations
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from .base_repository import BaseRepository
 from logging_config import get_logger
 import platform
@@ -355,6 +355,44 @@ class VideoRepository(BaseRepository):
         self.logger.info(f"Bulk upserted {count} videos for project {project_id}")
         return count
 
+    def bulk_update(self, updates: List[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        Update metadata fields of many videos in one transaction.
+
+        Rows updating the same set of fields share one executemany().
+
+        Args:
+            updates: (video_id, {field: value}) pairs
+
+        Returns:
+            Number of rows updated
+
+        Example:
+            >>> repo.bulk_update([(1, {'duration_seconds': 12.5}), (2, {'metadata_status': 'error'})])
+            2
+        """
+        groups: Dict[Tuple[str, ...], List[tuple]] = {}
+        for video_id, metadata in updates:
+            if metadata:
+                groups.setdefault(tuple(metadata), []).append(tuple(metadata.values()) + (video_id,))
+        if not groups:
+            return 0
+
+        count = 0
+        with self.connection() as conn:
+            for fields, rows in groups.items():
+                set_sql = ', '.join(f"{field} = ?" for field in fields)
+                cur = conn.executemany(f"""
+                    UPDATE video_metadata
+                    SET {set_sql}
+                    WHERE id = ?
+                """, rows)
+                count += max(0, cur.rowcount)
+            conn.commit()
+
+        self.logger.debug(f"Bulk updated {count} videos")
+        return count
+
     def get_unprocessed_videos(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Get videos that need metadata extraction.
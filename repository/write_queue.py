@@ -0,0 +1,396 @@
+# repository/write_queue.py
+# Single-writer queue: one thread applies every worker's SQLite writes in
+# coalesced transactions, with row-count backpressure
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from logging_config import get_logger
+from .connection_pool import get_connection_pool
+
+logger = get_logger(__name__)
+
+
+class WriteQueueClosed(RuntimeError):
+    """Raised when submitting to a write queue that is shutting down."""
+
+
+class _WriteItem:
+    """One submitted write: a row batch for ``sql`` or a task ``fn(conn)``."""
+
+    __slots__ = ("kind", "sql", "rows", "fn", "weight", "future")
+
+    def __init__(self, kind: str, sql: Optional[str], rows: Optional[List[Sequence]],
+                 fn: Optional[Callable], weight: int):
+        self.kind = kind
+        self.sql = sql
+        self.rows = rows
+        self.fn = fn
+        self.weight = weight
+        self.future: Future = Future()
+
+    def run(self, conn: sqlite3.Connection) -> Any:
+        if self.fn is not None:
+            return self.fn(conn)
+        conn.executemany(self.sql, self.rows)
+        return len(self.rows)
+
+
+def _is_locked(error: Exception) -> bool:
+    msg = str(error).lower()
+    return "database is locked" in msg or "database is busy" in msg
+
+
+class DatabaseWriteQueue:
+    """
+    Serializes all writes to one database file through a dedicated thread.
+
+    Workers submit typed write batches instead of opening their own write
+    transactions and retrying on "database is locked":
+
+    - ``submit_rows(kind, sql, rows)``: rows for one parameterized statement.
+      Consecutive batches with the same SQL (e.g. face_crops inserts from
+      several workers) are merged into a single executemany.
+    - ``submit(kind, fn)``: a task ``fn(conn)`` for writes that need reads or
+      several statements (delete-then-insert, upsert with lookups). Repository
+      calls made inside the task join the writer's transaction.
+
+    Everything drained in one round (up to ``max_transaction_rows``) is applied
+    in ONE transaction, each item inside its own SAVEPOINT so a failing item
+    rolls back alone and only its future gets the exception. Futures resolve
+    after the commit. Lock errors (another process holding the file) are
+    retried here instead of in every worker: the whole transaction is re-run
+    up to ``LOCK_RETRIES`` times, waiting ``LOCK_RETRY_DELAY`` doubled per
+    attempt (0.2 + 0.4 + ... + 3.2 = 6.2s in total). After that the lock
+    error fails every item in the round.
+
+    Backpressure: submit() blocks while more than ``max_pending_rows`` rows
+    are queued or in flight, so fast producers cannot buffer unbounded data.
+    """
+
+    LOCK_RETRIES = 5          # re-runs of a locked transaction before failing it
+    LOCK_RETRY_DELAY = 0.2    # seconds before the first re-run, doubles per retry
+
+    def __init__(self,
+                 db_path: str,
+                 max_pending_rows: int = 20000,
+                 max_transaction_rows: int = 5000,
+                 coalesce_window: float = 0.02):
+        self.db_path = os.path.abspath(db_path)
+        self.max_pending_rows = max(1, int(max_pending_rows))
+        self.max_transaction_rows = max(1, int(max_transaction_rows))
+        self.coalesce_window = coalesce_window
+
+        self._pool = get_connection_pool(self.db_path)
+        self._cond = threading.Condition()
+        self._items: List[_WriteItem] = []
+        self._pending_rows = 0
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {
+            'submitted': 0,
+            'transactions': 0,
+            'rows_written': 0,
+            'tasks_run': 0,
+            'coalesced': 0,
+            'failures': 0,
+            'lock_retries': 0,
+            'throttled': 0,
+            'max_transaction_items': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def submit_rows(self, kind: str, sql: str, rows: Sequence[Sequence],
+                    timeout: Optional[float] = None) -> Future:
+        """
+        Queue rows for one parameterized statement.
+
+        Returns:
+            Future resolving to the number of rows written once committed
+        """
+        rows = list(rows)
+        item = _WriteItem(kind, sql, rows, None, max(1, len(rows)))
+        if not rows:
+            item.future.set_result(0)
+            return item.future
+        return self._enqueue(item, timeout)
+
+    def submit(self, kind: str, fn: Callable[[sqlite3.Connection], Any],
+               weight: int = 1, timeout: Optional[float] = None) -> Future:
+        """
+        Queue a write task ``fn(conn)``; ``weight`` counts toward backpressure.
+
+        The task must not manage the transaction itself: commit() and
+        rollback() on ``conn`` are deferred to the queue.
+
+        Returns:
+            Future resolving to the task's return value once committed
+        """
+        return self._enqueue(_WriteItem(kind, None, None, fn, max(1, int(weight))), timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is committed. Returns False on timeout."""
+        if self.is_writer_thread():
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending_rows > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None):
+        """Stop accepting writes; the writer drains the queue and exits."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+            thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    @property
+    def closed(self) -> bool:
+        return self._closing
+
+    def is_writer_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def stats(self) -> Dict[str, int]:
+        """Queue counters plus current pending_rows / queued_items."""
+        with self._cond:
+            out = dict(self._counters)
+            out['pending_rows'] = self._pending_rows
+            out['queued_items'] = len(self._items)
+            return out
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def _enqueue(self, item: _WriteItem, timeout: Optional[float]) -> Future:
+        if self.is_writer_thread():
+            # A task (or a future callback) writing again: waiting on the
+            # queue would deadlock, so run it in the current transaction
+            self._run_inline(item)
+            return item.future
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._closing:
+                raise WriteQueueClosed(f"Write queue for {self.db_path} is shut down")
+            throttled = False
+            # An oversized batch is admitted alone rather than blocking forever
+            while self._pending_rows and self._pending_rows + item.weight > self.max_pending_rows:
+                if not throttled:
+                    throttled = True
+                    self._counters['throttled'] += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"Write queue backpressure: {self._pending_rows} rows pending")
+                self._cond.wait(remaining)
+                if self._closing:
+                    raise WriteQueueClosed(f"Write queue for {self.db_path} is shut down")
+
+            self._items.append(item)
+            self._pending_rows += item.weight
+            self._counters['submitted'] += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+        return item.future
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name=f"DBWriteQueue-{os.path.basename(self.db_path)}", daemon=True)
+            self._thread.start()
+
+    def _run_inline(self, item: _WriteItem):
+        try:
+            # Nested pool checkout: a SAVEPOINT inside the active transaction
+            with self._pool.connection() as conn:
+                result = item.run(conn)
+        except Exception as e:
+            item.future.set_exception(e)
+        else:
+            item.future.set_result(result)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _run(self):
+        logger.debug(f"[DatabaseWriteQueue] Writer thread started for {self.db_path}")
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                break
+            try:
+                self._apply(batch)
+            except Exception as e:
+                logger.error(f"[DatabaseWriteQueue] Unexpected writer error: {e}", exc_info=True)
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._pending_rows -= sum(item.weight for item in batch)
+                    self._cond.notify_all()
+        self._pool.release_thread()
+        logger.debug(f"[DatabaseWriteQueue] Writer thread stopped for {self.db_path}")
+
+    def _take_batch(self) -> Optional[List[_WriteItem]]:
+        """Block for work, linger briefly to coalesce, then pop one transaction's worth."""
+        with self._cond:
+            while not self._items and not self._closing:
+                self._cond.wait()
+            if not self._items:
+                return None
+
+            deadline = time.monotonic() + self.coalesce_window
+            while not self._closing:
+                queued = sum(item.weight for item in self._items)
+                remaining = deadline - time.monotonic()
+                if queued >= self.max_transaction_rows or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, rows = [], 0
+            while self._items and (not batch or rows + self._items[0].weight <= self.max_transaction_rows):
+                item = self._items.pop(0)
+                batch.append(item)
+                rows += item.weight
+            self._cond.notify_all()
+            return batch
+
+    def _apply(self, batch: List[_WriteItem]):
+        """Apply a batch in one transaction, retrying the whole transaction on lock errors."""
+        for attempt in range(self.LOCK_RETRIES + 1):
+            results: Dict[int, Any] = {}
+            errors: Dict[int, Exception] = {}
+            try:
+                with self._pool.connection() as conn:
+                    conn.defer_commit = True
+                    try:
+                        for group in self._coalesce(batch):
+                            self._apply_group(conn, group, results, errors)
+                    finally:
+                        conn.defer_commit = False
+                        conn.rollback_requested = False
+                # Leaving the outermost checkout committed the transaction
+                break
+            except sqlite3.OperationalError as e:
+                if _is_locked(e) and attempt < self.LOCK_RETRIES:
+                    delay = self.LOCK_RETRY_DELAY * (2 ** attempt)
+                    logger.warning(
+                        f"[DatabaseWriteQueue] Database locked, retrying transaction of "
+                        f"{len(batch)} writes in {delay:.1f}s (attempt {attempt + 1}/{self.LOCK_RETRIES})")
+                    with self._cond:
+                        self._counters['lock_retries'] += 1
+                    time.sleep(delay)
+                    continue
+                raise
+
+        rows_written = sum(results[id(item)] for item in batch
+                           if item.fn is None and id(item) in results)
+        with self._cond:
+            self._counters['transactions'] += 1
+            self._counters['rows_written'] += rows_written
+            self._counters['tasks_run'] += sum(1 for item in batch if item.fn is not None)
+            self._counters['failures'] += len(errors)
+            self._counters['max_transaction_items'] = max(
+                self._counters['max_transaction_items'], len(batch))
+
+        for item in batch:
+            if id(item) in errors:
+                item.future.set_exception(errors[id(item)])
+            else:
+                item.future.set_result(results.get(id(item)))
+
+    def _coalesce(self, batch: List[_WriteItem]) -> List[List[_WriteItem]]:
+        """Group consecutive row batches that share the same statement."""
+        groups: List[List[_WriteItem]] = []
+        for item in batch:
+            if (groups and item.fn is None and groups[-1][0].fn is None
+                    and groups[-1][0].sql == item.sql):
+                groups[-1].append(item)
+                with self._cond:
+                    self._counters['coalesced'] += 1
+            else:
+                groups.append([item])
+        return groups
+
+    def _apply_group(self, conn: sqlite3.Connection, group: List[_WriteItem],
+                     results: Dict[int, Any], errors: Dict[int, Exception]):
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        conn.execute("SAVEPOINT write_queue_item")
+        try:
+            if len(group) == 1:
+                outcome = group[0].run(conn)
+            else:
+                conn.executemany(group[0].sql, [row for item in group for row in item.rows])
+                outcome = None
+            if conn.rollback_requested:
+                # The task handled its own error and asked to undo its writes
+                conn.rollback_requested = False
+                self._rollback_savepoint(conn)
+            else:
+                conn.execute("RELEASE write_queue_item")
+        except Exception as e:
+            self._rollback_savepoint(conn)
+            conn.rollback_requested = False
+            if isinstance(e, sqlite3.OperationalError) and _is_locked(e):
+                raise
+            if len(group) > 1:
+                # Isolate the failing batch instead of failing all merged ones
+                for item in group:
+                    self._apply_group(conn, [item], results, errors)
+                return
+            logger.warning(f"[DatabaseWriteQueue] {group[0].kind} write failed: {e}")
+            errors[id(group[0])] = e
+            return
+
+        if len(group) == 1:
+            results[id(group[0])] = outcome
+        else:
+            for item in group:
+                results[id(item)] = len(item.rows)
+
+    @staticmethod
+    def _rollback_savepoint(conn: sqlite3.Connection):
+        try:
+            conn.execute("ROLLBACK TO write_queue_item")
+            conn.execute("RELEASE write_queue_item")
+        except sqlite3.Error:
+            pass
+
+
+_queues: Dict[str, DatabaseWriteQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_path: str) -> DatabaseWriteQueue:
+    """Return the process-wide write queue for a database file (keyed by absolute path)."""
+    key = os.path.abspath(db_path)
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None or queue.closed:
+            queue = DatabaseWriteQueue(key)
+            _queues[key] = queue
+        return queue
+
+
+def shutdown_write_queues(timeout: Optional[float] = 10.0):
+    """Drain and stop every write queue (application shutdown)."""
+    with _queues_lock:
+        queues = list(_queues.values())
+        _queues.clear()
+    for queue in queues:
+        queue.shutdown(wait=True, timeout=timeout)
@@ -0,0 +1,374 @@
+# services/ann_index.py
+# Incrementally maintained FAISS index for semantic ANN retrieval
+#
+# SearchOrchestrator used to throw away its IndexFlatIP and rebuild it from
+# scratch whenever a single embedding landed.  During a running
+# SemanticEmbeddingWorker job that meant rebuilding over and over.
+#
+# IncrementalANNIndex keeps an ID-mapped index (keys are photo_ids) and
+# applies only the delta between its own id set and the live rows of the
+# EmbeddingMatrixStore: new/re-embedded photos are add_with_ids'd, deleted
+# photos are remove_ids'd.  Above a configurable size it switches to an
+# approximate IVF (or HNSW) index, and the trained index is persisted next
+# to the embedding matrix so the training cost is paid once.
+
+"""
+IncrementalANNIndex - ID-mapped FAISS index with delta maintenance.
+
+Modes:
+    flat  IndexIDMap2(IndexFlatIP)     exact, supports remove_ids
+    ivf   IndexIVFFlat (inner product) approximate, trained once, supports remove_ids
+    hnsw  IndexIDMap2(IndexHNSWFlat)   approximate, deletions are tombstoned and
+                                       filtered at query time until the next rebuild
+    auto  flat below approx_threshold vectors, ivf above
+
+Usage:
+    from services.ann_index import IncrementalANNIndex
+
+    index = IncrementalANNIndex(store.file_stem, mode="auto")
+    index.sync(store.sync())
+    sims, photo_ids = index.search(query_vec.reshape(1, -1), k=200)
+"""
+
+import os
+import json
+import math
+import threading
+import time
+from typing import Optional, Set, Tuple
+
+import numpy as np
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import faiss as _faiss
+    _faiss_available = True
+except ImportError:
+    _faiss_available = False
+
+
+class IncrementalANNIndex:
+    """
+    FAISS index keyed by photo_id, kept in step with an EmbeddingMatrixView.
+
+    Thread-safe: sync(), search() and save() serialize on an internal lock.
+    """
+
+    MODE_AUTO = 'auto'
+    MODE_FLAT = 'flat'
+    MODE_IVF = 'ivf'
+    MODE_HNSW = 'hnsw'
+    MODES = (MODE_AUTO, MODE_FLAT, MODE_IVF, MODE_HNSW)
+
+    _MIN_TRAIN_VECTORS = 4096      # below this IVF/HNSW fall back to flat
+    _TRAIN_SAMPLE_PER_LIST = 64    # training points per IVF list
+    _HNSW_TOMBSTONE_RATIO = 0.10   # rebuild HNSW once 10% of entries are dead
+    _SAVE_INTERVAL = 120.0         # seconds between delta-triggered saves (flush() on shutdown)
+    _META_VERSION = 1
+
+    def __init__(self, path_stem: str, mode: str = MODE_AUTO,
+                 approx_threshold: int = 50000, nprobe: int = 16, hnsw_m: int = 32):
+        """
+        Args:
+            path_stem: File stem for persistence (e.g. EmbeddingMatrixStore.file_stem)
+            mode: 'auto', 'flat', 'ivf' or 'hnsw'
+            approx_threshold: In auto mode, switch to IVF at this many vectors
+            nprobe: IVF lists probed per query
+            hnsw_m: HNSW graph degree
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown ANN index mode: {mode}")
+        self.path_stem = path_stem
+        self.mode = mode
+        self.approx_threshold = approx_threshold
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+
+        self._lock = threading.RLock()
+        self._index = None
+        self._active_mode: Optional[str] = None
+        self._dim = 0
+        self._ids: Set[int] = set()
+        self._tombstones: Set[int] = set()
+        self._stamp: Tuple[int, int] = (-1, -1)   # (matrix generation, rows) at last save
+        self._last_save = 0.0
+        self._unsaved = False
+        self._load_attempted = False
+
+    # ── Paths ──
+
+    @property
+    def index_path(self) -> str:
+        return f"{self.path_stem}.faiss"
+
+    @property
+    def _ids_path(self) -> str:
+        return f"{self.path_stem}.faiss.ids.npy"
+
+    @property
+    def _meta_path(self) -> str:
+        return f"{self.path_stem}.faiss.json"
+
+    @property
+    def ntotal(self) -> int:
+        """Number of live photo_ids in the index."""
+        return len(self._ids) - len(self._tombstones)
+
+    @property
+    def active_mode(self) -> Optional[str]:
+        return self._active_mode
+
+    # ── Build ──
+
+    def _resolve_mode(self, n: int) -> str:
+        if n < self._MIN_TRAIN_VECTORS:
+            return self.MODE_FLAT
+        if self.mode == self.MODE_AUTO:
+            return self.MODE_IVF if n >= self.approx_threshold else self.MODE_FLAT
+        return self.mode
+
+    def _new_index(self, mode: str, vectors: np.ndarray):
+        dim = vectors.shape[1]
+        if mode == self.MODE_IVF:
+            n = len(vectors)
+            nlist = int(min(65536, max(16, 4 * math.sqrt(n))))
+            quantizer = _faiss.IndexFlatIP(dim)
+            index = _faiss.IndexIVFFlat(quantizer, dim, nlist, _faiss.METRIC_INNER_PRODUCT)
+            sample_n = min(n, nlist * self._TRAIN_SAMPLE_PER_LIST)
+            sample_idx = np.sort(np.random.default_rng(0).choice(n, sample_n, replace=False))
+            index.train(np.ascontiguousarray(vectors[sample_idx], dtype='float32'))
+            index.nprobe = min(self.nprobe, nlist)
+            return index
+        if mode == self.MODE_HNSW:
+            hnsw = _faiss.IndexHNSWFlat(dim, self.hnsw_m, _faiss.METRIC_INNER_PRODUCT)
+            hnsw.hnsw.efSearch = 64
+            return _faiss.IndexIDMap2(hnsw)
+        return _faiss.IndexIDMap2(_faiss.IndexFlatIP(dim))
+
+    def _rebuild(self, view, mode: str, reuse_training: bool = False):
+        """Build the index from all live rows of the view."""
+        start = time.time()
+        vectors = view.vectors
+        if reuse_training and self._index is not None:
+            self._index.reset()
+        else:
+            self._index = self._new_index(mode, vectors)
+        self._active_mode = mode
+        self._dim = vectors.shape[1]
+        self._ids = set()
+        self._tombstones = set()
+        ids = np.asarray(view.photo_ids, dtype=np.int64)
+        for start_row in range(0, len(ids), 65536):
+            block = slice(start_row, start_row + 65536)
+            self._index.add_with_ids(
+                np.ascontiguousarray(vectors[block], dtype='float32'), ids[block]
+            )
+        self._ids = set(view.photo_ids)
+        self._unsaved = True
+        logger.info(
+            f"[IncrementalANNIndex] Built {mode} index: {len(ids)} vectors, "
+            f"dim={self._dim}, {(time.time() - start) * 1000:.0f}ms"
+        )
+
+    # ── Delta maintenance ──
+
+    def sync(self, view) -> dict:
+        """
+        Apply the difference between the index and the view's live rows.
+
+        Returns {'added': n, 'removed': n, 'rebuilt': bool}.
+        """
+        stats = {'added': 0, 'removed': 0, 'rebuilt': False}
+        if not _faiss_available:
+            return stats
+
+        with self._lock:
+            if view.vectors is None or not view.photo_ids:
+                self._index = None
+                self._active_mode = None
+                self._ids = set()
+                self._tombstones = set()
+                return stats
+
+            n = len(view.photo_ids)
+            dim = view.vectors.shape[1]
+            target_mode = self._resolve_mode(n)
+            stamp = (view.generation, view.rows)
+
+            if self._index is None and not self._load_attempted:
+                self._load_attempted = True
+                self._load(dim)
+                if self._index is not None and self._stamp != stamp:
+                    # Matrix moved on since the save: keep the trained
+                    # structure, but re-add rows we cannot diff reliably.
+                    self._rebuild(view, self._active_mode, reuse_training=True)
+                    stats['rebuilt'] = True
+
+            if (self._index is None or self._dim != dim
+                    or (self._active_mode != target_mode
+                        and not self._within_hysteresis(target_mode, n))):
+                self._rebuild(view, target_mode)
+                stats['rebuilt'] = True
+            else:
+                stats.update(self._apply_delta(view))
+                if (self._active_mode == self.MODE_HNSW and self._ids
+                        and len(self._tombstones) / len(self._ids) > self._HNSW_TOMBSTONE_RATIO):
+                    self._rebuild(view, self.MODE_HNSW)
+                    stats['rebuilt'] = True
+
+            self._stamp = stamp
+            if self._unsaved:
+                self._maybe_save()
+        return stats
+
+    def _within_hysteresis(self, target_mode: str, n: int) -> bool:
+        # Avoid flapping flat<->ivf when the library hovers at the threshold
+        if self.mode != self.MODE_AUTO:
+            return False
+        if self._active_mode == self.MODE_IVF and target_mode == self.MODE_FLAT:
+            return n >= 0.8 * self.approx_threshold
+        return False
+
+    def _apply_delta(self, view) -> dict:
+        live = set(view.photo_ids)
+        present = self._ids - self._tombstones
+        changed = set(view.appended_ids) & present
+        to_remove = (present - live) | changed
+        to_add = (live - present) | changed
+
+        if to_remove:
+            if self._active_mode == self.MODE_HNSW:
+                # HNSW cannot delete: hide now, drop on the next rebuild
+                self._tombstones |= to_remove
+            else:
+                self._index.remove_ids(np.fromiter(to_remove, dtype=np.int64, count=len(to_remove)))
+                self._ids -= to_remove
+
+        if to_add:
+            if self._active_mode == self.MODE_HNSW and to_add & self._tombstones:
+                # A second HNSW entry for a tombstoned id would be hidden by
+                # the tombstone, so re-embeddings/undeletes force a rebuild.
+                self._rebuild(view, self.MODE_HNSW)
+                return {'added': len(to_add), 'removed': len(to_remove), 'rebuilt': True}
+            ids = np.asarray(view.photo_ids, dtype=np.int64)
+            rows = np.nonzero(np.isin(ids, np.fromiter(to_add, dtype=np.int64, count=len(to_add))))[0]
+            self._index.add_with_ids(
+                np.ascontiguousarray(view.vectors[rows], dtype='float32'), ids[rows]
+            )
+            self._ids |= to_add
+
+        if to_remove or to_add:
+            self._unsaved = True
+            logger.debug(
+                f"[IncrementalANNIndex] Delta applied: +{len(to_add)} -{len(to_remove)} "
+                f"(ntotal={self.ntotal}, mode={self._active_mode})"
+            )
+        return {'added': len(to_add), 'removed': len(to_remove)}
+
+    # ── Query ──
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (similarities, photo_ids) for the top-k matches of a (1, dim) query.
+        """
+        with self._lock:
+            if self._index is None or not self._ids or k <= 0:
+                return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+            fetch_k = min(k + len(self._tombstones), len(self._ids))
+            sims, ids = self._index.search(np.ascontiguousarray(query, dtype='float32'), fetch_k)
+            sims, ids = sims[0], ids[0]
+            keep = ids >= 0
+            if self._tombstones:
+                keep &= ~np.isin(ids, np.fromiter(self._tombstones, dtype=np.int64,
+                                                  count=len(self._tombstones)))
+            return sims[keep][:k], ids[keep][:k]
+
+    # ── Persistence ──
+
+    def _maybe_save(self):
+        if time.time() - self._last_save >= self._SAVE_INTERVAL:
+            self.save()
+
+    def flush(self) -> bool:
+        """Save now if deltas were applied since the last save (call on shutdown)."""
+        with self._lock:
+            if not self._unsaved:
+                return False
+            return self.save()
+
+    def save(self) -> bool:
+        """Write the index, its id set and stamp next to the embedding matrix."""
+        if not _faiss_available:
+            return False
+        with self._lock:
+            if self._index is None:
+                return False
+            try:
+                os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+                tmp_index = f"{self.index_path}.tmp"
+                _faiss.write_index(self._index, tmp_index)
+                os.replace(tmp_index, self.index_path)
+                with open(f"{self._ids_path}.tmp", 'wb') as f:
+                    np.save(f, np.fromiter(self._ids, dtype=np.int64, count=len(self._ids)))
+                os.replace(f"{self._ids_path}.tmp", self._ids_path)
+                meta = {
+                    'version': self._META_VERSION,
+                    'mode': self._active_mode,
+                    'dim': self._dim,
+                    'stamp': list(self._stamp),
+                    'tombstones': sorted(self._tombstones),
+                }
+                with open(f"{self._meta_path}.tmp", 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+                os.replace(f"{self._meta_path}.tmp", self._meta_path)
+                self._last_save = time.time()
+                self._unsaved = False
+                return True
+            except Exception as e:
+                logger.warning(f"[IncrementalANNIndex] Could not persist index: {e}")
+                return False
+
+    def _load(self, dim: int) -> bool:
+        try:
+            with open(self._meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != self._META_VERSION or meta.get('dim') != dim:
+                return False
+            index = _faiss.read_index(self.index_path)
+            ids = np.load(self._ids_path)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"[IncrementalANNIndex] Ignoring unreadable persisted index: {e}")
+            return False
+
+        if meta['mode'] == self.MODE_IVF:
+            index.nprobe = min(self.nprobe, index.nlist)
+        self._index = index
+        self._active_mode = meta['mode']
+        self._dim = dim
+        self._ids = set(ids.tolist())
+        self._tombstones = set(meta.get('tombstones') or [])
+        self._stamp = tuple(meta.get('stamp') or (-1, -1))
+        self._last_save = time.time()
+        logger.info(
+            f"[IncrementalANNIndex] Loaded persisted {self._active_mode} index "
+            f"({self.ntotal} vectors) from {self.index_path}"
+        )
+        return True
+
+    def clear(self):
+        """Drop the in-memory index and its persisted files."""
+        with self._lock:
+            self._index = None
+            self._active_mode = None
+            self._ids = set()
+            self._tombstones = set()
+            for path in (self.index_path, self._ids_path, self._meta_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
@@ -10,14 +10,16 @@
 # - Provide duplicate listings for UI
 
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
 import hashlib
 import os
 from logging_config import get_logger
 
 from repository.asset_repository import AssetRepository
 from repository.photo_repository import PhotoRepository
+from repository.search_feature_repository import SearchFeatureRepository
 
 logger = get_logger(__name__)
 
@@ -46,6 +48,9 @@ class AssetService:
     and asset-centric (media_asset + media_instance) models.
     """
 
+    # Concurrent file hashes during backfill (I/O and hashlib release the GIL)
+    HASH_WORKERS = min(8, os.cpu_count() or 2)
+
     def __init__(self, photo_repo: PhotoRepository, asset_repo: AssetRepository):
         """
         Initialize AssetService.
@@ -92,6 +97,38 @@ class AssetService:
             logger.error(f"Hash calculation failed for {file_path}: {e}")
             return None
 
+    @classmethod
+    def hash_files(
+        cls,
+        photos: List[Dict[str, Any]],
+        workers: Optional[int] = None
+    ) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Compute SHA256 hashes of many photos concurrently.
+
+        hashlib and file reads release the GIL, so hashing scales across
+        threads without process start-up or pickling. Largest files are
+        submitted first so one big video doesn't end up as the tail.
+
+        Args:
+            photos: photo dicts with "path" (and optionally "size_kb")
+            workers: Thread count (default: HASH_WORKERS)
+
+        Yields:
+            (photo, hexdigest or None) in completion order
+        """
+        workers = workers or cls.HASH_WORKERS
+        if workers <= 1 or len(photos) < 2:
+            for photo in photos:
+                yield photo, cls.compute_file_hash(photo["path"])
+            return
+
+        ordered = sorted(photos, key=lambda p: p.get("size_kb") or 0, reverse=True)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-hash") as pool:
+            futures = {pool.submit(cls.compute_file_hash, p["path"]): p for p in ordered}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
     # =========================================================================
     # HASH BACKFILL & ASSET LINKING
     # =========================================================================
@@ -107,13 +144,13 @@ class AssetService:
         Backfill algorithm (idempotent and resumable):
 
         Loop:
-        1. Fetch photos missing file_hash OR missing media_instance link
-        2. For each photo:
-           a. Compute content hash (SHA256) if missing
-           b. Update photo_metadata.file_hash
-           c. Create or fetch media_asset by content_hash
-           d. Link media_instance to asset
-           e. Update representative photo if needed
+        1. Fetch a page of photos missing a media_instance link
+        2. Compute missing content hashes (SHA256) concurrently (hash_files)
+        3. In one write-queue transaction for the page:
+           a. Update photo_metadata.file_hash
+           b. Create or fetch media_assets by content_hash
+           c. Link media_instances to assets
+           d. Set representative photos where missing
 
         This algorithm is:
         - Idempotent: Safe to run multiple times
@@ -148,41 +185,159 @@ class AssetService:
             )
 
         processed = 0
+        failed_ids = set()
 
         while True:
-            # Fetch batch of photos without instances
-            photos = self.asset_repo.get_photos_without_instance(project_id, limit=batch_size)
+            # Fetch batch of photos without instances (files that could not
+            # be hashed stay unlinked; fetch past them instead of retrying)
+            photos = self.asset_repo.get_photos_without_instance(
+                project_id, limit=batch_size + len(failed_ids)
+            )
+            photos = [photo for photo in photos if photo["id"] not in failed_ids]
 
             if not photos:
                 self.logger.info("No more photos to process")
                 break
 
-            for photo in photos:
-                scanned += 1
+            if stop_after:
+                photos = photos[:max(0, stop_after - processed)]
+
+            # Photos that already have a hash (e.g. device imports) only need linking
+            pending = [(photo, photo["file_hash"], False) for photo in photos if photo.get("file_hash")]
+            to_hash = [photo for photo in photos if not photo.get("file_hash")]
+            scanned += len(photos)
+            processed += len(pending)
+            if progress_callback and pending:
+                progress_callback(processed, total_without_instance)
+
+            # Hash outside any transaction; the page's writes go to the
+            # write queue as one task (one transaction) below
+            for photo, content_hash in self.hash_files(to_hash):
                 processed += 1
 
                 # Call progress callback if provided
                 if progress_callback:
                     progress_callback(processed, total_without_instance)
 
-                try:
-                    photo_id = photo["id"]
-                    photo_path = photo["path"]
-                    existing_hash = photo.get("file_hash")
-
-                    # Step 1: Ensure file_hash exists
-                    content_hash = existing_hash
-                    if not content_hash:
-                        content_hash = self.compute_file_hash(photo_path)
-                        if not content_hash:
-                            self.logger.warning(f"Could not compute hash for photo {photo_id} (path may be invalid)")
-                            errors += 1
-                            continue
-
-                        # Update photo_metadata.file_hash
+                photo_id = photo["id"]
+                if not content_hash:
+                    self.logger.warning(f"Could not compute hash for photo {photo_id} (path may be invalid)")
+                    errors += 1
+                    failed_ids.add(photo_id)
+                    continue
+                self.logger.debug(f"Computed hash for photo {photo_id}: {content_hash[:16]}...")
+                pending.append((photo, content_hash, True))
+
+            if pending:
+                page = self.photo_repo.write_queue().submit(
+                    "asset_backfill",
+                    lambda conn, pending=pending: self._write_asset_links(project_id, pending),
+                    weight=len(pending)
+                ).result()
+                hashed += page["hashed"]
+                linked += page["linked"]
+                errors += page["errors"]
+                if not page["linked"]:
+                    self.logger.warning("No photo of the page could be linked; stopping backfill")
+                    break
+
+            # Stop if limit reached
+            if stop_after and processed >= stop_after:
+                self.logger.info(f"Stopped after processing {processed} photos (limit reached)")
+                break
+
+        stats = AssetBackfillStats(
+            scanned=scanned,
+            hashed=hashed,
+            linked=linked,
+            errors=errors,
+            skipped=skipped
+        )
+
+        self.logger.info(f"Backfill complete: {stats}")
+        return stats
+
+    def _write_asset_links(self, project_id: int, pending: List[tuple]) -> Dict[str, int]:
+        """
+        Write hashes, assets and instance links for one page of photos.
+
+        Runs on the database write queue's writer thread, inside its
+        transaction. The page is written set-based (executemany per table)
+        in one savepoint; if that fails, it is rolled back and retried photo
+        by photo so one bad row doesn't fail the whole page.
+
+        Args:
+            project_id: Project ID
+            pending: (photo, content_hash, hash_was_computed) tuples
+
+        Returns:
+            Dict with hashed, linked and errors counts
+        """
+        try:
+            with self.photo_repo.connection():
+                counts = self._write_asset_links_bulk(project_id, pending)
+            linked_paths = [photo["path"] for photo, _, _ in pending]
+        except Exception as e:
+            self.logger.warning(f"Bulk asset linking failed, retrying per photo: {e}")
+            counts, linked_paths = self._write_asset_links_per_photo(project_id, pending)
+
+        # duplicate_group_id of the linked photos (runs inline in this transaction)
+        try:
+            SearchFeatureRepository(self.photo_repo._db_connection).apply_changes(
+                project_id, linked_paths, "duplicates")
+        except Exception as e:
+            self.logger.warning(f"Could not update search features after linking: {e}")
+        return counts
+
+    def _write_asset_links_bulk(self, project_id: int, pending: List[tuple]) -> Dict[str, int]:
+        """One executemany per table for the whole page (see _write_asset_links)."""
+        hashes = [(photo["id"], content_hash) for photo, content_hash, computed in pending if computed]
+        if hashes:
+            self.photo_repo.update_photo_hashes(hashes)
+
+        asset_ids = self.asset_repo.create_assets_bulk(
+            project_id, [content_hash for _, content_hash, _ in pending]
+        )
+        self.asset_repo.link_instances_bulk(project_id, [
+            (asset_ids[content_hash], photo["id"], photo["path"],
+             photo.get("size_kb") * 1024 if photo.get("size_kb") else None)
+            for photo, content_hash, _ in pending
+        ])
+
+        # Representatives: a sole instance is its own representative,
+        # shared assets go through the full selection
+        unrepresented = self.asset_repo.get_assets_without_representative(
+            project_id, list(asset_ids.values())
+        )
+        sole = [(asset_id, photo_ids[0]) for asset_id, photo_ids in unrepresented.items()
+                if len(photo_ids) == 1]
+        for asset_id, photo_ids in unrepresented.items():
+            if len(photo_ids) > 1:
+                representative_photo_id = self.choose_representative_photo(project_id, asset_id)
+                if representative_photo_id:
+                    sole.append((asset_id, representative_photo_id))
+        if sole:
+            self.asset_repo.set_representative_photos(project_id, sole)
+
+        return {"hashed": len(hashes), "linked": len(pending), "errors": 0}
+
+    def _write_asset_links_per_photo(self, project_id: int,
+                                     pending: List[tuple]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Fallback for _write_asset_links: each photo in its own savepoint.
+
+        Returns:
+            (counts dict, paths of the photos that were linked)
+        """
+        counts = {"hashed": 0, "linked": 0, "errors": 0}
+        linked_paths = []
+        for photo, content_hash, computed in pending:
+            photo_id = photo["id"]
+            try:
+                with self.photo_repo.connection():
+                    # Update photo_metadata.file_hash
+                    if computed:
                         self.photo_repo.update_photo_hash(photo_id, content_hash)
-                        hashed += 1
-                        self.logger.debug(f"Computed hash for photo {photo_id}: {content_hash[:16]}...")
 
                     # Step 2: Create or fetch media_asset
                     asset_id = self.asset_repo.create_asset_if_missing(
@@ -197,39 +352,22 @@ class AssetService:
                         asset_id=asset_id,
                         photo_id=photo_id,
                         source_device_id=None,  # Unknown for legacy photos
-                        source_path=photo_path,
+                        source_path=photo["path"],
                         import_session_id=None,
                         file_size=photo.get("size_kb") * 1024 if photo.get("size_kb") else None
                     )
-                    linked += 1
 
                     # Step 4: Update representative photo if needed
                     self._update_representative_if_needed(project_id, asset_id)
 
-                except Exception as e:
-                    self.logger.error(f"Failed to process photo {photo.get('id')}: {e}", exc_info=True)
-                    errors += 1
-                    continue
-
-                # Stop if limit reached
-                if stop_after and processed >= stop_after:
-                    self.logger.info(f"Stopped after processing {processed} photos (limit reached)")
-                    break
-
-            # Stop if limit reached
-            if stop_after and processed >= stop_after:
-                break
-
-        stats = AssetBackfillStats(
-            scanned=scanned,
-            hashed=hashed,
-            linked=linked,
-            errors=errors,
-            skipped=skipped
-        )
-
-        self.logger.info(f"Backfill complete: {stats}")
-        return stats
+                if computed:
+                    counts["hashed"] += 1
+                counts["linked"] += 1
+                linked_paths.append(photo["path"])
+            except Exception as e:
+                self.logger.error(f"Failed to process photo {photo_id}: {e}", exc_info=True)
+                counts["errors"] += 1
+        return counts, linked_paths
 
     def _update_representative_if_needed(self, project_id: int, asset_id: int) -> None:
         """
@@ -34,6 +34,7 @@ from services.candidate_builders.base_candidate_builder import (
     BaseCandidateBuilder,
     CandidateSet,
 )
+from services.project_meta_store import ProjectMetaStore, count_with_faces
 from services.query_intent_planner import QueryIntent
 from logging_config import get_logger
 
@@ -227,10 +228,7 @@ class PeopleCandidateBuilder(BaseCandidateBuilder):
         if total == 0:
             return False, "Empty project — no photos to search"
 
-        face_photo_count = sum(
-            1 for m in project_meta.values()
-            if (m.get("face_count", 0) or 0) > 0
-        )
+        face_photo_count = count_with_faces(project_meta)
         coverage = face_photo_count / total
 
         if coverage >= _FACE_COVERAGE_FLOOR:
@@ -270,6 +268,8 @@ class PeopleCandidateBuilder(BaseCandidateBuilder):
         min_faces: int = 1,
     ) -> Set[str]:
         """Get all paths that have at least min_faces detected."""
+        if isinstance(project_meta, ProjectMetaStore):
+            return set(project_meta.paths_where(project_meta.column("face_count") >= min_faces))
         return {
             path
             for path, meta in project_meta.items()
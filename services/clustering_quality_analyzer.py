@@ -17,12 +17,20 @@ Metrics:
 3. Cluster Compactness (within-cluster variance)
 4. Cluster Separation (between-cluster distances)
 5. Noise Ratio (percentage of unassigned faces)
+
+Only the silhouette needs pairwise face distances (O(n^2)); on large face
+sets it can be computed on a stratified sample (max_samples). Compactness,
+separation and Davies-Bouldin are derived from per-cluster centroids in
+blocked, vectorized passes. analyze_clustering_async() runs the analysis
+off the caller's thread so results can be committed and shown first.
 """
 
+import threading
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from sklearn.metrics import silhouette_score, davies_bouldin_score
+from scipy import sparse
+from sklearn.metrics import silhouette_samples
 from sklearn.metrics import pairwise_distances
 import logging
 
@@ -44,9 +52,10 @@ class ClusterQualityMetrics:
         face_count: Total number of faces
         noise_count: Number of faces marked as noise (-1 label)
         cluster_sizes: List of cluster sizes
-        cluster_silhouettes: Silhouette score per cluster
+        cluster_silhouettes: Silhouette score per cluster (NaN for clusters left out of a sample)
         overall_quality: Combined quality score (0-100)
         quality_label: Human-readable quality assessment
+        silhouette_sample_size: Faces the silhouette was computed on (None = all)
     """
     silhouette_score: float
     davies_bouldin_index: float
@@ -60,6 +69,7 @@ class ClusterQualityMetrics:
     cluster_silhouettes: List[float]
     overall_quality: float
     quality_label: str
+    silhouette_sample_size: Optional[int] = None
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for storage/logging."""
@@ -75,7 +85,8 @@ class ClusterQualityMetrics:
             'cluster_sizes': self.cluster_sizes,
             'cluster_silhouettes': self.cluster_silhouettes,
             'overall_quality': self.overall_quality,
-            'quality_label': self.quality_label
+            'quality_label': self.quality_label,
+            'silhouette_sample_size': self.silhouette_sample_size
         }
 
 
@@ -121,6 +132,11 @@ class ClusteringQualityAnalyzer:
         'compactness': 0.10      # 10% - cluster tightness
     }
 
+    # Rows per block in the centroid passes (bounds temporary arrays)
+    _BLOCK_ROWS = 16384
+    # Elements per block of centroid-to-centroid distances (~128 MB of float64)
+    _BLOCK_ELEMENTS = 16_000_000
+
     def __init__(self):
         """Initialize clustering quality analyzer."""
         pass
@@ -128,7 +144,9 @@ class ClusteringQualityAnalyzer:
     def analyze_clustering(self,
                           embeddings: np.ndarray,
                           labels: np.ndarray,
-                          metric: str = 'euclidean') -> ClusterQualityMetrics:
+                          metric: str = 'euclidean',
+                          max_samples: Optional[int] = None,
+                          random_state: int = 0) -> ClusterQualityMetrics:
         """
         Analyze quality of clustering results.
 
@@ -136,6 +154,10 @@ class ClusteringQualityAnalyzer:
             embeddings: Face embeddings (N, D) array
             labels: Cluster labels (N,) array (noise = -1)
             metric: Distance metric ('euclidean', 'cosine', etc.)
+            max_samples: If set and more faces are clustered, silhouette scores
+                         are computed on a stratified sample of at most this many
+                         faces. The other metrics always use every face.
+            random_state: Seed for the sample (same input, same metrics)
 
         Returns:
             ClusterQualityMetrics with all quality scores
@@ -156,11 +178,9 @@ class ClusteringQualityAnalyzer:
             noise_count = np.sum(noise_mask)
             noise_ratio = noise_count / face_count if face_count > 0 else 0.0
 
-            unique_labels = np.unique(labels[~noise_mask])
+            unique_labels, cluster_sizes = np.unique(labels[~noise_mask], return_counts=True)
             cluster_count = len(unique_labels)
-
-            # Calculate cluster sizes
-            cluster_sizes = [np.sum(labels == label) for label in unique_labels]
+            cluster_sizes = cluster_sizes.tolist()
 
             # Need at least 2 clusters for silhouette/DB index
             if cluster_count < 2:
@@ -174,30 +194,29 @@ class ClusteringQualityAnalyzer:
             non_noise_embeddings = embeddings[non_noise_mask]
             non_noise_labels = labels[non_noise_mask]
 
-            # Silhouette score (-1 to 1, higher is better)
-            silhouette = self._calculate_silhouette_score(
-                non_noise_embeddings, non_noise_labels, metric
-            )
+            # Overall and per-cluster silhouette (-1 to 1, higher is better),
+            # on a stratified sample when the clustered set is large
+            sample = self._stratified_sample(non_noise_labels, max_samples, random_state)
+            if sample is None:
+                silhouette, cluster_silhouettes = self._calculate_silhouettes(
+                    non_noise_embeddings, non_noise_labels, unique_labels, metric
+                )
+            else:
+                silhouette, cluster_silhouettes = self._calculate_silhouettes(
+                    non_noise_embeddings[sample], non_noise_labels[sample], unique_labels, metric
+                )
 
-            # Davies-Bouldin index (0+, lower is better)
-            db_index = self._calculate_davies_bouldin_index(
-                non_noise_embeddings, non_noise_labels
-            )
+            # Per-cluster centroids and mean distances to them (one pass)
+            stats = self._cluster_stats(non_noise_embeddings, non_noise_labels, unique_labels)
 
-            # Per-cluster silhouette scores
-            cluster_silhouettes = self._calculate_cluster_silhouettes(
-                non_noise_embeddings, non_noise_labels, unique_labels, metric
-            )
+            # Davies-Bouldin index (0+, lower is better)
+            db_index = self._calculate_davies_bouldin_index(stats)
 
             # Cluster compactness (within-cluster variance)
-            avg_compactness = self._calculate_avg_compactness(
-                non_noise_embeddings, non_noise_labels, unique_labels, metric
-            )
+            avg_compactness = self._calculate_avg_compactness(stats, metric)
 
             # Cluster separation (between-cluster distances)
-            avg_separation = self._calculate_avg_separation(
-                non_noise_embeddings, non_noise_labels, unique_labels, metric
-            )
+            avg_separation = self._calculate_avg_separation(stats, metric)
 
             # Calculate overall quality score (0-100)
             overall_quality = self._calculate_overall_quality(
@@ -219,19 +238,85 @@ class ClusteringQualityAnalyzer:
                 cluster_sizes=cluster_sizes,
                 cluster_silhouettes=cluster_silhouettes,
                 overall_quality=overall_quality,
-                quality_label=quality_label
+                quality_label=quality_label,
+                silhouette_sample_size=None if sample is None else int(len(sample))
             )
 
         except Exception as e:
             logger.error(f"Error analyzing clustering quality: {e}", exc_info=True)
             return self._default_metrics(len(labels) if labels is not None else 0)
 
-    def _calculate_silhouette_score(self,
-                                   embeddings: np.ndarray,
-                                   labels: np.ndarray,
-                                   metric: str) -> float:
+    def analyze_clustering_async(self,
+                                 embeddings: np.ndarray,
+                                 labels: np.ndarray,
+                                 on_done: Callable[[ClusterQualityMetrics], None],
+                                 metric: str = 'euclidean',
+                                 max_samples: Optional[int] = None,
+                                 random_state: int = 0) -> threading.Thread:
+        """
+        Run analyze_clustering() on a background thread.
+
+        on_done(metrics) is called from that thread. The arrays must not be
+        modified while the analysis runs (pass copies if the caller keeps
+        using them).
+
+        Returns:
+            The started (daemon) thread
+        """
+        def _run():
+            metrics = self.analyze_clustering(embeddings, labels, metric, max_samples, random_state)
+            try:
+                on_done(metrics)
+            except Exception as e:
+                logger.warning(f"Clustering quality callback failed: {e}", exc_info=True)
+
+        thread = threading.Thread(target=_run, name="ClusteringQualityAnalysis", daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _stratified_sample(labels: np.ndarray,
+                           max_samples: Optional[int],
+                           random_state: int) -> Optional[np.ndarray]:
         """
-        Calculate silhouette score for clustering.
+        Sorted indices of a per-cluster proportional sample, or None for "all".
+
+        Every sampled cluster keeps min(size, 2) faces so its silhouette stays
+        defined. When that alone would exceed max_samples, a random subset of
+        max_samples // 2 clusters is sampled instead.
+        """
+        n = len(labels)
+        if not max_samples or n <= max_samples:
+            return None
+
+        rng = np.random.default_rng(random_state)
+        sizes = np.unique(labels, return_counts=True)[1]
+        k = len(sizes)
+
+        keep = np.ones(k, dtype=bool)
+        if 2 * k > max_samples:
+            keep[:] = False
+            keep[rng.choice(k, size=max(2, max_samples // 2), replace=False)] = True
+
+        floor = np.where(keep, np.minimum(sizes, 2), 0)
+        rest = np.where(keep, sizes - floor, 0)
+        budget = max(0, max_samples - int(floor.sum()))
+        share = budget / rest.sum() if rest.sum() else 0.0
+        quotas = floor + np.floor(rest * share).astype(np.int64)
+
+        # Group by label (sorted label order, as np.unique), random order inside
+        perm = np.lexsort((rng.random(n), labels))
+        starts = np.cumsum(sizes) - sizes
+        rank = np.arange(n) - np.repeat(starts, sizes)
+        return np.sort(perm[rank < np.repeat(quotas, sizes)])
+
+    def _calculate_silhouettes(self,
+                               embeddings: np.ndarray,
+                               labels: np.ndarray,
+                               unique_labels: np.ndarray,
+                               metric: str) -> Tuple[float, List[float]]:
+        """
+        Calculate the overall and per-cluster silhouette scores.
 
         Silhouette score measures how similar an object is to its own cluster
         compared to other clusters. Range: -1 to 1.
@@ -239,28 +324,91 @@ class ClusteringQualityAnalyzer:
         - 0: Overlapping clusters
         - -1: Wrong clustering (closer to other clusters)
 
+        Both come from one silhouette_samples() pass (the overall score is
+        the mean over faces, as silhouette_score computes it).
+
         Args:
-            embeddings: Face embeddings (non-noise only)
-            labels: Cluster labels (non-noise only)
+            embeddings: Face embeddings (non-noise only, possibly sampled)
+            labels: Cluster labels (non-noise only, possibly sampled)
+            unique_labels: Unique cluster labels of the full clustering
             metric: Distance metric
 
         Returns:
-            Silhouette score (-1 to 1)
+            (silhouette score, per-cluster scores in unique_labels order;
+            NaN for clusters without faces in ``labels``)
         """
         try:
             if len(embeddings) < 2 or len(np.unique(labels)) < 2:
-                return 0.0
+                return 0.0, [0.0] * len(unique_labels)
+
+            sample_silhouettes = silhouette_samples(embeddings, labels, metric=metric)
+
+            idx = np.searchsorted(unique_labels, labels)
+            sums = np.bincount(idx, weights=sample_silhouettes, minlength=len(unique_labels))
+            counts = np.bincount(idx, minlength=len(unique_labels))
+            per_cluster = np.full(len(unique_labels), np.nan)
+            np.divide(sums, counts, out=per_cluster, where=counts > 0)
 
-            score = silhouette_score(embeddings, labels, metric=metric)
-            return float(score)
+            return float(np.mean(sample_silhouettes)), per_cluster.tolist()
 
         except Exception as e:
-            logger.debug(f"Error calculating silhouette score: {e}")
-            return 0.0
+            logger.debug(f"Error calculating silhouette scores: {e}")
+            return 0.0, [0.0] * len(unique_labels)
+
+    def _cluster_stats(self,
+                       embeddings: np.ndarray,
+                       labels: np.ndarray,
+                       unique_labels: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Per-cluster centroids and mean face-to-centroid distances.
+
+        Centroids come from one sparse membership product; distances are
+        computed in row blocks, so no (N, D) temporaries are built.
+
+        Args:
+            embeddings: Face embeddings (non-noise only)
+            labels: Cluster labels (non-noise only)
+            unique_labels: Unique cluster labels
 
-    def _calculate_davies_bouldin_index(self,
-                                       embeddings: np.ndarray,
-                                       labels: np.ndarray) -> float:
+        Returns:
+            dict with 'centroids' (K, D), 'counts' (K,), and mean 'euclidean'
+            and 'cosine' distance to the centroid per cluster (K,)
+        """
+        n = len(labels)
+        k = len(unique_labels)
+        idx = np.searchsorted(unique_labels, labels)
+        counts = np.bincount(idx, minlength=k)
+
+        membership = sparse.csr_matrix(
+            (np.ones(n, dtype=embeddings.dtype), (idx, np.arange(n))), shape=(k, n)
+        )
+        centroids = np.asarray(membership @ embeddings) / counts[:, None]
+
+        centroid_norms = np.linalg.norm(centroids, axis=1)
+        centroid_norms[centroid_norms == 0] = 1.0
+
+        euclidean = np.zeros(k)
+        cosine = np.zeros(k)
+        for start in range(0, n, self._BLOCK_ROWS):
+            X = embeddings[start:start + self._BLOCK_ROWS]
+            block_idx = idx[start:start + self._BLOCK_ROWS]
+            C = centroids[block_idx]
+
+            euclidean += np.bincount(block_idx, weights=np.linalg.norm(X - C, axis=1), minlength=k)
+
+            x_norms = np.linalg.norm(X, axis=1)
+            x_norms[x_norms == 0] = 1.0
+            sims = np.einsum('ij,ij->i', X, C) / (x_norms * centroid_norms[block_idx])
+            cosine += np.bincount(block_idx, weights=np.clip(1.0 - sims, 0.0, 2.0), minlength=k)
+
+        return {
+            'centroids': centroids,
+            'counts': counts,
+            'euclidean': euclidean / counts,
+            'cosine': cosine / counts,
+        }
+
+    def _calculate_davies_bouldin_index(self, stats: Dict[str, np.ndarray]) -> float:
         """
         Calculate Davies-Bouldin index for clustering.
 
@@ -275,168 +423,109 @@ class ClusteringQualityAnalyzer:
         - 1.0-1.5: Fair
         - > 1.5: Poor
 
+        Same definition as sklearn's davies_bouldin_score (euclidean), with
+        the centroid-to-centroid distances computed in row blocks.
+
         Args:
-            embeddings: Face embeddings (non-noise only)
-            labels: Cluster labels (non-noise only)
+            stats: Output of _cluster_stats()
 
         Returns:
             Davies-Bouldin index (0+, lower is better)
         """
         try:
-            if len(embeddings) < 2 or len(np.unique(labels)) < 2:
+            centroids = stats['centroids']
+            intra = stats['euclidean']
+            k = len(centroids)
+            if k < 2:
                 return 999.0  # Very high value for poor clustering
 
-            index = davies_bouldin_score(embeddings, labels)
-            return float(index)
+            if np.allclose(intra, 0):
+                return 0.0
+
+            worst = np.empty(k)
+            block = max(1, self._BLOCK_ELEMENTS // k)
+            for start in range(0, k, block):
+                dist = pairwise_distances(centroids[start:start + block], centroids, metric='euclidean')
+                b = dist.shape[0]
+                # Mask each centroid's own column by position: float error
+                # leaves the self-distance slightly above zero
+                dist[np.arange(b), start + np.arange(b)] = np.inf
+                ratio = (intra[start:start + block, None] + intra[None, :]) / dist
+                worst[start:start + block] = ratio.max(axis=1)
+
+            return float(np.mean(worst))
 
         except Exception as e:
             logger.debug(f"Error calculating Davies-Bouldin index: {e}")
             return 999.0
 
-    def _calculate_cluster_silhouettes(self,
-                                      embeddings: np.ndarray,
-                                      labels: np.ndarray,
-                                      unique_labels: np.ndarray,
-                                      metric: str) -> List[float]:
-        """
-        Calculate silhouette score for each cluster.
-
-        Args:
-            embeddings: Face embeddings (non-noise only)
-            labels: Cluster labels (non-noise only)
-            unique_labels: Unique cluster labels
-            metric: Distance metric
-
-        Returns:
-            List of silhouette scores per cluster
-        """
-        try:
-            from sklearn.metrics import silhouette_samples
-
-            if len(embeddings) < 2 or len(unique_labels) < 2:
-                return [0.0] * len(unique_labels)
-
-            # Calculate silhouette for each sample
-            sample_silhouettes = silhouette_samples(embeddings, labels, metric=metric)
-
-            # Average silhouette per cluster
-            cluster_silhouettes = []
-            for label in unique_labels:
-                mask = labels == label
-                avg_silhouette = np.mean(sample_silhouettes[mask])
-                cluster_silhouettes.append(float(avg_silhouette))
-
-            return cluster_silhouettes
-
-        except Exception as e:
-            logger.debug(f"Error calculating cluster silhouettes: {e}")
-            return [0.0] * len(unique_labels)
-
-    def _calculate_avg_compactness(self,
-                                  embeddings: np.ndarray,
-                                  labels: np.ndarray,
-                                  unique_labels: np.ndarray,
-                                  metric: str) -> float:
+    def _calculate_avg_compactness(self, stats: Dict[str, np.ndarray], metric: str) -> float:
         """
         Calculate average cluster compactness (within-cluster variance).
 
-        Compactness measures how tight each cluster is. Lower is better.
+        Compactness measures how tight each cluster is: the mean distance of
+        a cluster's faces to its centroid, averaged over clusters with at
+        least two faces. Lower is better.
 
         Args:
-            embeddings: Face embeddings (non-noise only)
-            labels: Cluster labels (non-noise only)
-            unique_labels: Unique cluster labels
-            metric: Distance metric
+            stats: Output of _cluster_stats()
+            metric: Distance metric ('cosine', otherwise euclidean)
 
         Returns:
             Average compactness (0+, lower is better)
         """
         try:
-            if len(unique_labels) == 0:
+            per_cluster = stats['cosine'] if metric == 'cosine' else stats['euclidean']
+            multi = stats['counts'] >= 2
+            if not multi.any():
                 return 0.0
 
-            compactness_values = []
-
-            for label in unique_labels:
-                cluster_mask = labels == label
-                cluster_embeddings = embeddings[cluster_mask]
-
-                if len(cluster_embeddings) < 2:
-                    continue
-
-                # Calculate centroid
-                centroid = np.mean(cluster_embeddings, axis=0)
-
-                # Calculate average distance to centroid
-                if metric == 'cosine':
-                    # Cosine distance
-                    from sklearn.metrics.pairwise import cosine_distances
-                    distances = cosine_distances(cluster_embeddings, centroid.reshape(1, -1))
-                else:
-                    # Euclidean distance
-                    distances = np.linalg.norm(cluster_embeddings - centroid, axis=1)
-
-                avg_distance = np.mean(distances)
-                compactness_values.append(avg_distance)
-
-            if not compactness_values:
-                return 0.0
-
-            return float(np.mean(compactness_values))
+            return float(np.mean(per_cluster[multi]))
 
         except Exception as e:
             logger.debug(f"Error calculating compactness: {e}")
             return 0.0
 
-    def _calculate_avg_separation(self,
-                                 embeddings: np.ndarray,
-                                 labels: np.ndarray,
-                                 unique_labels: np.ndarray,
-                                 metric: str) -> float:
+    def _calculate_avg_separation(self, stats: Dict[str, np.ndarray], metric: str) -> float:
         """
         Calculate average cluster separation (between-cluster distances).
 
-        Separation measures how far apart clusters are. Higher is better.
+        Separation measures how far apart clusters are: the mean distance
+        over all centroid pairs. Higher is better.
+
+        For cosine the mean has a closed form over unit centroids,
+        sum_{i<j} u_i.u_j = (|sum u|^2 - sum |u_i|^2) / 2, so no K x K
+        matrix is built; euclidean distances are summed in row blocks.
 
         Args:
-            embeddings: Face embeddings (non-noise only)
-            labels: Cluster labels (non-noise only)
-            unique_labels: Unique cluster labels
-            metric: Distance metric
+            stats: Output of _cluster_stats()
+            metric: Distance metric ('cosine', otherwise euclidean)
 
         Returns:
             Average separation (0+, higher is better)
         """
         try:
-            if len(unique_labels) < 2:
-                return 0.0
-
-            # Calculate cluster centroids
-            centroids = []
-            for label in unique_labels:
-                cluster_mask = labels == label
-                cluster_embeddings = embeddings[cluster_mask]
-                centroid = np.mean(cluster_embeddings, axis=0)
-                centroids.append(centroid)
-
-            centroids = np.array(centroids)
-
-            # Calculate pairwise distances between centroids
-            if metric == 'cosine':
-                from sklearn.metrics.pairwise import cosine_distances
-                distances = cosine_distances(centroids)
-            else:
-                distances = pairwise_distances(centroids, metric='euclidean')
-
-            # Average of upper triangle (exclude diagonal)
+            centroids = stats['centroids']
             n = len(centroids)
             if n < 2:
                 return 0.0
 
-            upper_triangle = distances[np.triu_indices(n, k=1)]
-            avg_separation = np.mean(upper_triangle)
-
-            return float(avg_separation)
+            pairs = n * (n - 1)
+            if metric == 'cosine':
+                norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                unit = (centroids / norms).astype(np.float64)
+                total = unit.sum(axis=0)
+                off_diagonal = float(total @ total) - float(np.einsum('ij,ij->', unit, unit))
+                return float(1.0 - off_diagonal / pairs)
+
+            total = 0.0
+            block = max(1, self._BLOCK_ELEMENTS // n)
+            for start in range(0, n, block):
+                total += float(pairwise_distances(
+                    centroids[start:start + block], centroids, metric='euclidean'
+                ).sum())
+            return float(total / pairs)
 
         except Exception as e:
             logger.debug(f"Error calculating separation: {e}")
@@ -0,0 +1,539 @@
+# services/embedding_matrix_store.py
+# Persistent, memory-mapped embedding matrix for ANN retrieval
+#
+# SearchOrchestrator used to rebuild its ANN matrix by selecting every
+# semantic_embeddings BLOB, decoding each row with np.frombuffer and
+# vstack-ing the result.  On a 150k-photo library that costs seconds and
+# holds two copies of the matrix in memory.
+#
+# This store keeps one packed matrix file per (project, model) next to the
+# database, plus a photo_id sidecar.  The matrix is memory-mapped at query
+# time, new/changed embeddings are appended incrementally, and rows that
+# were superseded or deleted are dropped by a background compaction.
+
+"""
+EmbeddingMatrixStore - On-disk, memory-mapped semantic embedding matrix.
+
+Layout (under <db_dir>/embedding_cache/):
+    p{project}__{model}.json        meta: generation, dim, dtype, rows, watermark
+    p{project}__{model}.g{N}.vec    raw row-major matrix (rows x dim), L2-normalized
+    p{project}__{model}.g{N}.ids    raw int64 photo_id per row
+
+Rows are append-only.  A photo that is re-embedded gets a new row; the
+latest row for a photo_id wins.  Photos whose embedding disappeared from
+the database are masked out at sync time and physically removed by
+compaction, which writes generation N+1 and switches the meta pointer.
+
+Usage:
+    from services.embedding_matrix_store import get_embedding_matrix_store
+
+    store = get_embedding_matrix_store(project_id=1, model_name="openai/clip-vit-base-patch32")
+    view = store.sync()
+    sims = view.vectors @ query_vec
+"""
+
+import os
+import re
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from repository.base_repository import DatabaseConnection
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EmbeddingMatrixView:
+    """Live rows of the matrix, ready for ANN search."""
+    photo_ids: List[int] = field(default_factory=list)
+    vectors: Optional[np.ndarray] = None        # (n, dim), normalized; memmap when no rows are dead
+    path_lookup: Dict[int, str] = field(default_factory=dict)
+    appended: int = 0                            # rows appended by this sync
+    appended_ids: List[int] = field(default_factory=list)  # photo_ids (re)written by this sync
+    removed: int = 0                             # photo_ids masked out (deleted / other project)
+    generation: int = 0
+    rows: int = 0                                # physical rows in this generation
+
+
+def decode_embedding_blob(blob, stored_dim: Optional[int]) -> Optional[np.ndarray]:
+    """
+    Decode a semantic_embeddings BLOB into float32.
+
+    Negative dim marks float16 storage (see SemanticEmbeddingService.store_embedding),
+    positive dim is legacy float32.  Returns None on a size mismatch.
+    """
+    if blob is None:
+        return None
+    if isinstance(blob, str):
+        blob = blob.encode('latin1')
+    if stored_dim is not None and stored_dim < 0:
+        actual_dim = -stored_dim
+        emb = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+    else:
+        actual_dim = stored_dim
+        emb = np.frombuffer(blob, dtype=np.float32)
+    if len(emb) == 0 or (actual_dim and len(emb) != actual_dim):
+        return None
+    return emb
+
+
+class EmbeddingMatrixStore:
+    """
+    Per-project/per-model embedding matrix persisted next to the database.
+
+    Thread-safe: sync() and compaction serialize on an internal lock; the
+    returned view stays valid after a compaction because old generation
+    files are only unlinked on the next successful sync.
+    """
+
+    _COMPACT_DEAD_RATIO = 0.25   # compact once a quarter of the rows are dead
+    _COMPACT_MIN_ROWS = 1000     # ...but never bother for tiny matrices
+    _FETCH_CHUNK = 500           # photo_ids per IN (...) query (SQLite var limit)
+    _WATERMARK_SETTLE = 60       # seconds after which no more writes land in the watermark's second
+    _META_VERSION = 1
+
+    def __init__(self, project_id: int, model_name: str,
+                 db_connection: Optional[DatabaseConnection] = None,
+                 cache_dir: Optional[str] = None,
+                 dtype: str = 'float32'):
+        """
+        Args:
+            project_id: Project ID
+            model_name: Canonical semantic model ID (HF name)
+            db_connection: Optional database connection
+            cache_dir: Directory for matrix files (default: <db_dir>/embedding_cache)
+            dtype: On-disk element type, 'float32' (zero-copy into BLAS/FAISS)
+                   or 'float16' (half the disk/page cache footprint)
+        """
+        if dtype not in ('float32', 'float16'):
+            raise ValueError(f"Unsupported embedding matrix dtype: {dtype}")
+
+        from utils.clip_model_registry import normalize_model_id, all_aliases_for
+
+        self.project_id = project_id
+        self.model_name = normalize_model_id(model_name)
+        self._model_aliases = all_aliases_for(self.model_name)
+        self.db = db_connection or DatabaseConnection()
+        self.dtype = np.dtype(dtype)
+
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(self.db._db_path), "embedding_cache")
+        self.cache_dir = cache_dir
+
+        slug = re.sub(r'[^A-Za-z0-9._-]+', '_', self.model_name)
+        self._stem = os.path.join(self.cache_dir, f"p{project_id}__{slug}")
+
+        self._lock = threading.RLock()
+        self._compact_thread: Optional[threading.Thread] = None
+        self._stale_generations: List[int] = []
+        self._swept = False
+
+    # ── File layout ──
+
+    @property
+    def file_stem(self) -> str:
+        """Path prefix shared by this store's files (used by IncrementalANNIndex)."""
+        return self._stem
+
+    @property
+    def meta_path(self) -> str:
+        return f"{self._stem}.json"
+
+    def _vec_path(self, generation: int) -> str:
+        return f"{self._stem}.g{generation}.vec"
+
+    def _ids_path(self, generation: int) -> str:
+        return f"{self._stem}.g{generation}.ids"
+
+    def _load_meta(self) -> Optional[Dict]:
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[EmbeddingMatrixStore] Unreadable meta {self.meta_path}: {e}")
+            return None
+
+        if (meta.get('version') != self._META_VERSION
+                or meta.get('dtype') != self.dtype.name
+                or meta.get('model') != self.model_name):
+            return None
+        gen = meta.get('generation', 0)
+        if not (os.path.exists(self._vec_path(gen)) and os.path.exists(self._ids_path(gen))):
+            return None
+        return meta
+
+    def _write_meta(self, meta: Dict):
+        # Data files are flushed before the meta pointer moves, so a crash
+        # mid-append leaves trailing bytes that `rows` simply ignores.
+        tmp = f"{self.meta_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def _new_meta(self, generation: int = 0) -> Dict:
+        return {
+            'version': self._META_VERSION,
+            'model': self.model_name,
+            'dtype': self.dtype.name,
+            'dim': 0,
+            'rows': 0,
+            'generation': generation,
+            'watermark': None,
+            'watermark_settled': False,
+        }
+
+    def _read_ids(self, meta: Dict) -> np.ndarray:
+        rows = meta['rows']
+        if rows == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.fromfile(self._ids_path(meta['generation']), dtype=np.int64, count=rows)
+
+    def _map_vectors(self, meta: Dict) -> Optional[np.ndarray]:
+        rows, dim = meta['rows'], meta['dim']
+        if rows == 0 or dim == 0:
+            return None
+        return np.memmap(self._vec_path(meta['generation']), dtype=self.dtype,
+                         mode='r', shape=(rows, dim))
+
+    @staticmethod
+    def _latest_rows(ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (unique photo_ids, row index of the latest row for each)."""
+        if len(ids) == 0:
+            return ids, np.empty(0, dtype=np.int64)
+        uniq, first_rev = np.unique(ids[::-1], return_index=True)
+        return uniq, (len(ids) - 1 - first_rev).astype(np.int64)
+
+    # ── Sync ──
+
+    def sync(self) -> EmbeddingMatrixView:
+        """
+        Bring the on-disk matrix up to date with semantic_embeddings.
+
+        Only photo_ids missing from the matrix and rows whose computed_at is
+        at or after the stored watermark are read as BLOBs; everything else
+        is served from the memory-mapped file. computed_at has one-second
+        resolution, so rows stamped in the watermark's own second are
+        re-read (until that second is _WATERMARK_SETTLE seconds old) and only
+        appended if their vector actually changed.
+        """
+        with self._lock:
+            meta = self._load_meta()
+            if meta is None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                meta = self._new_meta()
+                for path in (self._vec_path(0), self._ids_path(0)):
+                    open(path, 'wb').close()
+                self._write_meta(meta)
+            if not self._swept:
+                self._sweep_orphans(meta['generation'])
+
+            model_ph = ','.join('?' * len(self._model_aliases))
+            with self.db.get_connection(read_only=True) as conn:
+                settled_before = conn.execute(
+                    "SELECT datetime('now', ?) AS t", (f"-{self._WATERMARK_SETTLE} seconds",)
+                ).fetchone()['t']
+                rows = conn.execute(f"""
+                    SELECT se.photo_id, se.computed_at, pm.path
+                    FROM semantic_embeddings se
+                    JOIN photo_metadata pm ON se.photo_id = pm.id
+                    WHERE pm.project_id = ? AND se.model IN ({model_ph})
+                """, (self.project_id, *self._model_aliases)).fetchall()
+
+            path_lookup = {r['photo_id']: r['path'] for r in rows}
+            ids = self._read_ids(meta)
+            stored_ids, _ = self._latest_rows(ids)
+            stored_set = set(stored_ids.tolist())
+
+            watermark = meta.get('watermark')
+            settled = meta.get('watermark_settled', False)
+            new_watermark = watermark
+            to_fetch = []
+            recheck = []
+            for r in rows:
+                computed_at = r['computed_at'] or ''
+                if r['photo_id'] not in stored_set:
+                    to_fetch.append(r['photo_id'])
+                elif watermark and (computed_at > watermark
+                                    or (computed_at == watermark and not settled)):
+                    to_fetch.append(r['photo_id'])
+                    if computed_at == watermark:
+                        recheck.append(r['photo_id'])
+                if new_watermark is None or computed_at > new_watermark:
+                    new_watermark = computed_at
+
+            appended_ids = (self._append(meta, to_fetch, self._stored_vectors(meta, ids, recheck))
+                            if to_fetch else [])
+            appended = len(appended_ids)
+            # Every write stamped in the new watermark's second has been read
+            # once that second is old enough
+            new_settled = bool(new_watermark) and new_watermark <= settled_before
+            if new_watermark != watermark or new_settled != settled:
+                meta['watermark'] = new_watermark
+                meta['watermark_settled'] = new_settled
+                self._write_meta(meta)
+
+            view = self._build_view(meta, path_lookup)
+            view.appended = appended
+            view.appended_ids = appended_ids
+
+            stale, self._stale_generations = self._stale_generations, []
+            for gen in stale:
+                if gen != meta['generation']:
+                    self._unlink_generation(gen)
+
+        if appended:
+            logger.info(
+                f"[EmbeddingMatrixStore] project={self.project_id}: appended {appended} rows "
+                f"(live={len(view.photo_ids)}, rows={meta['rows']})"
+            )
+        self._maybe_compact(meta['rows'], len(view.photo_ids))
+        return view
+
+    def _stored_vectors(self, meta: Dict, ids: np.ndarray, photo_ids: List[int]) -> Dict[int, np.ndarray]:
+        """Copy of the latest stored row for each photo_id (read before appending)."""
+        vectors = self._map_vectors(meta)
+        if not photo_ids or vectors is None:
+            return {}
+        uniq, latest = self._latest_rows(ids)
+        pos = np.searchsorted(uniq, photo_ids)
+        stored = {pid: np.array(vectors[latest[i]]) for pid, i in zip(photo_ids, pos.tolist())}
+        del vectors
+        return stored
+
+    def _append(self, meta: Dict, photo_ids: List[int],
+                unchanged_if: Optional[Dict[int, np.ndarray]] = None) -> List[int]:
+        """
+        Fetch, normalize and append embeddings for photo_ids. Returns the ids written.
+
+        Photos in unchanged_if whose vector equals the given stored row are
+        not appended again.
+        """
+        model_ph = ','.join('?' * len(self._model_aliases))
+        dim = meta['dim']
+        written: List[int] = []
+
+        with open(self._vec_path(meta['generation']), 'r+b') as vec_f, \
+                open(self._ids_path(meta['generation']), 'r+b') as ids_f, \
+                self.db.get_connection(read_only=True) as conn:
+            # Truncate any bytes left behind by an interrupted append (only
+            # when needed: Windows refuses to resize a file that is mapped)
+            for f, size in ((vec_f, meta['rows'] * dim * self.dtype.itemsize),
+                            (ids_f, meta['rows'] * 8)):
+                if os.fstat(f.fileno()).st_size != size:
+                    f.truncate(size)
+            vec_f.seek(0, os.SEEK_END)
+            ids_f.seek(0, os.SEEK_END)
+
+            for start in range(0, len(photo_ids), self._FETCH_CHUNK):
+                chunk = photo_ids[start:start + self._FETCH_CHUNK]
+                id_ph = ','.join('?' * len(chunk))
+                fetched = conn.execute(f"""
+                    SELECT photo_id, embedding, dim
+                    FROM semantic_embeddings
+                    WHERE photo_id IN ({id_ph}) AND model IN ({model_ph})
+                """, (*chunk, *self._model_aliases)).fetchall()
+
+                chunk_ids = []
+                chunk_vecs = []
+                for r in fetched:
+                    emb = decode_embedding_blob(r['embedding'], r['dim'])
+                    if emb is None:
+                        continue
+                    if dim == 0:
+                        dim = meta['dim'] = len(emb)
+                    if len(emb) != dim:
+                        logger.warning(
+                            f"[EmbeddingMatrixStore] Skipping photo {r['photo_id']}: "
+                            f"dim {len(emb)} != matrix dim {dim}"
+                        )
+                        continue
+                    chunk_ids.append(r['photo_id'])
+                    chunk_vecs.append(emb)
+
+                if not chunk_vecs:
+                    continue
+
+                block = np.vstack(chunk_vecs).astype(np.float32)
+                block /= np.maximum(np.linalg.norm(block, axis=1, keepdims=True), 1e-8)
+                block = block.astype(self.dtype)
+                if unchanged_if:
+                    keep = [i for i, pid in enumerate(chunk_ids)
+                            if pid not in unchanged_if or not np.array_equal(block[i], unchanged_if[pid])]
+                    if len(keep) < len(chunk_ids):
+                        block = block[keep]
+                        chunk_ids = [chunk_ids[i] for i in keep]
+                    if not chunk_ids:
+                        continue
+                vec_f.write(block.tobytes())
+                ids_f.write(np.asarray(chunk_ids, dtype=np.int64).tobytes())
+                written.extend(chunk_ids)
+
+            vec_f.flush()
+            ids_f.flush()
+
+        meta['rows'] += len(written)
+        self._write_meta(meta)
+        return written
+
+    def _build_view(self, meta: Dict, path_lookup: Dict[int, str]) -> EmbeddingMatrixView:
+        ids = self._read_ids(meta)
+        view = EmbeddingMatrixView(generation=meta['generation'], rows=meta['rows'])
+        if len(ids) == 0:
+            return view
+
+        uniq, latest = self._latest_rows(ids)
+        keep = np.fromiter((pid in path_lookup for pid in uniq.tolist()),
+                           dtype=bool, count=len(uniq))
+        live_rows = np.sort(latest[keep])
+        view.removed = int(len(uniq) - keep.sum())
+
+        vectors = self._map_vectors(meta)
+        if vectors is None or len(live_rows) == 0:
+            return view
+
+        if len(live_rows) == len(ids):
+            # No dead rows: hand out the memmap itself (zero copy)
+            view.vectors = vectors
+        else:
+            view.vectors = np.asarray(vectors[live_rows])
+        view.photo_ids = ids[live_rows].tolist()
+        view.path_lookup = {pid: path_lookup[pid] for pid in view.photo_ids}
+        return view
+
+    # ── Compaction ──
+
+    def _maybe_compact(self, rows: int, live: int):
+        if rows < self._COMPACT_MIN_ROWS or rows == 0:
+            return
+        if (rows - live) / rows >= self._COMPACT_DEAD_RATIO:
+            self.compact_async()
+
+    def compact_async(self) -> bool:
+        """Start a background compaction unless one is already running."""
+        with self._lock:
+            if self._compact_thread and self._compact_thread.is_alive():
+                return False
+            self._compact_thread = threading.Thread(
+                target=self._compact_safe, name=f"EmbeddingMatrixCompact-p{self.project_id}",
+                daemon=True,
+            )
+            self._compact_thread.start()
+            return True
+
+    def _compact_safe(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.warning(f"[EmbeddingMatrixStore] Compaction failed for project {self.project_id}: {e}")
+
+    def compact(self) -> int:
+        """
+        Rewrite the matrix with only live rows into a new generation.
+
+        Returns the number of rows dropped.
+        """
+        with self._lock:
+            meta = self._load_meta()
+            if meta is None or meta['rows'] == 0:
+                return 0
+
+            model_ph = ','.join('?' * len(self._model_aliases))
+            with self.db.get_connection(read_only=True) as conn:
+                live_set = {r['photo_id'] for r in conn.execute(f"""
+                    SELECT se.photo_id
+                    FROM semantic_embeddings se
+                    JOIN photo_metadata pm ON se.photo_id = pm.id
+                    WHERE pm.project_id = ? AND se.model IN ({model_ph})
+                """, (self.project_id, *self._model_aliases)).fetchall()}
+
+            ids = self._read_ids(meta)
+            uniq, latest = self._latest_rows(ids)
+            keep = np.fromiter((pid in live_set for pid in uniq.tolist()),
+                               dtype=bool, count=len(uniq))
+            live_rows = np.sort(latest[keep])
+            dropped = meta['rows'] - len(live_rows)
+            if dropped == 0:
+                return 0
+
+            old_gen = meta['generation']
+            new_gen = old_gen + 1
+            vectors = self._map_vectors(meta)
+            with open(self._vec_path(new_gen), 'wb') as vec_f:
+                for start in range(0, len(live_rows), 8192):
+                    vec_f.write(np.asarray(vectors[live_rows[start:start + 8192]]).tobytes())
+            ids[live_rows].astype(np.int64).tofile(self._ids_path(new_gen))
+            del vectors
+
+            meta['generation'] = new_gen
+            meta['rows'] = int(len(live_rows))
+            self._write_meta(meta)
+            # Outstanding views may still map the old generation (and Windows
+            # refuses to unlink mapped files) - remove it on the next sync.
+            self._stale_generations.append(old_gen)
+
+        logger.info(
+            f"[EmbeddingMatrixStore] Compacted project={self.project_id}: "
+            f"dropped {dropped} rows, generation {old_gen} -> {new_gen}"
+        )
+        return dropped
+
+    def _unlink_generation(self, generation: int):
+        for path in (self._vec_path(generation), self._ids_path(generation)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"[EmbeddingMatrixStore] Could not remove {path}: {e}")
+                self._stale_generations.append(generation)
+                return
+
+    def _sweep_orphans(self, current_generation: int):
+        """Remove generations left behind by a previous process."""
+        self._swept = True
+        prefix = os.path.basename(self._stem) + ".g"
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            gen = name[len(prefix):].split('.', 1)[0]
+            if gen.isdigit() and int(gen) != current_generation:
+                self._unlink_generation(int(gen))
+
+    def clear(self):
+        """Delete all files for this project/model (next sync rebuilds)."""
+        with self._lock:
+            meta = self._load_meta()
+            if meta is not None:
+                self._unlink_generation(meta['generation'])
+            try:
+                os.remove(self.meta_path)
+            except FileNotFoundError:
+                pass
+
+
+# Per-(project, model) store registry
+_stores: Dict[Tuple[int, str], EmbeddingMatrixStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_matrix_store(project_id: int, model_name: str) -> EmbeddingMatrixStore:
+    """Get the shared EmbeddingMatrixStore for a project/model pair."""
+    from utils.clip_model_registry import normalize_model_id
+    key = (project_id, normalize_model_id(model_name))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = EmbeddingMatrixStore(project_id, key[1])
+            _stores[key] = store
+        return store
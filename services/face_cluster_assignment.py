@@ -0,0 +1,70 @@
+# services/face_cluster_assignment.py
+# Nearest-neighbour assignment of new face embeddings to existing clusters
+# Used by FaceClusterWorker's incremental mode
+# ------------------------------------------------------
+
+"""
+Face Cluster Assignment
+
+Incremental clustering assigns a newly detected face to the cluster of its
+nearest already-clustered face when that face is within the DBSCAN eps
+(cosine distance), i.e. the new face would have been density-reachable
+from the cluster in a full run. Only faces left over are re-clustered.
+"""
+
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Similarity block budget (elements, ~64 MB of float32)
+_BLOCK_ELEMENTS = 16_000_000
+
+
+def _unit_rows(X: np.ndarray) -> np.ndarray:
+    X = np.asarray(X, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return X / norms
+
+
+def nearest_cluster_assignments(
+    clustered_vecs: np.ndarray,
+    clustered_keys: Sequence[str],
+    new_vecs: np.ndarray,
+    eps: float,
+) -> List[Optional[str]]:
+    """
+    Branch key for each new face, or None when no clustered face is within eps.
+
+    Args:
+        clustered_vecs: (n, d) embeddings of faces that already have a cluster
+        clustered_keys: branch key per row of clustered_vecs
+        new_vecs: (m, d) embeddings to assign
+        eps: maximum cosine distance (same value as the DBSCAN eps)
+
+    Returns:
+        List of m branch keys / None, in new_vecs order
+    """
+    if len(new_vecs) == 0:
+        return []
+    if len(clustered_vecs) == 0:
+        return [None] * len(new_vecs)
+
+    existing = _unit_rows(clustered_vecs)
+    queries = _unit_rows(new_vecs)
+    min_sim = 1.0 - float(eps)
+
+    out: List[Optional[str]] = []
+    block = max(1, _BLOCK_ELEMENTS // len(existing))
+    for start in range(0, len(queries), block):
+        sims = queries[start:start + block] @ existing.T
+        nearest = np.argmax(sims, axis=1)
+        best = sims[np.arange(len(nearest)), nearest]
+        out.extend(
+            clustered_keys[int(j)] if s >= min_sim else None
+            for j, s in zip(nearest, best)
+        )
+    return out
@@ -0,0 +1,166 @@
+# services/face_clustering_backend.py
+# Pluggable DBSCAN backends for face clustering
+# Used by FaceClusterWorker and the legacy cluster_faces() entry point
+# ------------------------------------------------------
+
+"""
+Face Clustering Backend
+
+DBSCAN(metric='cosine') materializes every face's neighbourhood from a
+brute-force pairwise-distance pass, which on large libraries dominates the
+clustering run. The graph backend computes the same eps-neighbourhoods
+itself: embeddings are unit-normalized so cosine distance becomes
+1 - inner product, the radius graph is built with FAISS range search
+(blocked numpy matmul when FAISS is not installed), and DBSCAN runs on the
+resulting sparse precomputed-distance graph.
+
+DBSCAN labels depend only on the neighbour sets, so both backends return
+identical labels up to float rounding at exactly eps (see
+services/face_clustering_benchmark.py).
+
+Backends:
+    exact  sklearn DBSCAN(metric='cosine')
+    graph  DBSCAN(metric='precomputed') on a sparse cosine radius graph
+    auto   exact below graph_min_faces faces, graph above
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.cluster import DBSCAN
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss as _faiss
+    _faiss_available = True
+except ImportError:
+    _faiss_available = False
+
+BACKEND_AUTO = 'auto'
+BACKEND_EXACT = 'exact'
+BACKEND_GRAPH = 'graph'
+BACKENDS = (BACKEND_AUTO, BACKEND_EXACT, BACKEND_GRAPH)
+
+DEFAULT_GRAPH_MIN_FACES = 5000
+
+# Similarity block budget for the numpy engine (elements, ~64 MB of float32)
+_BLOCK_ELEMENTS = 16_000_000
+# Queries per FAISS range_search call (bounds the result buffers)
+_FAISS_QUERY_BLOCK = 4096
+
+
+def _unit_rows(X: np.ndarray) -> np.ndarray:
+    X = np.asarray(X, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return X / norms
+
+
+def _radius_pairs_numpy(unit: np.ndarray, min_sim: float):
+    n = len(unit)
+    block = max(1, _BLOCK_ELEMENTS // n)
+    rows, cols, sims = [], [], []
+    for start in range(0, n, block):
+        block_sims = unit[start:start + block] @ unit.T
+        r, c = np.nonzero(block_sims >= min_sim)
+        rows.append(r + start)
+        cols.append(c)
+        sims.append(block_sims[r, c])
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(sims)
+
+
+def _radius_pairs_faiss(unit: np.ndarray, min_sim: float):
+    index = _faiss.IndexFlatIP(unit.shape[1])
+    index.add(unit)
+    # range_search keeps scores strictly above the radius; nudge it down and
+    # apply the inclusive DBSCAN bound (distance <= eps) ourselves
+    radius = float(min_sim) - 1e-6
+    rows, cols, sims = [], [], []
+    for start in range(0, len(unit), _FAISS_QUERY_BLOCK):
+        lims, D, I = index.range_search(unit[start:start + _FAISS_QUERY_BLOCK], radius)
+        lims = lims.astype(np.int64)  # faiss returns uint64 offsets
+        r = np.repeat(np.arange(len(lims) - 1, dtype=np.int64), np.diff(lims)) + start
+        keep = D >= min_sim
+        rows.append(r[keep])
+        cols.append(I[keep])
+        sims.append(D[keep])
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(sims)
+
+
+def cosine_radius_graph(X: np.ndarray, eps: float, use_faiss: Optional[bool] = None) -> sparse.csr_matrix:
+    """
+    Sparse cosine-distance graph of every pair within eps (self loops included).
+
+    Rows are sorted by distance, the layout sklearn's precomputed
+    neighbour search expects.
+
+    Args:
+        X: (n, d) face embeddings (need not be normalized)
+        eps: maximum cosine distance
+        use_faiss: Force (True) or skip (False) FAISS; None uses it when installed
+
+    Returns:
+        (n, n) csr_matrix of cosine distances
+    """
+    unit = np.ascontiguousarray(_unit_rows(X))
+    n = len(unit)
+    if n == 0:
+        return sparse.csr_matrix((0, 0), dtype=np.float64)
+    min_sim = 1.0 - float(eps)
+
+    if use_faiss is None:
+        use_faiss = _faiss_available
+    if use_faiss:
+        rows, cols, sims = _radius_pairs_faiss(unit, min_sim)
+    else:
+        rows, cols, sims = _radius_pairs_numpy(unit, min_sim)
+
+    dist = np.clip(1.0 - sims.astype(np.float64), 0.0, float(eps))
+    dist[rows == cols] = 0.0
+    order = np.lexsort((dist, rows))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return sparse.csr_matrix((dist[order], cols[order], indptr), shape=(n, n))
+
+
+def resolve_backend(backend: str, n_faces: int, graph_min_faces: int = DEFAULT_GRAPH_MIN_FACES) -> str:
+    """Concrete backend ('exact' or 'graph') for a clustering run of n_faces."""
+    if backend not in BACKENDS:
+        logger.warning(f"[FaceClusteringBackend] Unknown backend '{backend}', using '{BACKEND_AUTO}'")
+        backend = BACKEND_AUTO
+    if backend == BACKEND_AUTO:
+        return BACKEND_GRAPH if n_faces >= graph_min_faces else BACKEND_EXACT
+    return backend
+
+
+def dbscan_cosine(X: np.ndarray, eps: float, min_samples: int,
+                  backend: str = BACKEND_AUTO,
+                  graph_min_faces: int = DEFAULT_GRAPH_MIN_FACES) -> np.ndarray:
+    """
+    DBSCAN labels of face embeddings under cosine distance.
+
+    Args:
+        X: (n, d) face embeddings
+        eps: DBSCAN eps (cosine distance)
+        min_samples: DBSCAN min_samples
+        backend: 'auto', 'exact' or 'graph'
+        graph_min_faces: In auto mode, use the graph backend from this many faces
+
+    Returns:
+        (n,) int labels, -1 for noise
+    """
+    if len(X) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if resolve_backend(backend, len(X), graph_min_faces) == BACKEND_EXACT:
+        return DBSCAN(eps=eps, min_samples=min_samples, metric='cosine').fit_predict(X)
+
+    graph = cosine_radius_graph(X, eps)
+    logger.debug(
+        f"[FaceClusteringBackend] Radius graph: {len(X)} faces, {graph.nnz} edges "
+        f"(faiss={_faiss_available})"
+    )
+    return DBSCAN(eps=eps, min_samples=min_samples, metric='precomputed').fit_predict(graph)
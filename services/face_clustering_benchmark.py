@@ -0,0 +1,145 @@
+# services/face_clustering_benchmark.py
+# Benchmark for the face clustering backends (exact vs radius-graph DBSCAN)
+# Checks both backends label synthetic face sets identically and reports
+# timings at library-sized face counts
+# ------------------------------------------------------
+
+"""
+Face Clustering Benchmark
+
+Generates synthetic ArcFace-like embeddings (identities of varying size
+plus one-off faces), clusters them with the graph backend and with sklearn
+DBSCAN(metric='cosine'), checks the labels are identical and reports
+timings.
+
+Usage:
+    python -m services.face_clustering_benchmark
+    python -m services.face_clustering_benchmark --sizes 10000 50000 200000 --exact-max 50000
+"""
+
+import argparse
+import time
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.face_clustering_backend import (
+    BACKEND_EXACT, BACKEND_GRAPH, _faiss_available, dbscan_cosine,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FaceClusteringBenchmarkResult:
+    """Result of one benchmark size."""
+
+    faces: int
+    clusters: int
+    noise: int
+    graph_seconds: float
+    exact_seconds: Optional[float]   # None when the exact run was skipped
+    identical: Optional[bool]
+    neighbor_engine: str
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if self.exact_seconds is None or self.graph_seconds <= 0:
+            return None
+        return self.exact_seconds / self.graph_seconds
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        out = asdict(self)
+        out['speedup'] = self.speedup
+        return out
+
+
+def synthetic_faces(n_faces: int, dim: int = 512, mean_identity_size: int = 12,
+                    noise: float = 0.025, single_ratio: float = 0.15,
+                    seed: int = 0) -> np.ndarray:
+    """
+    L2-normalized embeddings shaped like a face library.
+
+    ``single_ratio`` of the faces are strangers seen once; the rest belong
+    to identities whose sizes are geometric around ``mean_identity_size``.
+    With the default noise, faces of one identity sit at a cosine distance
+    of roughly 0.25 from each other, around the production eps.
+    """
+    rng = np.random.default_rng(seed)
+    n_known = int(n_faces * (1.0 - single_ratio))
+    sizes = rng.geometric(1.0 / mean_identity_size, size=max(1, n_known))
+    owners = np.repeat(np.arange(len(sizes)), sizes)[:n_known]
+    centers = rng.standard_normal((int(owners.max()) + 1 if n_known else 1, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    known = centers[owners] + noise * rng.standard_normal((n_known, dim)).astype(np.float32)
+    singles = rng.standard_normal((n_faces - n_known, dim)).astype(np.float32)
+    emb = np.vstack([known, singles])
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb[rng.permutation(n_faces)]
+
+
+def run_benchmark(sizes=(10000, 50000, 200000), eps: float = 0.30, min_samples: int = 3,
+                  exact_max: int = 50000, dim: int = 512) -> List[FaceClusteringBenchmarkResult]:
+    """
+    Time the graph backend (and exact DBSCAN up to ``exact_max`` faces) per size.
+
+    Returns:
+        One FaceClusteringBenchmarkResult per size
+    """
+    results = []
+    for n in sizes:
+        emb = synthetic_faces(n, dim=dim)
+
+        start = time.perf_counter()
+        labels = dbscan_cosine(emb, eps, min_samples, backend=BACKEND_GRAPH)
+        graph_seconds = time.perf_counter() - start
+
+        exact_seconds = identical = None
+        if n <= exact_max:
+            start = time.perf_counter()
+            reference = dbscan_cosine(emb, eps, min_samples, backend=BACKEND_EXACT)
+            exact_seconds = time.perf_counter() - start
+            identical = bool(np.array_equal(reference, labels))
+
+        result = FaceClusteringBenchmarkResult(
+            faces=n,
+            clusters=int(labels.max()) + 1 if len(labels) else 0,
+            noise=int(np.sum(labels == -1)),
+            graph_seconds=graph_seconds,
+            exact_seconds=exact_seconds,
+            identical=identical,
+            neighbor_engine="faiss" if _faiss_available else "numpy",
+        )
+        logger.info(f"[FaceClusteringBenchmark] {result.to_dict()}")
+        results.append(result)
+    return results
+
+
+def print_benchmark_report(results: List[FaceClusteringBenchmarkResult]):
+    """Print a formatted table of benchmark results."""
+    print("\n" + "=" * 78)
+    print("FACE CLUSTERING BENCHMARK (DBSCAN, cosine)")
+    print("=" * 78)
+    print(f"{'faces':>8s} {'clusters':>9s} {'noise':>7s} {'graph s':>9s} {'exact s':>9s} "
+          f"{'speedup':>9s} {'identical':>10s} {'engine':>7s}")
+    for r in results:
+        exact = f"{r.exact_seconds:9.3f}" if r.exact_seconds is not None else f"{'-':>9s}"
+        speedup = f"{r.speedup:8.1f}x" if r.speedup is not None else f"{'-':>9s}"
+        identical = str(r.identical) if r.identical is not None else "-"
+        print(f"{r.faces:8d} {r.clusters:9d} {r.noise:7d} {r.graph_seconds:9.3f} {exact} "
+              f"{speedup} {identical:>10s} {r.neighbor_engine:>7s}")
+    print("=" * 78 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--eps", type=float, default=0.30)
+    parser.add_argument("--min-samples", type=int, default=3)
+    parser.add_argument("--exact-max", type=int, default=50000,
+                        help="Largest size to also run sklearn DBSCAN(metric='cosine') on")
+    args = parser.parse_args()
+    print_benchmark_report(run_benchmark(args.sizes, args.eps, args.min_samples, args.exact_max))
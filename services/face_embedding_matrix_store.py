@@ -0,0 +1,645 @@
+# services/face_embedding_matrix_store.py
+# Persistent, memory-mapped face embedding matrix
+#
+# FaceClusterWorker used to load a project's faces with a JOIN across
+# face_crops, photo_metadata, search_asset_features and project_images plus
+# eight LIKE screenshot filters, then decode every embedding BLOB with
+# np.frombuffer.  On a 100k-face project that is ~200 MB of BLOBs per run.
+#
+# This store keeps one packed float32 matrix per project next to the
+# database, with a parallel record file (face id, photo id, bbox,
+# confidence, screenshot flag, photo size) and the crop/image paths.
+# face_crops ids are AUTOINCREMENT and a re-detected face is written as a
+# new row (INSERT OR REPLACE), so a face never changes behind its id: new
+# faces are appended by id watermark (the only JOIN, over new rows only),
+# deleted faces are dropped by compaction.  A sync otherwise reads just
+# face_crops / photo_metadata ids from their project indexes.
+
+"""
+FaceEmbeddingMatrixStore - On-disk, memory-mapped face embedding matrix.
+
+Layout (under <db_dir>/embedding_cache/):
+    faces_p{project}.json          meta: generation, dim, rows, max_face_id,
+                                   ids of faces skipped for their embedding
+    faces_p{project}.g{N}.vec      raw row-major float32 matrix (rows x dim), as stored
+    faces_p{project}.g{N}.rec      one FACE_RECORD_DTYPE record per row
+    faces_p{project}.g{N}.str      one JSON line [crop_path, image_path] per row
+
+Rows are sorted by face id (appends are in id order), so id -> row is a
+binary search.  Faces with a missing or wrongly sized embedding are never
+appended; their ids are kept in the meta so they are not mistaken for
+lost rows.
+
+Usage:
+    from services.face_embedding_matrix_store import get_face_embedding_matrix_store
+
+    store = get_face_embedding_matrix_store(project_id=1)
+    store.append_new()                      # after faces were saved
+    view = store.sync()                     # every live face (clustering)
+    vectors = store.get_vectors(face_ids)   # a few faces (review, person search)
+"""
+
+import os
+import re
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from repository.base_repository import DatabaseConnection
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+FACE_RECORD_DTYPE = np.dtype([
+    ('face_id', '<i8'),
+    ('photo_id', '<i8'),          # -1 when the photo was not in photo_metadata at append time
+    ('bbox', '<i4', (4,)),        # x, y, w, h
+    ('confidence', '<f4'),        # NaN when unknown
+    ('screenshot', 'u1'),         # image path looks like a screenshot
+    ('in_project', 'u1'),         # image was in project_images
+    ('image_size', '<i4', (2,)),  # photo width, height (0 when unknown)
+])
+
+# Same matches as the LIKE filters FaceClusterWorker used ('_' is a LIKE wildcard)
+_SCREENSHOT_PATH_RE = re.compile(
+    r"screenshot|screen.shot|bildschirmfoto|captura|스크린샷|スクリーンショット"
+)
+
+
+def is_screenshot_path(path: Optional[str]) -> bool:
+    """True if the file path names a screenshot (any language we know of)."""
+    return bool(path) and _SCREENSHOT_PATH_RE.search(path.lower()) is not None
+
+
+@dataclass
+class FaceEmbeddingMatrixView:
+    """Live faces of a project (face_crops order by id) with their embeddings."""
+    face_ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    photo_ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    bboxes: np.ndarray = field(default_factory=lambda: np.empty((0, 4), dtype=np.int32))
+    confidences: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
+    is_screenshot: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=bool))
+    image_sizes: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.int64))
+    vectors: Optional[np.ndarray] = None    # (n, dim) float32; memmap when nothing was dropped
+    crop_paths: List[str] = field(default_factory=list)
+    image_paths: List[str] = field(default_factory=list)
+    branch_keys: List[Optional[str]] = field(default_factory=list)
+    bad_embedding: int = 0                  # faces with an empty embedding
+    bad_size: int = 0                       # faces whose embedding is not `dim` float32 values
+    appended: int = 0                       # rows appended by this sync
+    generation: int = 0
+    rows: int = 0                           # physical rows in this generation
+
+    def __len__(self) -> int:
+        return len(self.face_ids)
+
+    @property
+    def missing(self) -> int:
+        """Faces without a usable embedding."""
+        return self.bad_embedding + self.bad_size
+
+
+class FaceEmbeddingMatrixStore:
+    """
+    Per-project face embedding matrix persisted next to the database.
+
+    Thread-safe: appends, syncs and compaction serialize on an internal
+    lock.  A returned view stays valid after a compaction because old
+    generation files are only unlinked on the next sync.
+    """
+
+    _COMPACT_DEAD_RATIO = 0.25   # compact once a quarter of the rows are dead
+    _COMPACT_MIN_ROWS = 1000     # ...but never bother for tiny matrices
+    _FETCH_CHUNK = 500           # rows per fetchmany() while appending
+    _ID_CHUNK = 500              # ids per IN (...) query
+    _META_VERSION = 2
+    _SKIP_REASONS = ('no_embedding', 'bad_embedding', 'bad_size')
+
+    def __init__(self, project_id: int,
+                 db_connection: Optional[DatabaseConnection] = None,
+                 cache_dir: Optional[str] = None,
+                 dim: int = 512):
+        """
+        Args:
+            project_id: Project ID
+            db_connection: Optional database connection
+            cache_dir: Directory for matrix files (default: <db_dir>/embedding_cache)
+            dim: Embedding size; faces with another size are skipped (ArcFace: 512)
+        """
+        self.project_id = project_id
+        self.db = db_connection or DatabaseConnection()
+        self.dim = dim
+
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(self.db._db_path), "embedding_cache")
+        self.cache_dir = cache_dir
+        self._stem = os.path.join(self.cache_dir, f"faces_p{project_id}")
+
+        self._lock = threading.RLock()
+        self._stale_generations: List[int] = []
+        self._swept = False
+        self._paths: Optional[Tuple[int, List[Tuple[str, str]]]] = None   # (generation, rows)
+
+    # ── File layout ──
+
+    @property
+    def meta_path(self) -> str:
+        return f"{self._stem}.json"
+
+    def _vec_path(self, generation: int) -> str:
+        return f"{self._stem}.g{generation}.vec"
+
+    def _rec_path(self, generation: int) -> str:
+        return f"{self._stem}.g{generation}.rec"
+
+    def _str_path(self, generation: int) -> str:
+        return f"{self._stem}.g{generation}.str"
+
+    def _generation_paths(self, generation: int):
+        return self._vec_path(generation), self._rec_path(generation), self._str_path(generation)
+
+    def _load_meta(self) -> Optional[Dict]:
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[FaceEmbeddingMatrixStore] Unreadable meta {self.meta_path}: {e}")
+            return None
+
+        if meta.get('version') != self._META_VERSION or meta.get('dim') != self.dim:
+            return None
+        gen = meta.get('generation', 0)
+        if not all(os.path.exists(p) for p in self._generation_paths(gen)):
+            return None
+        return meta
+
+    def _write_meta(self, meta: Dict):
+        # Data files are flushed before the meta pointer moves, so a crash
+        # mid-append leaves trailing bytes that `rows` simply ignores.
+        tmp = f"{self.meta_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def _open_meta(self) -> Dict:
+        """Current meta, creating an empty generation 0 on first use."""
+        meta = self._load_meta()
+        if meta is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            meta = {
+                'version': self._META_VERSION,
+                'dim': self.dim,
+                'rows': 0,
+                'generation': 0,
+                'max_face_id': 0,
+                'str_bytes': 0,
+                'skipped': {reason: [] for reason in self._SKIP_REASONS},
+            }
+            for path in self._generation_paths(0):
+                open(path, 'wb').close()
+            self._write_meta(meta)
+        if not self._swept:
+            self._sweep_orphans(meta['generation'])
+        return meta
+
+    def _map(self, meta: Dict, mode: str = 'r'):
+        """(records, vectors) memmaps of the current generation, or (None, None) when empty."""
+        rows = meta['rows']
+        if rows == 0:
+            return None, None
+        gen = meta['generation']
+        records = np.memmap(self._rec_path(gen), dtype=FACE_RECORD_DTYPE, mode=mode, shape=(rows,))
+        vectors = np.memmap(self._vec_path(gen), dtype=np.float32, mode='r', shape=(rows, self.dim))
+        return records, vectors
+
+    def _load_paths(self, meta: Dict) -> List[Tuple[str, str]]:
+        """(crop_path, image_path) of every row, cached in memory per generation."""
+        gen = meta['generation']
+        if self._paths is None or self._paths[0] != gen or len(self._paths[1]) < meta['rows']:
+            with open(self._str_path(gen), 'rb') as f:
+                data = f.read(meta['str_bytes'])
+            self._paths = (gen, [tuple(json.loads(line)) for line in data.splitlines()])
+        return self._paths[1]
+
+    @staticmethod
+    def _find_rows(stored_ids: np.ndarray, face_ids: np.ndarray) -> np.ndarray:
+        """Row of each face id in the (sorted) matrix, -1 when absent."""
+        if len(stored_ids) == 0:
+            return np.full(len(face_ids), -1, dtype=np.int64)
+        pos = np.searchsorted(stored_ids, face_ids)
+        pos = np.minimum(pos, len(stored_ids) - 1)
+        return np.where(stored_ids[pos] == face_ids, pos, -1)
+
+    # ── Append ──
+
+    def append_new(self) -> int:
+        """
+        Append faces saved since the last append (face id above the watermark).
+
+        Cheap enough to call after every batch of saved faces: only the new
+        face_crops rows are read.  Returns the number of rows appended.
+        """
+        with self._lock:
+            meta = self._open_meta()
+            appended = self._append(meta)
+        if appended:
+            logger.debug(
+                f"[FaceEmbeddingMatrixStore] project={self.project_id}: appended {appended} faces "
+                f"(rows={meta['rows']})"
+            )
+        return appended
+
+    def _append(self, meta: Dict) -> int:
+        written = 0
+        skipped = {reason: [] for reason in self._SKIP_REASONS}
+        max_face_id = meta['max_face_id']
+        gen = meta['generation']
+        paths = self._paths[1] if self._paths is not None and self._paths[0] == gen \
+            and len(self._paths[1]) == meta['rows'] else None
+
+        with open(self._vec_path(gen), 'r+b') as vec_f, \
+                open(self._rec_path(gen), 'r+b') as rec_f, \
+                open(self._str_path(gen), 'r+b') as str_f, \
+                self.db.get_connection(read_only=True) as conn:
+            # Truncate any bytes left behind by an interrupted append (only
+            # when needed: Windows refuses to resize a file that is mapped)
+            for f, size in ((vec_f, meta['rows'] * self.dim * 4),
+                            (rec_f, meta['rows'] * FACE_RECORD_DTYPE.itemsize),
+                            (str_f, meta['str_bytes'])):
+                if os.fstat(f.fileno()).st_size != size:
+                    f.truncate(size)
+                f.seek(0, os.SEEK_END)
+
+            cur = conn.execute("""
+                SELECT fc.id, fc.embedding, fc.image_path, fc.crop_path, fc.confidence,
+                       fc.bbox_x, fc.bbox_y, fc.bbox_w, fc.bbox_h,
+                       pm.id AS photo_id, pm.width, pm.height,
+                       EXISTS (
+                           SELECT 1 FROM project_images pi
+                           WHERE pi.image_path = fc.image_path
+                             AND pi.project_id = fc.project_id
+                       ) AS in_project
+                FROM face_crops fc
+                LEFT JOIN photo_metadata pm
+                       ON pm.path = fc.image_path AND pm.project_id = fc.project_id
+                WHERE fc.project_id = ? AND fc.id > ?
+                ORDER BY fc.id
+            """, (self.project_id, max_face_id))
+
+            while True:
+                fetched = cur.fetchmany(self._FETCH_CHUNK)
+                if not fetched:
+                    break
+                max_face_id = max(max_face_id, fetched[-1]['id'])
+
+                records = []
+                vecs = []
+                lines = []
+                for r in fetched:
+                    blob = r['embedding']
+                    if isinstance(blob, str):
+                        blob = blob.encode('latin1')
+                    if blob is None:
+                        skipped['no_embedding'].append(r['id'])
+                        continue
+                    if not blob:
+                        skipped['bad_embedding'].append(r['id'])
+                        continue
+                    if len(blob) != self.dim * 4:
+                        skipped['bad_size'].append(r['id'])
+                        continue
+                    vecs.append(blob)
+                    conf = r['confidence']
+                    records.append((
+                        r['id'],
+                        r['photo_id'] if r['photo_id'] is not None else -1,
+                        (r['bbox_x'] or 0, r['bbox_y'] or 0, r['bbox_w'] or 0, r['bbox_h'] or 0),
+                        conf if conf is not None else np.nan,
+                        is_screenshot_path(r['image_path']),
+                        bool(r['in_project']),
+                        (r['width'] or 0, r['height'] or 0),
+                    ))
+                    lines.append(json.dumps([r['crop_path'], r['image_path']]).encode('utf-8') + b'\n')
+                    if paths is not None:
+                        paths.append((r['crop_path'], r['image_path']))
+
+                if records:
+                    vec_f.write(b''.join(vecs))
+                    rec_f.write(np.array(records, dtype=FACE_RECORD_DTYPE).tobytes())
+                    str_f.write(b''.join(lines))
+                    written += len(records)
+
+            vec_f.flush()
+            rec_f.flush()
+            str_f.flush()
+            str_bytes = str_f.tell()
+
+        rejected = len(skipped['bad_embedding']) + len(skipped['bad_size'])
+        if rejected:
+            logger.warning(
+                f"[FaceEmbeddingMatrixStore] project={self.project_id}: skipped {rejected} faces "
+                f"whose embedding is not {self.dim} float32 values"
+            )
+        if written or max_face_id != meta['max_face_id']:
+            meta['rows'] += written
+            meta['max_face_id'] = max_face_id
+            meta['str_bytes'] = str_bytes
+            for reason, ids in skipped.items():
+                meta['skipped'][reason].extend(ids)
+            self._write_meta(meta)
+        return written
+
+    # ── Reads ──
+
+    def sync(self) -> FaceEmbeddingMatrixView:
+        """
+        Append new faces and return every live face of the project.
+
+        Live means what clustering has always loaded: faces with an embedding
+        whose photo is in photo_metadata and project_images.  Photo ids,
+        sizes and project membership are recorded when a face is appended;
+        a sync reads only the face_crops and photo_metadata ids (plus branch
+        keys) and re-resolves the few faces whose photo is gone or was never
+        found.  Faces saved after the append are left for the next sync.
+        Screenshot filtering is left to the caller (view.is_screenshot).
+        """
+        with self._lock:
+            meta = self._open_meta()
+            appended = self._append(meta)
+            crop_ids, branch_keys = self._current_faces(meta['max_face_id'])
+            records, vectors = self._map(meta)
+            rows = self._rows_of(records, crop_ids)
+            lost = (rows < 0) & ~self._skipped_mask(meta, crop_ids, self._SKIP_REASONS)
+            if lost.any():
+                # Faces at or below the watermark that were never appended:
+                # the database was replaced under the cache.  Start over.
+                logger.warning(
+                    f"[FaceEmbeddingMatrixStore] project={self.project_id}: "
+                    f"{int(lost.sum())} faces missing from the matrix, rebuilding"
+                )
+                del records, vectors
+                self.clear()
+                meta = self._open_meta()
+                appended = self._append(meta)
+                crop_ids, branch_keys = self._current_faces(meta['max_face_id'])
+                records, vectors = self._map(meta)
+                rows = self._rows_of(records, crop_ids)
+            found = rows >= 0
+
+            live = np.zeros(len(crop_ids), dtype=bool)
+            if records is not None:
+                photo_ids = self._photo_ids()
+                self._refresh_photos(meta, records, rows[found], photo_ids)
+                rec = records[rows[found]]
+                live[found] = (rec['in_project'] != 0) & np.isin(rec['photo_id'], photo_ids)
+
+            view = FaceEmbeddingMatrixView(
+                bad_embedding=int(self._skipped_mask(meta, crop_ids, ('bad_embedding',)).sum()),
+                bad_size=int(self._skipped_mask(meta, crop_ids, ('bad_size',)).sum()),
+                appended=appended, generation=meta['generation'], rows=meta['rows'],
+            )
+            live_rows = rows[live]
+            if len(live_rows):
+                rec = np.asarray(records[live_rows])
+                paths = self._load_paths(meta)
+                view.face_ids = rec['face_id']
+                view.photo_ids = rec['photo_id']
+                view.bboxes = rec['bbox']
+                view.confidences = rec['confidence']
+                view.is_screenshot = (rec['screenshot'] != 0) | np.isin(
+                    rec['photo_id'], self._screenshot_photo_ids())
+                view.image_sizes = rec['image_size'].astype(np.int64)
+                view.crop_paths = [paths[i][0] for i in live_rows.tolist()]
+                view.image_paths = [paths[i][1] for i in live_rows.tolist()]
+                view.branch_keys = [branch_keys[i] for i in np.flatnonzero(live).tolist()]
+                if len(live_rows) == meta['rows']:
+                    # Every row is live: hand out the memmap itself (zero copy)
+                    view.vectors = vectors
+                else:
+                    view.vectors = np.asarray(vectors[live_rows])
+
+            stale, self._stale_generations = self._stale_generations, []
+            for gen in stale:
+                if gen != meta['generation']:
+                    self._unlink_generation(gen)
+
+            dead = meta['rows'] - int(found.sum())
+            if dead and meta['rows'] >= self._COMPACT_MIN_ROWS \
+                    and dead / meta['rows'] >= self._COMPACT_DEAD_RATIO:
+                del records, vectors
+                self._compact(meta, crop_ids)
+
+        if appended:
+            logger.info(
+                f"[FaceEmbeddingMatrixStore] project={self.project_id}: appended {appended} faces "
+                f"(live={len(view)}, rows={view.rows})"
+            )
+        return view
+
+    def _current_faces(self, max_face_id: int):
+        """(ids, branch keys) of the project's faces up to the watermark, by id (index-only scan)."""
+        with self.db.get_connection(read_only=True) as conn:
+            rows = conn.execute(
+                "SELECT id, branch_key FROM face_crops WHERE project_id = ? AND id <= ?",
+                (self.project_id, max_face_id),
+            ).fetchall()
+        ids = np.fromiter((r['id'] for r in rows), dtype=np.int64, count=len(rows))
+        order = np.argsort(ids, kind='stable')
+        return ids[order], [rows[i]['branch_key'] for i in order.tolist()]
+
+    def _rows_of(self, records: Optional[np.ndarray], face_ids: np.ndarray) -> np.ndarray:
+        stored_ids = records['face_id'] if records is not None else np.empty(0, dtype=np.int64)
+        return self._find_rows(stored_ids, face_ids)
+
+    @staticmethod
+    def _skipped_mask(meta: Dict, face_ids: np.ndarray, reasons) -> np.ndarray:
+        """Which faces were skipped at append time for one of the given reasons."""
+        mask = np.zeros(len(face_ids), dtype=bool)
+        for reason in reasons:
+            mask |= np.isin(face_ids, np.asarray(meta['skipped'][reason], dtype=np.int64))
+        return mask
+
+    def _photo_ids(self) -> np.ndarray:
+        with self.db.get_connection(read_only=True) as conn:
+            return np.array([r['id'] for r in conn.execute(
+                "SELECT id FROM photo_metadata WHERE project_id = ?", (self.project_id,)
+            )], dtype=np.int64)
+
+    def _screenshot_photo_ids(self) -> np.ndarray:
+        """Photos search_asset_features flags as screenshots (a small set)."""
+        with self.db.get_connection(read_only=True) as conn:
+            return np.array([r['id'] for r in conn.execute("""
+                SELECT pm.id FROM search_asset_features saf
+                JOIN photo_metadata pm ON pm.path = saf.path AND pm.project_id = ?
+                WHERE saf.is_screenshot = 1
+            """, (self.project_id,))], dtype=np.int64)
+
+    def _refresh_photos(self, meta: Dict, records: np.ndarray, rows: np.ndarray, photo_ids: np.ndarray):
+        """
+        Re-resolve photo id, size and project membership of rows whose photo
+        is gone or was not found at append time (deleted and re-scanned
+        photos get a new id; a photo may reach project_images later).
+        """
+        rec = records[rows]
+        stale = (rec['photo_id'] < 0) | (rec['in_project'] == 0) | \
+            ~np.isin(rec['photo_id'], photo_ids)
+        stale_rows = rows[stale]
+        if len(stale_rows) == 0:
+            return
+
+        resolved = {}
+        face_ids = records['face_id'][stale_rows].tolist()
+        with self.db.get_connection(read_only=True) as conn:
+            for start in range(0, len(face_ids), self._ID_CHUNK):
+                chunk = face_ids[start:start + self._ID_CHUNK]
+                for r in conn.execute(f"""
+                    SELECT fc.id, pm.id AS photo_id, pm.width, pm.height,
+                           EXISTS (
+                               SELECT 1 FROM project_images pi
+                               WHERE pi.image_path = fc.image_path
+                                 AND pi.project_id = fc.project_id
+                           ) AS in_project
+                    FROM face_crops fc
+                    LEFT JOIN photo_metadata pm
+                           ON pm.path = fc.image_path AND pm.project_id = fc.project_id
+                    WHERE fc.id IN ({','.join('?' * len(chunk))})
+                """, chunk):
+                    resolved[r['id']] = (
+                        r['photo_id'] if r['photo_id'] is not None else -1,
+                        bool(r['in_project']), (r['width'] or 0, r['height'] or 0),
+                    )
+
+        writable, _ = self._map(meta, mode='r+')
+        for row, face_id in zip(stale_rows.tolist(), face_ids):
+            photo_id, in_project, size = resolved.get(face_id, (-1, False, (0, 0)))
+            writable['photo_id'][row] = photo_id
+            writable['in_project'][row] = in_project
+            writable['image_size'][row] = size
+        writable.flush()
+        del writable
+
+    def get_vectors(self, face_ids: Iterable[int]) -> Dict[int, np.ndarray]:
+        """
+        Embeddings of the given faces (face id -> float32 vector).
+
+        Faces without a usable embedding are absent from the result.
+        """
+        wanted = np.unique(np.fromiter((int(f) for f in face_ids), dtype=np.int64))
+        if len(wanted) == 0:
+            return {}
+        with self._lock:
+            meta = self._open_meta()
+            if wanted[-1] > meta['max_face_id']:
+                self._append(meta)
+            records, vectors = self._map(meta)
+            if records is None:
+                return {}
+            rows = self._find_rows(records['face_id'], wanted)
+            found = rows >= 0
+            block = np.asarray(vectors[rows[found]])
+        return {int(fid): block[i] for i, fid in enumerate(wanted[found].tolist())}
+
+    # ── Compaction ──
+
+    def _compact(self, meta: Dict, existing: np.ndarray):
+        """
+        Rewrite the rows of faces still in face_crops into a new generation.
+
+        Faces that are merely not live (photo left project_images, say) are
+        kept: the id watermark would never bring them back.
+
+        Args:
+            existing: Sorted ids of the project's faces up to the watermark
+        """
+        records, vectors = self._map(meta)
+        live_rows = self._find_rows(records['face_id'], existing)
+        live_rows = live_rows[live_rows >= 0]
+        dropped = meta['rows'] - len(live_rows)
+        if dropped == 0:
+            return
+
+        paths = self._load_paths(meta)
+        old_gen = meta['generation']
+        new_gen = old_gen + 1
+        with open(self._vec_path(new_gen), 'wb') as vec_f:
+            for start in range(0, len(live_rows), 8192):
+                vec_f.write(np.asarray(vectors[live_rows[start:start + 8192]]).tobytes())
+        np.asarray(records[live_rows]).tofile(self._rec_path(new_gen))
+        kept_paths = [paths[i] for i in live_rows.tolist()]
+        with open(self._str_path(new_gen), 'wb') as str_f:
+            str_f.write(b''.join(json.dumps(list(p)).encode('utf-8') + b'\n' for p in kept_paths))
+            str_bytes = str_f.tell()
+        del records, vectors
+
+        meta['generation'] = new_gen
+        meta['rows'] = int(len(live_rows))
+        meta['str_bytes'] = str_bytes
+        meta['skipped'] = {reason: np.asarray(ids, dtype=np.int64)[np.isin(ids, existing)].tolist()
+                           for reason, ids in meta['skipped'].items()}
+        self._write_meta(meta)
+        self._paths = (new_gen, kept_paths)
+        # Outstanding views may still map the old generation (and Windows
+        # refuses to unlink mapped files) - remove it on the next sync.
+        self._stale_generations.append(old_gen)
+        logger.info(
+            f"[FaceEmbeddingMatrixStore] Compacted project={self.project_id}: "
+            f"dropped {dropped} rows, generation {old_gen} -> {new_gen}"
+        )
+
+    def _unlink_generation(self, generation: int):
+        for path in self._generation_paths(generation):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"[FaceEmbeddingMatrixStore] Could not remove {path}: {e}")
+                self._stale_generations.append(generation)
+                return
+
+    def _sweep_orphans(self, current_generation: int):
+        """Remove generations left behind by a previous process."""
+        self._swept = True
+        prefix = os.path.basename(self._stem) + ".g"
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            gen = name[len(prefix):].split('.', 1)[0]
+            if gen.isdigit() and int(gen) != current_generation:
+                self._unlink_generation(int(gen))
+
+    def clear(self):
+        """Delete all files for this project (next use rebuilds)."""
+        with self._lock:
+            meta = self._load_meta()
+            if meta is not None:
+                self._unlink_generation(meta['generation'])
+            try:
+                os.remove(self.meta_path)
+            except FileNotFoundError:
+                pass
+            self._paths = None
+
+
+# Per-project store registry
+_stores: Dict[int, FaceEmbeddingMatrixStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_face_embedding_matrix_store(project_id: int) -> FaceEmbeddingMatrixStore:
+    """Get the shared FaceEmbeddingMatrixStore for a project."""
+    with _stores_lock:
+        store = _stores.get(project_id)
+        if store is None:
+            store = FaceEmbeddingMatrixStore(project_id)
+            _stores[project_id] = store
+        return store
@@ -25,7 +25,10 @@ import os
 from collections import Counter
 from typing import List, Dict, Tuple, Optional, Any
 
+import numpy as np
+
 from logging_config import get_logger
+from services.project_meta_store import ProjectMetaStore, count_with_faces
 from services.document_evidence_evaluator import (
     DocumentEvidenceEvaluator,
     DOC_NATIVE_EXTENSIONS as _DOC_NATIVE_EXTENSIONS,
@@ -208,10 +211,7 @@ class GateEngine:
         # edge cases where face data is nearly absent (<1%) for non-preset queries.
         if require_faces or min_face_count > 0:
             total_photos = len(project_meta) if project_meta else 0
-            face_photo_count = sum(
-                1 for m in project_meta.values()
-                if (m.get("face_count", 0) or 0) > 0
-            ) if project_meta else 0
+            face_photo_count = count_with_faces(project_meta) if project_meta else 0
             face_coverage = face_photo_count / total_photos if total_photos > 0 else 0
             if face_coverage < 0.01 and total_photos > 0:
                 logger.info(
@@ -232,23 +232,29 @@ class GateEngine:
 
         dropped = Counter()
         kept: list = []
+        kept_rows: List[int] = []
+
+        # Meta of each result (exact path, then normalized path - Bug B fix)
+        # and the columns the simple gates need, evaluated for all results at once
+        rows = _ResultMeta([r.path for r in scored], project_meta)
+        face_count = rows.face_count
+        w, h = rows.width, rows.height
+        simple_gates = (
+            ("exclude_screenshot", exclude_screenshots, rows.is_screenshot),
+            ("exclude_faces", exclude_faces, face_count > 0),
+            ("require_faces", require_faces, face_count == 0),
+            ("min_face_count", min_face_count > 0, face_count < min_face_count),
+            ("require_gps", require_gps, ~rows.has_gps),
+            # Unknown dimensions (-1) never fail the edge gate
+            ("min_edge_size", min_edge > 0, (w >= 0) & (h >= 0) & (np.minimum(w, h) < min_edge)),
+        )
+        first_failed = np.full(len(scored), -1, dtype=np.int8)
+        for k, (_, active, failed) in enumerate(simple_gates):
+            if active:
+                first_failed[(first_failed < 0) & failed] = k
+        first_failed = first_failed.tolist()
 
-        # Build normalized-path → meta lookup for Bug B fix
-        _norm_meta: Dict[str, Dict] = {}
-        for mp, mv in project_meta.items():
-            _norm_meta[os.path.normpath(mp).lower()] = mv
-
-        for r in scored:
-            # Try exact match first, then normalized match
-            meta = project_meta.get(r.path, {})
-            if not meta:
-                norm_key = os.path.normpath(r.path).lower()
-                meta = _norm_meta.get(norm_key, {})
-
-            is_screenshot = bool(meta.get("is_screenshot", False))
-            face_count = int(meta.get("face_count") or 0)
-            has_gps = bool(meta.get("has_gps", False))
-
+        for i, r in enumerate(scored):
             # Gate: require screenshot (strict flag or semantic supplement hit)
             if require_screenshot:
                 # We allow it to pass if it has the explicit metadata flag
@@ -261,52 +267,20 @@ class GateEngine:
                 if builder_evidence and self._rescue_screenshot_result_from_builder_evidence(r, builder_evidence):
                     rescued = True
 
-                if not rescued and not self._passes_screenshot_gate(meta) and screenshot_score < 0.20:
+                if not rescued and not self._passes_screenshot_gate(rows.meta(i)) and screenshot_score < 0.20:
                     dropped["require_screenshot"] += 1
                     continue
                 logger.debug(
                     f"[GateEngine] Screenshot PASS: {os.path.basename(r.path)} "
-                    f"is_screenshot={is_screenshot} score={r.final_score:.4f} rescued={rescued}"
+                    f"is_screenshot={bool(rows.is_screenshot[i])} score={r.final_score:.4f} rescued={rescued}"
                 )
 
-            # Gate: exclude screenshots
-            if exclude_screenshots and is_screenshot:
-                dropped["exclude_screenshot"] += 1
+            # Gates: exclude screenshots / exclude faces / require faces /
+            # minimum face count / require GPS / minimum edge size
+            if first_failed[i] >= 0:
+                dropped[simple_gates[first_failed[i]][0]] += 1
                 continue
 
-            # Gate: exclude faces
-            if exclude_faces and face_count > 0:
-                dropped["exclude_faces"] += 1
-                continue
-
-            # Gate: require faces present
-            if require_faces and face_count == 0:
-                dropped["require_faces"] += 1
-                continue
-
-            # Gate: minimum face count
-            if min_face_count > 0 and face_count < min_face_count:
-                dropped["min_face_count"] += 1
-                continue
-
-            # Gate: require GPS
-            if require_gps and not has_gps:
-                dropped["require_gps"] += 1
-                continue
-
-            # Gate: minimum edge size
-            if min_edge > 0:
-                w = meta.get("width")
-                h = meta.get("height")
-                try:
-                    w = int(w) if w is not None else None
-                    h = int(h) if h is not None else None
-                except (TypeError, ValueError):
-                    w, h = None, None
-                if w is not None and h is not None and min(w, h) < min_edge:
-                    dropped["min_edge_size"] += 1
-                    continue
-
             # Gate: strict document signal (extension-aware)
             if require_doc_signal:
                 # Check for rescue via builder evidence (DocumentCandidateBuilder low-confidence)
@@ -314,13 +288,13 @@ class GateEngine:
                 if builder_evidence and self._rescue_document_result_from_builder_evidence(r, builder_evidence):
                     rescued = True
 
-                if not rescued and not self._passes_document_gate(meta, r.path):
+                if not rescued and not self._passes_document_gate(rows.meta(i), r.path):
                     dropped["require_document_signal"] += 1
                     continue
 
             # Gate: pets precision (no faces, no screenshots)
             if is_pets:
-                if not self._passes_pets_gate(meta):
+                if not self._passes_pets_gate(rows.meta(i)):
                     dropped["pets_precision_gate"] += 1
                     continue
 
@@ -332,7 +306,7 @@ class GateEngine:
                     or evidence.get("doc_extension")
                     or evidence.get("structural_hit")
                     or evidence.get("low_confidence_admit")
-                    or self._passes_document_gate(meta, r.path)
+                    or self._passes_document_gate(rows.meta(i), r.path)
                 ):
                     logger.warning(
                         f"[GateEngine] DOCUMENT_SURVIVOR_ANOMALY: "
@@ -340,6 +314,7 @@ class GateEngine:
                     )
 
             kept.append(r)
+            kept_rows.append(i)
 
         if dropped:
             logger.info(
@@ -350,16 +325,76 @@ class GateEngine:
         # Log gate survivors for debugging
         if (require_screenshot or exclude_screenshots or exclude_faces
                 or require_doc_signal or is_pets) and kept:
-            for k in kept[:5]:
-                kmeta = project_meta.get(k.path, {})
-                if not kmeta:
-                    kmeta = _norm_meta.get(os.path.normpath(k.path).lower(), {})
+            for k, i in zip(kept[:5], kept_rows):
                 logger.debug(
                     f"[GateEngine] Survivor: {os.path.basename(k.path)} "
-                    f"is_screenshot={kmeta.get('is_screenshot')} "
-                    f"face_count={kmeta.get('face_count', 0)} "
+                    f"is_screenshot={rows.meta(i).get('is_screenshot')} "
+                    f"face_count={rows.meta(i).get('face_count', 0)} "
                     f"ext={os.path.splitext(k.path)[1].lower()} "
                     f"score={k.final_score:.4f}"
                 )
 
         return kept, dict(dropped)
+
+
+class _ResultMeta:
+    """
+    Meta rows of a scored result list plus the columns the simple gates use.
+
+    For a ProjectMetaStore the columns are gathered from its arrays and meta
+    dicts are only built for results that reach a dict-based gate. For a
+    {path: meta} dict the columns are built from the dicts, and the
+    normalized-path index is only built when an exact lookup misses.
+    """
+
+    def __init__(self, paths: List[str], project_meta):
+        if isinstance(project_meta, ProjectMetaStore):
+            self._store = project_meta
+            self._pos = project_meta.positions(paths, normalize=True)
+            self._metas: Dict[int, dict] = {}
+            self.is_screenshot = project_meta.column("is_screenshot", self._pos)
+            self.face_count = project_meta.column("face_count", self._pos)
+            self.has_gps = project_meta.column("has_gps", self._pos)
+            self.width = project_meta.column("width", self._pos)
+            self.height = project_meta.column("height", self._pos)
+            return
+
+        self._store = None
+        norm_meta: Optional[Dict[str, Dict]] = None
+        metas = []
+        for path in paths:
+            # Try exact match first, then normalized match
+            meta = project_meta.get(path, {})
+            if not meta:
+                if norm_meta is None:
+                    norm_meta = {os.path.normpath(mp).lower(): mv for mp, mv in project_meta.items()}
+                meta = norm_meta.get(os.path.normpath(path).lower(), {})
+            metas.append(meta)
+        self._metas = dict(enumerate(metas))
+
+        dims = [self._dimensions(m) for m in metas]
+        self.is_screenshot = np.array([bool(m.get("is_screenshot", False)) for m in metas], dtype=bool)
+        self.face_count = np.array([int(m.get("face_count") or 0) for m in metas], dtype=np.int64)
+        self.has_gps = np.array([bool(m.get("has_gps", False)) for m in metas], dtype=bool)
+        self.width = np.array([d[0] for d in dims], dtype=np.int64)
+        self.height = np.array([d[1] for d in dims], dtype=np.int64)
+
+    def meta(self, i: int) -> dict:
+        meta = self._metas.get(i)
+        if meta is None:
+            pos = int(self._pos[i])
+            meta = self._store.row_at(pos) if pos >= 0 else {}
+            self._metas[i] = meta
+        return meta
+
+    @staticmethod
+    def _dimensions(meta: dict) -> Tuple[int, int]:
+        """(width, height) as ints, -1 when unknown."""
+        w = meta.get("width")
+        h = meta.get("height")
+        try:
+            w = int(w) if w is not None else -1
+            h = int(h) if h is not None else -1
+        except (TypeError, ValueError):
+            w, h = -1, -1
+        return w, h
@@ -3,6 +3,8 @@
 
 This service provides reverse geocoding functionality using OpenStreetMap's
 Nominatim API. It includes:
+- Offline lookups from a local gazetteer before any API call
+  (services/offline_geocoder.py)
 - Rate limiting (1 req/sec as per Nominatim usage policy)
 - Automatic caching to minimize API calls
 - Graceful error handling
@@ -24,6 +26,8 @@ import json
 from typing import Optional
 from threading import Lock
 
+from services.offline_geocoder import OfflineGeocoder, dedupe_coordinates, get_offline_geocoder
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +36,7 @@ class GeocodingService:
     Reverse geocoding service using OpenStreetMap Nominatim API.
 
     Features:
+    - Offline gazetteer lookups, Nominatim only for coordinates they miss
     - Automatic rate limiting (1 request per second)
     - Cache integration to minimize API calls
     - Formatted location names (City, State/Region, Country)
@@ -59,14 +64,21 @@ class GeocodingService:
     OFFLINE_BACKOFF_INITIAL_SECONDS = 30.0  # Initial backoff after first failure
     OFFLINE_BACKOFF_MAX_SECONDS = 300.0      # Max backoff (5 minutes)
 
-    def __init__(self, use_cache: bool = True):
+    # Batch geocoding: coordinates equal to this many decimals are resolved once
+    DEFAULT_DEDUP_PRECISION = 3  # ≈ 110 m
+
+    def __init__(self, use_cache: bool = True, offline_geocoder: Optional[OfflineGeocoder] = None):
         """
         Initialize geocoding service.
 
         Args:
             use_cache: Whether to use database cache (default: True)
+            offline_geocoder: Gazetteer geocoder to try before the API
+                (default: the shared one from settings, if a gazetteer is installed)
         """
         self.use_cache = use_cache
+        self._offline_geocoder = offline_geocoder
+        self._offline_geocoder_resolved = offline_geocoder is not None
         self._last_request_time = 0.0
         self._rate_limit_lock = Lock()
 
@@ -121,6 +133,13 @@ class GeocodingService:
                 logger.debug(f"[GeocodingService] Cache hit: ({latitude:.4f}, {longitude:.4f}) → {cached}")
                 return cached
 
+        # Local gazetteer before the rate-limited API
+        offline_name = self._reverse_geocode_offline([(latitude, longitude)])[0]
+        if offline_name:
+            if self.use_cache:
+                self._cache_location(latitude, longitude, offline_name)
+            return offline_name
+
         # Make API request
         try:
             location_name = self._fetch_from_api(latitude, longitude, language)
@@ -331,36 +350,93 @@ class GeocodingService:
         return state_abbrev.get(state, state)
 
     def batch_reverse_geocode(self, coordinates: list[tuple[float, float]],
-                             progress_callback=None) -> dict[tuple[float, float], str]:
+                             progress_callback=None,
+                             precision: Optional[int] = None) -> dict[tuple[float, float], str]:
         """
-        Reverse geocode multiple coordinates with rate limiting.
+        Reverse geocode multiple coordinates.
+
+        Coordinates equal to ``precision`` decimals are resolved once. The
+        unique coordinates are looked up in the local gazetteer in a single
+        query (results are written to the location cache); only the misses
+        go through reverse_geocode(), i.e. the cache and the rate-limited API.
 
         Args:
             coordinates: List of (latitude, longitude) tuples
-            progress_callback: Optional callback(current, total, location_name)
+            progress_callback: Optional callback(current, total, location_name),
+                called once per unique coordinate
+            precision: De-duplication precision in decimal places
+                (default: gps_geocode_dedup_precision setting)
 
         Returns:
             Dict mapping (lat, lon) to location name
         """
-        results = {}
-        total = len(coordinates)
+        if precision is None:
+            precision = self._get_dedup_precision()
 
-        logger.info(f"[GeocodingService] Batch geocoding {total} locations...")
+        valid = [(lat, lon) for lat, lon in coordinates if self._validate_coordinates(lat, lon)]
+        unique, inverse = dedupe_coordinates(valid, precision)
+        total = len(unique)
 
-        for i, (lat, lon) in enumerate(coordinates, 1):
-            location = self.reverse_geocode(lat, lon)
-            results[(lat, lon)] = location
+        logger.info(f"[GeocodingService] Batch geocoding {len(coordinates)} coordinates "
+                    f"({total} unique at {precision} decimals)...")
+
+        names = self._reverse_geocode_offline(unique)
+        offline_hits = [(lat, lon, name) for (lat, lon), name in zip(unique, names) if name]
+        if offline_hits and self.use_cache:
+            self._cache_locations(offline_hits)
+        logger.info(f"[GeocodingService] Offline gazetteer resolved {len(offline_hits)}/{total} locations")
+
+        for i, ((lat, lon), name) in enumerate(zip(unique, names), 1):
+            if name is None:
+                name = self.reverse_geocode(lat, lon)
+                names[i - 1] = name
 
             if progress_callback:
-                progress_callback(i, total, location)
+                progress_callback(i, total, name)
 
             # Log progress every 10 items
             if i % 10 == 0 or i == total:
                 logger.info(f"[GeocodingService] Progress: {i}/{total} ({i*100//total}%)")
 
+        results = {coord: None for coord in coordinates}
+        for coord, u in zip(valid, inverse.tolist()):
+            results[coord] = names[u]
+
         logger.info(f"[GeocodingService] Batch complete: {len(results)} locations geocoded")
         return results
 
+    def _get_offline_geocoder(self) -> Optional[OfflineGeocoder]:
+        """Offline geocoder in use (resolved from settings on first call)."""
+        if not self._offline_geocoder_resolved:
+            self._offline_geocoder = get_offline_geocoder()
+            self._offline_geocoder_resolved = True
+        return self._offline_geocoder
+
+    def _reverse_geocode_offline(self, coordinates: list[tuple[float, float]]) -> list[Optional[str]]:
+        """
+        Look coordinates up in the local gazetteer.
+
+        Returns:
+            Location name per coordinate, None where the gazetteer has no
+            place within range (or no gazetteer is installed)
+        """
+        geocoder = self._get_offline_geocoder()
+        if geocoder is None or not coordinates:
+            return [None] * len(coordinates)
+        try:
+            return geocoder.reverse_geocode_batch(coordinates)
+        except Exception as e:
+            logger.warning(f"[GeocodingService] Offline lookup failed: {e}")
+            return [None] * len(coordinates)
+
+    def _get_dedup_precision(self) -> int:
+        """Batch de-duplication precision from settings."""
+        try:
+            from settings_manager_qt import SettingsManager
+            return int(SettingsManager().get("gps_geocode_dedup_precision", self.DEFAULT_DEDUP_PRECISION))
+        except Exception:
+            return self.DEFAULT_DEDUP_PRECISION
+
     def _fetch_from_api(self, latitude: float, longitude: float, language: str = 'en') -> Optional[str]:
         """
         Fetch location name from Nominatim API with rate limiting.
@@ -542,6 +618,21 @@ class GeocodingService:
         except Exception as e:
             logger.warning(f"[GeocodingService] Cache write failed: {e}")
 
+    def _cache_locations(self, entries: list[tuple[float, float, str]]):
+        """
+        Cache many location names in one database write.
+
+        Args:
+            entries: (latitude, longitude, location_name) tuples
+        """
+        try:
+            from reference_db import ReferenceDB
+            db = ReferenceDB()
+            db.cache_location_names(entries)
+            logger.debug(f"[GeocodingService] Cached {len(entries)} locations")
+        except Exception as e:
+            logger.warning(f"[GeocodingService] Cache write failed: {e}")
+
     @staticmethod
     def _validate_coordinates(latitude: float, longitude: float) -> bool:
         """
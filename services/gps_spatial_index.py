@@ -0,0 +1,211 @@
+# services/gps_spatial_index.py
+# Grid-bucketed spatial index for GPS location clustering
+# Used by ReferenceDB.get_photos_by_location / get_location_clusters /
+# create_location_branch and kept current by the GPS write paths
+# ------------------------------------------------------
+
+"""
+GPS Spatial Index
+
+Every geotagged photo_metadata row carries a ``gps_cell``: the id of the
+0.01 x 0.01 degree grid cell its coordinates fall in (row-major, rows from
+the south pole, columns from the antimeridian). The cell is written with the
+coordinates (scan upserts, update_photo_gps) and backfilled in SQL for rows
+that predate the column.
+
+Location clustering coarsens those cells into buckets at least one radius
+tall and compares each new cluster seed only against photos in the buckets
+its search cap can reach, with a vectorized haversine. The result is
+identical to the original greedy pass: photos are visited in (lat, lon)
+order and join the first cluster whose seed is within radius_km, otherwise
+they seed a new cluster.
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Fine grid persisted in photo_metadata.gps_cell
+GRID_SCALE = 100                       # cells per degree
+GRID_COLS = 360 * GRID_SCALE
+_MAX_ROW = 180 * GRID_SCALE            # lat = +90 lands in its own row
+
+_BOX_PAD = 1.0 + 1e-9
+
+# SQL expression computing gps_cell from the coordinate columns; must stay
+# in step with gps_cell() (same float arithmetic, CAST truncates like int())
+GPS_CELL_SQL = (
+    f"(CAST((gps_latitude + 90.0) * {GRID_SCALE} AS INTEGER) * {GRID_COLS} "
+    f"+ MIN(CAST((gps_longitude + 180.0) * {GRID_SCALE} AS INTEGER), {GRID_COLS - 1}))"
+)
+
+
+def gps_cell(latitude: Optional[float], longitude: Optional[float]) -> Optional[int]:
+    """Grid cell id of a coordinate, or None when either value is missing/out of range."""
+    if latitude is None or longitude is None:
+        return None
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        return None
+    row = int((latitude + 90.0) * GRID_SCALE)
+    col = min(int((longitude + 180.0) * GRID_SCALE), GRID_COLS - 1)
+    return row * GRID_COLS + col
+
+
+def gps_cells(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Vectorized gps_cell() for in-range coordinates."""
+    rows = ((np.asarray(latitudes, dtype=np.float64) + 90.0) * GRID_SCALE).astype(np.int64)
+    cols = ((np.asarray(longitudes, dtype=np.float64) + 180.0) * GRID_SCALE).astype(np.int64)
+    return rows * GRID_COLS + np.minimum(cols, GRID_COLS - 1)
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Distance in km from one point to many (same formula as ReferenceDB._haversine_distance)."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _search_box(lat: float, radius_km: float) -> Tuple[float, Optional[float]]:
+    """
+    (lat half-height, lon half-width) in degrees of the cap around a point.
+
+    The lon half-width is None when the cap reaches a pole (every longitude).
+    The box is padded by a hair so haversine rounding at exactly radius_km
+    cannot fall outside it.
+    """
+    ang = radius_km / EARTH_RADIUS_KM * _BOX_PAD
+    dlat = math.degrees(ang)
+    if abs(lat) + dlat >= 90.0 or ang >= math.pi / 2:
+        return dlat, None
+    dlon = math.degrees(math.asin(min(1.0, math.sin(ang) / math.cos(math.radians(lat)))))
+    return dlat, dlon
+
+
+def _col_spans(lon: float, dlon: Optional[float]) -> List[Tuple[int, int]]:
+    """Inclusive fine-grid column spans covering lon +/- dlon (split at the antimeridian)."""
+    if dlon is None:
+        return [(0, GRID_COLS - 1)]
+    col_lo = int(math.floor((lon - dlon + 180.0) * GRID_SCALE))
+    col_hi = int(math.floor((lon + dlon + 180.0) * GRID_SCALE))
+    if col_hi - col_lo + 1 >= GRID_COLS:
+        return [(0, GRID_COLS - 1)]
+    if col_lo < 0:
+        return [(0, col_hi), (col_lo + GRID_COLS, GRID_COLS - 1)]
+    if col_hi >= GRID_COLS:
+        return [(col_lo, GRID_COLS - 1), (0, col_hi - GRID_COLS)]
+    return [(col_lo, col_hi)]
+
+
+def cell_ranges(lat: float, lon: float, radius_km: float,
+                max_ranges: int = 200) -> List[Tuple[int, int]]:
+    """
+    Inclusive gps_cell ranges covering every point within radius_km of (lat, lon).
+
+    One range per grid row (two where the box crosses the antimeridian),
+    for ``gps_cell BETWEEN ? AND ?`` prefilters. The ranges may include
+    cells outside the radius; callers still check the distance.
+    """
+    lat = min(90.0, max(-90.0, lat))
+    lon = min(180.0, max(-180.0, lon))
+    dlat, dlon = _search_box(lat, radius_km)
+    row_lo = max(0, int((lat - dlat + 90.0) * GRID_SCALE))
+    row_hi = min(_MAX_ROW, int((lat + dlat + 90.0) * GRID_SCALE))
+
+    spans = _col_spans(lon, dlon)
+    ranges = sorted((row * GRID_COLS + lo, row * GRID_COLS + hi)
+                    for row in range(row_lo, row_hi + 1) for lo, hi in spans)
+
+    # Join ranges that touch (full-width rows, antimeridian wrap)
+    merged = [ranges[0]]
+    for lo, hi in ranges[1:]:
+        if lo <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(hi, merged[-1][1]))
+        else:
+            merged.append((lo, hi))
+
+    # Very large radii: one covering range keeps the SQL parameter count small
+    if len(merged) > max_ranges:
+        return [(merged[0][0], merged[-1][1])]
+    return merged
+
+
+def cluster_by_proximity(latitudes: Sequence[float], longitudes: Sequence[float],
+                         radius_km: float, cells: Optional[Sequence[Optional[int]]] = None) -> np.ndarray:
+    """
+    Greedy seed clustering of photos given in (lat, lon) order.
+
+    Each photo joins the earliest-created cluster whose seed (first photo)
+    is within radius_km, otherwise it seeds a new cluster.
+
+    Args:
+        latitudes: Photo latitudes, in processing order
+        longitudes: Photo longitudes, same order
+        radius_km: Clustering radius
+        cells: Optional persisted gps_cell per photo (None entries are computed)
+
+    Returns:
+        (n,) int64 array: index of each photo's seed photo (clusters are
+        numbered by their seed, so ascending labels = creation order)
+    """
+    lat = np.asarray(latitudes, dtype=np.float64)
+    lon = np.asarray(longitudes, dtype=np.float64)
+    n = len(lat)
+    labels = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return labels
+
+    # Bucketing works on clamped coordinates so stray out-of-range values
+    # still land in (and find) their own bucket; distances use the raw ones
+    lat_c = np.clip(lat, -90.0, 90.0)
+    lon_c = np.clip(lon, -180.0, 180.0)
+    if cells is None:
+        fine = gps_cells(lat_c, lon_c)
+    else:
+        fine = np.array([-1 if c is None else c for c in cells], dtype=np.int64)
+        missing = fine < 0
+        if missing.any():
+            fine[missing] = gps_cells(lat_c[missing], lon_c[missing])
+
+    # Buckets of f x f fine cells, at least one radius tall
+    dlat_deg, _ = _search_box(0.0, radius_km)
+    f = max(1, int(math.ceil(dlat_deg * GRID_SCALE)))
+    bucket_cols = -(-GRID_COLS // f)
+    bucket_rows = _MAX_ROW // f + 1
+    brow = (fine // GRID_COLS) // f
+    bucket = brow * bucket_cols + (fine % GRID_COLS) // f
+
+    order = np.argsort(bucket, kind='stable')
+    uniq, starts, counts = np.unique(bucket[order], return_index=True, return_counts=True)
+    members = {
+        b: order[s:s + c]
+        for b, s, c in zip(uniq.tolist(), starts.tolist(), counts.tolist())
+    }
+
+    lat_list = lat_c.tolist()
+    lon_list = lon_c.tolist()
+    brow_list = brow.tolist()
+    for i in range(n):
+        if labels[i] >= 0:
+            continue
+
+        # Photo i seeds a new cluster: claim every unclustered photo in reach
+        _, dlon = _search_box(lat_list[i], radius_km)
+        rows = range(max(0, brow_list[i] - 1), min(bucket_rows - 1, brow_list[i] + 1) + 1)
+        cols = set()
+        for lo, hi in _col_spans(lon_list[i], dlon):
+            cols.update(range(lo // f, hi // f + 1))
+
+        parts = [members[key] for key in (r * bucket_cols + c for r in rows for c in cols) if key in members]
+        candidates = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        candidates = candidates[labels[candidates] < 0]
+        near = haversine_km(lat[i], lon[i], lat[candidates], lon[candidates]) <= radius_km
+        labels[candidates[near]] = i
+        labels[i] = i
+
+    return labels
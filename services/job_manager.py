@@ -17,6 +17,7 @@ Key Principles:
 Architecture:
     JobManager (singleton)
     ├── WorkerPool (QThreadPool)
+    ├── Scheduler (per-resource-class concurrency + memory budgets)
     ├── ActiveJobs (tracking running workers)
     ├── Signals (progress, partial_results, completed)
     └── Database (ml_job table via JobService)
@@ -104,6 +105,107 @@ class JobStatus:
     CANCELED = 'canceled'
 
 
+class ResourceClass:
+    """
+    What a job mostly contends for.
+
+    Each class has its own concurrency and memory budget, so a face scan,
+    a CLIP embedding run and a hash backfill don't all saturate the same
+    resource at once.
+    """
+    CPU = 'cpu'    # Model inference (faces, CLIP embeddings)
+    DISK = 'disk'  # File reads (library scan, perceptual hashing)
+    DB = 'db'      # Database-heavy writes (clustering, grouping, post-scan)
+
+
+# Resource class per job type; unknown types are treated as CPU-heavy
+JOB_RESOURCE_CLASSES: Dict[str, str] = {
+    JobType.SCAN: ResourceClass.DISK,
+    JobType.FACE_SCAN: ResourceClass.CPU,
+    JobType.FACE_EMBED: ResourceClass.CPU,
+    JobType.FACE_CLUSTER: ResourceClass.DB,
+    JobType.FACE_PIPELINE: ResourceClass.CPU,
+    JobType.EMBEDDING: ResourceClass.CPU,
+    'embed': ResourceClass.CPU,
+    'semantic_embedding': ResourceClass.CPU,
+    JobType.DUPLICATE_HASH: ResourceClass.DISK,
+    JobType.DUPLICATE_GROUP: ResourceClass.DB,
+    JobType.POST_SCAN: ResourceClass.DB,
+    JobType.MODEL_WARMUP: ResourceClass.CPU,
+}
+
+# Estimated peak memory per job type (MB), checked against the budgets
+JOB_MEMORY_MB: Dict[str, int] = {
+    JobType.SCAN: 300,
+    JobType.FACE_SCAN: 1500,
+    JobType.FACE_EMBED: 1000,
+    JobType.FACE_CLUSTER: 800,
+    JobType.FACE_PIPELINE: 2000,
+    JobType.EMBEDDING: 2500,
+    'embed': 2500,
+    'semantic_embedding': 2500,
+    JobType.DUPLICATE_HASH: 500,
+    JobType.DUPLICATE_GROUP: 500,
+    JobType.POST_SCAN: 300,
+    JobType.MODEL_WARMUP: 1500,
+}
+DEFAULT_JOB_MEMORY_MB = 1000
+
+# Free system memory kept out of reach of background jobs (needs psutil)
+MEMORY_RESERVE_MB = 1024
+
+# Running jobs allowed while the user is scrolling/clicking (CRITICAL jobs exempt)
+USER_ACTIVE_MAX_WORKERS = 1
+
+
+@dataclass
+class ResourceBudget:
+    """Concurrency and memory limits of one resource class."""
+    max_concurrent: int
+    memory_mb: int
+
+
+def default_resource_budgets() -> Dict[str, ResourceBudget]:
+    """One job per class at a time; inference gets the largest memory share."""
+    return {
+        ResourceClass.CPU: ResourceBudget(max_concurrent=1, memory_mb=3000),
+        ResourceClass.DISK: ResourceBudget(max_concurrent=1, memory_mb=1024),
+        ResourceClass.DB: ResourceBudget(max_concurrent=1, memory_mb=1024),
+    }
+
+
+def resource_class_for(job_type: str) -> str:
+    """Resource class of a job type."""
+    return JOB_RESOURCE_CLASSES.get(job_type, ResourceClass.CPU)
+
+
+def job_memory_mb(job_type: str) -> int:
+    """Estimated peak memory of a job type in MB."""
+    return JOB_MEMORY_MB.get(job_type, DEFAULT_JOB_MEMORY_MB)
+
+
+def _available_memory_mb() -> Optional[float]:
+    """Free system memory minus MEMORY_RESERVE_MB, or None without psutil."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024) - MEMORY_RESERVE_MB
+    except ImportError:
+        return None
+    except Exception as e:
+        logger.debug(f"[JobManager] Could not read system memory: {e}")
+        return None
+
+
+def _parse_queued_at(created_at: Optional[str]) -> Optional[float]:
+    """ml_job.created_at (local ISO timestamp) as epoch seconds."""
+    if not created_at:
+        return None
+    try:
+        return datetime.fromisoformat(created_at).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
 @dataclass
 class JobProgress:
     """Progress information for a job."""
@@ -144,6 +246,11 @@ class ActiveJob:
     total: int = 0
     paused: bool = False
     cancel_requested: bool = False
+    # Scheduling: resource class, estimated memory and time spent queued
+    resource_class: str = ResourceClass.CPU
+    memory_mb: int = 0
+    queued_at: float = 0.0
+    queue_wait: float = 0.0
     # Stored (signal, slot) pairs for deterministic disconnect on cleanup
     _connections: List[tuple] = field(default_factory=list)
 
@@ -188,14 +295,84 @@ class JobManagerSignals(QObject):
     active_jobs_changed = Signal(int)
 
 
+def select_runnable_job(
+    queued: List[Job],
+    active_jobs: List[ActiveJob],
+    budgets: Dict[str, ResourceBudget],
+    max_workers: int,
+    user_active: bool = False,
+    available_memory_mb: Optional[float] = None,
+) -> Optional[Job]:
+    """
+    Pick the first queued job (in priority order) that can start now.
+
+    A job may start when:
+    - fewer than max_workers jobs run (USER_ACTIVE_MAX_WORKERS while the
+      user is interacting, unless the job is CRITICAL)
+    - its resource class runs fewer than budget.max_concurrent jobs
+    - its memory estimate fits the class memory budget and free system
+      memory; a class with nothing running (or an idle manager) always
+      admits one job, so oversized jobs cannot wait forever
+
+    A job held back by its class does not hold up jobs of other classes.
+
+    Args:
+        queued: Queued jobs, highest priority first
+        active_jobs: Running, paused and tracked jobs
+        budgets: Budget per resource class
+        max_workers: Overall concurrent job limit
+        user_active: Whether the user is currently interacting
+        available_memory_mb: Free system memory for jobs (None = unknown)
+
+    Returns:
+        Job to start, or None
+    """
+    running = [a for a in active_jobs if not a.paused]
+    if len(running) >= max_workers:
+        return None
+
+    blocked: Set[str] = set()
+    for job in queued:
+        if (user_active and job.priority < JobPriority.CRITICAL
+                and len(running) >= USER_ACTIVE_MAX_WORKERS):
+            # Everything after this job has lower priority too
+            return None
+
+        resource = resource_class_for(job.kind)
+        if resource in blocked:
+            continue
+        budget = budgets.get(resource) or default_resource_budgets()[resource]
+        in_class = [a for a in active_jobs if a.resource_class == resource]
+        need = job_memory_mb(job.kind)
+
+        if sum(1 for a in in_class if not a.paused) >= budget.max_concurrent:
+            blocked.add(resource)
+            continue
+        if in_class and sum(a.memory_mb for a in in_class) + need > budget.memory_mb:
+            blocked.add(resource)
+            continue
+        if available_memory_mb is not None and running and need > available_memory_mb:
+            blocked.add(resource)
+            continue
+        return job
+
+    return None
+
+
 class JobManager(QObject):
     """
     Central job orchestration service.
 
     Manages background workers, provides pause/resume/cancel,
     tracks progress, and emits signals for UI updates.
+
+    Jobs are scheduled by resource class (see select_runnable_job) rather
+    than strictly one after another in queue order.
     """
 
+    # Queued jobs inspected per scheduling pass
+    SCHEDULER_LOOKAHEAD = 20
+
     # Singleton instance
     _instance: Optional['JobManager'] = None
     _lock = Lock()
@@ -223,6 +400,7 @@ class JobManager(QObject):
         # Set during application shutdown to prevent new job scheduling.
         self._shutdown_requested: bool = False
         self._max_workers = min(4, self._thread_pool.maxThreadCount())
+        self._resource_budgets: Dict[str, ResourceBudget] = default_resource_budgets()
 
         # Active jobs tracking
         self._active_jobs: Dict[int, ActiveJob] = {}
@@ -431,6 +609,7 @@ class JobManager(QObject):
                 self._last_hist_progress_write.pop(job_id, None)
                 self.signals.job_canceled.emit(job_id, active.job_type)
                 self.signals.active_jobs_changed.emit(len(self._active_jobs))
+                self._try_start_next_job()
             return True
 
         # Mark in database
@@ -554,6 +733,7 @@ class JobManager(QObject):
             self._tracked_counter -= 1
             job_id = self._tracked_counter
 
+        # Tracked jobs count against their resource class like managed ones
         active = ActiveJob(
             job_id=job_id,
             job_type=job_type,
@@ -561,6 +741,8 @@ class JobManager(QObject):
             worker=None,
             started_at=time.time(),
             total=total,
+            resource_class=resource_class_for(job_type),
+            memory_mb=job_memory_mb(job_type),
         )
 
         with self._jobs_lock:
@@ -705,6 +887,9 @@ class JobManager(QObject):
         if len(self._active_jobs) == 0:
             self.signals.all_jobs_completed.emit()
 
+        # Its resource class may have been holding back queued jobs
+        self._try_start_next_job()
+
     def get_job_description(self, job_id: int) -> str:
         """Return the human-readable description for a tracked job, or ``""``."""
         return self._tracked_descriptions.get(job_id, "")
@@ -741,11 +926,58 @@ class JobManager(QObject):
     def _on_user_inactive(self):
         """Called when user stops interacting."""
         self._user_active = False
+        # Jobs held back while the user was active can start now
+        self._try_start_next_job()
 
     def is_user_active(self) -> bool:
         """Check if user is currently actively interacting."""
         return self._user_active
 
+    def set_resource_budget(
+        self,
+        resource_class: str,
+        max_concurrent: Optional[int] = None,
+        memory_mb: Optional[int] = None
+    ):
+        """
+        Change the concurrency and/or memory budget of a resource class.
+
+        Args:
+            resource_class: ResourceClass.CPU, DISK or DB
+            max_concurrent: Jobs of this class allowed to run at once
+            memory_mb: Combined memory estimate allowed for the class
+        """
+        with self._jobs_lock:
+            budget = self._resource_budgets.setdefault(
+                resource_class, default_resource_budgets()[ResourceClass.CPU])
+            if max_concurrent is not None:
+                budget.max_concurrent = max(1, int(max_concurrent))
+            if memory_mb is not None:
+                budget.memory_mb = max(1, int(memory_mb))
+        logger.info(f"[JobManager] Budget for {resource_class}: {budget}")
+        self._try_start_next_job()
+
+    def get_resource_usage(self) -> Dict[str, Dict[str, Any]]:
+        """Running jobs and memory estimate per resource class, with the budgets."""
+        with self._jobs_lock:
+            usage = {
+                resource: {
+                    'running': 0,
+                    'memory_mb': 0,
+                    'max_concurrent': budget.max_concurrent,
+                    'memory_budget_mb': budget.memory_mb,
+                }
+                for resource, budget in self._resource_budgets.items()
+            }
+            for active in self._active_jobs.values():
+                entry = usage.get(active.resource_class)
+                if entry is None:
+                    continue
+                if not active.paused:
+                    entry['running'] += 1
+                entry['memory_mb'] += active.memory_mb
+        return usage
+
     # ─────────────────────────────────────────────────────────────────────────
     # Public API: Priority Management
     # ─────────────────────────────────────────────────────────────────────────
@@ -908,6 +1140,8 @@ class JobManager(QObject):
                     'total': active.total,
                     'paused': active.paused,
                     'started_at': active.started_at,
+                    'resource_class': active.resource_class,
+                    'queue_wait_seconds': active.queue_wait,
                     'progress_pct': (active.processed / active.total * 100) if active.total > 0 else 0
                 }
                 for active in self._active_jobs.values()
@@ -928,6 +1162,8 @@ class JobManager(QObject):
         stats['active_count'] = len(self._active_jobs)
         stats['paused_count'] = len(self._paused_jobs)
         stats['global_pause'] = self._global_pause
+        stats['user_active'] = self._user_active
+        stats['resource_usage'] = self.get_resource_usage()
         return stats
 
     def is_job_running(self, job_type: str, project_id: int) -> bool:
@@ -943,22 +1179,39 @@ class JobManager(QObject):
     # ─────────────────────────────────────────────────────────────────────────
 
     def _try_start_next_job(self):
-        """Try to start the next queued job if we have capacity."""
+        """Start queued jobs while their resource classes have capacity."""
         if self._global_pause:
             return
 
-        with self._jobs_lock:
-            active_count = len([j for j in self._active_jobs.values() if not j.paused])
-            if active_count >= self._max_workers:
+        attempted: Set[int] = set()
+        while True:
+            with self._jobs_lock:
+                active_jobs = list(self._active_jobs.values())
+                if len([j for j in active_jobs if not j.paused]) >= self._max_workers:
+                    return
+                budgets = dict(self._resource_budgets)
+
+            queued_jobs = [
+                job for job in self._job_service.get_jobs(status='queued', limit=self.SCHEDULER_LOOKAHEAD)
+                if job.job_id not in attempted
+            ]
+            if not queued_jobs:
                 return
 
-        # Get next queued job
-        queued_jobs = self._job_service.get_jobs(status='queued', limit=1)
-        if not queued_jobs:
-            return
+            job = select_runnable_job(
+                queued_jobs, active_jobs, budgets, self._max_workers,
+                user_active=self._user_active,
+                available_memory_mb=_available_memory_mb(),
+            )
+            if job is None:
+                logger.debug(
+                    f"[JobManager] {len(queued_jobs)} queued job(s) waiting for resources"
+                    + (" (user active)" if self._user_active else "")
+                )
+                return
 
-        job = queued_jobs[0]
-        self._start_job(job)
+            attempted.add(job.job_id)
+            self._start_job(job)
 
     def _start_job(self, job: Job):
         """Start a job with its appropriate worker."""
@@ -978,14 +1231,20 @@ class JobManager(QObject):
 
         # Track active job
         payload = job.payload
+        now = time.time()
+        queued_at = _parse_queued_at(job.created_at) or now
         active = ActiveJob(
             job_id=job.job_id,
             job_type=job.kind,
             project_id=job.project_id or payload.get('project_id', 0),
             worker=worker,
             worker_id=worker_id,
-            started_at=time.time(),
-            total=payload.get('total', 0)
+            started_at=now,
+            total=payload.get('total', 0),
+            resource_class=resource_class_for(job.kind),
+            memory_mb=job_memory_mb(job.kind),
+            queued_at=queued_at,
+            queue_wait=max(0.0, now - queued_at),
         )
 
         with self._jobs_lock:
@@ -1002,11 +1261,15 @@ class JobManager(QObject):
             try:
                 desc = job.kind.replace('_', ' ').title()
                 self._history_repo.upsert_start(
-                    job_id=str(job.job_id), job_type=job.kind, title=desc)
+                    job_id=str(job.job_id), job_type=job.kind, title=desc,
+                    queued_ts=active.queued_at)
             except Exception:
                 pass
 
-        logger.info(f"[JobManager] Started job {job.job_id}: {job.kind}")
+        logger.info(
+            f"[JobManager] Started job {job.job_id}: {job.kind} "
+            f"[{active.resource_class}] after {active.queue_wait:.1f}s in queue"
+        )
         self.signals.job_started.emit(job.job_id, job.kind, active.total)
         self.signals.active_jobs_changed.emit(len(self._active_jobs))
 
@@ -1159,6 +1422,7 @@ class JobManager(QObject):
                     'failed_count': args[1],
                     'total_count': args[2]
                 }
+            stats['queue_wait_seconds'] = round(active.queue_wait, 3)
 
             # Persist to job history (managed jobs, positive IDs)
             if self._history_repo:
@@ -9,11 +9,14 @@
 #   - Thread-safe via lock (one reader shared across workers)
 #   - Stores extracted text in photo_metadata.ocr_text
 #   - Populates ocr_fts5 FTS5 virtual table for fast MATCH queries
+#     (plus asset_ocr_text / asset_ocr_text_fts), batched per transaction
+#   - Process-pool entry points for OCRPipelineWorker (one reader per process)
 #   - Integrated into post-scan pipeline as optional step
 
+import importlib.util
 import os
 import threading
-from typing import Optional, List, Tuple
+from typing import Iterable, Optional, List, Tuple
 from pathlib import Path
 
 from logging_config import get_logger
@@ -26,6 +29,25 @@ _reader_instance = None
 _reader_backend = None   # "easyocr" | "tesseract" | None
 _reader_failed = False   # Cache failure so we don't retry 29 times
 
+# run_ocr() outcomes
+OCR_OK = "ok"            # OCR ran (text may be empty)
+OCR_SKIPPED = "skipped"  # Unsupported, missing or too small - nothing to read
+OCR_FAILED = "failed"    # Decoding or recognition raised
+
+# Prefilter modes for get_photos_needing_ocr()
+PREFILTER_OFF = "off"                # Photo id order
+PREFILTER_PRIORITIZE = "prioritize"  # Screenshot/document candidates first, then the rest
+PREFILTER_ONLY = "candidates_only"   # Only candidates; the rest stay pending
+PREFILTER_MODES = (PREFILTER_OFF, PREFILTER_PRIORITIZE, PREFILTER_ONLY)
+
+# Upper bound for default_ocr_workers() (each process loads its own reader, ~200MB+)
+MAX_AUTO_OCR_WORKERS = 4
+
+# Screenshot confidence from search_asset_features that makes a photo a candidate
+CANDIDATE_MIN_SCREENSHOT_CONFIDENCE = 0.3
+# Extensions that usually carry text (lossless screenshots, scans)
+CANDIDATE_EXTENSIONS = ('.png', '.bmp', '.tif', '.tiff')
+
 
 def _get_reader(languages: Optional[List[str]] = None):
     """
@@ -212,39 +234,81 @@ class OCRService:
             if img is None:
                 return None
 
-            # Run OCR
-            self._ensure_reader()
-            results = self._reader.readtext(img, detail=1)
-
-            if not results:
-                return None
+            text, _ = self._read_image(img, image_path)
+            return text
 
-            # Filter by confidence and join text
-            text_parts = []
-            for bbox, text, confidence in results:
-                if confidence >= self.MIN_CONFIDENCE and text.strip():
-                    text_parts.append(text.strip())
+        except Exception as e:
+            logger.error(
+                f"[OCRService] OCR failed for {Path(image_path).name}: {e}"
+            )
+            return None
 
-            if not text_parts:
-                return None
+    def load_for_ocr(self, image_path: str):
+        """
+        Decode and downscale an image for OCR.
 
-            combined = ' '.join(text_parts)
+        Returns:
+            RGB numpy array, or None when the file is unsupported, missing,
+            too small or unreadable
+        """
+        if not self.is_supported(image_path) or not os.path.exists(image_path):
+            return None
+        return self._load_image(image_path)
 
-            # Sanity check: if the "text" is mostly noise, skip it
-            if len(combined) < 2:
-                return None
+    def ocr_loaded_image(self, img, image_path: str) -> Tuple[str, Optional[str], Optional[float]]:
+        """
+        OCR an image returned by load_for_ocr(), reporting what happened.
 
-            logger.debug(
-                f"[OCRService] Extracted {len(text_parts)} text regions "
-                f"({len(combined)} chars) from {Path(image_path).name}"
-            )
-            return combined
+        Returns:
+            (status, text, confidence): status is OCR_OK, OCR_SKIPPED or
+            OCR_FAILED; text is None when nothing readable was found;
+            confidence is the mean confidence of the kept regions
 
+        Raises:
+            ImportError: If no OCR backend is available
+        """
+        if img is None:
+            return OCR_SKIPPED, None, None
+        try:
+            text, confidence = self._read_image(img, image_path)
+        except ImportError:
+            raise
         except Exception as e:
-            logger.error(
-                f"[OCRService] OCR failed for {Path(image_path).name}: {e}"
-            )
-            return None
+            logger.error(f"[OCRService] OCR failed for {Path(image_path).name}: {e}")
+            return OCR_FAILED, None, None
+        return OCR_OK, text, confidence
+
+    def run_ocr(self, image_path: str) -> Tuple[str, Optional[str], Optional[float]]:
+        """load_for_ocr() + ocr_loaded_image() for one path."""
+        return self.ocr_loaded_image(self.load_for_ocr(image_path), image_path)
+
+    def _read_image(self, img, image_path: str) -> Tuple[Optional[str], Optional[float]]:
+        """Run the reader on a decoded image: (joined text or None, mean confidence)."""
+        self._ensure_reader()
+        results = self._reader.readtext(img, detail=1)
+
+        # Filter by confidence and join text
+        text_parts = []
+        confidences = []
+        for bbox, text, confidence in results or []:
+            if confidence >= self.MIN_CONFIDENCE and text.strip():
+                text_parts.append(text.strip())
+                confidences.append(float(confidence))
+
+        if not text_parts:
+            return None, None
+
+        combined = ' '.join(text_parts)
+
+        # Sanity check: if the "text" is mostly noise, skip it
+        if len(combined) < 2:
+            return None, None
+
+        logger.debug(
+            f"[OCRService] Extracted {len(text_parts)} text regions "
+            f"({len(combined)} chars) from {Path(image_path).name}"
+        )
+        return combined, sum(confidences) / len(confidences)
 
     def extract_text_with_regions(
         self, image_path: str
@@ -316,69 +380,148 @@ class OCRService:
         """
         Store extracted OCR text in the database.
 
-        Updates both photo_metadata.ocr_text and the ocr_fts5 FTS5 table.
+        Updates photo_metadata.ocr_text and the ocr_fts5 FTS5 table, then
+        queues the photo's search_asset_features row for re-derivation.
 
         Args:
             photo_id: The photo's row ID in photo_metadata
             text: Extracted text to store
             project_id: Project ID for the photo
         """
+        self.store_ocr_results([(photo_id, text, None)], project_id)
+
+    def store_ocr_results(
+        self,
+        results: Iterable[Tuple[int, str, Optional[float]]],
+        project_id: int,
+    ) -> int:
+        """
+        Store a batch of OCR results in one transaction.
+
+        Writes photo_metadata.ocr_text and ocr_fts5, plus asset_ocr_text and
+        asset_ocr_text_fts (keyed by media asset) for photos already linked
+        to a media_asset, then queues the search_asset_features rows for
+        re-derivation in one call.
+        An empty text marks a photo as processed.
+
+        Args:
+            results: (photo_id, text, confidence) tuples
+            project_id: Project ID for the photos
+
+        Returns:
+            Number of photos stored (0 on failure)
+        """
+        results = [(int(pid), text or "", conf) for pid, text, conf in results]
+        if not results:
+            return 0
+        photo_ids = [pid for pid, _, _ in results]
+        placeholders = ','.join(['?'] * len(photo_ids))
+
         try:
+            from datetime import datetime
             from repository.base_repository import DatabaseConnection
             db = DatabaseConnection()
             with db.get_connection() as conn:
-                # Update the ocr_text column
-                conn.execute(
-                    "UPDATE photo_metadata SET ocr_text = ? WHERE id = ?",
-                    (text, photo_id),
-                )
-
-                # Update search_asset_features if it exists
-                try:
-                    conn.execute(
-                        "UPDATE search_asset_features SET ocr_text = ? "
-                        "WHERE path = (SELECT path FROM photo_metadata WHERE id = ?)",
-                        (text, photo_id),
+                tables = {
+                    row["name"] for row in conn.execute(
+                        "SELECT name FROM sqlite_master WHERE name IN "
+                        "('ocr_fts5', 'asset_ocr_text', 'asset_ocr_text_fts', 'media_instance')"
                     )
-                except Exception:
-                    pass  # Table may not exist yet
+                }
 
-                # Sync FTS5 index
-                # FTS5 content-sync tables need explicit INSERT/DELETE
-                try:
-                    # Delete old entry if exists
+                # asset_ocr_text is keyed by media_asset.asset_id; photos not
+                # linked to an asset yet (no content hash) are skipped there.
+                # Duplicates share one asset, so one row per asset is written.
+                by_asset = {}
+                if 'asset_ocr_text' in tables and 'media_instance' in tables:
+                    asset_of = {
+                        row["photo_id"]: row["asset_id"] for row in conn.execute(
+                            "SELECT photo_id, asset_id FROM media_instance "
+                            f"WHERE project_id = ? AND photo_id IN ({placeholders})",
+                            [project_id, *photo_ids],
+                        )
+                    }
+                    by_asset = {
+                        asset_of[pid]: (pid, text, conf)
+                        for pid, text, conf in results if pid in asset_of
+                    }
+                asset_ids = list(by_asset)
+
+                # FTS5 content-sync tables need the *old* text to delete an
+                # entry, so drop previous entries before overwriting the rows
+                if 'ocr_fts5' in tables:
                     conn.execute(
                         "INSERT INTO ocr_fts5(ocr_fts5, rowid, ocr_text) "
-                        "VALUES('delete', ?, "
-                        "(SELECT ocr_text FROM photo_metadata WHERE id = ?))",
-                        (photo_id, photo_id),
+                        f"SELECT 'delete', id, ocr_text FROM photo_metadata "
+                        f"WHERE id IN ({placeholders}) AND ocr_text IS NOT NULL",
+                        photo_ids,
                     )
-                except Exception:
-                    pass  # No previous entry
-
-                try:
+                if asset_ids and 'asset_ocr_text_fts' in tables:
                     conn.execute(
+                        "INSERT INTO asset_ocr_text_fts(asset_ocr_text_fts, rowid, ocr_text) "
+                        f"SELECT 'delete', asset_id, ocr_text FROM asset_ocr_text "
+                        f"WHERE asset_id IN ({','.join(['?'] * len(asset_ids))}) "
+                        "AND ocr_text IS NOT NULL",
+                        asset_ids,
+                    )
+
+                conn.executemany(
+                    "UPDATE photo_metadata SET ocr_text = ? WHERE id = ?",
+                    [(text, pid) for pid, text, _ in results],
+                )
+                if 'ocr_fts5' in tables:
+                    conn.executemany(
                         "INSERT INTO ocr_fts5(rowid, ocr_text) VALUES(?, ?)",
-                        (photo_id, text),
+                        [(pid, text) for pid, text, _ in results],
                     )
-                except Exception as e:
-                    logger.debug(f"[OCRService] FTS5 insert skipped: {e}")
+
+                if asset_ids:
+                    now = datetime.now().isoformat(timespec='seconds')
+                    lang = '+'.join(self._languages)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO asset_ocr_text "
+                        "(asset_id, project_id, path, ocr_text, ocr_lang, "
+                        " ocr_confidence, token_count, updated_at) "
+                        "SELECT ?, ?, path, ?, ?, ?, ?, ? FROM photo_metadata WHERE id = ?",
+                        [(asset_id, project_id, text, lang, conf or 0.0, len(text.split()), now, pid)
+                         for asset_id, (pid, text, conf) in by_asset.items()],
+                    )
+                    if 'asset_ocr_text_fts' in tables:
+                        conn.executemany(
+                            "INSERT INTO asset_ocr_text_fts(rowid, ocr_text) VALUES(?, ?)",
+                            [(asset_id, text) for asset_id, (_, text, _) in by_asset.items()],
+                        )
 
                 conn.commit()
                 logger.debug(
-                    f"[OCRService] Stored OCR text for photo {photo_id} "
-                    f"({len(text)} chars)"
+                    f"[OCRService] Stored OCR text for {len(results)} photos"
                 )
 
+            # Re-derive the search feature rows (ocr_text feeds screenshot_confidence)
+            from repository.search_feature_repository import SearchFeatureRepository
+            SearchFeatureRepository(db).apply_photo_changes(photo_ids, "ocr")
+            return len(results)
+
         except Exception as e:
             logger.error(f"[OCRService] Failed to store OCR text: {e}")
+            return 0
 
     def get_photos_needing_ocr(
-        self, project_id: int, limit: int = 0
+        self, project_id: int, limit: int = 0, prefilter: str = PREFILTER_OFF
     ) -> List[Tuple[int, str]]:
         """
         Get photos that haven't been OCR-processed yet.
 
+        The prefilter uses the signals already in search_asset_features
+        (screenshot flag/confidence, text-heavy extensions, page-like
+        geometry). Photos without a feature row yet count as candidates.
+
+        Args:
+            project_id: Project to query
+            limit: Maximum rows (0 = all)
+            prefilter: PREFILTER_OFF (id order), PREFILTER_PRIORITIZE
+                (candidates first) or PREFILTER_ONLY (candidates only)
+
         Returns:
             List of (photo_id, path) tuples for photos with NULL ocr_text
         """
@@ -386,14 +529,50 @@ class OCRService:
             from repository.base_repository import DatabaseConnection
             db = DatabaseConnection()
             with db.get_connection() as conn:
-                sql = """
-                    SELECT id, path FROM photo_metadata
-                    WHERE project_id = ?
-                      AND ocr_text IS NULL
-                      AND path IS NOT NULL
-                    ORDER BY id
-                """
-                params: list = [project_id]
+                has_features = prefilter != PREFILTER_OFF and conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                    "AND name = 'search_asset_features'"
+                ).fetchone() is not None
+
+                params: list = []
+                if has_features:
+                    from services.document_evidence_evaluator import (
+                        MIN_EDGE_SIZE, PAGE_RATIO_MAX, PAGE_RATIO_MIN,
+                    )
+                    candidate = f"""(
+                        sf.path IS NULL
+                        OR sf.is_screenshot = 1
+                        OR sf.screenshot_confidence >= ?
+                        OR sf.ext IN ({','.join(['?'] * len(CANDIDATE_EXTENSIONS))})
+                        OR (MIN(sf.width, sf.height) >= ?
+                            AND MAX(sf.width, sf.height) * 1.0 / MIN(sf.width, sf.height)
+                                BETWEEN ? AND ?)
+                    )"""
+                    params += [CANDIDATE_MIN_SCREENSHOT_CONFIDENCE, *CANDIDATE_EXTENSIONS,
+                               MIN_EDGE_SIZE, PAGE_RATIO_MIN, PAGE_RATIO_MAX]
+                    sql = f"""
+                        SELECT pm.id, pm.path FROM photo_metadata pm
+                        LEFT JOIN search_asset_features sf
+                               ON sf.path = pm.path AND sf.project_id = pm.project_id
+                        WHERE pm.project_id = ?
+                          AND pm.ocr_text IS NULL
+                          AND pm.path IS NOT NULL
+                    """
+                    if prefilter == PREFILTER_ONLY:
+                        sql += f" AND {candidate} ORDER BY pm.id"
+                    else:
+                        sql += f" ORDER BY CASE WHEN {candidate} THEN 0 ELSE 1 END, pm.id"
+                    params = [project_id] + params
+                else:
+                    sql = """
+                        SELECT id, path FROM photo_metadata
+                        WHERE project_id = ?
+                          AND ocr_text IS NULL
+                          AND path IS NOT NULL
+                        ORDER BY id
+                    """
+                    params = [project_id]
+
                 if limit > 0:
                     sql += " LIMIT ?"
                     params.append(limit)
@@ -444,3 +623,47 @@ def get_ocr_service(languages: Optional[List[str]] = None) -> OCRService:
             if _ocr_service_instance is None:
                 _ocr_service_instance = OCRService(languages)
     return _ocr_service_instance
+
+
+def default_ocr_workers() -> int:
+    """
+    Worker processes for the OCR pipeline when not configured.
+
+    With a CUDA GPU one shared reader is fastest (1 = OCR in the calling
+    thread); on CPU, one reader per process up to MAX_AUTO_OCR_WORKERS,
+    leaving half the cores to torch's own threads and the rest of the app.
+    """
+    if _detect_gpu():
+        return 1
+    return max(1, min(MAX_AUTO_OCR_WORKERS, (os.cpu_count() or 2) // 2))
+
+
+def ocr_backend_available() -> bool:
+    """Whether an OCR backend is importable, without loading a model."""
+    return (importlib.util.find_spec("easyocr") is not None
+            or importlib.util.find_spec("pytesseract") is not None)
+
+
+# ── Process-pool entry points (OCRPipelineWorker) ─────────────────
+# Each worker process owns one OCRService and therefore one reader.
+
+_worker_service: Optional[OCRService] = None
+
+
+def _init_ocr_worker(languages: Optional[List[str]], torch_threads: int = 0):
+    """ProcessPoolExecutor initializer: per-process OCR service."""
+    global _worker_service
+    _worker_service = OCRService(languages)
+    if torch_threads > 0:
+        # Keep N processes x torch intra-op threads within the CPU count
+        try:
+            import torch
+            torch.set_num_threads(torch_threads)
+        except ImportError:
+            pass
+
+
+def _ocr_in_worker(photo_id: int, path: str) -> Tuple[int, str, Optional[str], Optional[float]]:
+    """Worker-process task: (photo_id,) + OCRService.run_ocr(path)."""
+    return (photo_id,) + _worker_service.run_ocr(path)
+
@@ -0,0 +1,325 @@
+# services/offline_geocoder.py
+# Offline reverse geocoding from a local gazetteer
+# Used by GeocodingService before it falls back to the Nominatim API
+# ------------------------------------------------------
+
+"""
+Offline Geocoder
+
+Resolves GPS coordinates to "City, Region, Country" names from a local
+gazetteer file, so geocoding a library does not wait on Nominatim's
+1 request/second policy. Places are indexed in a KD-tree over unit
+vectors on the sphere; each lookup is a nearest-neighbour query bounded by
+max_distance_km, and whole batches are resolved in one vectorized query.
+
+Supported gazetteers:
+    - GeoNames city dumps (cities500.txt / cities1000.txt / cities15000.txt,
+      or the .zip they ship in). Region and country names are read from
+      admin1CodesASCII.txt and countryInfo.txt next to the dump when present,
+      otherwise the codes are shown.
+    - CSV with a header row: name, latitude (or lat), longitude (or lon),
+      and optionally admin1 (or region/state) and country.
+
+Usage:
+    from services.offline_geocoder import get_offline_geocoder
+
+    geocoder = get_offline_geocoder()   # None when no gazetteer is installed
+    if geocoder:
+        names = geocoder.reverse_geocode_batch([(37.7749, -122.4194), (48.8566, 2.3522)])
+"""
+
+import csv
+import io
+import logging
+import math
+import os
+import zipfile
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+
+# Default gazetteer location when the setting is empty
+DEFAULT_GAZETTEER_DIR = ("models", "gazetteer")
+GAZETTEER_CANDIDATES = (
+    "cities500.txt", "cities500.zip",
+    "cities1000.txt", "cities1000.zip",
+    "cities5000.txt", "cities5000.zip",
+    "cities15000.txt", "cities15000.zip",
+    "gazetteer.csv",
+)
+
+
+def dedupe_coordinates(coordinates: Sequence[Tuple[float, float]],
+                       precision: int) -> Tuple[List[Tuple[float, float]], np.ndarray]:
+    """
+    Collapse coordinates that agree to ``precision`` decimal places.
+
+    Args:
+        coordinates: (lat, lon) pairs
+        precision: Decimal places kept (3 ≈ 110 m, 2 ≈ 1.1 km)
+
+    Returns:
+        (unique rounded (lat, lon) pairs, (n,) index of each input's unique pair)
+    """
+    if not coordinates:
+        return [], np.empty(0, dtype=np.int64)
+    rounded = np.round(np.asarray(coordinates, dtype=np.float64), precision)
+    unique, inverse = np.unique(rounded, axis=0, return_inverse=True)
+    return [tuple(row) for row in unique.tolist()], inverse.reshape(-1)
+
+
+def _unit_vectors(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    lat = np.radians(lats)
+    lon = np.radians(lons)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _format_place(city: str, region: str, country: str) -> str:
+    """City, Region, Country - same shape as GeocodingService._format_location_name."""
+    parts = [city] if city else []
+    if region and region != city:
+        parts.append(region)
+    if country:
+        parts.append(country)
+    return ', '.join(parts) if parts else "Unknown Location"
+
+
+def _read_text(path: str) -> io.TextIOBase:
+    """Open a gazetteer file, reading the first .txt/.csv member of a .zip."""
+    if path.lower().endswith('.zip'):
+        archive = zipfile.ZipFile(path)
+        member = next(n for n in archive.namelist() if n.lower().endswith(('.txt', '.csv')))
+        return io.TextIOWrapper(archive.open(member), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _load_geonames_lookups(directory: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """admin1 code ("US.CA") -> name and ISO country code -> name, when the files exist."""
+    admin1, countries = {}, {}
+    admin1_path = os.path.join(directory, "admin1CodesASCII.txt")
+    if os.path.exists(admin1_path):
+        with open(admin1_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) >= 2:
+                    admin1[fields[0]] = fields[1]
+    country_path = os.path.join(directory, "countryInfo.txt")
+    if os.path.exists(country_path):
+        with open(country_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('#'):
+                    continue
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) >= 5:
+                    countries[fields[0]] = fields[4]
+    return admin1, countries
+
+
+def load_gazetteer(path: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Read a gazetteer file.
+
+    Returns:
+        (formatted place names, latitudes, longitudes)
+    """
+    names, lats, lons = [], [], []
+
+    if path.lower().endswith('.csv'):
+        with _read_text(path) as f:
+            reader = csv.DictReader(f)
+            fields = {name.strip().lower(): name for name in (reader.fieldnames or [])}
+
+            def column(*options):
+                return next((fields[o] for o in options if o in fields), None)
+
+            name_col = column('name', 'city')
+            lat_col = column('latitude', 'lat')
+            lon_col = column('longitude', 'lon', 'lng')
+            region_col = column('admin1', 'region', 'state')
+            country_col = column('country')
+            if not (name_col and lat_col and lon_col):
+                raise ValueError(f"{path}: CSV gazetteer needs name, latitude and longitude columns")
+
+            for row in reader:
+                try:
+                    lat, lon = float(row[lat_col]), float(row[lon_col])
+                except (TypeError, ValueError):
+                    continue
+                names.append(_format_place(
+                    (row[name_col] or '').strip(),
+                    (row.get(region_col) or '').strip() if region_col else '',
+                    (row.get(country_col) or '').strip() if country_col else '',
+                ))
+                lats.append(lat)
+                lons.append(lon)
+    else:
+        # GeoNames dump: geonameid, name, asciiname, alternatenames, latitude,
+        # longitude, feature class, feature code, country code, cc2, admin1 code, ...
+        admin1, countries = _load_geonames_lookups(os.path.dirname(path))
+        with _read_text(path) as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) < 11:
+                    continue
+                try:
+                    lat, lon = float(fields[4]), float(fields[5])
+                except ValueError:
+                    continue
+                country_code = fields[8]
+                region = admin1.get(f"{country_code}.{fields[10]}", '')
+                names.append(_format_place(fields[1], region, countries.get(country_code, country_code)))
+                lats.append(lat)
+                lons.append(lon)
+
+    return names, np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+
+
+class OfflineGeocoder:
+    """
+    Nearest-place reverse geocoder over a local gazetteer.
+
+    The gazetteer is loaded and indexed on first use. Thread-safe.
+    """
+
+    DEFAULT_MAX_DISTANCE_KM = 30.0
+
+    def __init__(self, gazetteer_path: str, max_distance_km: float = DEFAULT_MAX_DISTANCE_KM):
+        """
+        Args:
+            gazetteer_path: GeoNames dump (.txt/.zip) or CSV gazetteer
+            max_distance_km: Coordinates farther than this from every place
+                stay unresolved (left for the online provider)
+        """
+        self.gazetteer_path = gazetteer_path
+        self.max_distance_km = float(max_distance_km)
+        self._names: List[str] = []
+        self._tree: Optional[cKDTree] = None
+        self._load_failed = False
+        self._load_lock = Lock()
+
+    def _ensure_loaded(self) -> bool:
+        if self._tree is not None:
+            return True
+        with self._load_lock:
+            if self._tree is None and not self._load_failed:
+                try:
+                    names, lats, lons = load_gazetteer(self.gazetteer_path)
+                except Exception as e:
+                    logger.error(f"[OfflineGeocoder] Failed to load gazetteer {self.gazetteer_path}: {e}")
+                    names = []
+                if not names:
+                    logger.warning(f"[OfflineGeocoder] No places loaded from {self.gazetteer_path}")
+                    self._load_failed = True
+                    return False
+                self._names = names
+                self._tree = cKDTree(_unit_vectors(lats, lons))
+                logger.info(f"[OfflineGeocoder] Indexed {len(names)} places from {self.gazetteer_path}")
+        return self._tree is not None
+
+    @property
+    def size(self) -> int:
+        """Number of indexed places (loads the gazetteer)."""
+        return len(self._names) if self._ensure_loaded() else 0
+
+    def reverse_geocode(self, latitude: float, longitude: float) -> Optional[str]:
+        """Name of the nearest place within max_distance_km, or None."""
+        return self.reverse_geocode_batch([(latitude, longitude)])[0]
+
+    def reverse_geocode_batch(self, coordinates: Sequence[Tuple[float, float]]) -> List[Optional[str]]:
+        """
+        Resolve many coordinates in one KD-tree query.
+
+        Args:
+            coordinates: (lat, lon) pairs
+
+        Returns:
+            Place name per coordinate, None where no place is within range
+        """
+        if not coordinates or not self._ensure_loaded():
+            return [None] * len(coordinates)
+
+        coords = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        # Great-circle limit as a chord length between unit vectors
+        angle = min(math.pi, self.max_distance_km / EARTH_RADIUS_KM)
+        chord = 2.0 * math.sin(angle / 2.0)
+        dist, idx = self._tree.query(_unit_vectors(coords[:, 0], coords[:, 1]), k=1,
+                                     distance_upper_bound=chord)
+
+        found = np.isfinite(dist)
+        return [self._names[i] if ok else None for i, ok in zip(idx.tolist(), found.tolist())]
+
+
+def find_gazetteer(configured_path: str = "") -> Optional[str]:
+    """
+    Gazetteer file to use: the configured file, the first known file in a
+    configured directory, or the first known file in models/gazetteer.
+    """
+    if configured_path:
+        if os.path.isfile(configured_path):
+            return configured_path
+        search_dirs = [configured_path]
+    else:
+        from app_env import app_path
+        search_dirs = [app_path(*DEFAULT_GAZETTEER_DIR)]
+
+    for directory in search_dirs:
+        for candidate in GAZETTEER_CANDIDATES:
+            path = os.path.join(directory, candidate)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+# Singleton instance (None when offline geocoding is disabled or no gazetteer exists)
+_offline_geocoder = None
+_offline_geocoder_checked = False
+_offline_geocoder_lock = Lock()
+
+
+def get_offline_geocoder() -> Optional[OfflineGeocoder]:
+    """
+    Get the shared OfflineGeocoder configured in settings.
+
+    Settings:
+        gps_offline_geocoding_enabled: Use the gazetteer at all
+        gps_offline_gazetteer_path: Gazetteer file or directory ("" = models/gazetteer)
+        gps_offline_max_distance_km: Farthest place accepted as a match
+
+    Returns:
+        Shared OfflineGeocoder, or None when disabled or no gazetteer was found
+    """
+    global _offline_geocoder, _offline_geocoder_checked
+    with _offline_geocoder_lock:
+        if _offline_geocoder_checked:
+            return _offline_geocoder
+        _offline_geocoder_checked = True
+
+        try:
+            from settings_manager_qt import SettingsManager
+            sm = SettingsManager()
+            enabled = bool(sm.get("gps_offline_geocoding_enabled", True))
+            configured_path = sm.get("gps_offline_gazetteer_path", "") or ""
+            max_distance_km = float(sm.get("gps_offline_max_distance_km",
+                                           OfflineGeocoder.DEFAULT_MAX_DISTANCE_KM))
+        except Exception as e:
+            logger.warning(f"[OfflineGeocoder] Could not read settings: {e}")
+            enabled, configured_path, max_distance_km = True, "", OfflineGeocoder.DEFAULT_MAX_DISTANCE_KM
+
+        if not enabled:
+            logger.info("[OfflineGeocoder] Disabled in settings")
+            return None
+
+        path = find_gazetteer(configured_path)
+        if path is None:
+            logger.info("[OfflineGeocoder] No gazetteer found, using online geocoding only")
+            return None
+
+        _offline_geocoder = OfflineGeocoder(path, max_distance_km=max_distance_km)
+        return _offline_geocoder
@@ -29,7 +29,6 @@ Key Design Decisions:
 
 from __future__ import annotations
 import json
-import sqlite3
 import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
@@ -526,122 +525,116 @@ class PeopleGroupService:
             Dict with computation results
         """
         start_time = time.time()
-        max_retries = 3
-        retry_delay = 2  # seconds, doubles on each retry
 
-        for attempt in range(max_retries):
-            try:
-                with self.db._connect() as conn:
-                    cur = conn.cursor()
+        try:
+            with self.db._connect() as conn:
+                cur = conn.cursor()
 
-                    # Get group members
-                    cur.execute("""
-                        SELECT branch_key FROM person_group_members
-                        WHERE group_id = ?
-                    """, (group_id,))
-                    members = [row[0] for row in cur.fetchall()]
-
-                    if len(members) < 2:
-                        return {
-                            'success': False,
-                            'error': 'Group must have at least 2 members',
-                            'match_count': 0
-                        }
-
-                    member_count = len(members)
-
-                    if progress_callback:
-                        progress_callback(0, 100, f"Finding photos with {member_count} people together...")
-
-                    # Find photos where ALL members appear.
-                    # Uses project_images (not face_crops) because merge operations
-                    # update project_images.branch_key but NOT face_crops.branch_key.
-                    placeholders = ','.join(['?'] * len(members))
-
-                    cur.execute(f"""
-                        SELECT
-                            pi.image_path,
-                            pm.id as photo_id,
-                            COUNT(DISTINCT pi.branch_key) as person_count
-                        FROM project_images pi
-                        JOIN photo_metadata pm ON pm.path = pi.image_path AND pm.project_id = pi.project_id
-                        WHERE pi.project_id = ?
-                          AND pi.branch_key IN ({placeholders})
-                        GROUP BY pi.image_path
-                        HAVING COUNT(DISTINCT pi.branch_key) = ?
-                    """, (project_id, *members, member_count))
-
-                    matching_photos = cur.fetchall()
-
-                    if progress_callback:
-                        progress_callback(50, 100, f"Found {len(matching_photos)} matching photos")
-
-                    # Clear previous matches for this group
-                    cur.execute("""
-                        DELETE FROM group_asset_matches
-                        WHERE group_id = ? AND scope = 'same_photo'
-                    """, (group_id,))
-
-                    # Insert new matches
-                    now = int(time.time())
-                    match_count = 0
-                    for image_path, photo_id, person_count in matching_photos:
-                        cur.execute("""
-                            INSERT INTO group_asset_matches
-                                (group_id, scope, photo_id, computed_at)
-                            VALUES (?, 'same_photo', ?, ?)
-                        """, (group_id, photo_id, now))
-                        match_count += 1
-
-                    if progress_callback:
-                        progress_callback(90, 100, f"Saved {match_count} matches")
-
-                    # Update group last_used_at
-                    cur.execute("""
-                        UPDATE person_groups SET last_used_at = ? WHERE id = ?
-                    """, (now, group_id))
+                # Get group members
+                cur.execute("""
+                    SELECT branch_key FROM person_group_members
+                    WHERE group_id = ?
+                """, (group_id,))
+                members = [row[0] for row in cur.fetchall()]
 
-                    conn.commit()
+                if len(members) < 2:
+                    return {
+                        'success': False,
+                        'error': 'Group must have at least 2 members',
+                        'match_count': 0
+                    }
 
-                    duration = time.time() - start_time
+                member_count = len(members)
 
-                    if progress_callback:
-                        progress_callback(100, 100, f"Complete: {match_count} photos")
+                if progress_callback:
+                    progress_callback(0, 100, f"Finding photos with {member_count} people together...")
 
-                    logger.info(f"[PeopleGroupService] Together matches for group {group_id}: "
-                               f"{match_count} photos with {member_count} people in {duration:.2f}s")
+                # Find photos where ALL members appear.
+                # Uses project_images (not face_crops) because merge operations
+                # update project_images.branch_key but NOT face_crops.branch_key.
+                placeholders = ','.join(['?'] * len(members))
 
-                    return {
-                        'success': True,
-                        'match_count': match_count,
-                        'member_count': member_count,
-                        'duration_s': duration
-                    }
+                cur.execute(f"""
+                    SELECT
+                        pi.image_path,
+                        pm.id as photo_id,
+                        COUNT(DISTINCT pi.branch_key) as person_count
+                    FROM project_images pi
+                    JOIN photo_metadata pm ON pm.path = pi.image_path AND pm.project_id = pi.project_id
+                    WHERE pi.project_id = ?
+                      AND pi.branch_key IN ({placeholders})
+                    GROUP BY pi.image_path
+                    HAVING COUNT(DISTINCT pi.branch_key) = ?
+                """, (project_id, *members, member_count))
 
-            except sqlite3.OperationalError as e:
-                if "database is locked" in str(e) and attempt < max_retries - 1:
-                    wait = retry_delay * (2 ** attempt)
-                    logger.warning(
-                        f"[PeopleGroupService] Database locked for group {group_id}, "
-                        f"retrying in {wait}s (attempt {attempt + 1}/{max_retries})"
-                    )
-                    time.sleep(wait)
-                    continue
-                logger.error(f"[PeopleGroupService] Together match computation failed: {e}", exc_info=True)
-                return {
-                    'success': False,
-                    'error': str(e),
-                    'match_count': 0
-                }
+                matching_photos = cur.fetchall()
+
+                if progress_callback:
+                    progress_callback(50, 100, f"Found {len(matching_photos)} matching photos")
+
+                # Replace previous matches (single-writer queue, one transaction)
+                match_count = self._replace_group_matches(
+                    group_id, 'same_photo', [photo_id for _, photo_id, _ in matching_photos]
+                )
+
+                if progress_callback:
+                    progress_callback(90, 100, f"Saved {match_count} matches")
+
+                duration = time.time() - start_time
+
+                if progress_callback:
+                    progress_callback(100, 100, f"Complete: {match_count} photos")
+
+                logger.info(f"[PeopleGroupService] Together matches for group {group_id}: "
+                           f"{match_count} photos with {member_count} people in {duration:.2f}s")
 
-            except Exception as e:
-                logger.error(f"[PeopleGroupService] Together match computation failed: {e}", exc_info=True)
                 return {
-                    'success': False,
-                    'error': str(e),
-                    'match_count': 0
+                    'success': True,
+                    'match_count': match_count,
+                    'member_count': member_count,
+                    'duration_s': duration
                 }
 
+        except Exception as e:
+            logger.error(f"[PeopleGroupService] Together match computation failed: {e}", exc_info=True)
+            return {
+                'success': False,
+                'error': str(e),
+                'match_count': 0
+            }
+
+    def _replace_group_matches(self, group_id: int, scope: str, photo_ids: List[int]) -> int:
+        """
+        Replace a group's matches for one scope and touch last_used_at.
+
+        Runs as one task on the database's write queue, so concurrent
+        workers never hit "database is locked" here; lock retries happen
+        once, in the writer. Blocks until committed.
+
+        Returns:
+            Number of matches written
+        """
+        now = int(time.time())
+
+        def _write(conn) -> int:
+            conn.execute("""
+                DELETE FROM group_asset_matches
+                WHERE group_id = ? AND scope = ?
+            """, (group_id, scope))
+            conn.executemany("""
+                INSERT OR IGNORE INTO group_asset_matches
+                    (group_id, scope, photo_id, computed_at)
+                VALUES (?, ?, ?, ?)
+            """, [(group_id, scope, photo_id, now) for photo_id in photo_ids])
+            conn.execute("""
+                UPDATE person_groups SET last_used_at = ? WHERE id = ?
+            """, (now, group_id))
+            return len(photo_ids)
+
+        return self.db.write_queue().submit(
+            "group_asset_matches", _write, weight=len(photo_ids) + 2
+        ).result()
+
     def compute_event_window_matches(
         self,
         project_id: int,
@@ -667,182 +660,144 @@ class PeopleGroupService:
             Dict with computation results
         """
         start_time = time.time()
-        max_retries = 3
-        retry_delay = 2  # seconds, doubles on each retry
 
-        for attempt in range(max_retries):
-            try:
-                with self.db._connect() as conn:
-                    cur = conn.cursor()
+        try:
+            with self.db._connect() as conn:
+                cur = conn.cursor()
 
-                    # Get group members
-                    cur.execute("""
-                        SELECT branch_key FROM person_group_members
-                        WHERE group_id = ?
-                    """, (group_id,))
-                    members = [row[0] for row in cur.fetchall()]
-
-                    if len(members) < 2:
-                        return {
-                            'success': False,
-                            'error': 'Group must have at least 2 members',
-                            'match_count': 0
-                        }
-
-                    member_count = len(members)
-
-                    if progress_callback:
-                        progress_callback(0, 100, f"Finding event windows with {member_count} people...")
-
-                    # Get all photo timestamps for each member
-                    placeholders = ','.join(['?'] * len(members))
-
-                    cur.execute(f"""
-                        SELECT
-                            fc.branch_key,
-                            pm.created_ts,
-                            pm.id as photo_id,
-                            pm.path
-                        FROM face_crops fc
-                        JOIN photo_metadata pm ON pm.path = fc.image_path AND pm.project_id = fc.project_id
-                        WHERE fc.project_id = ?
-                          AND fc.branch_key IN ({placeholders})
-                          AND fc.confidence >= ?
-                          AND pm.created_ts IS NOT NULL
-                        ORDER BY pm.created_ts ASC
-                    """, (project_id, *members, min_confidence))
-
-                    events = cur.fetchall()
-
-                    if not events:
-                        return {
-                            'success': True,
-                            'match_count': 0,
-                            'member_count': member_count,
-                            'message': 'No photos with timestamps found'
-                        }
-
-                    if progress_callback:
-                        progress_callback(20, 100, f"Analyzing {len(events)} photo events...")
-
-                    # Find event windows where all members appear
-                    matching_photos = set()
-
-                    # Build person -> timestamp mapping
-                    person_times: Dict[str, List[Tuple[int, int, str]]] = {m: [] for m in members}
-                    for branch_key, ts, photo_id, path in events:
-                        if ts is not None:
-                            person_times[branch_key].append((ts, photo_id, path))
-
-                    # Sort each person's timeline
-                    for m in members:
-                        person_times[m].sort(key=lambda x: x[0])
-
-                    # Use the first member's timeline as anchor
-                    if not person_times[members[0]]:
-                        return {
-                            'success': True,
-                            'match_count': 0,
-                            'member_count': member_count,
-                            'message': 'No photos found for anchor person'
-                        }
-
-                    anchor_member = members[0]
-                    other_members = members[1:]
-
-                    for anchor_ts, anchor_photo_id, anchor_path in person_times[anchor_member]:
-                        window_start = anchor_ts - window_seconds
-                        window_end = anchor_ts + window_seconds
-
-                        all_present = True
-                        window_photos = [(anchor_photo_id, anchor_path)]
-
-                        for other_member in other_members:
-                            found_in_window = False
-                            for other_ts, other_photo_id, other_path in person_times[other_member]:
-                                if window_start <= other_ts <= window_end:
-                                    found_in_window = True
-                                    window_photos.append((other_photo_id, other_path))
-                                    break
-
-                            if not found_in_window:
-                                all_present = False
-                                break
+                # Get group members
+                cur.execute("""
+                    SELECT branch_key FROM person_group_members
+                    WHERE group_id = ?
+                """, (group_id,))
+                members = [row[0] for row in cur.fetchall()]
 
-                        if all_present:
-                            for photo_id, path in window_photos:
-                                matching_photos.add((photo_id, path))
+                if len(members) < 2:
+                    return {
+                        'success': False,
+                        'error': 'Group must have at least 2 members',
+                        'match_count': 0
+                    }
 
-                    if progress_callback:
-                        progress_callback(70, 100, f"Found {len(matching_photos)} matching photos")
+                member_count = len(members)
 
-                    # Clear previous event_window matches
-                    cur.execute("""
-                        DELETE FROM group_asset_matches
-                        WHERE group_id = ? AND scope = 'event_window'
-                    """, (group_id,))
-
-                    # Insert new matches
-                    now = int(time.time())
-                    match_count = 0
-                    for photo_id, path in matching_photos:
-                        cur.execute("""
-                            INSERT OR IGNORE INTO group_asset_matches
-                                (group_id, scope, photo_id, computed_at)
-                            VALUES (?, 'event_window', ?, ?)
-                        """, (group_id, photo_id, now))
-                        match_count += 1
-
-                    if progress_callback:
-                        progress_callback(90, 100, f"Saved {match_count} matches")
-
-                    # Update group last_used_at
-                    cur.execute("""
-                        UPDATE person_groups SET last_used_at = ? WHERE id = ?
-                    """, (now, group_id))
+                if progress_callback:
+                    progress_callback(0, 100, f"Finding event windows with {member_count} people...")
+
+                # Get all photo timestamps for each member
+                placeholders = ','.join(['?'] * len(members))
+
+                cur.execute(f"""
+                    SELECT
+                        fc.branch_key,
+                        pm.created_ts,
+                        pm.id as photo_id,
+                        pm.path
+                    FROM face_crops fc
+                    JOIN photo_metadata pm ON pm.path = fc.image_path AND pm.project_id = fc.project_id
+                    WHERE fc.project_id = ?
+                      AND fc.branch_key IN ({placeholders})
+                      AND fc.confidence >= ?
+                      AND pm.created_ts IS NOT NULL
+                    ORDER BY pm.created_ts ASC
+                """, (project_id, *members, min_confidence))
+
+                events = cur.fetchall()
+
+                if not events:
+                    return {
+                        'success': True,
+                        'match_count': 0,
+                        'member_count': member_count,
+                        'message': 'No photos with timestamps found'
+                    }
 
-                    conn.commit()
+                if progress_callback:
+                    progress_callback(20, 100, f"Analyzing {len(events)} photo events...")
 
-                    duration = time.time() - start_time
+                # Find event windows where all members appear
+                matching_photos = set()
 
-                    if progress_callback:
-                        progress_callback(100, 100, f"Complete: {match_count} photos")
+                # Build person -> timestamp mapping
+                person_times: Dict[str, List[Tuple[int, int, str]]] = {m: [] for m in members}
+                for branch_key, ts, photo_id, path in events:
+                    if ts is not None:
+                        person_times[branch_key].append((ts, photo_id, path))
 
-                    logger.info(f"[PeopleGroupService] Event window matches for group {group_id}: "
-                               f"{match_count} photos within {window_seconds}s window in {duration:.2f}s")
+                # Sort each person's timeline
+                for m in members:
+                    person_times[m].sort(key=lambda x: x[0])
 
+                # Use the first member's timeline as anchor
+                if not person_times[members[0]]:
                     return {
                         'success': True,
-                        'match_count': match_count,
+                        'match_count': 0,
                         'member_count': member_count,
-                        'duration_s': duration,
-                        'window_seconds': window_seconds
+                        'message': 'No photos found for anchor person'
                     }
 
-            except sqlite3.OperationalError as e:
-                if "database is locked" in str(e) and attempt < max_retries - 1:
-                    wait = retry_delay * (2 ** attempt)
-                    logger.warning(
-                        f"[PeopleGroupService] Database locked for group {group_id} (event_window), "
-                        f"retrying in {wait}s (attempt {attempt + 1}/{max_retries})"
-                    )
-                    time.sleep(wait)
-                    continue
-                logger.error(f"[PeopleGroupService] Event window computation failed: {e}", exc_info=True)
-                return {
-                    'success': False,
-                    'error': str(e),
-                    'match_count': 0
-                }
+                anchor_member = members[0]
+                other_members = members[1:]
+
+                for anchor_ts, anchor_photo_id, anchor_path in person_times[anchor_member]:
+                    window_start = anchor_ts - window_seconds
+                    window_end = anchor_ts + window_seconds
+
+                    all_present = True
+                    window_photos = [(anchor_photo_id, anchor_path)]
+
+                    for other_member in other_members:
+                        found_in_window = False
+                        for other_ts, other_photo_id, other_path in person_times[other_member]:
+                            if window_start <= other_ts <= window_end:
+                                found_in_window = True
+                                window_photos.append((other_photo_id, other_path))
+                                break
+
+                        if not found_in_window:
+                            all_present = False
+                            break
+
+                    if all_present:
+                        for photo_id, path in window_photos:
+                            matching_photos.add((photo_id, path))
+
+                if progress_callback:
+                    progress_callback(70, 100, f"Found {len(matching_photos)} matching photos")
+
+                # Replace previous event_window matches (single-writer queue)
+                match_count = self._replace_group_matches(
+                    group_id, 'event_window', [photo_id for photo_id, _ in matching_photos]
+                )
+
+                if progress_callback:
+                    progress_callback(90, 100, f"Saved {match_count} matches")
+
+                duration = time.time() - start_time
+
+                if progress_callback:
+                    progress_callback(100, 100, f"Complete: {match_count} photos")
+
+                logger.info(f"[PeopleGroupService] Event window matches for group {group_id}: "
+                           f"{match_count} photos within {window_seconds}s window in {duration:.2f}s")
 
-            except Exception as e:
-                logger.error(f"[PeopleGroupService] Event window computation failed: {e}", exc_info=True)
                 return {
-                    'success': False,
-                    'error': str(e),
-                    'match_count': 0
+                    'success': True,
+                    'match_count': match_count,
+                    'member_count': member_count,
+                    'duration_s': duration,
+                    'window_seconds': window_seconds
                 }
 
+        except Exception as e:
+            logger.error(f"[PeopleGroupService] Event window computation failed: {e}", exc_info=True)
+            return {
+                'success': False,
+                'error': str(e),
+                'match_count': 0
+            }
+
     def get_group_matches(
         self,
         project_id: int,
@@ -9,6 +9,11 @@ Produces ranked merge suggestions from cluster data using multiple weak signals:
 
 Does NOT merge automatically — only produces ranked suggestions.
 Accepted/rejected pairs are excluded via caller-provided sets.
+
+Pairs are scored as a centroid similarity matrix (NumPy, row blocks) with
+size/penalty terms as array operations, pruned to the top candidates per
+row, and only the survivors are re-scored with _score_pair() so output is
+identical to scoring every pair.
 """
 
 from __future__ import annotations
@@ -17,6 +22,21 @@ from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 import math
 
+import numpy as np
+
+# Highest score a pair can reach with zero similarity (size + unnamed bonus).
+# Pairs only compete on similarity when min_score is above this.
+_MAX_SCORE_WITHOUT_SIMILARITY = 0.18 + 0.06
+
+# Slack between the float64 matrix scores and _score_pair()'s summation
+_SCORE_TOLERANCE = 1e-9
+
+# Suggestions are ranked by score rounded to this many places (ties keep scan order)
+_SCORE_DECIMALS = 4
+
+# Similarity matrix block budget (elements, ~32 MB of float64)
+_BLOCK_ELEMENTS = 4_000_000
+
 
 @dataclass
 class MergeCandidate:
@@ -63,31 +83,37 @@ class PeopleMergeEngine:
         rejected_pairs = rejected_pairs or set()
 
         normalized = self._normalize_clusters(clusters)
+        excluded = accepted_pairs | rejected_pairs
+
+        if self.min_score > _MAX_SCORE_WITHOUT_SIMILARITY:
+            pairs = self._candidate_pairs(normalized, excluded)
+        else:
+            n = len(normalized)
+            pairs = ((i, j) for i in range(n) for j in range(i + 1, n))
+
         suggestions: List[MergeCandidate] = []
+        for i, j in pairs:
+            left = normalized[i]
+            right = normalized[j]
 
-        for i in range(len(normalized)):
-            for j in range(i + 1, len(normalized)):
-                left = normalized[i]
-                right = normalized[j]
-
-                pair_key = self._pair_key(left["id"], right["id"])
-                if pair_key in accepted_pairs or pair_key in rejected_pairs:
-                    continue
-
-                score, rationale = self._score_pair(left, right)
-                if score < self.min_score:
-                    continue
-
-                label = f'{left["label"]} \u2194 {right["label"]}'
-                suggestions.append(
-                    MergeCandidate(
-                        left_id=left["id"],
-                        right_id=right["id"],
-                        score=round(score, 4),
-                        label=label,
-                        rationale=rationale,
-                    )
+            pair_key = self._pair_key(left["id"], right["id"])
+            if pair_key in excluded:
+                continue
+
+            score, rationale = self._score_pair(left, right)
+            if score < self.min_score:
+                continue
+
+            label = f'{left["label"]} \u2194 {right["label"]}'
+            suggestions.append(
+                MergeCandidate(
+                    left_id=left["id"],
+                    right_id=right["id"],
+                    score=round(score, _SCORE_DECIMALS),
+                    label=label,
+                    rationale=rationale,
                 )
+            )
 
         suggestions.sort(key=lambda x: x.score, reverse=True)
         return [
@@ -101,6 +127,109 @@ class PeopleMergeEngine:
             for s in suggestions[: self.max_candidates]
         ]
 
+    def _candidate_pairs(self, normalized: List[Dict[str, Any]], excluded: set) -> List[tuple[int, int]]:
+        """
+        Index pairs (i < j, in scan order) that can make the suggestion list.
+
+        Only pairs with positive similarity can pass min_score here, so pairs
+        are scored per group of same-dimension centroids. Each row keeps its
+        max_candidates best pairs: a pair in the overall top list is also in
+        its row's top list. The row cut-off compares rounded scores, as the
+        final ranking does, so every pair tying the k-th after rounding is
+        kept; ties and near-ties at both cut-offs (_SCORE_TOLERANCE) are
+        settled by the exact re-score in the caller.
+        """
+        n = len(normalized)
+        counts = np.array([c["count"] for c in normalized], dtype=np.float64)
+        unnamed = np.array([c["unnamed"] for c in normalized], dtype=bool)
+
+        index_of: Dict[str, List[int]] = {}
+        for i, c in enumerate(normalized):
+            index_of.setdefault(c["id"], []).append(i)
+
+        # Group unit-length centroids by dimension; zero/missing vectors have
+        # similarity 0 and cannot qualify. Non-finite ones get the scalar path.
+        groups: Dict[int, List[int]] = {}
+        vectors: Dict[int, np.ndarray] = {}
+        irregular: List[int] = []
+        for i, c in enumerate(normalized):
+            centroid = c["centroid"]
+            if centroid is None:
+                continue
+            try:
+                vec = np.asarray(centroid, dtype=np.float64)
+            except (TypeError, ValueError):
+                continue
+            if vec.ndim != 1 or vec.size == 0:
+                continue
+            if not np.all(np.isfinite(vec)):
+                irregular.append(i)
+                continue
+            norm = float(np.linalg.norm(vec))
+            if norm <= 0.0:
+                continue
+            vectors[i] = vec / norm
+            groups.setdefault(vec.size, []).append(i)
+
+        pairs = set()
+        k = max(1, int(self.max_candidates))
+        floor = self.min_score - _SCORE_TOLERANCE
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            idx = np.array(members)
+            mat = np.vstack([vectors[i] for i in members])
+            block = max(1, _BLOCK_ELEMENTS // len(members))
+
+            for start in range(0, len(members), block):
+                rows = idx[start:start + block]
+                sim = mat[start:start + block] @ mat.T
+
+                small = np.minimum.outer(counts[rows], counts[idx])
+                large = np.maximum.outer(counts[rows], counts[idx])
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    size_score = np.where(small > 0, np.clip(small / large, 0.0, 1.0), 0.0)
+                bonus = np.where(np.logical_or.outer(unnamed[rows], unnamed[idx]), 0.06, 0.0)
+                penalty = np.where(
+                    (large >= 20) & (small <= 2), 0.16,
+                    np.where((large >= 15) & (small <= 3), 0.10, 0.0),
+                )
+                score = 0.70 * sim + 0.18 * size_score + bonus - penalty
+
+                # Upper triangle only (members are in scan order)
+                score[np.arange(len(rows))[:, None] + start >= np.arange(len(idx))[None, :]] = -np.inf
+                if excluded:
+                    self._mask_excluded(score, rows, idx, excluded, index_of)
+
+                for r in range(len(rows)):
+                    row = score[r]
+                    cols = np.flatnonzero(row >= floor)
+                    if cols.size > k:
+                        kth = np.partition(row[cols], cols.size - k)[cols.size - k]
+                        # Lowest score that can round to the k-th's rounded value
+                        cut = round(float(kth), _SCORE_DECIMALS) - 0.5 * 10.0 ** -_SCORE_DECIMALS
+                        cols = cols[row[cols] >= cut - _SCORE_TOLERANCE]
+                    i = int(rows[r])
+                    pairs.update((i, int(idx[c])) for c in cols)
+
+        for i in irregular:
+            pairs.update((min(i, j), max(i, j)) for j in range(n) if j != i)
+
+        return sorted(pairs)
+
+    @staticmethod
+    def _mask_excluded(score: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+                       excluded: set, index_of: Dict[str, List[int]]):
+        """Set excluded pairs in a score block to -inf."""
+        row_pos = {int(g): r for r, g in enumerate(rows)}
+        col_pos = {int(g): c for c, g in enumerate(cols)}
+        for a, b in excluded:
+            for x in index_of.get(a, ()):
+                for y in index_of.get(b, ()):
+                    for i, j in ((x, y), (y, x)):
+                        if i in row_pos and j in col_pos:
+                            score[row_pos[i], col_pos[j]] = -np.inf
+
     def _normalize_clusters(self, clusters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         out = []
         for c in clusters or []:
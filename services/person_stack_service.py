@@ -171,36 +171,28 @@ class PersonStackService:
             with self.db._connect() as conn:
                 cur = conn.execute("""
                     SELECT
+                        id,
                         image_path,
-                        embedding,
                         confidence,
                         is_representative
                     FROM face_crops
                     WHERE project_id = ? AND branch_key = ?
                 """, (project_id, branch_key))
+                rows = cur.fetchall()
+
+            # Embeddings come from the packed face matrix (one gather, no BLOBs)
+            from services.face_embedding_matrix_store import get_face_embedding_matrix_store
+            vectors = get_face_embedding_matrix_store(project_id).get_vectors(row[0] for row in rows)
+
+            face_data = {}
+            for face_id, image_path, confidence, is_representative in rows:
+                face_data[image_path] = {
+                    'embedding': vectors.get(face_id),
+                    'confidence': confidence,
+                    'is_representative': bool(is_representative)
+                }
 
-                face_data = {}
-                for row in cur.fetchall():
-                    image_path = row[0]
-                    embedding_blob = row[1]
-                    confidence = row[2]
-                    is_representative = row[3]
-
-                    # Deserialize embedding if available
-                    embedding = None
-                    if embedding_blob:
-                        try:
-                            embedding = np.frombuffer(embedding_blob, dtype=np.float32)
-                        except Exception as e:
-                            logger.warning(f"Failed to load embedding for {image_path}: {e}")
-
-                    face_data[image_path] = {
-                        'embedding': embedding,
-                        'confidence': confidence,
-                        'is_representative': bool(is_representative)
-                    }
-
-                return face_data
+            return face_data
 
         except Exception as e:
             logger.error(f"Error getting face data: {e}", exc_info=True)
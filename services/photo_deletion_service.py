@@ -119,6 +119,9 @@ class PhotoDeletionService:
             project_id = list(project_ids)[0]
             self._update_folder_counts(folders_to_update, project_id)
 
+        # Drop deleted photos from the ANN index on next search
+        self._mark_ann_dirty(project_ids)
+
         # Invalidate thumbnail cache
         if invalidate_cache:
             self._invalidate_thumbnails(paths)
@@ -220,6 +223,9 @@ class PhotoDeletionService:
             project_id = list(project_ids)[0]
             self._update_folder_counts(folders_to_update, project_id)
 
+        # Drop deleted photos from the ANN index on next search
+        self._mark_ann_dirty(project_ids)
+
         # Invalidate thumbnail cache
         if invalidate_cache:
             self._invalidate_thumbnails(paths)
@@ -289,6 +295,8 @@ class PhotoDeletionService:
         except Exception as e:
             self.logger.warning(f"Failed to update folder count: {e}")
 
+        self._mark_ann_dirty({project_id})
+
         # Invalidate thumbnail cache
         self._invalidate_thumbnails(paths)
 
@@ -310,6 +318,20 @@ class PhotoDeletionService:
             except Exception as e:
                 self.logger.warning(f"Failed to update folder {folder_id} count: {e}")
 
+    def _mark_ann_dirty(self, project_ids: set):
+        """
+        Mark the semantic ANN index dirty so deleted photos are removed.
+
+        Args:
+            project_ids: Projects that lost photos
+        """
+        try:
+            from services.search_orchestrator import SearchOrchestrator
+            for project_id in project_ids:
+                SearchOrchestrator.mark_ann_dirty(project_id)
+        except Exception as e:
+            self.logger.debug(f"Failed to mark ANN index dirty: {e}")
+
     def _invalidate_thumbnails(self, paths: List[str]):
         """
         Invalidate thumbnail cache entries for deleted photos.
@@ -2,23 +2,38 @@
 # Version 10.01.01.04 dated 20260127
 # Photo scanning service - Uses MetadataService for extraction
 
+import multiprocessing
 import os
 import platform
 import time
-import sys
-import shutil
 from pathlib import Path
-from typing import Optional, List, Tuple, Callable, Dict, Any, Set
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Optional, List, Tuple, Callable, Dict, Any, Set, Iterable, Iterator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures import BrokenExecutor
 from dataclasses import dataclass
+from functools import partial
 
 from repository import PhotoRepository, FolderRepository, ProjectRepository, DatabaseConnection
+from repository.search_feature_repository import SearchFeatureRepository
 from logging_config import get_logger
 from .metadata_service import MetadataService
 
 logger = get_logger(__name__)
 
 
+# Per-process MetadataService for the scan's process pool (created lazily in each worker)
+_worker_metadata_service: Optional[MetadataService] = None
+
+
+def _extract_basic_metadata_in_worker(path: str):
+    """Process-pool entry point for MetadataService.extract_basic_metadata()."""
+    global _worker_metadata_service
+    if _worker_metadata_service is None:
+        _worker_metadata_service = MetadataService()
+    return _worker_metadata_service.extract_basic_metadata(path)
+
+
 @dataclass
 class ScanResult:
     """Results from a photo repository scan."""
@@ -126,6 +141,13 @@ class PhotoScanService:
     # Combined: all supported media files (photos + videos)
     SUPPORTED_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
 
+    # Scan pipeline tuning
+    MAX_DEFAULT_WORKERS = 8          # Default worker cap when scan_workers is unset
+    PIPELINE_DEPTH = 4               # Files in flight per worker in each stage
+    PROCESS_POOL_MIN_FILES = 200     # Smaller scans don't amortise process start-up
+    METADATA_TIMEOUT = 5.0           # Per-file header/EXIF parse limit (seconds)
+    FLUSH_INTERVAL = 2.0             # Commit partial batches at least this often (seconds)
+
     # Default ignore patterns (OS-specific to avoid irrelevant exclusions)
     # Common folders to ignore across all platforms
     _COMMON_IGNORE_FOLDERS = {
@@ -158,7 +180,9 @@ class PhotoScanService:
                  project_repo: Optional[ProjectRepository] = None,
                  metadata_service: Optional[MetadataService] = None,
                  batch_size: int = 200,
-                 stat_timeout: float = 3.0):
+                 stat_timeout: float = 3.0,
+                 workers: Optional[int] = None,
+                 use_processes: Optional[bool] = None):
         """
         Initialize scan service.
 
@@ -171,6 +195,11 @@ class PhotoScanService:
                        NOTE: Could be made configurable via SettingsManager in the future
             stat_timeout: Timeout for os.stat calls in seconds (default: 3.0)
                          NOTE: Could be made configurable via SettingsManager in the future
+            workers: Parallel workers for the stat and metadata stages
+                     (default: "scan_workers" setting, else min(8, CPU count))
+            use_processes: Parse headers/EXIF in a process pool (default: True
+                           unless a custom metadata_service was injected, since
+                           it cannot be shipped to worker processes)
         """
         self.project_id = project_id
         
@@ -181,6 +210,13 @@ class PhotoScanService:
 
         self.batch_size = batch_size
         self.stat_timeout = stat_timeout
+        self.workers = self._resolve_workers(workers)
+        self.use_processes = (metadata_service is None) if use_processes is None else bool(use_processes)
+        self._parse_executor = None
+        self._parse_fn = None
+        self._retired_executors = []
+        self._process_pool_failed = False
+        self._discovery_complete = False
 
         self._cancelled = False
         self._stats = {
@@ -256,6 +292,10 @@ class PhotoScanService:
             # Fallback to generic message
             status_line = f"📷 {file_name} ({file_size_kb} KB)"
 
+        if not self._discovery_complete:
+            # Streaming discovery: totals are still growing
+            status_line = f"{status_line}  (discovering… {self._total_media_files} files found)"
+
         progress = ScanProgress(
             current=processed_media,
             total=self._total_media_files,
@@ -270,8 +310,6 @@ class PhotoScanService:
                 self._last_progress_emit = now if now is not None else time.time()
         except Exception as e:
             logger.error(f"Progress callback error: {e}", exc_info=True)
-            print(f"[SCAN] ⚠️ Progress callback failed: {e}")
-            sys.stdout.flush()
 
     # ------------------------------------------------------------------
     # Quick pre-scan statistics (no metadata, no hashes — just counting)
@@ -347,7 +385,8 @@ class PhotoScanService:
                        extract_exif_date: bool = True,
                        ignore_folders: Optional[Set[str]] = None,
                        progress_callback: Optional[Callable[[ScanProgress], None]] = None,
-                       on_video_metadata_finished: Optional[Callable[[int, int], None]] = None) -> ScanResult:
+                       on_video_metadata_finished: Optional[Callable[[int, int], None]] = None,
+                       on_batch_written: Optional[Callable[[int], None]] = None) -> ScanResult:
         """
         Scan a photo repository and index all photos.
 
@@ -359,6 +398,8 @@ class PhotoScanService:
             extract_exif_date: Extract EXIF DateTimeOriginal
             ignore_folders: Folders to skip (uses defaults if None)
             progress_callback: Optional callback for progress updates
+            on_batch_written: Optional callback with the row count of each committed
+                              photo batch (lets the UI show photos while scanning)
 
         Returns:
             ScanResult with statistics
@@ -374,6 +415,10 @@ class PhotoScanService:
         self._videos_processed = 0
         self._scan_start_time = start_time
         self._last_progress_emit = 0.0
+        self._total_photos = 0
+        self._total_videos = 0
+        self._total_media_files = 0
+        self._discovery_complete = False
 
         # FIX: If skip_unchanged not specified, use incremental value
         if skip_unchanged is None:
@@ -392,7 +437,7 @@ class PhotoScanService:
         self._ensure_project_exists(project_id, root_folder)
 
         try:
-            # Step 1: Discover all media files (photos + videos)
+            # Step 1: Resolve exclusions
             # Priority: explicit parameter > settings > platform-specific defaults
             if ignore_folders is not None:
                 ignore_set = ignore_folders
@@ -400,45 +445,6 @@ class PhotoScanService:
                 # Check settings for custom exclusions
                 ignore_set = self._get_ignore_folders_from_settings()
 
-            # _discover_files/_discover_videos already dedup internally
-            # via _deduplicate_paths() using resolved canonical paths.
-            all_files = self._discover_files(root_path, ignore_set)
-            all_videos = self._discover_videos(root_path, ignore_set)
-
-            total_files = len(all_files)
-            total_videos = len(all_videos)
-            self._total_photos = total_files
-            self._total_videos = total_videos
-            self._total_media_files = total_files + total_videos
-
-            logger.info(f"Discovered {total_files} candidate image files and {total_videos} video files")
-
-            # CRITICAL FIX: Send discovery message to progress callback for dialog threshold check
-            # scan_controller.py needs this message to parse file count and decide whether to show dialog
-            if progress_callback:
-                discovery_msg = self._build_progress_message(
-                    status_line="Preparing scan…",
-                    current_path=root_path,
-                    processed_count=0,
-                    total_count=self._total_media_files,
-                    discovery=True
-                )
-                progress = ScanProgress(
-                    current=0,
-                    total=self._total_media_files,
-                    percent=0,
-                    message=discovery_msg,
-                    current_file=None
-                )
-                try:
-                    progress_callback(progress)
-                except Exception as e:
-                    logger.warning(f"Progress callback error during discovery: {e}")
-
-            if total_files == 0 and total_videos == 0:
-                logger.warning("No media files found")
-                return ScanResult(0, 0, 0, 0, 0, time.time() - start_time)
-
             # Step 2: Load existing metadata for incremental scan
             existing_metadata = {}
             existing_video_metadata = {}
@@ -454,135 +460,61 @@ class PhotoScanService:
                     existing_metadata = {}
                     existing_video_metadata = {}
 
-            # Step 3: Process files in batches
-            batch_rows = []
-            folders_seen: Set[str] = set()
-
-            # DEADLOCK FIX v2: Use single executor for entire scan
-            # PROBLEM v1: Fresh executor per file = 105 executors, massive overhead, thread leaks
-            # PROBLEM v2: Batch approach (every 5 files) = shutdown(wait=True) DEADLOCKS at boundaries
-            #   - Root cause: Main thread blocks on executor.shutdown(wait=True)
-            #   - While blocking, database/Qt operations can't proceed → circular wait
-            #   - Observed: Freeze at file 10/15 (66%) when recreating executor
-            # SOLUTION v2: Single executor for entire scan, shutdown only at end
-            #   - No mid-scan shutdown calls = no deadlock opportunities
-            #   - All futures properly awaited via .result() calls
-            #   - Clean shutdown in finally block when scan completes
-            executor = ThreadPoolExecutor(max_workers=2)
-            print(f"[SCAN] Created single executor for scan ({total_files} files)")
-
-            try:
-                for i, file_path in enumerate(all_files, 1):
-                    if self._cancelled:
-                        logger.info("Scan cancelled by user")
-                        break
-
-                    # Update progress details for UI — mark as starting
-                    self._last_file_details['filename'] = file_path.name
-                    self._last_file_details['status'] = 'starting'
-                    self._last_file_details['width'] = None
-                    self._last_file_details['height'] = None
-                    self._last_file_details['date_taken'] = None
+            if progress_callback:
+                discovery_msg = self._build_progress_message(
+                    status_line="Preparing scan…",
+                    current_path=root_path,
+                    processed_count=0,
+                    total_count=0,
+                    discovery=True
+                )
+                try:
+                    progress_callback(ScanProgress(current=0, total=0, percent=0,
+                                                   message=discovery_msg, current_file=None))
+                except Exception as e:
+                    logger.warning(f"Progress callback error during discovery: {e}")
 
-                    # NOTE: Removed per-file "starting" emit to prevent UI stutter.
-                    # The main throttled emit below (every 0.35 s / 25 files) is sufficient.
+            # Step 3: Single streaming walk feeds the stat -> parse -> write pipeline
+            # directly; videos are collected along the way for Step 4.
+            all_videos: List[Path] = []
 
-                    try:
-                        # Process file
-                        row = self._process_file(
-                            file_path=file_path,
-                            root_path=root_path,
-                            project_id=project_id,
-                            existing_metadata=existing_metadata,
-                            skip_unchanged=skip_unchanged,
-                            extract_exif_date=extract_exif_date,
-                            executor=executor
-                        )
-                    except Exception as file_error:
-                        logger.error(f"File processing error: {file_error}")
-                        self._stats['photos_failed'] += 1
-                        continue
+            def _photo_stream():
+                for is_video, path, entry in self._discover_media(root_path, ignore_set):
+                    if is_video:
+                        all_videos.append(path)
+                    else:
+                        yield path, entry
 
-                    if row is None:
-                        # Skipped or failed
-                        continue
+            folders_seen: Set[str] = set()
+            self._scan_photos_pipelined(
+                files=_photo_stream(),
+                root_path=root_path,
+                project_id=project_id,
+                existing_metadata=existing_metadata,
+                skip_unchanged=skip_unchanged,
+                extract_exif_date=extract_exif_date,
+                folders_seen=folders_seen,
+                progress_callback=progress_callback,
+                on_batch_written=on_batch_written
+            )
 
-                    # Track folder
-                    folder_path = os.path.dirname(str(file_path))
-                    folders_seen.add(folder_path)
+            total_files = self._total_photos
+            total_videos = len(all_videos)
+            logger.info(f"Discovered {total_files} candidate image files and {total_videos} video files")
 
-                    batch_rows.append(row)
-
-                    # Flush batch if needed
-                    if len(batch_rows) >= self.batch_size:
-                        logger.info(f"Writing batch of {len(batch_rows)} photos to database")
-                        self._write_batch(batch_rows, project_id)
-                        batch_rows.clear()
-
-                    self._photos_processed = i
-
-                    # Report progress (check cancellation here too for responsiveness)
-                    if progress_callback:
-                        now = time.time()
-                        should_emit = (
-                            i == total_files
-                            or i <= 5  # show early feedback immediately
-                            or (now - self._last_progress_emit) >= 0.35
-                            or i % 25 == 0
-                        )
-
-                        if should_emit:
-                            # RESPONSIVE CANCEL: Check during progress reporting
-                            if self._cancelled:
-                                logger.info("Scan cancelled during progress reporting")
-                                break
-
-                            self._emit_progress_event(
-                                progress_callback=progress_callback,
-                                file_path=file_path,
-                                file_index=i,
-                                total_files=total_files,
-                                row=row,
-                                now=now
-                            )
-
-                # Final batch flush
-                if batch_rows and not self._cancelled:
-                    print(f"[SCAN] ⚡ Writing final batch to database: {len(batch_rows)} photos")
-                    logger.info(f"Writing final batch of {len(batch_rows)} photos to database")
-                    self._write_batch(batch_rows, project_id)
-                    print(f"[SCAN] ✓ Final batch write complete")
-
-            finally:
-                # DEADLOCK FIX v2: Shutdown executor with wait=False to avoid blocking
-                # All futures are already awaited via .result() calls, so wait=False is safe
-                if executor is not None:
-                    try:
-                        print(f"[SCAN] Shutting down executor")
-                        executor.shutdown(wait=False, cancel_futures=True)
-                        logger.info(f"Executor shutdown complete")
-                    except Exception as e:
-                        logger.warning(f"Final executor shutdown error: {e}")
+            if total_files == 0 and total_videos == 0 and not self._cancelled:
+                logger.warning("No media files found")
+                return ScanResult(0, 0, 0, 0, 0, time.time() - start_time)
 
             # Step 4: Process videos
-            print(f"\n[SCAN] === STEP 4: VIDEO PROCESSING ===")
-            print(f"[SCAN] total_videos={total_videos}")
-            print(f"[SCAN] self._cancelled={self._cancelled}")
-            print(f"[SCAN] Condition check: {total_videos} > 0 and not {self._cancelled} = {total_videos > 0 and not self._cancelled}")
-            sys.stdout.flush()
-
             if total_videos > 0 and not self._cancelled:
-                print(f"[SCAN] Condition TRUE - calling _process_videos()")
-                sys.stdout.flush()
                 logger.info(f"Processing {total_videos} videos...")
                 self._process_videos(all_videos, root_path, project_id, folders_seen, skip_unchanged, existing_video_metadata, progress_callback)
             else:
-                print(f"[SCAN] Condition FALSE - skipping video processing!")
-                if total_videos == 0:
-                    print(f"[SCAN]   Reason: No videos found (total_videos=0)")
-                if self._cancelled:
-                    print(f"[SCAN]   Reason: Scan was cancelled")
-                sys.stdout.flush()
+                logger.debug(
+                    f"Skipping video processing "
+                    f"({'scan cancelled' if self._cancelled else 'no videos found'})"
+                )
 
             # Step 5: Create default project and branch if needed
             self._ensure_default_project(root_folder)
@@ -624,95 +556,87 @@ class PhotoScanService:
         self._cancelled = True
         logger.info("Scan cancellation requested")
 
-    def _deduplicate_paths(self, paths: List[Path]) -> List[Path]:
-        """De-duplicate candidate paths while preserving order.
-
-        Symlinks, NTFS junctions, and case-insensitive filesystems can make
-        os.walk() yield the same physical file under different paths, causing
-        doubled DB rows and wasted background work.
-
-        Uses os.path.normcase (platform-aware) instead of .lower() so the
-        behaviour is correct on both Windows (case-insensitive) and Linux
-        (case-sensitive).
-        """
-        seen: set = set()
-        unique: List[Path] = []
-        for p in paths or []:
-            try:
-                key = os.path.normcase(str(p.resolve()))
-            except OSError:
-                key = os.path.normcase(str(p))
-            if key not in seen:
-                seen.add(key)
-                unique.append(p)
-        removed = len(paths) - len(unique)
-        if removed > 0:
-            logger.info(f"De-duplicated {removed} duplicate path(s) from {len(paths)} candidates")
-        return unique
-
-    def _discover_files(self, root_path: Path, ignore_folders: Set[str]) -> List[Path]:
+    def _discover_media(self, root_path: Path, ignore_folders: Set[str]) -> Iterator[Tuple[bool, Path, os.DirEntry]]:
         """
-        Discover all image files in directory tree.
-
-        Args:
-            root_path: Root directory
-            ignore_folders: Folder names to skip
-
-        Returns:
-            List of image file paths
+        Stream photos and videos from a single os.scandir walk.
+
+        Yields (is_video, path, dir_entry) as soon as each directory is listed,
+        so processing starts before the walk finishes. The DirEntry is passed on
+        because its stat() result is cached (free on Windows, one syscall on
+        POSIX, and never repeated). Running totals are kept in _total_photos,
+        _total_videos and _total_media_files.
+
+        Duplicates from symlinks, NTFS junctions and case-insensitive
+        filesystems are dropped by canonical path: one realpath() per
+        directory (and per symlinked file) rather than one per file.
+        Keys use os.path.normcase (platform-aware) so the behaviour is correct
+        on both Windows (case-insensitive) and Linux (case-sensitive).
         """
-        image_files = []
-
-        for dirpath, dirnames, filenames in os.walk(root_path):
-            # Check cancellation during discovery (responsive cancel)
-            if self._cancelled:
-                logger.info("File discovery cancelled by user")
-                return image_files
+        seen_dirs: Set[str] = set()
+        seen_files: Set[str] = set()
+        stack = [str(root_path)]
+        duplicates = 0
 
-            # Filter ignored directories in-place
-            dirnames[:] = [
-                d for d in dirnames
-                if d not in ignore_folders and not d.startswith(".")
-            ]
-
-            for filename in filenames:
-                ext = Path(filename).suffix.lower()
-                if ext in self.IMAGE_EXTENSIONS:  # CRITICAL FIX: Use IMAGE_EXTENSIONS, not SUPPORTED_EXTENSIONS
-                    image_files.append(Path(dirpath) / filename)
-
-        return self._deduplicate_paths(image_files)
+        try:
+            while stack:
+                # Check cancellation during discovery (responsive cancel)
+                if self._cancelled:
+                    logger.info("Media discovery cancelled by user")
+                    return
 
-    def _discover_videos(self, root_path: Path, ignore_folders: Set[str]) -> List[Path]:
-        """
-        Discover all video files in directory tree.
+                dirpath = stack.pop()
+                dir_key = os.path.normcase(os.path.realpath(dirpath))
+                if dir_key in seen_dirs:
+                    duplicates += 1
+                    continue
+                seen_dirs.add(dir_key)
 
-        Args:
-            root_path: Root directory
-            ignore_folders: Folder names to skip
+                try:
+                    with os.scandir(dirpath) as it:
+                        entries = list(it)
+                except OSError as e:
+                    logger.warning(f"Cannot list {dirpath}: {e}")
+                    continue
 
-        Returns:
-            List of video file paths
-        """
-        video_files = []
+                subdirs = []
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        if entry.is_dir():
+                            # Filter ignored directories
+                            if name not in ignore_folders and not name.startswith("."):
+                                subdirs.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
 
-        for dirpath, dirnames, filenames in os.walk(root_path):
-            # Check cancellation during discovery (responsive cancel)
-            if self._cancelled:
-                logger.info("Video discovery cancelled by user")
-                return video_files
+                    ext = os.path.splitext(name)[1].lower()
+                    is_video = ext in self.VIDEO_EXTENSIONS
+                    if not is_video and ext not in self.IMAGE_EXTENSIONS:
+                        continue
 
-            # Filter ignored directories in-place
-            dirnames[:] = [
-                d for d in dirnames
-                if d not in ignore_folders and not d.startswith(".")
-            ]
+                    if entry.is_symlink():
+                        file_key = os.path.normcase(os.path.realpath(entry.path))
+                    else:
+                        file_key = os.path.join(dir_key, os.path.normcase(name))
+                    if file_key in seen_files:
+                        duplicates += 1
+                        continue
+                    seen_files.add(file_key)
 
-            for filename in filenames:
-                ext = Path(filename).suffix.lower()
-                if ext in self.VIDEO_EXTENSIONS:
-                    video_files.append(Path(dirpath) / filename)
+                    if is_video:
+                        self._total_videos += 1
+                    else:
+                        self._total_photos += 1
+                    self._total_media_files += 1
+                    yield is_video, Path(entry.path), entry
 
-        return self._deduplicate_paths(video_files)
+                # Reverse so subdirectories are visited in listing order
+                stack.extend(reversed(subdirs))
+        finally:
+            self._discovery_complete = True
+            if duplicates:
+                logger.info(f"De-duplicated {duplicates} duplicate path(s) during discovery")
 
     def _get_ignore_folders_from_settings(self) -> Set[str]:
         """
@@ -828,8 +752,8 @@ class PhotoScanService:
         """
         Quickly extract video creation date during scan with timeout.
 
-        Uses ffprobe to extract creation_time from video metadata. This is faster
-        and more accurate than using file modified date.
+        Uses ffprobe (through the shared VideoProbeEngine) to read the container
+        creation date. This is more accurate than using file modified date.
 
         Args:
             video_path: Path to video file
@@ -841,221 +765,253 @@ class PhotoScanService:
         Note:
             This method prioritizes speed over completeness:
             - Uses short timeout to avoid blocking scan
-            - Only extracts creation date (not duration, resolution, etc.)
+            - Probes are normally already running (see _prefetch_video_probes)
             - Falls back to None if extraction fails (caller uses modified date)
-            - Background workers will extract full metadata later
+            - The full result is cached, so the background metadata worker
+              does not run ffprobe again for this file
         """
-        import subprocess
-        import json  # CRITICAL FIX: Import outside try block to avoid "referenced before assignment" error
-
         try:
-            # Check if ffprobe is available
-            if not shutil.which('ffprobe'):
-                return None
-
-            # Quick ffprobe extraction with timeout
-            # Only extract creation_time tag, not full metadata
-            result = subprocess.run(
-                [
-                    'ffprobe',
-                    '-v', 'quiet',
-                    '-print_format', 'json',
-                    '-show_entries', 'format_tags=creation_time',
-                    str(video_path)
-                ],
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-
-            if result.returncode != 0:
+            from services.video_probe_engine import get_video_probe_engine
+            engine = get_video_probe_engine()
+            if not engine.available:
                 return None
 
-            # Parse JSON output
-            data = json.loads(result.stdout)
-
-            # Extract creation_time from format tags
-            creation_time = data.get('format', {}).get('tags', {}).get('creation_time')
+            # One ffprobe for all fields, shared with the metadata worker through
+            # the engine cache; a probe still running after the timeout keeps
+            # going in the background (usually already started by prefetch)
+            metadata = engine.probe(str(video_path), timeout=timeout)
+            date_taken = metadata.get('date_taken')
 
-            if not creation_time:
+            # Without a container date the service falls back to the file's
+            # modified time, which the caller uses anyway
+            if not date_taken or date_taken == metadata.get('modified'):
                 return None
+            return date_taken.split(' ')[0]
 
-            # Parse ISO 8601 timestamp: 2024-11-12T10:30:45.000000Z
-            # Extract YYYY-MM-DD part
-            from datetime import datetime
-            dt = datetime.fromisoformat(creation_time.replace('Z', '+00:00'))
-            return dt.strftime('%Y-%m-%d')
-
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, ValueError, Exception) as e:
+        except Exception as e:
             logger.debug(f"Quick video date extraction failed for {video_path}: {e}")
             return None
 
-    def _process_file(self,
-                     file_path: Path,
-                     root_path: Path,
-                     project_id: int,
-                     existing_metadata: Dict[str, str],
-                     skip_unchanged: bool,
-                     extract_exif_date: bool,
-                     executor: ThreadPoolExecutor) -> Optional[Tuple]:
+    def _prefetch_video_probes(self, video_files: List[Path], skip_unchanged: bool,
+                               existing_video_metadata: Dict[str, str]) -> int:
         """
-        Process a single image file.
+        Start ffprobe for every video the scan will index, several at a time.
+
+        Unchanged videos skipped by an incremental scan are not probed.
 
         Returns:
-            Tuple for database insert, or None if skipped/failed
+            Number of videos queued
         """
-        # RESPONSIVE CANCEL: Check before processing each file
-        if self._cancelled:
-            return None
-
-        path_str = str(file_path)
-        print(f"[SCAN] _process_file started for: {path_str}")
-        sys.stdout.flush()
-
-        # Step 1: Get file stats with timeout protection
         try:
-            print(f"[SCAN] Getting file stats...")
-            sys.stdout.flush()
-            future = executor.submit(os.stat, path_str)
-            stat_result = future.result(timeout=self.stat_timeout)
-            print(f"[SCAN] File stats retrieved successfully")
-            sys.stdout.flush()
-        except FuturesTimeoutError:
-            logger.warning(f"os.stat timeout for {path_str}")
-            self._stats['photos_failed'] += 1
-            try:
-                future.cancel()
-            except Exception:
-                pass
-            return None
-        except FileNotFoundError:
-            logger.debug(f"File not found: {path_str}")
-            self._stats['photos_failed'] += 1
-            return None
+            from services.video_probe_engine import get_video_probe_engine
+            engine = get_video_probe_engine()
+            if not engine.available:
+                return 0
+
+            paths = []
+            for video_path in video_files:
+                if skip_unchanged:
+                    try:
+                        mtime = os.stat(video_path).st_mtime
+                    except OSError:
+                        continue
+                    modified = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mtime))
+                    normalized_path = self.photo_repo._normalize_path(str(video_path))
+                    if existing_video_metadata.get(normalized_path) == modified:
+                        continue
+                paths.append(str(video_path))
+            return engine.prefetch(paths)
         except Exception as e:
-            logger.warning(f"os.stat failed for {path_str}: {e}")
-            self._stats['photos_failed'] += 1
-            return None
+            logger.debug(f"Video probe prefetch failed: {e}")
+            return 0
 
-        # Step 2: Extract basic metadata from stat
+    def _resolve_workers(self, workers: Optional[int]) -> int:
+        """Worker count for the stat and metadata stages (explicit > settings > CPU count)."""
+        if workers is None:
+            try:
+                from settings_manager_qt import SettingsManager
+                workers = SettingsManager().get("scan_workers", None)
+            except Exception:
+                workers = None
+        try:
+            workers = int(workers) if workers else 0
+        except (TypeError, ValueError):
+            workers = 0
+        if workers <= 0:
+            workers = min(self.MAX_DEFAULT_WORKERS, os.cpu_count() or 2)
+        return max(1, workers)
+
+    def _start_parse_executor(self):
+        """Create the thread executor the header/EXIF stage starts on."""
+        self._parse_executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan-meta")
+        self._parse_fn = self.metadata_service.extract_basic_metadata
+        self._retired_executors = []
+        logger.info(f"[PhotoScanService] Metadata stage: {self.workers} worker threads")
+
+    def _maybe_upgrade_parse_executor(self):
+        """
+        Move the header/EXIF stage to a process pool once the walk has found
+        enough photos to amortise worker start-up.
+
+        Pillow decoding holds the GIL for most of the header parse, so large
+        scans benefit from processes; small ones finish on threads before a
+        pool would even be ready. Only used with the default MetadataService.
+        Files already queued on the thread executor finish there. Workers are
+        spawned, never forked: the scan runs on a Qt worker thread.
+        """
+        if (not self.use_processes or self.workers < 2
+                or not isinstance(self._parse_executor, ThreadPoolExecutor)
+                or self._total_photos < self.PROCESS_POOL_MIN_FILES
+                or self._process_pool_failed):
+            return
         try:
-            mtime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stat_result.st_mtime))
-            size_kb = stat_result.st_size / 1024.0
+            pool = ProcessPoolExecutor(max_workers=self.workers,
+                                       mp_context=multiprocessing.get_context("spawn"))
         except Exception as e:
-            logger.error(f"Failed to process stat result for {path_str}: {e}")
-            self._stats['photos_failed'] += 1
-            return None
-
-        # Step 3: Skip if unchanged (incremental scan)
-        # CRITICAL FIX: Normalize path before lookup (database stores normalized paths)
-        normalized_path = self.photo_repo._normalize_path(path_str)
-        if skip_unchanged and existing_metadata.get(normalized_path) == mtime:
-            self._stats['photos_skipped'] += 1
-            return None
-
-        # RESPONSIVE CANCEL: Check before expensive metadata extraction
-        if self._cancelled:
-            return None
+            self._process_pool_failed = True
+            logger.warning(f"[PhotoScanService] Process pool unavailable, staying on threads: {e}")
+            return
+        self._retired_executors.append(self._parse_executor)
+        self._parse_executor = pool
+        self._parse_fn = _extract_basic_metadata_in_worker
+        logger.info(f"[PhotoScanService] Metadata stage: {self.workers} worker processes")
+
+    def _fallback_to_thread_parse(self):
+        """Replace a broken process pool with threads for the rest of the scan."""
+        if isinstance(self._parse_executor, ThreadPoolExecutor):
+            return
+        self._process_pool_failed = True
+        logger.warning("[PhotoScanService] Metadata process pool broke, continuing with threads")
+        try:
+            self._parse_executor.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+        self._parse_executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan-meta")
+        self._parse_fn = self.metadata_service.extract_basic_metadata
+
+    def _iter_file_stats(self,
+                         files: Iterable[Tuple[Path, Optional[os.DirEntry]]],
+                         stat_executor: ThreadPoolExecutor,
+                         window: int):
+        """
+        Stat stage: yield (file_path, stat_result) in discovery order.
 
-        # Step 4: Extract dimensions, EXIF date, and GPS using MetadataService
-        # CRITICAL FIX: Wrap metadata extraction with timeout to prevent hangs
-        # PIL/Pillow can hang on corrupted images, malformed TIFF/EXIF, or files with infinite loops
-        # BUG FIX #8: Use fast extract_basic_metadata() to avoid hangs, compute created_* inline
-        # LONG-TERM FIX (2026-01-08): Now also extracts GPS coordinates for Locations section
-        width = height = date_taken = gps_lat = gps_lon = None
-        created_ts = created_date = created_year = None
-        metadata_timeout = 5.0  # 5 seconds per image
-
-        if extract_exif_date:
-            # Use fast basic metadata extraction (BUG FIX #8: Reverted from extract_metadata)
+        Keeps at most ``window`` stat calls in flight so slow/network storage
+        is queried concurrently. Uses the DirEntry's cached stat() when the
+        walk provided one. stat_result is None when the call failed or
+        exceeded stat_timeout (already counted as failed).
+        """
+        in_flight = deque()
+        files_iter = iter(files)
+
+        def _fill():
+            while len(in_flight) < window and not self._cancelled:
+                item = next(files_iter, None)
+                if item is None:
+                    return
+                file_path, entry = item
+                stat_call = entry.stat if entry is not None else partial(os.stat, str(file_path))
+                in_flight.append((file_path, stat_executor.submit(stat_call)))
+
+        _fill()
+        while in_flight:
+            if self._cancelled:
+                return
+            file_path, future = in_flight.popleft()
             try:
-                # DIAGNOSTIC: Always log which file is being processed (can help identify freeze cause)
-                logger.info(f"📷 Processing: {os.path.basename(path_str)} ({size_kb:.1f} KB)")
-                print(f"[SCAN] Processing: {os.path.basename(path_str)}")
-                sys.stdout.flush()
-
-                # Update progress details for UI
-                self._last_file_details['filename'] = os.path.basename(path_str)
-                self._last_file_details['size_kb'] = size_kb
-                self._last_file_details['status'] = 'extracting'
-
-                future = executor.submit(self.metadata_service.extract_basic_metadata, str(file_path))
-                width, height, date_taken, gps_lat, gps_lon, image_content_hash = future.result(timeout=metadata_timeout)
-
-                # Store extracted metadata for progress updates
-                self._last_file_details['width'] = width
-                self._last_file_details['height'] = height
-                self._last_file_details['date_taken'] = date_taken
-
-                # Log GPS extraction if found
-                if gps_lat is not None and gps_lon is not None:
-                    logger.info(f"[Scan] ✓ GPS extracted: {os.path.basename(path_str)} ({gps_lat:.4f}, {gps_lon:.4f})")
-                    print(f"[SCAN] ✓ GPS: ({gps_lat:.4f}, {gps_lon:.4f})")
-                    sys.stdout.flush()
-
-                print(f"[SCAN] ✓ Metadata extracted: {os.path.basename(path_str)} [w={width}, h={height}, date={date_taken}]")
-                sys.stdout.flush()
-                logger.info(f"[Scan] Metadata extracted successfully: {os.path.basename(path_str)} [w={width}, h={height}, date={date_taken}]")
+                stat_result = future.result(timeout=self.stat_timeout)
             except FuturesTimeoutError:
-                logger.warning(f"Metadata extraction timeout for {path_str} (5s limit) - continuing without metadata")
-                # Continue without dimensions/EXIF - photo will still be indexed
-                try:
-                    future.cancel()
-                except Exception:
-                    pass
+                logger.warning(f"os.stat timeout for {file_path}")
+                future.cancel()
+                stat_result = None
+            except FileNotFoundError:
+                logger.debug(f"File not found: {file_path}")
+                stat_result = None
             except Exception as e:
-                logger.debug(f"Could not extract image metadata from {path_str}: {e}")
-                # Continue without dimensions/EXIF
-        else:
-            # Just get dimensions without EXIF (with timeout)
+                logger.warning(f"os.stat failed for {file_path}: {e}")
+                stat_result = None
+            if stat_result is None:
+                self._stats['photos_failed'] += 1
+            _fill()
+            yield file_path, stat_result
+
+    def _await_metadata(self, future, path_str: str):
+        """
+        Wait for one header/EXIF parse, honouring the per-file timeout.
+
+        The timeout only starts counting once a worker has picked the file up;
+        files still queued behind slower ones get a few extra rounds.
+        Returns the extract_basic_metadata() tuple or None on failure/timeout.
+        """
+        queued_rounds = 0
+        while True:
             try:
-                future = executor.submit(self.metadata_service.extract_basic_metadata, str(file_path))
-                width, height, _, gps_lat, gps_lon, image_content_hash = future.result(timeout=metadata_timeout)
+                return future.result(timeout=self.METADATA_TIMEOUT)
             except FuturesTimeoutError:
-                logger.warning(f"Dimension extraction timeout for {path_str} (5s limit)")
-                try:
-                    future.cancel()
-                except Exception:
-                    pass
+                if not future.running() and queued_rounds < 3 and not self._cancelled:
+                    queued_rounds += 1
+                    continue
+                logger.warning(f"Metadata extraction timeout for {path_str} "
+                               f"({self.METADATA_TIMEOUT:.0f}s limit) - continuing without metadata")
+                future.cancel()
+                return None
+            except BrokenExecutor:
+                self._fallback_to_thread_parse()
+                future = self._parse_executor.submit(self._parse_fn, path_str)
             except Exception as e:
-                logger.debug(f"Could not extract dimensions from {path_str}: {e}")
+                logger.debug(f"Could not extract image metadata from {path_str}: {e}")
+                return None
 
-        # BUG FIX #7 + #8: Compute created_* fields from date_taken inline (no heavy extract_metadata call)
-        if date_taken:
-            try:
-                from datetime import datetime
-                # Parse date_taken (format: 'YYYY-MM-DD HH:MM:SS' or 'YYYY-MM-DD')
-                date_str = date_taken.split(' ')[0]  # Extract YYYY-MM-DD part
-                dt = datetime.strptime(date_str, '%Y-%m-%d')
-                created_ts = int(dt.timestamp())
-                created_date = date_str  # YYYY-MM-DD
-                created_year = dt.year
-            except (ValueError, AttributeError, IndexError) as e:
-                # If date parsing fails, these fields will remain NULL
-                logger.debug(f"[Scan] Failed to parse date_taken '{date_taken}': {e}")
-
-        # Step 5: Ensure folder hierarchy exists
-        try:
-            print(f"[SCAN] Creating folder hierarchy for: {os.path.basename(path_str)}")
-            sys.stdout.flush()
-            folder_id = self._ensure_folder_hierarchy(file_path.parent, root_path, project_id)
+    def _build_photo_row(self,
+                         file_path: Path,
+                         root_path: Path,
+                         project_id: int,
+                         mtime: str,
+                         size_kb: float,
+                         metadata: Optional[Tuple],
+                         extract_exif_date: bool,
+                         folder_ids: Dict[Path, int]) -> Optional[Tuple]:
+        """
+        Final per-file stage: combine stat + parsed metadata into a DB row.
 
-            # Store folder_id for progress updates
-            self._last_file_details['folder_id'] = folder_id
+        Returns:
+            Tuple for database insert, or None if the folder could not be created
+        """
+        path_str = str(file_path)
+        width = height = date_taken = gps_lat = gps_lon = image_content_hash = None
+        if metadata:
+            width, height, date_taken, gps_lat, gps_lon, image_content_hash = metadata
+            if not extract_exif_date:
+                date_taken = None
 
-            print(f"[SCAN] ✓ Folder hierarchy created: folder_id={folder_id}")
-            sys.stdout.flush()
-        except Exception as e:
-            logger.error(f"Failed to create folder hierarchy for {path_str}: {e}")
-            self._stats['photos_failed'] += 1
-            self._last_file_details['status'] = 'failed'
-            return None
+        self._last_file_details['filename'] = file_path.name
+        self._last_file_details['size_kb'] = size_kb
+        self._last_file_details['width'] = width
+        self._last_file_details['height'] = height
+        self._last_file_details['date_taken'] = date_taken
+
+        if gps_lat is not None and gps_lon is not None:
+            logger.debug(f"[Scan] GPS extracted: {file_path.name} ({gps_lat:.4f}, {gps_lon:.4f})")
+
+        # BUG FIX #7 + #8: Compute created_* fields from date_taken inline (no heavy extract_metadata call)
+        created_ts, created_date, created_year = self._compute_created_fields(date_taken, None)
+
+        # Folder hierarchy: resolved once per directory instead of once per file
+        folder_path = file_path.parent
+        folder_id = folder_ids.get(folder_path)
+        if folder_id is None:
+            try:
+                folder_id = self._ensure_folder_hierarchy(folder_path, root_path, project_id)
+                folder_ids[folder_path] = folder_id
+            except Exception as e:
+                logger.error(f"Failed to create folder hierarchy for {path_str}: {e}")
+                self._stats['photos_failed'] += 1
+                self._last_file_details['status'] = 'failed'
+                return None
+        self._last_file_details['folder_id'] = folder_id
 
-        # Success
         self._stats['photos_indexed'] += 1
         self._last_file_details['status'] = 'complete'
-        print(f"[SCAN] ✓ File processed successfully: {os.path.basename(path_str)}")
-        sys.stdout.flush()
 
         # Return row tuple for batch insert
         # BUG FIX #7: Include created_ts, created_date, created_year for date hierarchy
@@ -1066,6 +1022,131 @@ class PhotoScanService:
         return (path_str, folder_id, size_kb, mtime, width, height, date_taken, None,
                 created_ts, created_date, created_year, gps_lat, gps_lon, image_content_hash)
 
+    def _scan_photos_pipelined(self,
+                               files: Iterable[Tuple[Path, Optional[os.DirEntry]]],
+                               root_path: Path,
+                               project_id: int,
+                               existing_metadata: Dict[str, str],
+                               skip_unchanged: bool,
+                               extract_exif_date: bool,
+                               folders_seen: Set[str],
+                               progress_callback: Optional[Callable[[ScanProgress], None]] = None,
+                               on_batch_written: Optional[Callable[[int], None]] = None):
+        """
+        Index photos through a staged pipeline.
+
+        ``files`` may be a live discovery stream; totals are read from the
+        running discovery counters. Stages (each bounded to
+        ``workers * PIPELINE_DEPTH`` files in flight):
+        1. stat + incremental skip check (thread pool, I/O bound)
+        2. header/EXIF parse (threads, moved to processes for large scans)
+        3. folder resolution + row build + batched _write_batch (this thread,
+           overlapping with the parses still running in stage 2). Batches are
+           also flushed every FLUSH_INTERVAL seconds so the first photos are
+           committed early on slow storage.
+        """
+        window = max(1, self.workers * self.PIPELINE_DEPTH)
+        batch_rows: List[Tuple] = []
+        folder_ids: Dict[Path, int] = {}
+        pending = deque()  # (file_path, mtime, size_kb, future)
+        last_flush = time.time()
+
+        def _flush(reason: str):
+            nonlocal last_flush
+            logger.info(f"Writing {reason} batch of {len(batch_rows)} photos to database")
+            self._write_batch(batch_rows, project_id)
+            if on_batch_written and not self._cancelled:
+                try:
+                    on_batch_written(len(batch_rows))
+                except Exception as e:
+                    logger.warning(f"Batch callback error: {e}")
+            batch_rows.clear()
+            last_flush = time.time()
+
+        def _report(file_path: Path, row: Optional[Tuple]):
+            self._photos_processed += 1
+            if not progress_callback:
+                return
+            i = self._photos_processed
+            now = time.time()
+            if (i <= 5 or i % 25 == 0 or (now - self._last_progress_emit) >= 0.35
+                    or (self._discovery_complete and i == self._total_photos)):
+                self._emit_progress_event(
+                    progress_callback=progress_callback,
+                    file_path=file_path,
+                    file_index=i,
+                    total_files=self._total_photos,
+                    row=row,
+                    now=now
+                )
+
+        def _finish_oldest():
+            file_path, mtime, size_kb, future = pending.popleft()
+            metadata = self._await_metadata(future, str(file_path))
+            row = self._build_photo_row(file_path, root_path, project_id, mtime, size_kb,
+                                        metadata, extract_exif_date, folder_ids)
+            if row is not None:
+                folders_seen.add(os.path.dirname(row[0]))
+                batch_rows.append(row)
+                if len(batch_rows) >= self.batch_size:
+                    _flush("full")
+                elif time.time() - last_flush >= self.FLUSH_INTERVAL:
+                    _flush("interval")
+            _report(file_path, row)
+
+        stat_executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan-stat")
+        self._start_parse_executor()
+        logger.info(f"[PhotoScanService] Pipeline: {self.workers} workers, window={window}")
+
+        try:
+            for file_path, stat_result in self._iter_file_stats(files, stat_executor, window):
+                if self._cancelled:
+                    logger.info("Scan cancelled by user")
+                    break
+                if stat_result is None:
+                    _report(file_path, None)
+                    continue
+
+                mtime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stat_result.st_mtime))
+                size_kb = stat_result.st_size / 1024.0
+
+                # Incremental scan: normalize path before lookup (database stores normalized paths)
+                if skip_unchanged and existing_metadata.get(self.photo_repo._normalize_path(str(file_path))) == mtime:
+                    self._stats['photos_skipped'] += 1
+                    _report(file_path, None)
+                    continue
+
+                self._last_file_details['filename'] = file_path.name
+                self._last_file_details['size_kb'] = size_kb
+                self._last_file_details['status'] = 'extracting'
+                self._maybe_upgrade_parse_executor()
+                try:
+                    future = self._parse_executor.submit(self._parse_fn, str(file_path))
+                except BrokenExecutor:
+                    self._fallback_to_thread_parse()
+                    future = self._parse_executor.submit(self._parse_fn, str(file_path))
+                pending.append((file_path, mtime, size_kb, future))
+
+                while len(pending) >= window and not self._cancelled:
+                    _finish_oldest()
+
+            while pending and not self._cancelled:
+                _finish_oldest()
+
+            # Final batch flush
+            if batch_rows and not self._cancelled:
+                _flush("final")
+        finally:
+            # All consumed futures were awaited; never block on stragglers (hung NAS/decoder)
+            for executor in [stat_executor, self._parse_executor] + self._retired_executors:
+                try:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                except Exception as e:
+                    logger.warning(f"Executor shutdown error: {e}")
+            self._parse_executor = None
+            self._parse_fn = None
+            self._retired_executors = []
+
     def _ensure_folder_hierarchy(self, folder_path: Path, root_path: Path, project_id: int) -> int:
         """
         Ensure folder and all parent folders exist in database.
@@ -1138,29 +1219,36 @@ class PhotoScanService:
             return
 
         try:
-            print(f"[SCAN] 💾 Starting bulk_upsert for {len(rows)} photos...")
             logger.info(f"[DB] Starting bulk_upsert for {len(rows)} photos")
             affected = self.photo_repo.bulk_upsert(rows, project_id)
-            print(f"[SCAN] ✓ Bulk_upsert completed: {affected} photos written")
             logger.info(f"[DB] Bulk_upsert completed: {affected} photos written")
         except Exception as e:
-            print(f"[SCAN] ⚠️ Batch write failed: {e}")
             logger.error(f"Failed to write batch: {e}", exc_info=True)
             # Try individual writes as fallback
-            print(f"[SCAN] Attempting individual writes as fallback...")
+            logger.debug("Attempting individual writes as fallback...")
             for idx, row in enumerate(rows, 1):
                 try:
                     # BUG FIX #7: Unpack row with created_* fields
                     # LONG-TERM FIX (2026-01-08): Include GPS coordinates
                     # v9.3.0: Include image_content_hash for pixel-based staleness
                     path, folder_id, size_kb, modified, width, height, date_taken, tags, created_ts, created_date, created_year, gps_lat, gps_lon, image_content_hash = row
-                    print(f"[SCAN] Writing individual photo {idx}/{len(rows)}: {os.path.basename(path)}")
+                    logger.debug(f"Writing individual photo {idx}/{len(rows)}: {os.path.basename(path)}")
                     self.photo_repo.upsert(path, folder_id, project_id, size_kb, modified, width, height,
                                           date_taken, tags, created_ts, created_date, created_year, gps_lat, gps_lon, image_content_hash)
                 except Exception as e2:
-                    print(f"[SCAN] ⚠️ Failed to write photo {idx}/{len(rows)}: {e2}")
                     logger.error(f"Failed to write individual photo {row[0]}: {e2}")
 
+        self._queue_feature_updates(rows, project_id)
+
+    def _queue_feature_updates(self, rows: List[Tuple], project_id: int):
+        """Re-derive the search features of a written batch (queued, non-blocking)."""
+        try:
+            paths = [self.photo_repo._normalize_path(row[0]) for row in rows]
+            feature_repo = SearchFeatureRepository(self.photo_repo._db_connection)
+            feature_repo.apply_changes(project_id, paths, "scan")
+        except Exception as e:
+            logger.warning(f"Could not queue search feature updates: {e}")
+
     def _ensure_default_project(self, root_folder: str):
         """
         Ensure a default project exists and has an 'all' branch.
@@ -1260,6 +1348,9 @@ class PhotoScanService:
             from services.video_service import VideoService
             video_service = VideoService()
 
+            # Probe creation dates concurrently; the loop below picks them up in order
+            self._prefetch_video_probes(video_files, skip_unchanged, existing_video_metadata)
+
             for i, video_path in enumerate(video_files, 1):
                 if self._cancelled:
                     logger.info("Video processing cancelled by user")
@@ -1296,11 +1387,11 @@ class PhotoScanService:
                     created_ts, created_date, created_year = self._compute_created_fields(video_date_taken, modified)
 
                     # Index video WITH date fields (using modified as fallback until workers extract date_taken)
-                    print(f"[VIDEO_INDEX] Attempting to index: {os.path.basename(str(video_path))}")
-                    print(f"[VIDEO_INDEX]   project_id={project_id}, folder_id={folder_id}")
-                    print(f"[VIDEO_INDEX]   size_kb={size_kb}, modified={modified}")
-                    print(f"[VIDEO_INDEX]   created_ts={created_ts}, created_date={created_date}, created_year={created_year}")
-                    sys.stdout.flush()
+                    logger.debug(
+                        f"[VIDEO_INDEX] Indexing {video_path.name}: project_id={project_id}, "
+                        f"folder_id={folder_id}, size_kb={size_kb}, modified={modified}, "
+                        f"created_ts={created_ts}, created_date={created_date}, created_year={created_year}"
+                    )
 
                     video_id = video_service.index_video(
                         path=str(video_path),
@@ -1314,19 +1405,14 @@ class PhotoScanService:
                     )
 
                     if video_id:
-                        print(f"[VIDEO_INDEX] SUCCESS: video_id={video_id}")
+                        logger.debug(f"[VIDEO_INDEX] Indexed {video_path.name}: video_id={video_id}")
                         self._stats['videos_indexed'] += 1
                     else:
-                        print(f"[VIDEO_INDEX] FAILED: video_service.index_video returned None")
                         logger.error(f"Video indexing returned None for {video_path}")
-                    sys.stdout.flush()
 
                 except Exception as e:
-                    print(f"[VIDEO_INDEX] EXCEPTION: {type(e).__name__}: {e}")
                     logger.warning(f"Failed to index video {video_path}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    sys.stdout.flush()
+                    logger.debug(f"[VIDEO_INDEX] {type(e).__name__} indexing {video_path.name}", exc_info=True)
 
                 # Report progress
                 if progress_callback:
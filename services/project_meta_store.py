@@ -0,0 +1,434 @@
+# services/project_meta_store.py
+# Columnar in-memory project metadata for search scoring
+#
+# SearchOrchestrator._get_project_meta used to return {path: {...}} for
+# every photo of the project and rebuild it whenever its 60s TTL expired.
+# At 200k photos that is hundreds of MB of per-photo dicts, and
+# FacetComputer / GateEngine walked them row by row on every query.
+#
+# This store keeps one NumPy array per numeric column (categorical codes
+# for flag/ext/media_type/year, plain lists only for the free-text
+# columns), answers facet counting and gate filtering with vector
+# operations, and is refreshed incrementally from
+# search_asset_features.updated_at.
+
+"""
+ProjectMetaStore - Columnar snapshot of a project's search_asset_features.
+
+The store is also a read-only Mapping (path -> meta dict, built on access
+with the keys SearchFeatureRepository.get_project_meta returns), so the
+candidate builders, ranker and deduplicator keep working unchanged.
+
+Snapshots are immutable: refreshed() returns a new store with the rows
+changed since the watermark applied, so a query still holding the old
+snapshot is unaffected. When rows were deleted the new snapshot is a
+full reload.
+
+Usage:
+    from services.project_meta_store import ProjectMetaStore
+
+    store = ProjectMetaStore.load(feature_repo, project_id)
+    store = store.refreshed(feature_repo)      # incremental
+    meta = store.get(path, {})                 # dict view of one row
+    pos = store.positions(paths)               # row per path, -1 = missing
+    facets = store.facet_counts(paths)
+"""
+
+import os
+import re
+import time
+from collections.abc import ItemsView, Mapping, ValuesView
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Epoch seconds of rows without a (parseable) date
+NO_DATE = np.iinfo(np.int64).min
+
+_DATE_RE = re.compile(r'^(\d{4})[-:](\d{2})[-:](\d{2})(?:[ T](\d{2}):(\d{2}):(\d{2}))?')
+
+# Rows materialized per chunk when iterating items()/values()
+_ITER_CHUNK = 4096
+
+# (column, dtype, value stored for NULL)
+_NUMERIC_COLUMNS = (
+    ("photo_id", np.int64, -1),
+    ("width", np.int32, -1),
+    ("height", np.int32, -1),
+    ("face_count", np.int32, 0),
+    ("rating", np.int32, 0),
+    ("duplicate_group_id", np.int64, -1),
+    ("has_gps", np.bool_, False),
+    ("is_screenshot", np.bool_, False),
+    ("flag", np.int16, -1),        # code into the flag categories
+    ("ext", np.int16, -1),         # code into the ext categories
+    ("media_type", np.int16, -1),  # code into the media_type categories
+    ("year", np.int16, -1),        # code into the year categories
+    ("date_ts", np.int64, NO_DATE),
+)
+_CATEGORICAL = ("flag", "ext", "media_type", "year")
+
+
+class _Categories:
+    """Value <-> small-int code table for a low-cardinality column."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values: Sequence = ()):
+        self.values = list(values)
+        self.codes = {v: i for i, v in enumerate(self.values)}
+
+    def code(self, value) -> int:
+        c = self.codes.get(value)
+        if c is None:
+            c = len(self.values)
+            self.values.append(value)
+            self.codes[value] = c
+        return c
+
+
+def _date_to_iso(value) -> str:
+    """'YYYY-MM-DDTHH:MM:SS' for numpy datetime64 parsing, 'NaT' if unparseable."""
+    m = _DATE_RE.match(str(value)) if value else None
+    if not m:
+        return "NaT"
+    y, mo, d, hh, mm, ss = m.groups()
+    if hh is None:
+        return f"{y}-{mo}-{d}T00:00:00"
+    return f"{y}-{mo}-{d}T{hh}:{mm}:{ss}"
+
+
+def _dates_to_epoch(values: List) -> np.ndarray:
+    """Epoch seconds (int64) per date string; NO_DATE when missing or invalid."""
+    iso = [_date_to_iso(v) for v in values]
+    try:
+        parsed = np.array(iso, dtype='datetime64[s]')
+    except ValueError:
+        # One out-of-range component (month 13, day 00, ...) fails the whole array
+        parsed = np.empty(len(iso), dtype='datetime64[s]')
+        for i, s in enumerate(iso):
+            try:
+                parsed[i] = np.datetime64(s, 's')
+            except ValueError:
+                parsed[i] = np.datetime64('NaT')
+    # NaT is int64 min, i.e. NO_DATE
+    return parsed.astype(np.int64)
+
+
+def _year_of(date) -> Optional[str]:
+    """Year bucket exactly as FacetComputer derives it from a date string."""
+    if date and len(str(date)) >= 4:
+        year = str(date)[:4]
+        if year.isdigit():
+            return year
+    return None
+
+
+class _StoreItems(ItemsView):
+    def __iter__(self):
+        yield from self._mapping._iter_rows(with_paths=True)
+
+
+class _StoreValues(ValuesView):
+    def __iter__(self):
+        yield from self._mapping._iter_rows(with_paths=False)
+
+
+class ProjectMetaStore(Mapping):
+    """Immutable columnar snapshot of one project's search features."""
+
+    def __init__(self, project_id: int):
+        self.project_id = project_id
+        self.watermark = ""   # max updated_at of the loaded rows
+        self._paths: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._dates: List[Optional[str]] = []
+        self._ocr: List[Optional[str]] = []
+        self._cols: Dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=dtype) for name, dtype, _ in _NUMERIC_COLUMNS
+        }
+        self._cats: Dict[str, _Categories] = {name: _Categories() for name in _CATEGORICAL}
+        self._norm_index: Optional[Dict[str, int]] = None
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, repo, project_id: int) -> "ProjectMetaStore":
+        """Full load from a SearchFeatureRepository."""
+        start = time.time()
+        store = cls(project_id)
+        store._append(*store._parse(repo.iter_project_rows(project_id)))
+        logger.debug(
+            f"[ProjectMetaStore] Loaded {len(store)} rows for project {project_id} "
+            f"in {(time.time() - start) * 1000:.0f}ms ({store.nbytes() / 1e6:.1f} MB columns)"
+        )
+        return store
+
+    def refreshed(self, repo) -> "ProjectMetaStore":
+        """
+        Snapshot with the rows changed since the watermark applied.
+
+        Returns self when nothing changed, and a full reload when rows were
+        deleted (the row count no longer matches).
+        """
+        if not self.watermark:
+            return ProjectMetaStore.load(repo, self.project_id)
+
+        changed = list(repo.iter_project_rows(self.project_id, updated_since=self.watermark))
+        total = repo.get_row_count(self.project_id)
+        if not changed and total == len(self):
+            return self
+
+        store = self._copy()
+        paths, cols, dates, ocr, watermark = store._parse(changed)
+        pos = store.positions(paths)
+        if total == len(self) and self._unchanged(pos, cols, dates, ocr):
+            # updated_at has 1s resolution, so rows stamped in the
+            # watermark's second are re-read on every refresh
+            return self
+        existing = np.flatnonzero(pos >= 0)
+        if len(existing):
+            rows = pos[existing]
+            for name, values in cols.items():
+                store._cols[name][rows] = values[existing]
+            for j, row in zip(existing.tolist(), rows.tolist()):
+                store._dates[row] = dates[j]
+                store._ocr[row] = ocr[j]
+        added = np.flatnonzero(pos < 0)
+        store._append(
+            [paths[j] for j in added],
+            {name: values[added] for name, values in cols.items()},
+            [dates[j] for j in added],
+            [ocr[j] for j in added],
+            watermark,
+        )
+
+        if len(store) != total:
+            logger.debug(
+                f"[ProjectMetaStore] Row count changed ({len(store)} != {total}), full reload"
+            )
+            return ProjectMetaStore.load(repo, self.project_id)
+        logger.debug(
+            f"[ProjectMetaStore] Refreshed project {self.project_id}: "
+            f"{len(existing)} updated, {len(added)} added"
+        )
+        return store
+
+    def _parse(self, rows: Iterable[Dict]) -> Tuple[List[str], Dict[str, np.ndarray], List, List, str]:
+        """Rows -> (paths, numeric columns, dates, ocr texts, max updated_at)."""
+        paths: List[str] = []
+        dates: List = []
+        ocr: List = []
+        raw: Dict[str, List] = {name: [] for name, _, _ in _NUMERIC_COLUMNS if name != "date_ts"}
+        cats = self._cats
+        watermark = self.watermark
+
+        for r in rows:
+            paths.append(r['path'])
+            date = r['date_taken']
+            dates.append(date)
+            ocr.append(r['ocr_text'])
+            raw["photo_id"].append(r['photo_id'] if r['photo_id'] is not None else -1)
+            raw["width"].append(r['width'] if r['width'] is not None else -1)
+            raw["height"].append(r['height'] if r['height'] is not None else -1)
+            raw["face_count"].append(r['face_count'] or 0)
+            raw["rating"].append(r['rating'] or 0)
+            dup = r['duplicate_group_id']
+            raw["duplicate_group_id"].append(dup if dup is not None else -1)
+            raw["has_gps"].append(bool(r['has_gps']))
+            raw["is_screenshot"].append(bool(r['is_screenshot']))
+            raw["flag"].append(cats["flag"].code(r['flag'] or "none"))
+            raw["ext"].append(cats["ext"].code(r['ext']))
+            raw["media_type"].append(cats["media_type"].code(r['media_type']))
+            year = _year_of(date)
+            raw["year"].append(cats["year"].code(year) if year is not None else -1)
+            updated = r['updated_at']
+            if updated and str(updated) > watermark:
+                watermark = str(updated)
+
+        cols = {name: np.asarray(raw[name], dtype=dtype)
+                for name, dtype, _ in _NUMERIC_COLUMNS if name != "date_ts"}
+        cols["date_ts"] = _dates_to_epoch(dates)
+        return paths, cols, dates, ocr, watermark
+
+    def _unchanged(self, pos: np.ndarray, cols: Dict[str, np.ndarray],
+                   dates: List, ocr: List) -> bool:
+        """True when every parsed row already exists with identical values."""
+        if len(pos) and pos.min() < 0:
+            return False
+        rows = pos.tolist()
+        return (all(np.array_equal(self._cols[name][pos], values) for name, values in cols.items())
+                and [self._dates[i] for i in rows] == dates
+                and [self._ocr[i] for i in rows] == ocr)
+
+    def _append(self, paths: List[str], cols: Dict[str, np.ndarray],
+                dates: List, ocr: List, watermark: str):
+        base = len(self._paths)
+        self._paths.extend(paths)
+        self._index.update((p, base + i) for i, p in enumerate(paths))
+        self._dates.extend(dates)
+        self._ocr.extend(ocr)
+        for name, values in cols.items():
+            self._cols[name] = np.concatenate([self._cols[name], values])
+        self.watermark = max(self.watermark, watermark)
+        self._norm_index = None
+
+    def _copy(self) -> "ProjectMetaStore":
+        store = ProjectMetaStore(self.project_id)
+        store.watermark = self.watermark
+        store._paths = list(self._paths)
+        store._index = dict(self._index)
+        store._dates = list(self._dates)
+        store._ocr = list(self._ocr)
+        store._cols = {name: col.copy() for name, col in self._cols.items()}
+        store._cats = {name: _Categories(cat.values) for name, cat in self._cats.items()}
+        return store
+
+    # ------------------------------------------------------------------
+    # Mapping interface (path -> meta dict)
+    # ------------------------------------------------------------------
+    def __getitem__(self, path: str) -> Dict[str, Any]:
+        return self.row_at(self._index[path])
+
+    def get(self, path, default=None):
+        i = self._index.get(path)
+        return default if i is None else self.row_at(i)
+
+    def __contains__(self, path) -> bool:
+        return path in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def items(self):
+        return _StoreItems(self)
+
+    def values(self):
+        return _StoreValues(self)
+
+    def row_at(self, i: int) -> Dict[str, Any]:
+        """Meta dict of row ``i`` (see positions())."""
+        return next(self._iter_rows(with_paths=False, start=i, stop=i + 1))
+
+    def _iter_rows(self, with_paths: bool, start: int = 0, stop: Optional[int] = None):
+        """Meta dicts for rows [start, stop), materialized a chunk at a time."""
+        stop = len(self._paths) if stop is None else stop
+        flags = self._cats["flag"].values
+        exts = self._cats["ext"].values
+        media_types = self._cats["media_type"].values
+        for lo in range(start, stop, _ITER_CHUNK):
+            hi = min(stop, lo + _ITER_CHUNK)
+            c = {name: col[lo:hi].tolist() for name, col in self._cols.items()}
+            for j in range(hi - lo):
+                w = c["width"][j]
+                h = c["height"][j]
+                dup = c["duplicate_group_id"][j]
+                date = self._dates[lo + j]
+                meta = {
+                    "media_type": media_types[c["media_type"][j]],
+                    "width": w if w >= 0 else None,
+                    "height": h if h >= 0 else None,
+                    "has_gps": c["has_gps"][j],
+                    "face_count": c["face_count"][j],
+                    "is_screenshot": c["is_screenshot"][j],
+                    "flag": flags[c["flag"][j]],
+                    "ext": exts[c["ext"][j]],
+                    "created_date": date,
+                    "date_taken": date,
+                    "duplicate_group_id": dup if dup >= 0 else None,
+                    "ocr_text": self._ocr[lo + j],
+                    "rating": c["rating"][j],
+                }
+                yield (self._paths[lo + j], meta) if with_paths else meta
+
+    # ------------------------------------------------------------------
+    # Vector API
+    # ------------------------------------------------------------------
+    def positions(self, paths: Sequence[str], normalize: bool = False) -> np.ndarray:
+        """
+        Row index per path (-1 when absent).
+
+        With ``normalize``, misses are retried on os.path.normpath().lower()
+        (paths written with other separators/case on Windows).
+        """
+        index = self._index
+        pos = np.fromiter((index.get(p, -1) for p in paths), dtype=np.int64, count=len(paths))
+        if normalize and len(pos) and pos.min() < 0:
+            if self._norm_index is None:
+                self._norm_index = {os.path.normpath(p).lower(): i
+                                    for i, p in enumerate(self._paths)}
+            norm = self._norm_index
+            for j in np.flatnonzero(pos < 0).tolist():
+                pos[j] = norm.get(os.path.normpath(paths[j]).lower(), -1)
+        return pos
+
+    def column(self, name: str, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        A numeric column, whole or gathered at ``positions``.
+
+        Rows at position -1 get the column's NULL value (see _NUMERIC_COLUMNS).
+        Categorical columns return codes; decode them with categories().
+        """
+        col = self._cols[name]
+        if positions is None:
+            return col
+        default = next(d for n, _, d in _NUMERIC_COLUMNS if n == name)
+        if len(col) == 0:
+            return np.full(len(positions), default, dtype=col.dtype)
+        out = col[np.where(positions >= 0, positions, 0)]
+        out[positions < 0] = default
+        return out
+
+    def categories(self, name: str) -> List:
+        """Decoded values of a categorical column, indexed by code."""
+        return list(self._cats[name].values)
+
+    def paths_where(self, mask: np.ndarray) -> List[str]:
+        """Paths of the rows selected by a boolean mask over the whole store."""
+        paths = self._paths
+        return [paths[i] for i in np.flatnonzero(mask).tolist()]
+
+    def face_photo_count(self) -> int:
+        """Number of assets with at least one detected face."""
+        return int(np.count_nonzero(self._cols["face_count"] > 0))
+
+    def facet_counts(self, paths: Sequence[str]) -> Dict[str, Any]:
+        """
+        Year / location / rating counts over a result set, vectorized.
+
+        Paths not in the store count as no location, unrated, no year.
+
+        Returns:
+            {"years": {"2024": n, ...}, "with_location": n, "rated": n, "total": n}
+        """
+        pos = self.positions(paths)
+        known = pos[pos >= 0]
+        years = self._cols["year"][known]
+        years = years[years >= 0]
+        year_values = self._cats["year"].values
+        codes, counts = np.unique(years, return_counts=True)
+        return {
+            "years": {year_values[c]: int(n) for c, n in zip(codes.tolist(), counts.tolist())},
+            "with_location": int(np.count_nonzero(self._cols["has_gps"][known])),
+            "rated": int(np.count_nonzero(self._cols["rating"][known] >= 1)),
+            "total": len(pos),
+        }
+
+    def nbytes(self) -> int:
+        """Bytes held by the NumPy columns (paths and text lists not included)."""
+        return sum(col.nbytes for col in self._cols.values())
+
+
+def count_with_faces(project_meta: Mapping) -> int:
+    """Assets with face_count > 0, for a ProjectMetaStore or a {path: meta} dict."""
+    if isinstance(project_meta, ProjectMetaStore):
+        return project_meta.face_photo_count()
+    return sum(1 for m in project_meta.values() if (m.get("face_count", 0) or 0) > 0)
@@ -9,6 +9,8 @@ Based on best practices from Google Photos, Apple Photos, and Lightroom:
 - Decode at target size (never full resolution for UI display)
 - QImageReader.setScaledSize() for pre-decode downsampling
 - PIL draft() mode for huge JPEG images
+- Embedded previews (JPEG EXIF thumbnail, RAW preview, HEIF thumbnail)
+  when they cover the target size (fast_decode_pil)
 - Retry ladder on decode failure (2560 → 1920 → 1280 → placeholder)
 - Null checks at every step
 - Thread-safe (returns QImage, never QPixmap)
@@ -57,6 +59,27 @@ RAW_FORMATS = {
     '.raf', '.pef', '.srw', '.x3f', '.3fr', '.rwl', '.mrw',
 }
 
+JPEG_FORMATS = {'.jpg', '.jpeg', '.jpe', '.jfif'}
+
+# HEIF formats (decoded through pillow_heif when installed)
+HEIF_FORMATS = {'.heic', '.heif', '.hif'}
+
+# Formats with a reduced-resolution decode path (see fast_decode_pil)
+FAST_DECODE_FORMATS = JPEG_FORMATS | HEIF_FORMATS | RAW_FORMATS
+
+# An embedded preview is only used when its aspect ratio matches the image
+# within this tolerance (some cameras letterbox 16:9 shots into 4:3 previews)
+PREVIEW_ASPECT_TOLERANCE = 0.02
+
+# EXIF orientation -> PIL transpose (same table as ImageOps.exif_transpose)
+_ORIENTATION_TRANSPOSE = {
+    2: 'FLIP_LEFT_RIGHT', 3: 'ROTATE_180', 4: 'FLIP_TOP_BOTTOM',
+    5: 'TRANSPOSE', 6: 'ROTATE_270', 7: 'TRANSVERSE', 8: 'ROTATE_90',
+}
+
+# LibRaw sizes.flip -> EXIF orientation
+_RAW_FLIP_ORIENTATION = {3: 3, 5: 8, 6: 6}
+
 
 def safe_decode_qimage(
     path: str,
@@ -173,6 +196,49 @@ def create_placeholder(size: int = 400, message: str = "Image Error") -> QImage:
     return placeholder
 
 
+def fast_decode_pil(path: str, max_dim: int = 0, height: int = 0, allow_draft: bool = True):
+    """
+    Decode an image at reduced resolution without reading full-size pixels.
+
+    Tries, in order:
+    - the embedded preview (JPEG EXIF thumbnail, RAW preview, HEIF thumbnail)
+      when it covers the target size
+    - JPEG draft() mode, i.e. libjpeg DCT-domain scaling by 1/2, 1/4 or 1/8.
+      Pass allow_draft=False when the caller falls back to a QImageReader
+      scaled decode, which does the same.
+
+    The target is max_dim on the longest edge, or an exact height.
+
+    Returns:
+        Loaded PIL image with orientation applied and at least the target
+        size (callers still resize it), or None when no fast path applies.
+        info["decode_path"] is "preview" or "draft".
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FAST_DECODE_FORMATS or not (max_dim or height):
+        return None
+
+    try:
+        if ext in RAW_FORMATS:
+            img = _raw_preview(path, max_dim, height)
+        elif ext in HEIF_FORMATS:
+            img = _heif_thumbnail(path, max_dim, height)
+        else:
+            img = _jpeg_fast(path, max_dim, height, allow_draft)
+    except ImportError:
+        return None
+    except Exception as e:
+        logger.debug(f"[SafeImageLoader] Fast decode unavailable for {path}: {e}")
+        return None
+
+    if img is not None:
+        logger.debug(
+            f"[SafeImageLoader] Fast decode ({img.info['decode_path']}) "
+            f"{os.path.basename(path)}: {img.width}x{img.height}"
+        )
+    return img
+
+
 # ---------------------------------------------------------------------------
 # Internal decoders
 # ---------------------------------------------------------------------------
@@ -186,6 +252,12 @@ def _decode_qt(path: str, max_dim: int, timeout: float) -> Optional[QImage]:
     """
     start = time.perf_counter()
 
+    # Embedded preview if large enough; the scaled read below already does
+    # DCT-domain scaling for JPEG, so no draft() here
+    preview = fast_decode_pil(path, max_dim=max_dim, allow_draft=False)
+    if preview is not None:
+        return _pil_to_qimage(preview, max_dim, path)
+
     reader = QImageReader(path)
     reader.setAutoTransform(True)  # EXIF rotation
 
@@ -251,6 +323,10 @@ def _decode_pil(path: str, max_dim: int, timeout: float) -> Optional[QImage]:
             logger.warning(f"[SafeImageLoader] File too large ({file_size // (1024*1024)}MB): {path}")
             return None
 
+        fast = fast_decode_pil(path, max_dim=max_dim)
+        if fast is not None:
+            return _pil_to_qimage(fast, max_dim, path)
+
         from PIL import Image, ImageOps
 
         img = Image.open(path)
@@ -281,31 +357,8 @@ def _decode_pil(path: str, max_dim: int, timeout: float) -> Optional[QImage]:
                 logger.warning(f"[SafeImageLoader] PIL decode timeout: {path}")
                 return None
 
-            # Resize to target
-            target_w, target_h = _fit_dimensions(img.width, img.height, max_dim)
-            if img.width > target_w or img.height > target_h:
-                img.thumbnail((target_w, target_h), Image.Resampling.LANCZOS)
-
-            # Color mode conversion
-            if img.mode == 'CMYK':
-                img = img.convert('RGB')
-            elif img.mode in ('P', 'PA'):
-                img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
-            elif img.mode in ('L', 'LA', 'I', 'F'):
-                img = img.convert('RGB')
-            elif img.mode not in ('RGB', 'RGBA'):
-                img = img.convert('RGB')
-
-            # Convert to QImage via buffer (thread-safe)
-            buf = io.BytesIO()
-            fmt = "PNG" if img.mode == "RGBA" else "JPEG"
-            quality_args = {"quality": 95} if fmt == "JPEG" else {"optimize": False}
-            img.save(buf, format=fmt, **quality_args)
-
-            qimg = QImage.fromData(buf.getvalue())
-
-            if qimg.isNull():
-                logger.warning(f"[SafeImageLoader] PIL->QImage conversion failed: {path}")
+            qimg = _pil_to_qimage(img, max_dim, path)
+            if qimg is None:
                 return None
 
             elapsed = time.perf_counter() - start
@@ -328,6 +381,11 @@ def _decode_raw(path: str, max_dim: int, timeout: float) -> Optional[QImage]:
     Decode RAW files using rawpy with half_size option for memory safety.
     Falls back to PIL if rawpy not available.
     """
+    # The embedded camera preview is usually full-size JPEG: no demosaic needed
+    preview = fast_decode_pil(path, max_dim=max_dim)
+    if preview is not None:
+        return _pil_to_qimage(preview, max_dim, path)
+
     try:
         import rawpy
 
@@ -378,10 +436,181 @@ def _decode_raw(path: str, max_dim: int, timeout: float) -> Optional[QImage]:
         return _decode_pil(path, max_dim, timeout)
 
 
+def _jpeg_fast(path: str, max_dim: int, height: int, allow_draft: bool):
+    """JPEG: EXIF thumbnail if it covers the target, else draft() decode."""
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as img:
+        orientation = img.getexif().get(0x0112, 1)
+        swap = orientation in (5, 6, 7, 8)
+        w, h = (img.height, img.width) if swap else img.size
+        if not _needs_reduction(w, h, max_dim, height):
+            return None
+
+        preview = _exif_preview(img)
+        if preview is not None:
+            pw, ph = (preview.height, preview.width) if swap else preview.size
+            if _preview_covers(pw, ph, max_dim, height) and _aspect_matches(pw, ph, w, h):
+                preview = _apply_orientation(preview, orientation)
+                preview.info["decode_path"] = "preview"
+                return preview
+
+        if not allow_draft:
+            return None
+
+        target_w, target_h = _target_dimensions(w, h, max_dim, height)
+        img.draft(img.mode, (target_h, target_w) if swap else (target_w, target_h))
+        with _pil_decode_lock:
+            img.load()
+        img = ImageOps.exif_transpose(img)
+        img.info["decode_path"] = "draft"
+        return img
+
+
+def _exif_preview(img):
+    """The JPEG thumbnail stored in EXIF IFD1, or None."""
+    from PIL import Image, ExifTags
+
+    ifd1 = img.getexif().get_ifd(ExifTags.IFD.IFD1)
+    offset, length = ifd1.get(0x0201), ifd1.get(0x0202)  # JPEGInterchangeFormat(Length)
+    if not offset or not length:
+        return None
+
+    tiff = img.info.get("exif", b"")
+    if tiff.startswith(b"Exif\x00\x00"):
+        tiff = tiff[6:]
+    data = tiff[offset:offset + length]
+    if len(data) != length:
+        return None
+
+    preview = Image.open(io.BytesIO(data))
+    preview.load()
+    return preview
+
+
+def _raw_preview(path: str, max_dim: int, height: int):
+    """The camera's embedded preview from a RAW file (needs rawpy)."""
+    import rawpy
+    from PIL import Image
+
+    with rawpy.imread(path) as raw:
+        thumb = raw.extract_thumb()
+        orientation = _RAW_FLIP_ORIENTATION.get(raw.sizes.flip, 1)
+
+    if thumb.format == rawpy.ThumbFormat.JPEG:
+        preview = Image.open(io.BytesIO(thumb.data))
+        preview.load()
+    elif thumb.format == rawpy.ThumbFormat.BITMAP:
+        preview = Image.fromarray(thumb.data)
+    else:
+        return None
+
+    preview = _apply_orientation(preview, orientation)
+    if not _preview_covers(preview.width, preview.height, max_dim, height):
+        return None
+    preview.info["decode_path"] = "preview"
+    return preview
+
+
+def _heif_thumbnail(path: str, max_dim: int, height: int):
+    """
+    The smallest stored HEIF thumbnail that covers the target (needs
+    pillow_heif). libheif cannot decode at reduced scale, so without a
+    suitable thumbnail the caller decodes the primary image.
+    """
+    import pillow_heif
+    from PIL import Image
+
+    pillow_heif.register_heif_opener()
+    with Image.open(path) as img:
+        w, h = img.size
+        if not _needs_reduction(w, h, max_dim, height):
+            return None
+        target_w, target_h = _target_dimensions(w, h, max_dim, height)
+        thumb = pillow_heif.thumbnail(img, min_box=max(target_w, target_h))
+        if thumb is img or thumb.size == img.size:
+            return None
+        thumb.load()
+
+    if not (_preview_covers(thumb.width, thumb.height, max_dim, height)
+            and _aspect_matches(thumb.width, thumb.height, w, h)):
+        return None
+    thumb.info["decode_path"] = "preview"
+    return thumb
+
+
+def _pil_to_qimage(img, max_dim: int, path: str) -> Optional[QImage]:
+    """Resize a PIL image to fit max_dim, normalize its mode and convert to QImage."""
+    from PIL import Image
+
+    # Resize to target
+    target_w, target_h = _fit_dimensions(img.width, img.height, max_dim)
+    if img.width > target_w or img.height > target_h:
+        img.thumbnail((target_w, target_h), Image.Resampling.LANCZOS)
+
+    # Color mode conversion
+    if img.mode == 'CMYK':
+        img = img.convert('RGB')
+    elif img.mode in ('P', 'PA'):
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    elif img.mode in ('L', 'LA', 'I', 'F'):
+        img = img.convert('RGB')
+    elif img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGB')
+
+    # Convert to QImage via buffer (thread-safe)
+    buf = io.BytesIO()
+    fmt = "PNG" if img.mode == "RGBA" else "JPEG"
+    quality_args = {"quality": 95} if fmt == "JPEG" else {"optimize": False}
+    img.save(buf, format=fmt, **quality_args)
+
+    qimg = QImage.fromData(buf.getvalue())
+
+    if qimg.isNull():
+        logger.warning(f"[SafeImageLoader] PIL->QImage conversion failed: {path}")
+        return None
+    return qimg
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _target_dimensions(w: int, h: int, max_dim: int, height: int) -> Tuple[int, int]:
+    """Target size for an exact height, or for max_dim on the longest edge."""
+    if height:
+        return (max(1, int(w * height / h)), height)
+    return _fit_dimensions(w, h, max_dim)
+
+
+def _needs_reduction(w: int, h: int, max_dim: int, height: int) -> bool:
+    return h > height if height else max(w, h) > max_dim
+
+
+def _preview_covers(w: int, h: int, max_dim: int, height: int) -> bool:
+    return h >= height if height else max(w, h) >= max_dim
+
+
+def _aspect_matches(w: int, h: int, orig_w: int, orig_h: int) -> bool:
+    if h <= 0 or orig_h <= 0:
+        return False
+    aspect = orig_w / orig_h
+    return abs(w / h - aspect) <= PREVIEW_ASPECT_TOLERANCE * aspect
+
+
+def _apply_orientation(img, orientation: int):
+    """Apply an EXIF orientation value to an image without EXIF of its own."""
+    from PIL import Image
+
+    method = _ORIENTATION_TRANSPOSE.get(orientation)
+    if method is None:
+        return img
+    info = img.info
+    img = img.transpose(getattr(Image.Transpose, method))
+    img.info.update(info)
+    return img
+
+
 def _fit_dimensions(orig_w: int, orig_h: int, max_dim: int) -> Tuple[int, int]:
     """
     Calculate target dimensions that fit within max_dim, preserving aspect ratio.
@@ -22,11 +22,13 @@ class ScanWorkerAdapter(QObject):
         progress(int, str): Progress percent and message
         finished(int, int): Folders found and photos indexed
         error(str): Error message
+        committed(int): Photo rows written by each scan batch
     """
 
     progress = Signal(int, str)          # percent, message
     finished = Signal(int, int, int)     # folders, photos, videos
     error = Signal(str)
+    committed = Signal(int)              # rows written in a batch
 
     def __init__(self,
                  folder: str,
@@ -62,7 +64,8 @@ class ScanWorkerAdapter(QObject):
         self.service = PhotoScanService(
             project_id,
             batch_size=settings.get("scan_batch_size", 200),
-            stat_timeout=settings.get("stat_timeout_secs", 3.0)
+            stat_timeout=settings.get("stat_timeout_secs", 3.0),
+            workers=settings.get("scan_workers")
         )
 
         self._interrupted = False
@@ -124,7 +127,8 @@ class ScanWorkerAdapter(QObject):
                 extract_exif_date=extract_exif,
                 ignore_folders=ignore_folders if ignore_folders else None,
                 progress_callback=on_progress,
-                on_video_metadata_finished=self.on_video_metadata_finished
+                on_video_metadata_finished=self.on_video_metadata_finished,
+                on_batch_written=self.committed.emit
             )
 
             # Update statistics
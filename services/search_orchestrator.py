@@ -48,12 +48,13 @@ import time
 import threading
 import math
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any, Callable
+from typing import List, Dict, Mapping, Optional, Tuple, Any, Callable
 from dataclasses import dataclass, field
 from logging_config import get_logger
 
 # ── Extracted modules (Phase 1 decomposition) ──
 from services.gate_engine import GateEngine
+from services.project_meta_store import ProjectMetaStore, count_with_faces
 from services.ranker import (
     Ranker, ScoringWeights, ScoredResult,
     get_preset_family, get_weights_for_family, is_people_implied,
@@ -511,47 +512,49 @@ class FacetComputer:
         elif media_counts["Videos"] > 0:
             facets["media"] = {"Videos": media_counts["Videos"]}
 
+        year_counts, loc_yes, rated = cls._meta_counts(paths, project_meta)
+        loc_no = len(paths) - loc_yes
+        unrated = len(paths) - rated
+
         # Year distribution
-        year_counts = {}
-        for p in paths:
-            meta = project_meta.get(p, {})
-            created = meta.get("created_date") or meta.get("date_taken", "")
-            if created and len(str(created)) >= 4:
-                year = str(created)[:4]
-                if year.isdigit():
-                    year_counts[year] = year_counts.get(year, 0) + 1
         if len(year_counts) > 1:
             # Sort descending
             facets["years"] = dict(sorted(year_counts.items(), reverse=True))
 
         # Location
-        loc_yes = 0
-        loc_no = 0
-        for p in paths:
-            meta = project_meta.get(p, {})
-            if meta.get("has_gps"):
-                loc_yes += 1
-            else:
-                loc_no += 1
         if loc_yes > 0 and loc_no > 0:
             facets["location"] = {"With Location": loc_yes, "No Location": loc_no}
 
         # Rating
-        rated = 0
-        unrated = 0
-        for p in paths:
-            meta = project_meta.get(p, {})
-            rating = meta.get("rating", 0) or 0
-            if rating >= 1:
-                rated += 1
-            else:
-                unrated += 1
         if rated > 0 and unrated > 0:
             facets["rated"] = {"Rated": rated, "Unrated": unrated}
 
         # Hygiene: prune small buckets, drop single-bucket facets, order by entropy
         return cls._apply_hygiene(facets)
 
+    @staticmethod
+    def _meta_counts(paths: List[str], project_meta) -> Tuple[Dict[str, int], int, int]:
+        """(year_counts, with_location, rated) over the result set."""
+        if isinstance(project_meta, ProjectMetaStore):
+            counts = project_meta.facet_counts(paths)
+            return counts["years"], counts["with_location"], counts["rated"]
+
+        year_counts: Dict[str, int] = {}
+        loc_yes = 0
+        rated = 0
+        for p in paths:
+            meta = project_meta.get(p, {})
+            created = meta.get("created_date") or meta.get("date_taken", "")
+            if created and len(str(created)) >= 4:
+                year = str(created)[:4]
+                if year.isdigit():
+                    year_counts[year] = year_counts.get(year, 0) + 1
+            if meta.get("has_gps"):
+                loc_yes += 1
+            if (meta.get("rating", 0) or 0) >= 1:
+                rated += 1
+        return year_counts, loc_yes, rated
+
     @classmethod
     def _apply_hygiene(cls, facets: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
         """Prune small buckets, drop degenerate/lopsided facets, order by entropy."""
@@ -613,7 +616,8 @@ class SearchOrchestrator:
         self._weights = ScoringWeights()
         self._weights.validate()
         self._smart_find_service = None  # Lazy
-        self._project_meta_cache: Optional[Dict[str, Dict]] = None
+        self._project_meta_cache: Optional[Mapping[str, Dict]] = None
+        self._meta_store: Optional[ProjectMetaStore] = None
         self._meta_cache_time: float = 0.0
         self._META_CACHE_TTL = 60.0  # Refresh metadata cache every 60s
         self._embedding_quality_logged = False
@@ -1371,10 +1375,7 @@ class SearchOrchestrator:
         if total_photos == 0:
             return None
 
-        face_photo_count = sum(
-            1 for m in project_meta.values()
-            if (m.get("face_count", 0) or 0) > 0
-        )
+        face_photo_count = count_with_faces(project_meta)
         face_coverage = face_photo_count / total_photos
 
         if face_coverage >= self._FACE_COVERAGE_FLOOR:
@@ -1782,10 +1783,7 @@ class SearchOrchestrator:
                 logger.error(f"[SearchOrchestrator] Path resolution failed: {e}")
 
         if people_implied:
-            face_photo_count = sum(
-                1 for m in project_meta.values()
-                if (m.get("face_count", 0) or 0) > 0
-            )
+            face_photo_count = count_with_faces(project_meta)
             total_photos = len(project_meta)
             face_coverage = face_photo_count / total_photos if total_photos else 0
             logger.info(
@@ -2414,7 +2412,7 @@ class SearchOrchestrator:
                 pass
         return getattr(self, '_search_feature_repo', None)
 
-    def _get_project_meta(self) -> Dict[str, Dict]:
+    def _get_project_meta(self) -> Mapping[str, Dict]:
         """Get project photo metadata with caching (includes flag, dimensions, face counts).
 
         Fast path: reads from search_asset_features table if populated.
@@ -2429,38 +2427,41 @@ class SearchOrchestrator:
                 and (now - _cache_time) < _cache_ttl):
             return _cache
 
-        # Fast path: use flattened search_asset_features table if available
+        # Fast path: columnar store over search_asset_features, refreshed
+        # incrementally from the previous snapshot when there is one
         repo = self._get_search_feature_repo()
         if repo is not None:
             try:
-                meta = repo.get_project_meta(self.project_id)
-                if meta:
-                    self._project_meta_cache = meta
+                store = getattr(self, '_meta_store', None)
+                if store is not None and store.project_id == self.project_id:
+                    store = store.refreshed(repo)
+                else:
+                    store = ProjectMetaStore.load(repo, self.project_id)
+                if not len(store):
+                    # Table exists but empty for this project (never indexed) —
+                    # sync it: every photo is "missing", upserted in chunks
+                    logger.info(
+                        f"[SearchOrchestrator] search_asset_features empty for "
+                        f"project {self.project_id}, triggering incremental sync"
+                    )
+                    rebuilt = repo.sync_project(self.project_id)
+                    if rebuilt > 0:
+                        store = ProjectMetaStore.load(repo, self.project_id)
+                        logger.info(
+                            f"[SearchOrchestrator] Auto-synced {rebuilt} rows "
+                            f"in search_asset_features"
+                        )
+                if len(store):
+                    self._meta_store = store
+                    self._project_meta_cache = store
                     self._meta_cache_time = now
                     logger.debug(
-                        f"[SearchOrchestrator] Loaded {len(meta)} rows from "
+                        f"[SearchOrchestrator] Loaded {len(store)} rows from "
                         f"search_asset_features (fast path)"
                     )
                     # Validate critical columns are populated
-                    self._validate_search_features(meta)
-                    return meta
-                # Table exists but empty for this project — auto-rebuild
-                logger.info(
-                    f"[SearchOrchestrator] search_asset_features empty for "
-                    f"project {self.project_id}, triggering auto-rebuild"
-                )
-                rebuilt = repo.refresh_project(self.project_id)
-                if rebuilt > 0:
-                    meta = repo.get_project_meta(self.project_id)
-                    if meta:
-                        self._project_meta_cache = meta
-                        self._meta_cache_time = now
-                        logger.info(
-                            f"[SearchOrchestrator] Auto-rebuilt {rebuilt} rows "
-                            f"in search_asset_features"
-                        )
-                        self._validate_search_features(meta)
-                        return meta
+                    self._validate_search_features(store)
+                    return store
             except Exception as e:
                 logger.debug(f"[SearchOrchestrator] search_asset_features fallback: {e}")
 
@@ -2750,7 +2751,10 @@ class SearchOrchestrator:
             logger.info(f"  facets: {facet_summary}")
 
     def invalidate_meta_cache(self):
-        """Invalidate the metadata cache (call after scans, rating changes, etc.)."""
+        """Invalidate the metadata cache (call after scans, rating changes, etc.).
+
+        The columnar store is kept so the next load only reads changed rows.
+        """
         self._project_meta_cache = None
         self._meta_cache_time = 0.0
 
@@ -3420,16 +3424,23 @@ class SearchOrchestrator:
 
     _ann_index_cache: Dict[int, Tuple] = {}  # class-level: {project_id: (index, photo_ids, vectors, timestamp)}
     _ann_dirty: set = set()  # class-level: project_ids with new embeddings since last build
+    _ann_indexes: Dict[int, Any] = {}  # class-level: {project_id: IncrementalANNIndex}
     _ANN_CACHE_TTL = 300.0  # 5 minutes
 
     def _get_or_build_ann_index(self):
         """
         Get or build a FAISS/numpy ANN index for the project.
 
+        Vectors come from the persistent EmbeddingMatrixStore: the on-disk
+        matrix is memory-mapped and only embeddings added since the last
+        sync are read from semantic_embeddings, so cold start and
+        dirty-mark refreshes no longer decode every BLOB.
+
         Caches the index for _ANN_CACHE_TTL seconds.
-        Rebuilds immediately if marked dirty (new embeddings added).
-        For projects with >500 embeddings and FAISS available,
-        uses FAISS IndexFlatIP for O(log n) retrieval.
+        Re-syncs immediately if marked dirty (new embeddings added).
+        For projects with >500 embeddings and FAISS available, uses a
+        photo_id-keyed IncrementalANNIndex that only applies the delta
+        (new, re-embedded and deleted photos) instead of rebuilding.
         """
         if not _numpy_available:
             return None, [], {}
@@ -3441,64 +3452,42 @@ class SearchOrchestrator:
             return cached[0], cached[1], cached[2]
 
         if is_dirty:
-            logger.info(f"[SearchOrchestrator] ANN index dirty (new embeddings) — rebuilding for project {self.project_id}")
+            logger.info(f"[SearchOrchestrator] ANN index dirty (new embeddings) — syncing for project {self.project_id}")
             SearchOrchestrator._ann_dirty.discard(self.project_id)
 
         try:
-            from repository.base_repository import DatabaseConnection
-            db = DatabaseConnection()
-
-            with db.get_connection() as conn:
-                rows = conn.execute("""
-                    SELECT se.photo_id, se.embedding, pm.path
-                    FROM semantic_embeddings se
-                    JOIN photo_metadata pm ON se.photo_id = pm.id
-                    WHERE pm.project_id = ?
-                """, (self.project_id,)).fetchall()
-
-            if not rows:
-                return None, [], {}
-
-            photo_ids = []
-            vectors = []
-            path_lookup = {}
+            from services.embedding_matrix_store import get_embedding_matrix_store
+            from repository.project_repository import ProjectRepository
 
-            for row in rows:
-                try:
-                    emb = np.frombuffer(row['embedding'], dtype=np.float32)
-                    if len(emb) == 0:
-                        emb = np.frombuffer(row['embedding'], dtype=np.float16).astype(np.float32)
-                    if len(emb) > 0:
-                        photo_ids.append(row['photo_id'])
-                        vectors.append(emb)
-                        path_lookup[row['photo_id']] = row['path']
-                except Exception:
-                    continue
+            model_name = ProjectRepository().get_semantic_model(self.project_id) or \
+                "openai/clip-vit-base-patch32"
+            store = get_embedding_matrix_store(self.project_id, model_name)
+            view = store.sync()
 
-            if not vectors:
+            if view.vectors is None or not view.photo_ids:
                 return None, [], {}
 
-            vectors_np = np.vstack(vectors).astype('float32')
-            # Normalize for cosine similarity
-            norms = np.linalg.norm(vectors_np, axis=1, keepdims=True)
-            vectors_np = vectors_np / np.maximum(norms, 1e-8)
+            photo_ids = view.photo_ids
+            path_lookup = view.path_lookup
+            vectors_np = view.vectors  # already L2-normalized on append
 
             n_vectors = len(photo_ids)
             dim = vectors_np.shape[1]
 
             if _faiss_available and n_vectors >= 500:
-                index = _faiss.IndexFlatIP(dim)
-                index.add(vectors_np)
+                index = self._get_incremental_index(store.file_stem)
+                delta = index.sync(view)
                 index_data = ('faiss', index, vectors_np)
                 logger.info(
-                    f"[SearchOrchestrator] Built FAISS ANN index: "
-                    f"{n_vectors} vectors, dim={dim}"
+                    f"[SearchOrchestrator] FAISS ANN index ready: "
+                    f"{index.ntotal} vectors, dim={dim}, mode={index.active_mode}, "
+                    f"+{delta['added']} -{delta['removed']}, rebuilt={delta['rebuilt']}"
                 )
             else:
                 index_data = ('numpy', None, vectors_np)
                 logger.debug(
                     f"[SearchOrchestrator] Using numpy brute-force: "
-                    f"{n_vectors} vectors"
+                    f"{n_vectors} vectors, appended={view.appended}"
                 )
 
             SearchOrchestrator._ann_index_cache[self.project_id] = (
@@ -3510,6 +3499,22 @@ class SearchOrchestrator:
             logger.error(f"[SearchOrchestrator] ANN index build failed: {e}")
             return None, [], {}
 
+    def _get_incremental_index(self, path_stem: str):
+        """Get (or create) the project's IncrementalANNIndex for a matrix file stem."""
+        from services.ann_index import IncrementalANNIndex
+        from config.search_config import SearchConfig
+
+        index = SearchOrchestrator._ann_indexes.get(self.project_id)
+        if index is None or index.path_stem != path_stem:
+            index = IncrementalANNIndex(
+                path_stem,
+                mode=SearchConfig.get_ann_index_mode(),
+                approx_threshold=SearchConfig.get_ann_approx_threshold(),
+                nprobe=SearchConfig.get_ann_ivf_nprobe(),
+            )
+            SearchOrchestrator._ann_indexes[self.project_id] = index
+        return index
+
     def search_ann(self, query_text: str, top_k: int = 200,
                    extra_filters: Optional[Dict] = None) -> OrchestratorResult:
         """
@@ -3565,12 +3570,12 @@ class SearchOrchestrator:
             ann_hits = {}  # {photo_id: (score, query_text)}
 
             if index_type == 'faiss' and _faiss_available:
-                sims, indices = index.search(query_emb, candidate_k)
-                for sim, idx in zip(sims[0], indices[0]):
-                    if 0 <= idx < len(photo_ids):
-                        ann_hits[photo_ids[idx]] = (float(sim), semantic_text)
+                # IncrementalANNIndex is keyed by photo_id, not row position
+                sims, hit_ids = index.search(query_emb, candidate_k)
+                for sim, photo_id in zip(sims, hit_ids):
+                    ann_hits[int(photo_id)] = (float(sim), semantic_text)
             else:
-                sims = np.dot(vectors, query_emb.T).flatten()
+                sims = np.dot(vectors, query_emb.T.astype(vectors.dtype)).astype('float32').flatten()
                 if len(sims) > candidate_k:
                     top_idx = np.argpartition(sims, -candidate_k)[-candidate_k:]
                 else:
@@ -3651,6 +3656,23 @@ class SearchOrchestrator:
         cls._ann_dirty.add(project_id)
         logger.info(f"[SearchOrchestrator] ANN index marked dirty for project {project_id}")
 
+    @classmethod
+    def flush_ann_indexes(cls) -> int:
+        """
+        Persist incremental ANN indexes with unsaved deltas.
+
+        IncrementalANNIndex only saves on a timer during syncs, so call this
+        on application shutdown. Returns the number of indexes written.
+        """
+        saved = 0
+        for project_id, index in list(cls._ann_indexes.items()):
+            try:
+                if index.flush():
+                    saved += 1
+            except Exception as e:
+                logger.warning(f"[SearchOrchestrator] Could not save ANN index for project {project_id}: {e}")
+        return saved
+
     # ── Relevance Feedback (search_events + personal boost) ──
 
     @staticmethod
@@ -1030,6 +1030,98 @@ class SemanticEmbeddingService:
 
         return vec
 
+    @classmethod
+    def load_image_for_clip(cls, image_path: str, min_side: int = 256) -> Image.Image:
+        """
+        Decode an image for CLIP and pre-shrink it on the calling thread.
+
+        CLIP only ever sees a 224px center crop, so the shortest side is
+        reduced to ``min_side`` here.  JPEGs use PIL draft mode (DCT-domain
+        scaling) so a 24MP photo never decodes at full resolution.  Safe to
+        call from decode threads - it does not touch the model.
+
+        Raises:
+            Exception: If the file cannot be opened/decoded.
+        """
+        image = Image.open(image_path)
+        width, height = image.size
+        scale = min_side / max(1, min(width, height))
+        if scale < 1.0 and image.format == 'JPEG':
+            image.draft('RGB', (int(width * scale) + 1, int(height * scale) + 1))
+        image = cls._normalize_pil_for_clip(image)
+
+        width, height = image.size
+        scale = min_side / max(1, min(width, height))
+        if scale < 1.0:
+            image = image.resize(
+                (max(1, round(width * scale)), max(1, round(height * scale))),
+                Image.Resampling.BICUBIC,
+            )
+        return image
+
+    def encode_pil_batch(self, images: List[Image.Image]) -> Optional[np.ndarray]:
+        """
+        Encode already-decoded RGB images in a single forward pass.
+
+        Decoding happens elsewhere (see load_image_for_clip), so the
+        inference lock is only held for preprocessing + the model call.
+        On GPU OOM the batch is split in half and retried.
+
+        Args:
+            images: Decoded PIL images
+
+        Returns:
+            (len(images), dim) normalized float32 array, or None if inference failed.
+        """
+        if not images:
+            return np.empty((0, 0), dtype='float32')
+
+        self._load_model()
+        if not _MODEL_READY_EVENT.wait(timeout=120):
+            logger.error("[SemanticEmbeddingService] Timed out waiting for model ready event")
+            return None
+
+        try:
+            with self._infer_lock:
+                # Same numpy -> torch.from_numpy path as encode_image (avoids
+                # the processor's as_tensor() crash on Windows)
+                inputs_np = self._processor(images=images, return_tensors="np")
+                inputs = {}
+                for k, v in inputs_np.items():
+                    arr = np.ascontiguousarray(v)
+                    inputs[k] = self._torch.from_numpy(arr).to(self._device)
+
+                with self._torch.inference_mode():
+                    image_features = self._model.get_image_features(**inputs)
+        except RuntimeError as e:
+            if ('out of memory' in str(e).lower() or 'CUDA' in str(e)) and len(images) > 1:
+                if self._device and self._device.type == 'cuda':
+                    self._torch.cuda.empty_cache()
+                mid = len(images) // 2
+                logger.warning(
+                    f"[SemanticEmbeddingService] OOM with batch size {len(images)}, splitting"
+                )
+                head = self.encode_pil_batch(images[:mid])
+                tail = self.encode_pil_batch(images[mid:])
+                if head is None or tail is None:
+                    return None
+                return np.vstack([head, tail])
+            logger.exception("[SemanticEmbeddingService] Batched CLIP inference failed: %s", e)
+            return None
+        except Exception as e:
+            logger.exception("[SemanticEmbeddingService] Batched CLIP inference failed: %s", e)
+            return None
+
+        embeddings = image_features.cpu().numpy().astype('float32')
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.maximum(norms, 1e-8)
+
+        del inputs, image_features
+        if self._device and self._device.type == 'cuda':
+            self._torch.cuda.empty_cache()
+
+        return embeddings
+
     def encode_text(self, text: str) -> Optional[np.ndarray]:
         """
         Extract semantic embedding from text query.
@@ -1511,6 +1603,68 @@ class SemanticEmbeddingService:
             precision = "float16" if use_half_precision else "float32"
             logger.debug(f"[SemanticEmbeddingService] Stored {precision} embedding for photo {photo_id}")
 
+    def store_embeddings_batch(self,
+                               records: List[Tuple[int, np.ndarray, Optional[str], Optional[str]]],
+                               use_half_precision: bool = True) -> int:
+        """
+        Store many semantic embeddings in one transaction.
+
+        Same serialization as store_embedding() (float16 with negative dim
+        by default), but a single executemany instead of one connection and
+        commit per photo. The rows go through the database's write queue, so
+        they share a transaction with other workers' writes instead of
+        contending for the write lock; this call blocks until committed.
+
+        Args:
+            records: (photo_id, embedding, source_hash, source_mtime) tuples
+            use_half_precision: If True, store as float16 (default)
+
+        Returns:
+            Number of rows written
+        """
+        if not records:
+            return 0
+
+        rows = []
+        for photo_id, embedding, source_hash, source_mtime in records:
+            embedding = np.asarray(embedding, dtype='float32')
+            norm = float(np.linalg.norm(embedding))
+            if not (0.99 <= norm <= 1.01) and norm > 0:
+                embedding = embedding / norm
+                norm = 1.0
+            dim = len(embedding)
+            if use_half_precision:
+                blob, stored_dim = embedding.astype('float16').tobytes(), -dim
+            else:
+                blob, stored_dim = embedding.tobytes(), dim
+            rows.append((photo_id, self.model_name, blob, stored_dim, norm, source_hash, source_mtime))
+
+        written = self.db.write_queue().submit_rows("semantic_embeddings", """
+            INSERT OR REPLACE INTO semantic_embeddings
+            (photo_id, model, embedding, dim, norm, source_photo_hash, source_photo_mtime, computed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, rows).result()
+
+        logger.debug(f"[SemanticEmbeddingService] Stored {written} embeddings via write queue")
+        return written
+
+    def get_embedded_photo_ids(self, photo_ids: List[int]) -> set:
+        """Return the subset of photo_ids that already have an embedding for this model."""
+        found = set()
+        if not photo_ids:
+            return found
+        model_ph = ','.join('?' * len(self._model_aliases))
+        with self.db.get_connection(read_only=True) as conn:
+            for start in range(0, len(photo_ids), 500):
+                chunk = photo_ids[start:start + 500]
+                id_ph = ','.join('?' * len(chunk))
+                cursor = conn.execute(f"""
+                    SELECT photo_id FROM semantic_embeddings
+                    WHERE photo_id IN ({id_ph}) AND model IN ({model_ph})
+                """, (*chunk, *self._model_aliases))
+                found.update(row['photo_id'] for row in cursor.fetchall())
+        return found
+
     def get_embedding(self, photo_id: int) -> Optional[np.ndarray]:
         """
         Retrieve semantic embedding from database.
@@ -0,0 +1,158 @@
+# services/stack_clustering_benchmark.py
+# Benchmark for similar-shot stack clustering (complete-linkage engine)
+# Compares the matrix/mask engine against the original nested-loop algorithm
+# on synthetic burst sequences
+# ------------------------------------------------------
+
+"""
+Stack Clustering Benchmark
+
+Generates synthetic "bursts" (groups of near-identical CLIP-like embeddings
+plus unrelated singles), runs complete_linkage_clusters() and the original
+per-pair nested-loop algorithm, checks both produce identical clusters and
+reports timings.
+
+Usage:
+    python -m services.stack_clustering_benchmark
+    python -m services.stack_clustering_benchmark --sizes 1000 5000 10000 --legacy-max 2000
+"""
+
+import argparse
+import time
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.stack_generation_service import complete_linkage_clusters
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClusteringBenchmarkResult:
+    """Result of one benchmark size."""
+
+    photos: int
+    clusters: int
+    engine_seconds: float
+    legacy_seconds: Optional[float]   # None when the legacy run was skipped
+    identical: Optional[bool]
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if self.legacy_seconds is None or self.engine_seconds <= 0:
+            return None
+        return self.legacy_seconds / self.engine_seconds
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        out = asdict(self)
+        out['speedup'] = self.speedup
+        return out
+
+
+def synthetic_bursts(n_photos: int, burst_size: int = 8, dim: int = 512,
+                     noise: float = 0.35, single_ratio: float = 0.3,
+                     seed: int = 0) -> np.ndarray:
+    """
+    L2-normalized embeddings shaped like a photo library's time window.
+
+    ``single_ratio`` of the photos are unrelated singles; the rest come in
+    bursts of ``burst_size`` shots jittered around a shared direction.
+    Rows are shuffled so bursts interleave as they do in real windows.
+    """
+    rng = np.random.default_rng(seed)
+    n_burst = int(n_photos * (1.0 - single_ratio))
+    centers = rng.standard_normal((max(1, n_burst // burst_size + 1), dim)).astype(np.float32)
+    rows = np.repeat(centers, burst_size, axis=0)[:n_burst]
+    rows = rows + noise * rng.standard_normal(rows.shape).astype(np.float32)
+    singles = rng.standard_normal((n_photos - n_burst, dim)).astype(np.float32)
+    emb = np.vstack([rows, singles])
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb[rng.permutation(n_photos)]
+
+
+def legacy_complete_linkage(embeddings: np.ndarray, similarity_threshold: float) -> List[List[int]]:
+    """The original nested-loop algorithm (per-pair np.dot), kept as the reference."""
+    n = len(embeddings)
+    assigned = set()
+    clusters = []
+    for i in range(n):
+        if i in assigned:
+            continue
+        cluster = [i]
+        assigned.add(i)
+        for j in range(i + 1, n):
+            if j in assigned:
+                continue
+            is_similar_to_all = True
+            for member in cluster:
+                if float(np.dot(embeddings[j], embeddings[member])) < similarity_threshold:
+                    is_similar_to_all = False
+                    break
+            if is_similar_to_all:
+                cluster.append(j)
+                assigned.add(j)
+        clusters.append(cluster)
+    return clusters
+
+
+def run_benchmark(sizes=(1000, 2000, 5000, 10000), similarity_threshold: float = 0.85,
+                  legacy_max: int = 2000, dim: int = 512) -> List[ClusteringBenchmarkResult]:
+    """
+    Time the engine (and the legacy loop up to ``legacy_max`` photos) per size.
+
+    Returns:
+        One ClusteringBenchmarkResult per size
+    """
+    results = []
+    for n in sizes:
+        emb = synthetic_bursts(n, dim=dim)
+
+        start = time.perf_counter()
+        clusters = complete_linkage_clusters(emb, similarity_threshold)
+        engine_seconds = time.perf_counter() - start
+
+        legacy_seconds = identical = None
+        if n <= legacy_max:
+            start = time.perf_counter()
+            reference = legacy_complete_linkage(emb, similarity_threshold)
+            legacy_seconds = time.perf_counter() - start
+            identical = reference == clusters
+
+        result = ClusteringBenchmarkResult(
+            photos=n,
+            clusters=sum(1 for c in clusters if len(c) > 1),
+            engine_seconds=engine_seconds,
+            legacy_seconds=legacy_seconds,
+            identical=identical,
+        )
+        logger.info(f"[StackClusteringBenchmark] {result.to_dict()}")
+        results.append(result)
+    return results
+
+
+def print_benchmark_report(results: List[ClusteringBenchmarkResult]):
+    """Print a formatted table of benchmark results."""
+    print("\n" + "=" * 70)
+    print("STACK CLUSTERING BENCHMARK (complete-linkage)")
+    print("=" * 70)
+    print(f"{'photos':>8s} {'clusters':>9s} {'engine s':>10s} {'legacy s':>10s} {'speedup':>9s} {'identical':>10s}")
+    for r in results:
+        legacy = f"{r.legacy_seconds:10.3f}" if r.legacy_seconds is not None else f"{'-':>10s}"
+        speedup = f"{r.speedup:8.1f}x" if r.speedup is not None else f"{'-':>9s}"
+        identical = str(r.identical) if r.identical is not None else "-"
+        print(f"{r.photos:8d} {r.clusters:9d} {r.engine_seconds:10.3f} {legacy} {speedup} {identical:>10s}")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 10000])
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--legacy-max", type=int, default=2000,
+                        help="Largest size to also run the original nested-loop algorithm on")
+    args = parser.parse_args()
+    print_benchmark_report(run_benchmark(args.sizes, args.threshold, args.legacy_max))
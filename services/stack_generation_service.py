@@ -26,6 +26,81 @@ from repository.base_repository import DatabaseConnection
 
 logger = get_logger(__name__)
 
+# Rows of the thresholded similarity matrix computed per block; bounds the
+# transient float32 block to _SIMILARITY_BLOCK_ROWS x N.
+_SIMILARITY_BLOCK_ROWS = 512
+
+
+def _similar_at_least(rows, cols, similarity_threshold: float):
+    """Boolean ``rows @ cols.T >= threshold``, computed in row blocks."""
+    import numpy as np
+
+    out = np.empty((len(rows), len(cols)), dtype=bool)
+    for start in range(0, len(rows), _SIMILARITY_BLOCK_ROWS):
+        stop = min(start + _SIMILARITY_BLOCK_ROWS, len(rows))
+        np.greater_equal(rows[start:stop] @ cols.T, similarity_threshold, out=out[start:stop])
+    return out
+
+
+def complete_linkage_clusters(embeddings, similarity_threshold: float) -> List[List[int]]:
+    """
+    Strict (complete-linkage) greedy clustering over L2-normalized rows.
+
+    Same result as the original nested-loop algorithm: seeds are taken in
+    row order, and each later unassigned row joins the current cluster only
+    if its cosine similarity to EVERY member is >= similarity_threshold.
+
+    Vectorized: the upper triangle of the thresholded similarity matrix is
+    computed once, one block of seed rows at a time. A seed's candidates are
+    the later unassigned rows similar to it (every member must be); the
+    candidates' own similarity matrix then drives the "similar to all
+    members" test as a running boolean mask, so adding a member is one mask
+    AND and finding the next one an argmax, with no per-pair Python work.
+
+    Args:
+        embeddings: (N, D) array of L2-normalized embeddings
+        similarity_threshold: Minimum cosine similarity within a cluster
+
+    Returns:
+        Clusters as lists of row indices (all clusters, including singletons)
+    """
+    import numpy as np
+
+    emb = np.ascontiguousarray(embeddings, dtype=np.float32)
+    n = len(emb)
+    unassigned = np.ones(n, dtype=bool)
+    clusters = []
+
+    for block_start in range(0, n, _SIMILARITY_BLOCK_ROWS):
+        block_stop = min(block_start + _SIMILARITY_BLOCK_ROWS, n)
+        # Only columns >= block_start: earlier rows are already assigned
+        block = _similar_at_least(emb[block_start:block_stop], emb[block_start:], similarity_threshold)
+
+        for seed in range(block_start, block_stop):
+            if not unassigned[seed]:
+                continue
+            unassigned[seed] = False
+            members = [seed]
+
+            row = block[seed - block_start, seed - block_start + 1:]
+            candidates = seed + 1 + np.flatnonzero(row & unassigned[seed + 1:])
+            if len(candidates):
+                pairwise = _similar_at_least(emb[candidates], emb[candidates], similarity_threshold)
+                # Candidates still similar to all members so far (in row order)
+                eligible = np.ones(len(candidates), dtype=bool)
+                pos = 0
+                while pos < len(candidates):
+                    k = pos + int(eligible[pos:].argmax())
+                    if not eligible[k]:
+                        break
+                    members.append(int(candidates[k]))
+                    eligible &= pairwise[k]
+                    pos = k + 1
+                unassigned[members[1:]] = False
+
+            clusters.append(members)
+    return clusters
+
 
 @dataclass(frozen=True)
 class StackGenParams:
@@ -839,48 +914,17 @@ class StackGenerationService:
             self.logger.debug(f"Not enough photos with embeddings: {len(photo_embeddings)}")
             return []
 
-        # FIXED: Complete-linkage clustering (strict similarity requirement)
+        # FIXED: Complete-linkage clustering (strict similarity requirement),
+        # on the window's similarity matrix instead of per-pair dot products
         photo_ids = list(photo_embeddings.keys())
-        assigned = set()
         clusters = []
-
-        for i, photo_id in enumerate(photo_ids):
-            if photo_id in assigned:
-                continue
-
-            # Start new cluster with this photo
-            cluster = [photo_id]
-            assigned.add(photo_id)
-
-            # Find similar photos not yet assigned
-            embedding = photo_embeddings[photo_id]
-
-            for other_id in photo_ids[i+1:]:
-                if other_id in assigned:
-                    continue
-
-                other_embedding = photo_embeddings[other_id]
-
-                # CRITICAL FIX: Check similarity with ALL cluster members, not just seed
-                is_similar_to_all = True
-                for cluster_member_id in cluster:
-                    cluster_member_embedding = photo_embeddings[cluster_member_id]
-                    similarity = float(np.dot(other_embedding, cluster_member_embedding))
-
-                    if similarity < similarity_threshold:
-                        is_similar_to_all = False
-                        break
-
-                # Only add if similar to ALL cluster members
-                if is_similar_to_all:
-                    cluster.append(other_id)
-                    assigned.add(other_id)
-
+        for indices in complete_linkage_clusters(
+                np.stack([photo_embeddings[pid] for pid in photo_ids]), similarity_threshold):
             # Keep cluster if meets minimum size
-            if len(cluster) >= min_cluster_size:
-                clusters.append(cluster)
+            if len(indices) >= min_cluster_size:
+                clusters.append([photo_ids[idx] for idx in indices])
                 self.logger.debug(
-                    f"Created cluster of {len(cluster)} photos "
+                    f"Created cluster of {len(indices)} photos "
                     f"(all-pairs similarity >= {similarity_threshold:.2f})"
                 )
 
@@ -944,41 +988,14 @@ class StackGenerationService:
             f"({unique_clustered} unique photos in {len(set(already_clustered.values()))} time-window clusters)"
         )
 
-        # Build embedding matrix and compute pairwise cosine similarity
+        # Complete-linkage clustering on the cosine similarity matrix
+        # (embeddings already normalized)
         emb_matrix = np.stack(candidate_embeddings)  # shape: (N, D)
-        # Cosine similarity matrix via matrix multiplication (embeddings already normalized)
-        sim_matrix = emb_matrix @ emb_matrix.T  # shape: (N, N)
-
-        # Complete-linkage clustering on the similarity matrix
-        n = len(candidate_ids)
-        assigned = set()
-        raw_clusters = []
-
-        for i in range(n):
-            if i in assigned:
-                continue
-
-            cluster_indices = [i]
-            assigned.add(i)
-
-            for j in range(i + 1, n):
-                if j in assigned:
-                    continue
-
-                # Check similarity with ALL current cluster members
-                is_similar_to_all = True
-                for ci in cluster_indices:
-                    if sim_matrix[j, ci] < similarity_threshold:
-                        is_similar_to_all = False
-                        break
-
-                if is_similar_to_all:
-                    cluster_indices.append(j)
-                    assigned.add(j)
-
-            if len(cluster_indices) >= min_cluster_size:
-                cluster_photo_ids = [candidate_ids[idx] for idx in cluster_indices]
-                raw_clusters.append(cluster_photo_ids)
+        raw_clusters = [
+            [candidate_ids[idx] for idx in indices]
+            for indices in complete_linkage_clusters(emb_matrix, similarity_threshold)
+            if len(indices) >= min_cluster_size
+        ]
 
         # Deduplicate: only keep clusters that span multiple time-window clusters
         # or contain photos not in any time-window cluster (true cross-date groups)
@@ -0,0 +1,232 @@
+# services/thumbnail_decode_benchmark.py
+# Benchmark for thumbnail decode paths per image format
+# Compares full-resolution PIL decode, QImageReader scaled decode and the
+# fast path (embedded preview / JPEG draft / HEIF thumbnail)
+# ------------------------------------------------------
+
+"""
+Thumbnail Decode Benchmark
+
+Times three ways of producing a thumbnail of a given height from each file
+of a fixture corpus:
+
+- full:      PIL open + load + thumbnail() (the old PIL fallback path)
+- qt_scaled: QImageReader.setScaledSize()
+- fast:      safe_image_loader.fast_decode_pil() + thumbnail(), falling back
+             to the full decode when no fast path applies
+
+Without --corpus a synthetic corpus is written to a temp dir: a plain JPEG,
+a JPEG with a 640x480 EXIF preview, PNG, TIFF and (with pillow_heif) HEIC.
+
+Usage:
+    python -m services.thumbnail_decode_benchmark
+    python -m services.thumbnail_decode_benchmark --corpus ~/Pictures/sample --heights 128 512
+"""
+
+import argparse
+import io
+import os
+import struct
+import tempfile
+import time
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from services.safe_image_loader import fast_decode_pil
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DecodeBenchmarkResult:
+    """Mean decode time of one file at one thumbnail height."""
+
+    label: str
+    height: int
+    full_ms: float
+    qt_ms: Optional[float]      # None when Qt cannot read the format
+    fast_ms: float
+    fast_path: str              # "preview", "draft" or "full" (no fast path)
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if self.fast_ms <= 0:
+            return None
+        return self.full_ms / self.fast_ms
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        out = asdict(self)
+        out['speedup'] = self.speedup
+        return out
+
+
+def exif_with_preview(preview_jpeg: bytes, orientation: int = 1) -> bytes:
+    """
+    Minimal EXIF APP1 payload: IFD0 with Orientation, IFD1 pointing at an
+    embedded JPEG thumbnail (what cameras and phones write).
+    """
+    ifd1_offset = 8 + 2 + 12 + 4
+    data_offset = ifd1_offset + 2 + 2 * 12 + 4
+    tiff = b"II*\x00" + struct.pack("<I", 8)
+    tiff += struct.pack("<H", 1) + struct.pack("<HHIHH", 0x0112, 3, 1, orientation, 0)
+    tiff += struct.pack("<I", ifd1_offset)
+    tiff += struct.pack("<H", 2)
+    tiff += struct.pack("<HHII", 0x0201, 4, 1, data_offset)
+    tiff += struct.pack("<HHII", 0x0202, 4, 1, len(preview_jpeg))
+    tiff += struct.pack("<I", 0)
+    return b"Exif\x00\x00" + tiff + preview_jpeg
+
+
+def _photo_like(size) -> Image.Image:
+    """Gradient plus noise, so encoders and decoders do realistic work."""
+    w, h = size
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.effect_noise(size, 40)
+    return Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+
+def write_fixture_corpus(directory: str, size=(4000, 3000), preview_size=(640, 480)) -> Dict[str, str]:
+    """
+    Write the synthetic corpus into directory.
+
+    Returns:
+        label -> file path
+    """
+    img = _photo_like(size)
+    corpus = {}
+
+    path = os.path.join(directory, "plain.jpg")
+    img.save(path, quality=90)
+    corpus["jpeg"] = path
+
+    buf = io.BytesIO()
+    img.resize(preview_size).save(buf, "JPEG", quality=85)
+    path = os.path.join(directory, "preview.jpg")
+    img.save(path, quality=90, exif=exif_with_preview(buf.getvalue()))
+    corpus["jpeg+exif_preview"] = path
+
+    for label, ext in (("png", "png"), ("tiff", "tif")):
+        path = os.path.join(directory, f"plain.{ext}")
+        img.save(path)
+        corpus[label] = path
+
+    try:
+        import pillow_heif
+        pillow_heif.register_heif_opener()
+        path = os.path.join(directory, "plain.heic")
+        img.save(path, quality=90)
+        corpus["heic"] = path
+    except Exception as e:
+        logger.info(f"[ThumbnailDecodeBenchmark] HEIC skipped: {e}")
+
+    return corpus
+
+
+def load_corpus(directory: str) -> Dict[str, str]:
+    """Real files from directory, labelled by extension (first file per extension)."""
+    corpus = {}
+    for name in sorted(os.listdir(directory)):
+        ext = os.path.splitext(name)[1].lower().lstrip(".")
+        path = os.path.join(directory, name)
+        if ext and os.path.isfile(path):
+            corpus.setdefault(ext, path)
+    return corpus
+
+
+def decode_full(path: str, height: int) -> Image.Image:
+    with Image.open(path) as img:
+        img.load()
+        img.thumbnail((img.width, height), Image.Resampling.LANCZOS)
+        return img
+
+
+def decode_qt_scaled(path: str, height: int):
+    from PySide6.QtCore import QSize
+    from PySide6.QtGui import QImageReader
+
+    reader = QImageReader(path)
+    size = reader.size()
+    if not size.isValid():
+        return None
+    if size.height() > height:
+        reader.setScaledSize(QSize(int(size.width() * height / size.height()), height))
+    img = reader.read()
+    return None if img.isNull() else img
+
+
+def decode_fast(path: str, height: int):
+    img = fast_decode_pil(path, height=height)
+    if img is None:
+        return decode_full(path, height), "full"
+    img.thumbnail((img.width, height), Image.Resampling.LANCZOS)
+    return img, img.info.get("decode_path", "fast")
+
+
+def _mean_ms(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) * 1000.0 / repeats
+
+
+def run_benchmark(corpus: Dict[str, str], heights=(128, 256, 512),
+                  repeats: int = 5) -> List[DecodeBenchmarkResult]:
+    """
+    Time each decode path per corpus file and height.
+
+    Returns:
+        One DecodeBenchmarkResult per (file, height)
+    """
+    results = []
+    for label, path in corpus.items():
+        for height in heights:
+            _, fast_path = decode_fast(path, height)     # also warms the OS file cache
+            qt_ms = None
+            if decode_qt_scaled(path, height) is not None:
+                qt_ms = _mean_ms(lambda: decode_qt_scaled(path, height), repeats)
+
+            result = DecodeBenchmarkResult(
+                label=label,
+                height=height,
+                full_ms=_mean_ms(lambda: decode_full(path, height), repeats),
+                qt_ms=qt_ms,
+                fast_ms=_mean_ms(lambda: decode_fast(path, height), repeats),
+                fast_path=fast_path,
+            )
+            logger.info(f"[ThumbnailDecodeBenchmark] {result.to_dict()}")
+            results.append(result)
+    return results
+
+
+def print_benchmark_report(results: List[DecodeBenchmarkResult]):
+    """Print a formatted table of benchmark results."""
+    print("\n" + "=" * 78)
+    print("THUMBNAIL DECODE BENCHMARK (mean ms per thumbnail)")
+    print("=" * 78)
+    print(f"{'format':>18s} {'height':>7s} {'full':>9s} {'qt scaled':>10s} {'fast':>9s} {'path':>8s} {'speedup':>8s}")
+    for r in results:
+        qt = f"{r.qt_ms:10.1f}" if r.qt_ms is not None else f"{'-':>10s}"
+        speedup = f"{r.speedup:7.1f}x" if r.speedup is not None else f"{'-':>8s}"
+        print(f"{r.label:>18s} {r.height:7d} {r.full_ms:9.1f} {qt} {r.fast_ms:9.1f} {r.fast_path:>8s} {speedup}")
+    print("=" * 78 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of real files (one per extension is used)")
+    parser.add_argument("--heights", type=int, nargs="+", default=[128, 256, 512])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--size", type=int, nargs=2, default=[4000, 3000], metavar=("W", "H"),
+                        help="Synthetic corpus image size")
+    args = parser.parse_args()
+
+    if args.corpus:
+        print_benchmark_report(run_benchmark(load_corpus(args.corpus), args.heights, args.repeats))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = write_fixture_corpus(tmp, tuple(args.size))
+            print_benchmark_report(run_benchmark(corpus, args.heights, args.repeats))
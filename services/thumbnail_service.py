@@ -22,6 +22,7 @@ from PySide6.QtWidgets import QApplication
 
 from logging_config import get_logger
 from thumb_cache_db import ThumbCacheDB, get_cache
+from services.safe_image_loader import FAST_DECODE_FORMATS, fast_decode_pil
 
 logger = get_logger(__name__)
 
@@ -48,6 +49,13 @@ PIL_PREFERRED_FORMATS = {
     '.bmp',           # Some BMP variants
 }
 
+# Thumbnail pyramid: heights generated together from one decode and stored as
+# separate L2 rows. A request is served from the nearest level at or above
+# its height with a cheap downscale, so grid zoom, filmstrip and face crops
+# share the same cached levels instead of each re-decoding the original.
+# Requests above the top level are generated at their exact height.
+PYRAMID_LEVELS = (128, 256, 512)
+
 def _qt_message_handler(msg_type, context, message):
     """
     Custom Qt message handler to suppress known TIFF compression warnings.
@@ -503,12 +511,10 @@ class ThumbnailService:
             if cached_image and not cached_image.isNull():
                 return cached_image
 
-        # 2. Check L2 (database) cache - returns QPixmap, convert to QImage
-        l2_pixmap = self.l2_cache.get_cached_thumbnail(path, current_mtime, height * 2)
-        if l2_pixmap and not l2_pixmap.isNull():
+        # 2. Check L2 (database) cache - nearest pyramid level, as QImage
+        l2_image = self._get_l2_image(path, height, current_mtime)
+        if l2_image is not None:
             logger.debug(f"L2 hit: {path}")
-            # Convert QPixmap to QImage for thread-safe storage
-            l2_image = l2_pixmap.toImage()
             # Store in L1 for faster subsequent access
             self.l1_cache.put(cache_key, {"image": l2_image, "mtime": current_mtime})
             return l2_image
@@ -517,15 +523,11 @@ class ThumbnailService:
         logger.debug(f"Cache miss, generating: {path} @ {height}px")
 
         with _decode_semaphore:
-            qimage = self._generate_thumbnail_as_qimage(path, height, timeout)
+            qimage = self._generate_and_store(path, height, timeout, current_mtime)
 
         if qimage and not qimage.isNull():
             # Store in L1 cache
             self.l1_cache.put(cache_key, {"image": qimage, "mtime": current_mtime})
-            # Store in L2 cache (convert to QPixmap for database storage)
-            # NOTE: This is safe because L2 stores PNG bytes, not QPixmap object
-            pixmap = QPixmap.fromImage(qimage)
-            self.l2_cache.store_thumbnail(path, current_mtime, pixmap)
 
         return qimage
 
@@ -595,27 +597,106 @@ class ThumbnailService:
             if cached_pixmap and not cached_pixmap.isNull():
                 return cached_pixmap
 
-        # 2. Check L2 (database) cache
-        l2_pixmap = self.l2_cache.get_cached_thumbnail(path, current_mtime, height * 2)
-        if l2_pixmap and not l2_pixmap.isNull():
+        # 2. Check L2 (database) cache - nearest pyramid level
+        l2_image = self._get_l2_image(path, height, current_mtime)
+        if l2_image is not None:
             logger.debug(f"L2 hit: {path}")
             # Store as QImage in L1 for thread-safety
-            l2_image = l2_pixmap.toImage()
             self.l1_cache.put(cache_key, {"image": l2_image, "mtime": current_mtime})
-            return l2_pixmap
+            return QPixmap.fromImage(l2_image)
 
         # 3. Generate thumbnail
         logger.debug(f"Cache miss, generating: {path} @ {height}px")
-        pixmap = self._generate_thumbnail(path, height, timeout)
+        if self._pyramid_level(height) is None:
+            pixmap = self._generate_thumbnail(path, height, timeout)
+            if pixmap and not pixmap.isNull():
+                self.l2_cache.store_thumbnail(path, current_mtime, pixmap)
+        else:
+            pixmap = QPixmap.fromImage(self._generate_and_store(path, height, timeout, current_mtime))
 
         if pixmap and not pixmap.isNull():
             # Store as QImage in L1 for thread-safety
             qimage = pixmap.toImage()
             self.l1_cache.put(cache_key, {"image": qimage, "mtime": current_mtime})
-            self.l2_cache.store_thumbnail(path, current_mtime, pixmap)
 
         return pixmap
 
+    @staticmethod
+    def _pyramid_level(height: int) -> Optional[int]:
+        """Smallest pyramid level that covers height (None above the top level)."""
+        for level in PYRAMID_LEVELS:
+            if height <= level:
+                return level
+        return None
+
+    @staticmethod
+    def _fit_height(image: QImage, height: int) -> QImage:
+        """Downscale image to height; never upscales."""
+        if height > 0 and image.height() > height:
+            return image.scaledToHeight(height, Qt.SmoothTransformation)
+        return image
+
+    def _get_l2_image(self, path: str, height: int, mtime: float) -> Optional[QImage]:
+        """
+        Look up a thumbnail for height in the L2 cache.
+
+        Tries the covering pyramid level first, then larger levels (a level
+        may have been evicted or skipped for small originals). Heights above
+        the top level use the single unlevelled row as before.
+
+        Returns:
+            QImage at most height pixels high, or None on a miss
+        """
+        level = self._pyramid_level(height)
+        if level is None:
+            image = self.l2_cache.get_cached_image(path, mtime, height * 2)
+            return image if image is not None and not image.isNull() else None
+
+        for candidate in PYRAMID_LEVELS[PYRAMID_LEVELS.index(level):]:
+            image = self.l2_cache.get_cached_image(path, mtime, level=candidate)
+            if image is not None and not image.isNull():
+                return self._fit_height(image, height)
+        return None
+
+    def _generate_and_store(self, path: str, height: int, timeout: float, mtime: float) -> QImage:
+        """
+        Generate a thumbnail for height and store it in L2.
+
+        Within the pyramid range, decodes once at the top level and derives
+        the smaller levels by successive halving, so the next request at any
+        zoom is an L2 hit. Levels that would duplicate a larger one (original
+        smaller than the level) are not stored; lookups fall through to the
+        larger level instead.
+
+        Returns:
+            QImage at most height pixels high (null on error)
+        """
+        if self._pyramid_level(height) is None:
+            qimage = self._generate_thumbnail_as_qimage(path, height, timeout)
+            if qimage and not qimage.isNull():
+                self.l2_cache.store_image(path, mtime, qimage)
+            return qimage
+
+        top = self._generate_thumbnail_as_qimage(path, PYRAMID_LEVELS[-1], timeout)
+        if top is None or top.isNull():
+            return QImage()
+
+        result = top
+        previous = None
+        for level in reversed(PYRAMID_LEVELS):
+            if previous is None:
+                image = top
+            elif previous.height() > level:
+                image = previous.scaledToHeight(level, Qt.SmoothTransformation)
+            else:
+                continue
+            self.l2_cache.store_image(path, mtime, image, level=level)
+            previous = image
+            if level >= height:
+                result = image
+
+        return self._fit_height(result, height)
+
     def _generate_thumbnail(self, path: str, height: int, timeout: float) -> QPixmap:
         """
         Generate thumbnail from image file.
@@ -650,12 +731,25 @@ class ThumbnailService:
             logger.debug(f"Using PIL for {ext} format: {path}")
             return self._generate_thumbnail_pil(path, height, timeout)
 
+        # Embedded preview (EXIF / RAW / HEIF thumbnail) when it is large enough
+        if ext in FAST_DECODE_FORMATS:
+            preview = self._fast_decode_as_qimage(path, height, allow_draft=False)
+            if preview is not None:
+                return QPixmap.fromImage(preview)
+
         # Try Qt's fast QImageReader for common formats
         try:
             start = time.time()
             reader = QImageReader(path)
             reader.setAutoTransform(True)  # Handle EXIF rotation
 
+            # Decode at target size instead of full resolution
+            original_size = reader.size()
+            if height > 0 and original_size.isValid() and original_size.height() > height:
+                scale_factor = height / original_size.height()
+                from PySide6.QtCore import QSize
+                reader.setScaledSize(QSize(int(original_size.width() * scale_factor), height))
+
             # Check timeout
             if time.time() - start > timeout:
                 logger.warning(f"Decode timeout: {path}")
@@ -718,6 +812,11 @@ class ThumbnailService:
                 self._add_failed_image(self._normalize_path(path))
                 return QPixmap()
 
+            # Reduced-resolution decode (embedded preview / JPEG draft / HEIF thumbnail)
+            fast = self._fast_decode_as_qimage(path, height)
+            if fast is not None:
+                return QPixmap.fromImage(fast)
+
             start = time.time()
 
             # P2-34 FIX: Skip separate verify() step to eliminate double disk read
@@ -888,6 +987,14 @@ class ThumbnailService:
             logger.debug(f"Using PIL for {ext} format: {path}")
             return self._generate_thumbnail_pil_as_qimage(path, height, timeout)
 
+        # Embedded preview (EXIF / RAW / HEIF thumbnail) when it is large enough.
+        # No draft() here: the scaled QImageReader decode below already scales
+        # JPEG in the DCT domain.
+        if ext in FAST_DECODE_FORMATS:
+            preview = self._fast_decode_as_qimage(path, height, allow_draft=False)
+            if preview is not None:
+                return preview
+
         # Try Qt's fast QImageReader for common formats
         try:
             start = time.time()
@@ -962,6 +1069,11 @@ class ThumbnailService:
                 self._add_failed_image(self._normalize_path(path))
                 return QImage()
 
+            # Reduced-resolution decode (embedded preview / JPEG draft / HEIF thumbnail)
+            fast = self._fast_decode_as_qimage(path, height)
+            if fast is not None:
+                return fast
+
             start = time.time()
 
             try:
@@ -1083,6 +1195,38 @@ class ThumbnailService:
             self._add_failed_image(self._normalize_path(path))
             return QImage()
 
+    def _fast_decode_as_qimage(self, path: str, height: int, allow_draft: bool = True) -> Optional[QImage]:
+        """
+        Thumbnail from fast_decode_pil() (THREAD-SAFE).
+
+        Args:
+            path: Image file path
+            height: Target height in pixels
+            allow_draft: Also use JPEG draft() decoding, not only embedded previews
+
+        Returns:
+            QImage at most height pixels high, or None when no fast path applies
+        """
+        if height <= 0:
+            return None
+        img = fast_decode_pil(path, height=height, allow_draft=allow_draft)
+        if img is None:
+            return None
+
+        try:
+            if img.height > height:
+                img.thumbnail((img.width, height), Image.Resampling.LANCZOS)
+            if img.mode != "RGB":
+                img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+
+            fmt = QImage.Format_RGBA8888 if img.mode == "RGBA" else QImage.Format_RGB888
+            stride = img.width * len(img.getbands())
+            # copy() detaches the QImage from the Python buffer
+            return QImage(img.tobytes(), img.width, img.height, stride, fmt).copy()
+        except Exception as e:
+            logger.debug(f"Fast decode conversion failed for {path}: {e}")
+            return None
+
     def invalidate(self, path: str):
         """
         Invalidate cached thumbnail for a file.
@@ -1105,8 +1249,8 @@ class ThumbnailService:
             if self.l1_cache.invalidate(cache_key):
                 l1_removed += 1
 
-        # Remove from L2
-        self.l2_cache.invalidate(path)
+        # Remove from L2 (every pyramid level)
+        self.l2_cache.invalidate(path, levels=PYRAMID_LEVELS)
 
         # Remove from failed images (allow retry after file is fixed)
         was_failed = False
@@ -1128,13 +1272,11 @@ class ThumbnailService:
 
         # P2-23 FIX: Explicitly delete ALL L2 cache entries from database
         # purge_stale(max_age_days=0) only removes entries with mtime < now,
-        # which may miss recently-added entries. Use direct DELETE for complete removal.
+        # which may miss recently-added entries. Use clear() for complete removal.
         try:
-            if hasattr(self.l2_cache, 'conn') and hasattr(self.l2_cache, 'lock'):
-                with self.l2_cache.lock:
-                    self.l2_cache.conn.execute("DELETE FROM thumbnail_cache")
-                    self.l2_cache.conn.commit()
-                    logger.info("[ThumbCache] P2-23: Cleared ALL L2 cache entries from database")
+            if hasattr(self.l2_cache, 'clear'):
+                self.l2_cache.clear()
+                logger.info("[ThumbCache] P2-23: Cleared ALL L2 cache entries from database")
             else:
                 # Fallback to purge_stale if direct access not available
                 self.l2_cache.purge_stale(max_age_days=0)
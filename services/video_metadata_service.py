@@ -1,6 +1,8 @@
 # services/video_metadata_service.py
 # Version 1.0.0 dated 2025-11-09
 # Video metadata extraction using ffmpeg/ffprobe
+# All fields are read in one ffprobe call; services/video_probe_engine.py
+# runs many of these concurrently with a (path, size, mtime) cache
 
 import subprocess
 import json
@@ -11,6 +13,16 @@ from logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Everything extract_metadata() reads, requested in one ffprobe call
+# (format fields plus the first video stream)
+FFPROBE_ENTRIES = (
+    "format=duration,bit_rate"
+    ":format_tags=creation_time,date,DATE"
+    ":stream=codec_type,codec_name,width,height,r_frame_rate"
+    ":stream_tags=creation_time,date,DATE,rotate"
+    ":stream_side_data=rotation"
+)
+
 
 class VideoMetadataService:
     """
@@ -26,6 +38,7 @@ class VideoMetadataService:
     - Codec
     - Bitrate
     - Creation date
+    - Rotation (degrees clockwise)
     """
 
     def __init__(self, ffprobe_path: str = None):
@@ -107,6 +120,7 @@ class VideoMetadataService:
             - codec: Video codec name (str)
             - bitrate: Bitrate in kbps (int)
             - date_taken: Creation date (str, YYYY-MM-DD HH:MM:SS format)
+            - rotation: Display rotation in degrees clockwise (int, only when set)
             - size_kb: File size in KB (float)
             - modified: Last modified timestamp (str)
 
@@ -153,13 +167,13 @@ class VideoMetadataService:
             Dict with video metadata fields
         """
         try:
-            # Run ffprobe with JSON output
+            # Run ffprobe with JSON output, asking only for the fields we parse
             cmd = [
                 self._ffprobe_path,
                 '-v', 'quiet',
                 '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
+                '-select_streams', 'v:0',
+                '-show_entries', FFPROBE_ENTRIES,
                 video_path
             ]
 
@@ -170,6 +184,24 @@ class VideoMetadataService:
                 timeout=30
             )
 
+            if result.returncode != 0:
+                # Older ffprobe builds reject unknown -show_entries sections;
+                # retry with the full dump before giving up
+                cmd = [
+                    self._ffprobe_path,
+                    '-v', 'quiet',
+                    '-print_format', 'json',
+                    '-show_format',
+                    '-show_streams',
+                    video_path
+                ]
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    timeout=30
+                )
+
             if result.returncode != 0:
                 self.logger.error(f"ffprobe failed for {video_path}: {result.stderr}")
                 return {}
@@ -262,6 +294,22 @@ class VideoMetadataService:
                     if 'codec_name' in video_stream:
                         metadata['codec'] = video_stream['codec_name']
 
+                    # Rotation: legacy 'rotate' tag (clockwise) or display
+                    # matrix side data (counter-clockwise)
+                    rotation = None
+                    try:
+                        if 'rotate' in video_stream.get('tags', {}):
+                            rotation = int(float(video_stream['tags']['rotate']))
+                        else:
+                            for side_data in video_stream.get('side_data_list', []):
+                                if 'rotation' in side_data:
+                                    rotation = -int(float(side_data['rotation']))
+                                    break
+                    except (ValueError, TypeError):
+                        rotation = None
+                    if rotation is not None:
+                        metadata['rotation'] = rotation % 360
+
                     # Strategy 4: Stream-level creation_time tag (if not found in format)
                     if 'date_taken' not in metadata and 'tags' in video_stream:
                         stream_date = None
@@ -0,0 +1,217 @@
+# services/video_probe_engine.py
+# Concurrent ffprobe metadata extraction with a (path, size, mtime) cache
+# Used by PhotoScanService (creation dates while indexing) and
+# VideoMetadataWorker (full metadata), so each video is probed once
+
+"""
+Video Probe Engine
+
+Runs VideoMetadataService.extract_metadata() - one ffprobe call per video
+for duration, resolution, codec, creation date and rotation - on a shared
+thread pool, so up to ``max_workers`` ffprobe processes run at once.
+
+Results are cached by (path, size, mtime_ns): a scan that prefetches
+creation dates leaves the full metadata behind for the background metadata
+worker, and re-probing an unchanged file is free. A video already being
+probed is not probed a second time; callers share its future.
+
+Usage:
+    from services.video_probe_engine import get_video_probe_engine
+
+    engine = get_video_probe_engine()
+    engine.prefetch(paths)                      # start probing, don't wait
+    metadata = engine.probe(path, timeout=2.0)  # {} if not ready/failed
+    for path, metadata in engine.probe_many(paths):
+        ...
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+ProbeKey = Tuple[str, int, int]
+
+
+def default_probe_workers() -> int:
+    """Concurrent ffprobe processes when not configured (I/O bound, so above the core count is fine)."""
+    return max(2, min(8, os.cpu_count() or 2))
+
+
+def probe_key(path: str) -> Optional[ProbeKey]:
+    """Cache key of a video file, or None if it cannot be stat'ed."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def _has_probe_data(metadata: Dict[str, Any]) -> bool:
+    """True when ffprobe contributed fields (not just the file size/mtime)."""
+    return any(k in metadata for k in ('duration_seconds', 'width', 'codec'))
+
+
+def _done(result: Dict[str, Any]) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class VideoProbeEngine:
+    """
+    Bounded-concurrency front end to VideoMetadataService.extract_metadata().
+
+    Thread-safe. The pool is created on first use and shared by all callers.
+    """
+
+    DEFAULT_CACHE_SIZE = 4096
+
+    def __init__(self, metadata_service=None, max_workers: Optional[int] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            metadata_service: VideoMetadataService to run (default: shared instance)
+            max_workers: Concurrent ffprobe processes (default: default_probe_workers())
+            cache_size: Results kept, least recently used evicted first
+        """
+        if metadata_service is None:
+            from services.video_metadata_service import get_video_metadata_service
+            metadata_service = get_video_metadata_service()
+        self._service = metadata_service
+        self.max_workers = max(1, int(max_workers or default_probe_workers()))
+        self.cache_size = max(1, int(cache_size))
+
+        self._cache: "OrderedDict[ProbeKey, Dict[str, Any]]" = OrderedDict()
+        self._in_flight: Dict[ProbeKey, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether ffprobe is installed (without it only file size/mtime are returned)."""
+        return self._service.is_ffprobe_available()
+
+    def submit(self, path: str) -> Future:
+        """
+        Start probing a video unless it is cached or already running.
+
+        Returns:
+            Future resolving to the metadata dict ({} if the file is missing)
+        """
+        key = probe_key(path)
+        if key is None:
+            return _done({})
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return _done(dict(cached))
+            future = self._in_flight.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="ffprobe"
+                    )
+                future = self._executor.submit(self._probe, key)
+                self._in_flight[key] = future
+            return future
+
+    def _probe(self, key: ProbeKey) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {}
+        try:
+            metadata = self._service.extract_metadata(key[0])
+        except Exception as e:
+            logger.error(f"[VideoProbeEngine] Probe failed for {key[0]}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                # Failed probes are not cached: they may be timeouts
+                if _has_probe_data(metadata):
+                    self._cache[key] = dict(metadata)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        return metadata
+
+    def prefetch(self, paths: Iterable[str]) -> int:
+        """Queue probes for paths without waiting; returns the number queued."""
+        count = 0
+        for path in paths:
+            self.submit(path)
+            count += 1
+        return count
+
+    def probe(self, path: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Metadata for one video, waiting up to ``timeout`` seconds.
+
+        On timeout {} is returned; the probe keeps running and its result
+        is cached for the next caller.
+        """
+        try:
+            return dict(self.submit(path).result(timeout=timeout))
+        except FutureTimeoutError:
+            return {}
+
+    def probe_many(self, paths: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Probe many videos, at most two per worker queued at a time.
+
+        Yields:
+            (path, metadata) in completion order; every path once
+        """
+        window = self.max_workers * 2
+        paths_iter = iter(paths)
+        pending: Dict[Future, List[str]] = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window:
+                path = next(paths_iter, None)
+                if path is None:
+                    exhausted = True
+                    break
+                pending.setdefault(self.submit(path), []).append(path)
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                metadata = future.result()
+                for path in pending.pop(future):
+                    yield path, dict(metadata)
+
+    def clear_cache(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._cache.clear()
+
+
+# Singleton instance
+_video_probe_engine = None
+_video_probe_engine_lock = Lock()
+
+
+def get_video_probe_engine() -> VideoProbeEngine:
+    """
+    Get the shared VideoProbeEngine.
+
+    Settings:
+        video_probe_workers: Concurrent ffprobe processes (0 = auto)
+    """
+    global _video_probe_engine
+    with _video_probe_engine_lock:
+        if _video_probe_engine is None:
+            try:
+                from settings_manager_qt import SettingsManager
+                workers = int(SettingsManager().get("video_probe_workers", 0) or 0)
+            except Exception:
+                workers = 0
+            _video_probe_engine = VideoProbeEngine(max_workers=workers or None)
+        return _video_probe_engine
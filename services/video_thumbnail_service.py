@@ -4,7 +4,8 @@
 
 import subprocess
 import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
 from pathlib import Path
 from logging_config import get_logger
 
@@ -29,6 +30,11 @@ class VideoThumbnailService:
     Thumbnail format: JPEG (for compatibility and file size)
     """
 
+    # Concurrent ffmpeg processes in generate_thumbnails_batch()
+    DEFAULT_BATCH_WORKERS = min(4, os.cpu_count() or 2)
+    # Seconds before a single ffmpeg run is killed
+    DEFAULT_TIMEOUT = 30.0
+
     def __init__(self, thumbnail_dir: str = None):
         """
         Initialize VideoThumbnailService.
@@ -116,7 +122,9 @@ class VideoThumbnailService:
         output_path: Optional[str] = None,
         timestamp: Optional[float] = None,
         width: int = 320,
-        height: int = 240
+        height: int = 240,
+        timeout: float = DEFAULT_TIMEOUT,
+        keyframes_only: bool = False
     ) -> Optional[str]:
         """
         Generate a thumbnail for a video file.
@@ -130,6 +138,10 @@ class VideoThumbnailService:
             timestamp: Optional timestamp in seconds to extract frame from (default: 10% of duration or 1 second)
             width: Thumbnail width in pixels (default: 320)
             height: Thumbnail height in pixels (default: 240)
+            timeout: Seconds before ffmpeg is killed (default: 30)
+            keyframes_only: Grab the keyframe at or before the timestamp
+                instead of decoding up to the exact frame (much faster on
+                long-GOP phone videos; retried exactly if it yields nothing)
 
         Returns:
             Path to generated thumbnail, or None if failed
@@ -154,34 +166,27 @@ class VideoThumbnailService:
             timestamp = self._get_default_timestamp(video_path)
 
         try:
-            # Use ffmpeg to extract frame
-            # Note: -pix_fmt yuvj420p is required for WMV and some other formats
-            # that use non-full-range YUV color space (fixes "Non full-range YUV" error)
-            cmd = [
-                self._ffmpeg_path,  # Use configured ffmpeg path
-                '-y',  # Overwrite output file
-                '-ss', str(timestamp),  # Seek to timestamp
-                '-i', video_path,  # Input file
-                '-vframes', '1',  # Extract 1 frame
-                '-vf', f'scale={width}:{height}:force_original_aspect_ratio=decrease',  # Scale
-                '-pix_fmt', 'yuvj420p',  # Force full-range YUV for JPEG compatibility
-                '-q:v', '2',  # Quality (2 = high quality for JPEG)
-                str(output_path)
-            ]
-
+            cmd = self._ffmpeg_command(video_path, output_path, timestamp, width, height, keyframes_only)
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=timeout
             )
 
+            created = output_path.exists() and output_path.stat().st_size > 0
+            if keyframes_only and (result.returncode != 0 or not created):
+                self.logger.debug(f"Keyframe extraction failed for {video_path}, retrying exact seek")
+                return self.generate_thumbnail(
+                    video_path, str(output_path), timestamp, width, height, timeout
+                )
+
             if result.returncode != 0:
                 self.logger.error(f"ffmpeg failed for {video_path}: {result.stderr}")
                 return None
 
             # Verify thumbnail was created
-            if output_path.exists() and output_path.stat().st_size > 0:
+            if created:
                 self.logger.info(f"Generated thumbnail for {video_path} at {output_path}")
                 return str(output_path)
             else:
@@ -195,6 +200,26 @@ class VideoThumbnailService:
             self.logger.error(f"Unexpected error generating thumbnail for {video_path}: {e}")
             return None
 
+    def _ffmpeg_command(self, video_path: str, output_path: Path, timestamp: float,
+                        width: int, height: int, keyframes_only: bool) -> list:
+        """ffmpeg arguments extracting one scaled frame at ``timestamp``."""
+        cmd = [self._ffmpeg_path, '-y']  # Use configured ffmpeg path, overwrite output
+        if keyframes_only:
+            # Decode keyframes only and take the one the input seek lands on
+            cmd += ['-skip_frame', 'nokey', '-noaccurate_seek']
+        # Note: -pix_fmt yuvj420p is required for WMV and some other formats
+        # that use non-full-range YUV color space (fixes "Non full-range YUV" error)
+        cmd += [
+            '-ss', str(timestamp),  # Seek to timestamp
+            '-i', video_path,  # Input file
+            '-vframes', '1',  # Extract 1 frame
+            '-vf', f'scale={width}:{height}:force_original_aspect_ratio=decrease',  # Scale
+            '-pix_fmt', 'yuvj420p',  # Force full-range YUV for JPEG compatibility
+            '-q:v', '2',  # Quality (2 = high quality for JPEG)
+            str(output_path)
+        ]
+        return cmd
+
     def _generate_thumbnail_cv2(
         self,
         video_path: str,
@@ -386,15 +411,32 @@ class VideoThumbnailService:
         self,
         video_paths: list[str],
         width: int = 320,
-        height: int = 240
+        height: int = 240,
+        max_workers: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        keyframes_only: bool = True,
+        on_result: Optional[Callable[[str, Optional[str]], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
     ) -> dict[str, Optional[str]]:
         """
-        Generate thumbnails for multiple videos.
+        Generate thumbnails for multiple videos, several ffmpeg processes at a time.
+
+        Each job runs one ffmpeg (plus an ffprobe for the default timestamp)
+        as a subprocess, so a small thread pool is enough to keep
+        ``max_workers`` of them busy; the pool size bounds how many run
+        at once.
 
         Args:
             video_paths: List of video file paths
             width: Thumbnail width in pixels
             height: Thumbnail height in pixels
+            max_workers: Concurrent ffmpeg processes (default: DEFAULT_BATCH_WORKERS)
+            timeout: Per-video ffmpeg timeout in seconds
+            keyframes_only: Keyframe-only seeking (see generate_thumbnail)
+            on_result: Called as on_result(video_path, thumbnail_path or None)
+                for every video as it finishes, on the calling thread
+            should_cancel: Polled between results; when it returns True,
+                videos not yet started are skipped (left out of the result)
 
         Returns:
             Dict mapping video_path to thumbnail_path (None if failed)
@@ -411,18 +453,45 @@ class VideoThumbnailService:
         """
         results = {}
 
+        def _report(video_path, thumb_path):
+            results[video_path] = thumb_path
+            if on_result:
+                on_result(video_path, thumb_path)
+
+        to_generate = []
         for video_path in video_paths:
             # Skip if thumbnail already exists
             if self.thumbnail_exists(video_path):
-                results[video_path] = str(self.get_thumbnail_path(video_path))
-                continue
-
-            # Generate thumbnail
-            thumb_path = self.generate_thumbnail(video_path, width=width, height=height)
-            results[video_path] = thumb_path
+                _report(video_path, str(self.get_thumbnail_path(video_path)))
+            else:
+                to_generate.append(video_path)
+
+        workers = max(1, min(max_workers or self.DEFAULT_BATCH_WORKERS, len(to_generate) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="video-thumb") as executor:
+            futures = {
+                executor.submit(
+                    self.generate_thumbnail, video_path,
+                    width=width, height=height, timeout=timeout, keyframes_only=keyframes_only
+                ): video_path
+                for video_path in to_generate
+            }
+            for future in as_completed(futures):
+                if should_cancel and should_cancel():
+                    self.logger.info("[VideoThumbnailService] Batch cancelled")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                try:
+                    thumb_path = future.result()
+                except Exception as e:
+                    self.logger.error(f"Thumbnail job failed for {futures[future]}: {e}")
+                    thumb_path = None
+                _report(futures[future], thumb_path)
 
         succeeded = sum(1 for v in results.values() if v is not None)
-        self.logger.info(f"Batch thumbnail generation: {succeeded}/{len(video_paths)} succeeded")
+        self.logger.info(
+            f"Batch thumbnail generation: {succeeded}/{len(video_paths)} succeeded "
+            f"({workers} ffmpeg workers)"
+        )
 
         return results
 
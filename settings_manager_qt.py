@@ -42,6 +42,17 @@ DEFAULT_SETTINGS = {
     "gps_reverse_geocoding_enabled": True,  # Auto-fetch location names from coordinates
     "gps_geocoding_timeout_sec": 2.0,  # Timeout for reverse geocoding API calls
     "gps_cache_location_names": True,  # Cache location names to reduce API calls
+    "gps_offline_geocoding_enabled": True,  # Resolve names from a local gazetteer before the API
+    "gps_offline_gazetteer_path": "",  # Gazetteer file or folder (empty = models/gazetteer)
+    "gps_offline_max_distance_km": 30.0,  # Farthest gazetteer place accepted as a match
+    "gps_geocode_dedup_precision": 3,  # Batch geocoding resolves coordinates once per 3 decimals (~110 m)
+
+    # --- OCR settings ---
+    "ocr_workers": 0,  # OCR worker processes (0 = auto: 1 on GPU, else half the cores up to 4)
+    "ocr_prefilter": "prioritize",  # off | prioritize | candidates_only (screenshots/documents first)
+
+    # --- Video settings ---
+    "video_probe_workers": 0,  # Concurrent ffprobe processes for video metadata (0 = auto, up to 8)
 
     # --- Device Detection settings ---
     "device_auto_refresh": False,  # Auto-detect device connections (default: manual refresh only)
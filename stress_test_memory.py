@@ -23,6 +23,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer, Qt
 from reference_db import ReferenceDB
+from repository.connection_pool import get_connection_pool
 from thumbnail_grid_qt import ThumbnailGridQt
 from main_window_qt import MainWindow
 
@@ -98,7 +99,7 @@ def stress_test_database_connections():
     print(f"Starting memory: {results.start_memory_mb:.1f} MB")
     
     # Track connection pool size
-    initial_pool_size = len(ReferenceDB._connection_pool)
+    initial_pool_size = ReferenceDB.pool_stats()['pooled']
     print(f"Initial connection pool size: {initial_pool_size}")
     
     print("\n🔄 Creating 100 ReferenceDB instances (should reuse singleton)...")
@@ -110,7 +111,7 @@ def stress_test_database_connections():
             results.db_connections_created += 1
             
             if (i + 1) % 20 == 0:
-                pool_size = len(ReferenceDB._connection_pool)
+                pool_size = ReferenceDB.pool_stats()['pooled']
                 memory_mb = get_memory_usage_mb()
                 print(f"  [{i+1}/100] Pool size: {pool_size}, Memory: {memory_mb:.1f} MB")
                 
@@ -130,14 +131,15 @@ def stress_test_database_connections():
         results.errors.append("Singleton pattern not working")
     
     # Test connection pooling
-    print("\n🔍 Testing connection pool (max 10 connections)...")
-    final_pool_size = len(ReferenceDB._connection_pool)
+    print("\n🔍 Testing connection pool limit...")
+    final_pool_size = ReferenceDB.pool_stats()['pooled']
+    pool_limit = get_connection_pool(ReferenceDB().db_file).max_connections
     print(f"Final pool size: {final_pool_size}")
     
-    if final_pool_size <= ReferenceDB._max_pool_size:
-        print(f"✅ Connection pool within limit ({final_pool_size}/{ReferenceDB._max_pool_size})")
+    if final_pool_size <= pool_limit:
+        print(f"✅ Connection pool within limit ({final_pool_size}/{pool_limit})")
     else:
-        print(f"❌ Connection pool exceeded limit ({final_pool_size}/{ReferenceDB._max_pool_size})")
+        print(f"❌ Connection pool exceeded limit ({final_pool_size}/{pool_limit})")
         results.errors.append(f"Connection pool overflow: {final_pool_size} connections")
     
     # Test connection validity
@@ -303,13 +305,14 @@ def stress_test_concurrent_operations():
         print(f"⚠️ {len(errors)} thread errors occurred")
     
     # Check connection pool
-    pool_size = len(ReferenceDB._connection_pool)
+    pool_size = ReferenceDB.pool_stats()['pooled']
+    pool_limit = get_connection_pool(ReferenceDB().db_file).max_connections
     print(f"\n🔍 Final connection pool size: {pool_size}")
     
-    if pool_size <= ReferenceDB._max_pool_size:
-        print(f"✅ Pool within limit ({pool_size}/{ReferenceDB._max_pool_size})")
+    if pool_size <= pool_limit:
+        print(f"✅ Pool within limit ({pool_size}/{pool_limit})")
     else:
-        print(f"❌ Pool overflow ({pool_size}/{ReferenceDB._max_pool_size})")
+        print(f"❌ Pool overflow ({pool_size}/{pool_limit})")
         results.errors.append(f"Thread pool overflow: {pool_size}")
     
     results.end_memory_mb = get_memory_usage_mb()
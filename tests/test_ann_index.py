@@ -0,0 +1,123 @@
+# tests/test_ann_index.py
+# Tests for delta-maintained FAISS ANN index
+#
+# Run: python -m pytest tests/test_ann_index.py -v
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from services.ann_index import IncrementalANNIndex
+from services.embedding_matrix_store import EmbeddingMatrixView
+
+
+def _view(ids, vectors, appended_ids=(), generation=0):
+    return EmbeddingMatrixView(
+        photo_ids=list(ids), vectors=vectors, appended_ids=list(appended_ids),
+        generation=generation, rows=len(ids),
+    )
+
+
+def _unit(n, dim=16, seed=0):
+    v = np.random.default_rng(seed).normal(size=(n, dim)).astype('float32')
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+class TestIncrementalANNIndex:
+
+    @pytest.fixture
+    def index(self, temp_dir):
+        return IncrementalANNIndex(str(temp_dir / "p1__model"), mode="flat")
+
+    def test_search_returns_photo_ids(self, index):
+        vecs = _unit(50)
+        ids = list(range(1000, 1050))
+        index.sync(_view(ids, vecs))
+        sims, hit_ids = index.search(vecs[7:8], 1)
+        assert hit_ids[0] == 1007
+        assert sims[0] == pytest.approx(1.0, abs=1e-4)
+
+    def test_add_is_delta_not_rebuild(self, index):
+        vecs = _unit(60)
+        assert index.sync(_view(range(50), vecs[:50]))['rebuilt']
+        stats = index.sync(_view(range(60), vecs, appended_ids=range(50, 60)))
+        assert not stats['rebuilt']
+        assert stats['added'] == 10
+        assert index.ntotal == 60
+
+    def test_deleted_photo_removed(self, index):
+        vecs = _unit(20)
+        index.sync(_view(range(20), vecs))
+        keep = [i for i in range(20) if i != 5]
+        stats = index.sync(_view(keep, vecs[keep]))
+        assert stats['removed'] == 1
+        _, hit_ids = index.search(vecs[5:6], 20)
+        assert 5 not in hit_ids
+
+    def test_reembedded_photo_replaced(self, index):
+        vecs = _unit(20)
+        index.sync(_view(range(20), vecs))
+        new_vecs = vecs.copy()
+        new_vecs[3] = vecs[11]
+        index.sync(_view(range(20), new_vecs, appended_ids=[3]))
+        assert index.ntotal == 20
+        _, hit_ids = index.search(vecs[11:12], 2)
+        assert set(hit_ids) == {3, 11}
+
+    def test_hnsw_tombstones_filtered(self, temp_dir):
+        index = IncrementalANNIndex(str(temp_dir / "hnsw"), mode="hnsw")
+        index._MIN_TRAIN_VECTORS = 0
+        vecs = _unit(100)
+        index.sync(_view(range(100), vecs))
+        assert index.active_mode == "hnsw"
+        keep = [i for i in range(100) if i != 42]
+        index.sync(_view(keep, vecs[keep]))
+        _, hit_ids = index.search(vecs[42:43], 5)
+        assert 42 not in hit_ids
+        assert index.ntotal == 99
+
+    def test_ivf_persisted_and_reloaded(self, temp_dir):
+        stem = str(temp_dir / "ivf")
+        vecs = _unit(5000, dim=8)
+        index = IncrementalANNIndex(stem, mode="ivf")
+        view = _view(range(5000), vecs)
+        index.sync(view)
+        assert index.active_mode == "ivf"
+        assert index.save()
+
+        reloaded = IncrementalANNIndex(stem, mode="ivf")
+        stats = reloaded.sync(view)
+        assert not stats['rebuilt']
+        assert reloaded.ntotal == 5000
+        _, hit_ids = reloaded.search(vecs[9:10], 1)
+        assert hit_ids[0] == 9
+
+    def test_reload_with_stale_stamp_readds(self, temp_dir):
+        stem = str(temp_dir / "flat")
+        vecs = _unit(30)
+        index = IncrementalANNIndex(stem, mode="flat")
+        index.sync(_view(range(30), vecs))
+        index.save()
+
+        changed = vecs.copy()
+        changed[0] = vecs[1]
+        reloaded = IncrementalANNIndex(stem, mode="flat")
+        stats = reloaded.sync(_view(range(30), changed, generation=1))
+        assert stats['rebuilt']
+        _, hit_ids = reloaded.search(vecs[1:2], 2)
+        assert set(hit_ids) == {0, 1}
+
+    def test_flush_saves_delta_before_interval(self, temp_dir):
+        stem = str(temp_dir / "flush")
+        vecs = _unit(40)
+        index = IncrementalANNIndex(stem, mode="flat")
+        index.sync(_view(range(30), vecs[:30]))      # first sync saves
+        index.sync(_view(range(40), vecs))           # delta, inside the save interval
+        assert index.flush()
+        assert not index.flush()
+
+        reloaded = IncrementalANNIndex(stem, mode="flat")
+        stats = reloaded.sync(_view(range(40), vecs))
+        assert not stats['rebuilt'] and stats['added'] == 0
+        assert reloaded.ntotal == 40
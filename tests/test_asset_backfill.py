@@ -0,0 +1,114 @@
+# tests/test_asset_backfill.py
+# Tests for hash backfill and bulk asset linking
+#
+# Run: python -m pytest tests/test_asset_backfill.py -v
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from repository.asset_repository import AssetRepository
+from repository.base_repository import DatabaseConnection
+from repository.photo_repository import PhotoRepository
+from services.asset_service import AssetService
+
+
+@pytest.fixture
+def db(test_db_path: Path):
+    db = DatabaseConnection(str(test_db_path), auto_init=True)
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO projects (id, name, folder, mode) VALUES (1, 'p', '/lib', 'scan')")
+        conn.execute("INSERT INTO photo_folders (id, name, path, project_id) VALUES (1, 'lib', '/lib', 1)")
+    yield db
+    db.write_queue().shutdown()
+
+
+@pytest.fixture
+def service(db):
+    return AssetService(PhotoRepository(db), AssetRepository(db))
+
+
+def _add_file(db, temp_dir, name, content, width=100, file_hash=None):
+    path = temp_dir / name
+    if content is not None:
+        path.write_bytes(content)
+    with db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO photo_metadata (path, folder_id, project_id, width, height, size_kb, file_hash) "
+            "VALUES (?, 1, 1, ?, 100, ?, ?)",
+            (str(path), width, len(content or b"") / 1024, file_hash)
+        )
+        return conn.execute("SELECT id FROM photo_metadata WHERE path = ?", (str(path),)).fetchone()["id"]
+
+
+def _assets(db):
+    with db.get_connection(read_only=True) as conn:
+        rows = conn.execute(
+            "SELECT a.content_hash, a.representative_photo_id, i.photo_id "
+            "FROM media_asset a JOIN media_instance i ON i.asset_id = a.asset_id"
+        ).fetchall()
+    out = {}
+    for r in rows:
+        out.setdefault(r["content_hash"], {"rep": r["representative_photo_id"], "photos": set()})
+        out[r["content_hash"]]["photos"].add(r["photo_id"])
+    return out
+
+
+class TestBackfill:
+
+    def test_links_duplicates_to_one_asset(self, db, service, temp_dir):
+        a = _add_file(db, temp_dir, "a.jpg", b"same" * 1000, width=50)
+        b = _add_file(db, temp_dir, "b.jpg", b"same" * 1000, width=200)
+        c = _add_file(db, temp_dir, "c.jpg", b"other" * 1000)
+
+        stats = service.backfill_hashes_and_link_assets(1, batch_size=2)
+
+        assert (stats.scanned, stats.hashed, stats.linked, stats.errors) == (3, 3, 3, 0)
+        assets = _assets(db)
+        same = hashlib.sha256(b"same" * 1000).hexdigest()
+        assert assets[same] == {"rep": b, "photos": {a, b}}    # higher resolution wins
+        other = hashlib.sha256(b"other" * 1000).hexdigest()
+        assert assets[other] == {"rep": c, "photos": {c}}
+        with db.get_connection(read_only=True) as conn:
+            stored = {r["id"]: r["file_hash"] for r in conn.execute("SELECT id, file_hash FROM photo_metadata")}
+        assert stored == {a: same, b: same, c: other}
+
+    def test_existing_hash_is_not_recomputed(self, db, service, temp_dir, monkeypatch):
+        _add_file(db, temp_dir, "a.jpg", None, file_hash="f" * 64)
+        monkeypatch.setattr(AssetService, "compute_file_hash", staticmethod(lambda path: pytest.fail(path)))
+
+        stats = service.backfill_hashes_and_link_assets(1)
+
+        assert (stats.hashed, stats.linked) == (0, 1)
+        assert set(_assets(db)) == {"f" * 64}
+
+    def test_unreadable_files_do_not_stall_the_loop(self, db, service, temp_dir):
+        for i in range(3):
+            _add_file(db, temp_dir, f"missing{i}.jpg", None)
+        ok = _add_file(db, temp_dir, "ok.jpg", b"ok")
+
+        stats = service.backfill_hashes_and_link_assets(1, batch_size=2)
+
+        assert (stats.errors, stats.linked) == (3, 1)
+        assert [a["photos"] for a in _assets(db).values()] == [{ok}]
+
+    def test_bulk_failure_falls_back_to_per_photo(self, db, service, temp_dir, monkeypatch):
+        a = _add_file(db, temp_dir, "a.jpg", b"x" * 10)
+        b = _add_file(db, temp_dir, "b.jpg", b"x" * 10)
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(service.asset_repo, "link_instances_bulk", broken)
+        stats = service.backfill_hashes_and_link_assets(1)
+
+        assert stats.linked == 2
+        (asset,) = _assets(db).values()
+        assert asset["photos"] == {a, b} and asset["rep"] in (a, b)
+
+    def test_stop_after(self, db, service, temp_dir):
+        for i in range(5):
+            _add_file(db, temp_dir, f"{i}.jpg", bytes([i]) * 10)
+        stats = service.backfill_hashes_and_link_assets(1, batch_size=2, stop_after=3)
+        assert stats.linked == 3
@@ -0,0 +1,128 @@
+# tests/test_clustering_quality_sampling.py
+# Tests for the sampled silhouette and centroid-based metrics in ClusteringQualityAnalyzer
+#
+# Run: python -m pytest tests/test_clustering_quality_sampling.py -v
+
+import threading
+
+import numpy as np
+import pytest
+from sklearn.metrics import davies_bouldin_score, silhouette_score
+from sklearn.metrics.pairwise import cosine_distances
+
+from services.clustering_quality_analyzer import ClusteringQualityAnalyzer
+
+
+def _blobs(n_clusters=12, per_cluster=40, dim=32, noise=0.3, n_noise=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim))
+    sizes = rng.integers(2, per_cluster * 2, size=n_clusters)
+    X = np.vstack([c + noise * rng.standard_normal((s, dim)) for c, s in zip(centers, sizes)])
+    labels = np.repeat(np.arange(n_clusters), sizes)
+    X = np.vstack([X, 3 * rng.standard_normal((n_noise, dim))])
+    labels = np.concatenate([labels, np.full(n_noise, -1)])
+    order = rng.permutation(len(labels))
+    return X[order].astype(np.float32), labels[order]
+
+
+def _reference(X, labels, metric):
+    """The metrics as the analyzer used to compute them (per-cluster loops)."""
+    keep = labels != -1
+    X, labels = X[keep], labels[keep]
+    uniq = np.unique(labels)
+    centroids = np.array([X[labels == c].mean(axis=0) for c in uniq])
+    compact = []
+    for c, centroid in zip(uniq, centroids):
+        members = X[labels == c]
+        if len(members) < 2:
+            continue
+        if metric == 'cosine':
+            compact.append(cosine_distances(members, centroid[None]).mean())
+        else:
+            compact.append(np.linalg.norm(members - centroid, axis=1).mean())
+    if metric == 'cosine':
+        dist = cosine_distances(centroids)
+    else:
+        dist = np.linalg.norm(centroids[:, None] - centroids[None], axis=2)
+    sep = dist[np.triu_indices(len(uniq), k=1)].mean()
+    return {
+        'silhouette': silhouette_score(X, labels, metric=metric),
+        'db': davies_bouldin_score(X, labels),
+        'compactness': np.mean(compact),
+        'separation': sep,
+    }
+
+
+class TestFullMetrics:
+
+    @pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+    def test_match_reference(self, metric, monkeypatch):
+        monkeypatch.setattr(ClusteringQualityAnalyzer, "_BLOCK_ROWS", 50)
+        monkeypatch.setattr(ClusteringQualityAnalyzer, "_BLOCK_ELEMENTS", 30)
+        X, labels = _blobs()
+        ref = _reference(X, labels, metric)
+
+        m = ClusteringQualityAnalyzer().analyze_clustering(X, labels, metric=metric)
+
+        assert m.silhouette_sample_size is None
+        assert m.silhouette_score == pytest.approx(ref['silhouette'], abs=1e-5)
+        assert m.davies_bouldin_index == pytest.approx(ref['db'], rel=1e-4)
+        assert m.avg_cluster_compactness == pytest.approx(ref['compactness'], rel=1e-4)
+        assert m.avg_cluster_separation == pytest.approx(ref['separation'], rel=1e-4)
+        assert m.cluster_sizes == [int(np.sum(labels == c)) for c in range(12)]
+        assert len(m.cluster_silhouettes) == 12
+
+
+class TestSampledMetrics:
+
+    def test_sample_is_bounded_and_stratified(self):
+        labels = np.repeat(np.arange(50), np.arange(1, 51))
+        sample = ClusteringQualityAnalyzer._stratified_sample(labels, 300, random_state=0)
+
+        assert len(sample) <= 300
+        assert np.all(np.diff(sample) > 0)
+        counts = np.bincount(labels[sample], minlength=50)
+        assert counts[0] == 1 and np.all(counts[1:] >= 2)
+        assert counts[49] > counts[5]
+
+    def test_many_small_clusters_sample_a_subset_of_clusters(self):
+        labels = np.repeat(np.arange(1000), 3)
+        sample = ClusteringQualityAnalyzer._stratified_sample(labels, 100, random_state=1)
+
+        assert len(sample) <= 100
+        assert len(np.unique(labels[sample])) == 50
+
+    def test_no_sampling_below_limit(self):
+        assert ClusteringQualityAnalyzer._stratified_sample(np.arange(10), 10, 0) is None
+        assert ClusteringQualityAnalyzer._stratified_sample(np.arange(10), None, 0) is None
+
+    def test_sampled_silhouette_close_and_deterministic(self):
+        X, labels = _blobs(n_clusters=20, per_cluster=100, seed=3)
+        analyzer = ClusteringQualityAnalyzer()
+        full = analyzer.analyze_clustering(X, labels, metric='cosine')
+
+        a = analyzer.analyze_clustering(X, labels, metric='cosine', max_samples=600)
+        b = analyzer.analyze_clustering(X, labels, metric='cosine', max_samples=600)
+
+        assert a.silhouette_sample_size <= 600
+        assert a.silhouette_score == b.silhouette_score
+        assert a.silhouette_score == pytest.approx(full.silhouette_score, abs=0.05)
+        # Centroid metrics never depend on the sample
+        assert a.davies_bouldin_index == full.davies_bouldin_index
+        assert a.avg_cluster_separation == full.avg_cluster_separation
+
+    def test_async_reports_through_callback(self):
+        X, labels = _blobs()
+        done = threading.Event()
+        results = []
+
+        def on_done(metrics):
+            results.append(metrics)
+            done.set()
+
+        thread = ClusteringQualityAnalyzer().analyze_clustering_async(
+            X, labels, on_done, metric='cosine', max_samples=200
+        )
+        assert done.wait(30)
+        thread.join(5)
+        assert results[0].cluster_count == 12 and results[0].silhouette_sample_size <= 200
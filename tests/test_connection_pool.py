@@ -0,0 +1,169 @@
+# tests/test_connection_pool.py
+# Tests for the per-thread SQLite connection pool
+#
+# Run: python -m pytest tests/test_connection_pool.py -v
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from repository import DatabaseConnection
+from repository.connection_pool import SQLiteConnectionPool
+
+
+@pytest.fixture
+def pool(temp_dir: Path):
+    pool = SQLiteConnectionPool(str(temp_dir / "pool.db"))
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    yield pool
+    pool.close_all()
+
+
+def _values(pool):
+    with pool.connection(read_only=True) as conn:
+        return [r[0] for r in conn.execute("SELECT v FROM t ORDER BY id")]
+
+
+def _in_thread(fn):
+    out = []
+    t = threading.Thread(target=lambda: out.append(fn()))
+    t.start()
+    t.join()
+    return out[0]
+
+
+class TestSQLiteConnectionPool:
+
+    def test_connection_reused_within_thread(self, pool):
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        assert first is second
+        stats = pool.stats()
+        assert stats['opens'] == 1
+        assert stats['reuses'] == 2
+
+    def test_threads_get_their_own_connections(self, pool):
+        with pool.connection() as mine:
+            pass
+        other = _in_thread(lambda: pool.connection().__enter__())
+        assert other is not mine
+
+    def test_configured_once(self, pool):
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0].upper() == "WAL"
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+
+    def test_nested_write_failure_rolls_back_to_savepoint(self, pool):
+        with pool.connection() as outer:
+            outer.execute("INSERT INTO t (v) VALUES ('outer')")
+            with pytest.raises(ValueError):
+                with pool.connection() as inner:
+                    inner.execute("INSERT INTO t (v) VALUES ('inner')")
+                    raise ValueError("boom")
+            assert outer.in_transaction
+        assert _values(pool) == ['outer']
+
+    def test_outer_failure_discards_nested_work(self, pool):
+        with pytest.raises(ValueError):
+            with pool.connection() as outer:
+                with pool.connection() as inner:
+                    inner.execute("INSERT INTO t (v) VALUES ('inner')")
+                raise ValueError("boom")
+        assert _values(pool) == []
+
+    def test_nested_explicit_commit_tolerated(self, pool):
+        with pool.connection():
+            with pool.connection() as inner:
+                inner.execute("INSERT INTO t (v) VALUES ('x')")
+                inner.commit()
+        assert _values(pool) == ['x']
+
+    def test_row_factory_restored_after_nested_checkout(self, pool):
+        with pool.connection(row_factory=sqlite3.Row) as outer:
+            with pool.connection(row_factory=None):
+                pass
+            assert outer.row_factory is sqlite3.Row
+
+    def test_closed_connection_replaced(self, pool):
+        with pool.connection() as conn:
+            pass
+        conn.close()
+        with pool.connection() as fresh:
+            fresh.execute("SELECT 1")
+        assert fresh is not conn
+        assert pool.stats()['health_failures'] == 1
+
+    def test_replaced_database_file_resets_pool(self, pool, temp_dir):
+        _values(pool)
+        pool.close_all()
+        os.remove(pool.db_path)
+        other = sqlite3.connect(pool.db_path)
+        other.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+        other.execute("INSERT INTO t (v) VALUES ('new')")
+        other.commit()
+        other.close()
+        assert _values(pool) == ['new']
+
+    def test_overflow_when_full(self, temp_dir):
+        pool = SQLiteConnectionPool(str(temp_dir / "small.db"), max_connections=1)
+        with pool.connection():
+            pass
+        ready, release = threading.Event(), threading.Event()
+
+        def hold():
+            with pool.connection() as conn:
+                ready.set()
+                release.wait(5)
+                return conn
+
+        t = threading.Thread(target=hold)
+        with pool.connection(read_only=True):
+            pass
+        assert pool.stats()['overflow'] == 1
+        t.start()
+        ready.wait(5)
+        release.set()
+        t.join()
+        assert pool.stats()['pooled'] == 1
+        pool.close_all()
+
+    def test_dead_thread_connections_evicted(self, temp_dir):
+        pool = SQLiteConnectionPool(str(temp_dir / "evict.db"), max_connections=1)
+        _in_thread(lambda: pool.connection().__enter__() and None)
+        with pool.connection():
+            pass
+        stats = pool.stats()
+        assert stats['evictions'] == 1
+        assert stats['overflow'] == 0
+        pool.close_all()
+
+
+class TestSharedPool:
+
+    def test_database_connection_reuses_pooled_connections(self, test_db_path, init_test_database):
+        db = DatabaseConnection(str(test_db_path))
+        before = db.pool_stats()
+        for _ in range(5):
+            with db.get_connection(read_only=True) as conn:
+                row = conn.execute("SELECT COUNT(*) AS n FROM photo_metadata").fetchone()
+                assert row == {'n': 0}
+        after = db.pool_stats()
+        assert after['opens'] - before['opens'] <= 1
+        assert after['reuses'] - before['reuses'] >= 4
+
+    def test_reference_db_shares_pool(self, test_db_path, init_test_database):
+        from reference_db import ReferenceDB
+        db = DatabaseConnection(str(test_db_path))
+        with db.get_connection() as conn:
+            pass
+        ref = ReferenceDB(str(test_db_path))
+        with ref._connect() as ref_conn:
+            assert isinstance(ref_conn.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+        assert ref_conn is conn
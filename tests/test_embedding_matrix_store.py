@@ -0,0 +1,170 @@
+# tests/test_embedding_matrix_store.py
+# Tests for the persistent, memory-mapped ANN embedding matrix
+#
+# Run: python -m pytest tests/test_embedding_matrix_store.py -v
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from repository import DatabaseConnection, ProjectRepository
+from services.embedding_matrix_store import EmbeddingMatrixStore, decode_embedding_blob
+
+MODEL = "openai/clip-vit-base-patch32"
+
+
+@pytest.fixture
+def db_conn(test_db_path: Path, init_test_database):
+    return DatabaseConnection(str(test_db_path))
+
+
+@pytest.fixture
+def project_id(db_conn):
+    return ProjectRepository(db_conn).create("Test Project", "/test", "branch")
+
+
+def _add_photos(db_conn, project_id, count, dim=8, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = []
+    with db_conn.get_connection() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO photo_folders (name, path, project_id) VALUES (?, ?, ?)",
+            ("root", "/test", project_id))
+        folder_id = conn.execute(
+            "SELECT id FROM photo_folders WHERE path = ? AND project_id = ?",
+            ("/test", project_id)).fetchone()['id']
+        for _ in range(count):
+            cur = conn.execute(
+                "INSERT INTO photo_metadata (path, folder_id, project_id) VALUES (?, ?, ?)",
+                (f"/test/{rng.integers(1 << 40)}.jpg", folder_id, project_id))
+            ids.append(cur.lastrowid)
+    for pid in ids:
+        _store(db_conn, pid, rng.normal(size=dim).astype('float32'))
+    return ids
+
+
+def _store(db_conn, photo_id, vec, computed_at='2026-01-01 00:00:00'):
+    vec = vec / np.linalg.norm(vec)
+    with db_conn.get_connection() as conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO semantic_embeddings
+            (photo_id, model, embedding, dim, norm, computed_at)
+            VALUES (?, ?, ?, ?, 1.0, ?)
+        """, (photo_id, MODEL, vec.astype('float16').tobytes(), -len(vec), computed_at))
+
+
+class TestDecodeEmbeddingBlob:
+
+    def test_negative_dim_is_float16(self):
+        vec = np.arange(4, dtype='float32')
+        out = decode_embedding_blob(vec.astype('float16').tobytes(), -4)
+        assert out.dtype == np.float32
+        assert np.allclose(out, vec)
+
+    def test_size_mismatch_returns_none(self):
+        assert decode_embedding_blob(np.zeros(3, 'float32').tobytes(), 4) is None
+
+
+class TestEmbeddingMatrixStore:
+
+    @pytest.fixture
+    def store(self, db_conn, project_id, temp_dir):
+        return EmbeddingMatrixStore(project_id, MODEL, db_connection=db_conn,
+                                    cache_dir=str(temp_dir / "embedding_cache"))
+
+    def test_cold_sync_builds_normalized_matrix(self, db_conn, project_id, store):
+        ids = _add_photos(db_conn, project_id, 5)
+        view = store.sync()
+        assert sorted(view.photo_ids) == sorted(ids)
+        assert view.appended == 5
+        assert view.vectors.shape == (5, 8)
+        assert np.allclose(np.linalg.norm(view.vectors, axis=1), 1.0, atol=1e-3)
+        assert isinstance(view.vectors, np.memmap)
+        assert set(view.path_lookup) == set(ids)
+
+    def test_second_sync_reads_nothing(self, db_conn, project_id, store):
+        _add_photos(db_conn, project_id, 5)
+        store.sync()
+        view = store.sync()
+        assert view.appended == 0
+        assert len(view.photo_ids) == 5
+
+    def test_new_process_reuses_files(self, db_conn, project_id, store):
+        _add_photos(db_conn, project_id, 5)
+        store.sync()
+        fresh = EmbeddingMatrixStore(project_id, MODEL, db_connection=db_conn,
+                                     cache_dir=store.cache_dir)
+        view = fresh.sync()
+        assert view.appended == 0
+        assert len(view.photo_ids) == 5
+
+    def test_incremental_append(self, db_conn, project_id, store):
+        _add_photos(db_conn, project_id, 5)
+        store.sync()
+        new_ids = _add_photos(db_conn, project_id, 3, seed=1)
+        view = store.sync()
+        assert view.appended == 3
+        assert set(new_ids) <= set(view.photo_ids)
+        assert len(view.photo_ids) == 8
+
+    def test_reembedded_photo_latest_row_wins(self, db_conn, project_id, store):
+        ids = _add_photos(db_conn, project_id, 3)
+        store.sync()
+        target = np.zeros(8, dtype='float32')
+        target[0] = 1.0
+        _store(db_conn, ids[0], target, computed_at='2026-02-01 00:00:00')
+        view = store.sync()
+        assert view.appended == 1
+        assert len(view.photo_ids) == 3
+        row = view.photo_ids.index(ids[0])
+        assert np.allclose(view.vectors[row], target, atol=1e-3)
+
+    def test_same_second_rewrite_is_picked_up(self, db_conn, project_id, store):
+        with db_conn.get_connection() as conn:
+            now = conn.execute("SELECT CURRENT_TIMESTAMP AS t").fetchone()['t']
+        ids = _add_photos(db_conn, project_id, 3)
+        for pid in ids:
+            _store(db_conn, pid, np.arange(1, 9, dtype='float32') + pid, computed_at=now)
+        assert store.sync().appended == 3
+
+        target = np.zeros(8, dtype='float32')
+        target[0] = 1.0
+        _store(db_conn, ids[0], target, computed_at=now)
+        view = store.sync()
+        assert view.appended_ids == [ids[0]]
+        row = view.photo_ids.index(ids[0])
+        assert np.allclose(view.vectors[row], target, atol=1e-3)
+
+        # Unchanged rows in the watermark's second are not appended again
+        view = store.sync()
+        assert view.appended == 0
+        assert view.rows == 4
+
+    def test_old_watermark_is_settled(self, db_conn, project_id, store):
+        _add_photos(db_conn, project_id, 3)
+        store.sync()
+        assert store._load_meta()['watermark_settled']
+
+    def test_deleted_photo_masked_and_compacted(self, db_conn, project_id, store):
+        ids = _add_photos(db_conn, project_id, 4)
+        store.sync()
+        with db_conn.get_connection() as conn:
+            conn.execute("DELETE FROM semantic_embeddings WHERE photo_id = ?", (ids[1],))
+        view = store.sync()
+        assert ids[1] not in view.photo_ids
+        assert view.removed == 1
+
+        assert store.compact() == 1
+        view = store.sync()
+        assert sorted(view.photo_ids) == sorted([ids[0], ids[2], ids[3]])
+        assert view.generation == 1
+        assert not Path(store._vec_path(0)).exists()
+
+    def test_float16_storage(self, db_conn, project_id, temp_dir):
+        _add_photos(db_conn, project_id, 3)
+        store = EmbeddingMatrixStore(project_id, MODEL, db_connection=db_conn,
+                                     cache_dir=str(temp_dir / "f16"), dtype='float16')
+        view = store.sync()
+        assert view.vectors.dtype == np.float16
+        assert len(view.photo_ids) == 3
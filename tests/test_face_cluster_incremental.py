@@ -0,0 +1,159 @@
+# tests/test_face_cluster_incremental.py
+# Tests for incremental face clustering (assign new faces to existing clusters)
+#
+# Run: python -m pytest tests/test_face_cluster_incremental.py -v
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from services.face_cluster_assignment import nearest_cluster_assignments
+
+DIM = 512
+
+
+def _identities(n, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n, DIM)).astype(np.float32)
+    return centers / np.linalg.norm(centers, axis=1, keepdims=True)
+
+
+def _face(center, rng, noise=0.02):
+    vec = center + noise * rng.standard_normal(DIM).astype(np.float32)
+    return (vec / np.linalg.norm(vec)).astype(np.float32)
+
+
+class TestNearestClusterAssignments:
+
+    def test_assigns_within_eps_only(self):
+        rng = np.random.default_rng(1)
+        centers = _identities(3)
+        clustered = np.vstack([_face(c, rng) for c in centers for _ in range(4)])
+        keys = [f"face_{i:03d}" for i in range(3) for _ in range(4)]
+        new = np.vstack([_face(centers[2], rng), _identities(1, seed=9)[0]])
+
+        assert nearest_cluster_assignments(clustered, keys, new, eps=0.3) == ["face_002", None]
+
+    def test_blocked_matches_unblocked(self, monkeypatch):
+        import services.face_cluster_assignment as module
+
+        rng = np.random.default_rng(2)
+        centers = _identities(5)
+        clustered = np.vstack([_face(c, rng, 0.3) for c in centers for _ in range(10)])
+        keys = [f"face_{i:03d}" for i in range(5) for _ in range(10)]
+        new = np.vstack([_face(c, rng, 0.3) for c in centers for _ in range(7)])
+
+        expected = nearest_cluster_assignments(clustered, keys, new, eps=0.5)
+        monkeypatch.setattr(module, "_BLOCK_ELEMENTS", 100)
+        assert nearest_cluster_assignments(clustered, keys, new, eps=0.5) == expected
+
+    def test_empty_inputs(self):
+        assert nearest_cluster_assignments(np.zeros((0, DIM)), [], np.ones((2, DIM)), 0.3) == [None, None]
+        assert nearest_cluster_assignments(np.ones((2, DIM)), ["a", "b"], np.zeros((0, DIM)), 0.3) == []
+
+
+@pytest.fixture
+def project_db(temp_dir, monkeypatch):
+    """Empty production-schema reference_data.db in temp_dir, with one project."""
+    monkeypatch.chdir(temp_dir)
+    import services.face_embedding_matrix_store as face_matrix
+    from reference_db import ReferenceDB
+
+    monkeypatch.setattr(face_matrix, "_stores", {})
+
+    db = ReferenceDB()
+    with db._connect() as conn:
+        conn.execute("INSERT INTO projects (id, name, folder, mode) VALUES (1, 'p', ?, 'date')", (str(temp_dir),))
+        conn.execute("INSERT INTO photo_folders (id, name, path, project_id) VALUES (1, 'f', ?, 1)", (str(temp_dir),))
+        conn.commit()
+    yield db.db_file
+    ReferenceDB._instances.pop(db.db_file, None)
+
+
+def _add_faces(db_file, faces, start):
+    """faces: list of embeddings, one photo per face; returns image paths."""
+    conn = sqlite3.connect(db_file)
+    paths = []
+    for n, vec in enumerate(faces, start):
+        path = f"/photos/img_{n:04d}.jpg"
+        conn.execute(
+            "INSERT INTO photo_metadata (path, folder_id, project_id, width, height) VALUES (?, 1, 1, 1000, 1000)",
+            (path,),
+        )
+        conn.execute("INSERT INTO project_images (project_id, branch_key, image_path) VALUES (1, 'all', ?)", (path,))
+        conn.execute("""
+            INSERT INTO face_crops (project_id, image_path, crop_path, embedding,
+                                    bbox_x, bbox_y, bbox_w, bbox_h, confidence)
+            VALUES (1, ?, ?, ?, 0, 0, 300, 300, 0.99)
+        """, (path, path + ".crop.jpg", vec.tobytes()))
+        paths.append(path)
+    conn.commit()
+    conn.close()
+    return paths
+
+
+def _run(incremental):
+    from workers.face_cluster_worker import FaceClusterWorker
+
+    worker = FaceClusterWorker(project_id=1, eps=0.3, min_samples=2, auto_tune=False, incremental=incremental)
+    result = []
+    worker.signals.finished.connect(lambda clusters, faces: result.append((clusters, faces)))
+    worker.run()
+    return worker, result
+
+
+def _keys_by_path(db_file):
+    conn = sqlite3.connect(db_file)
+    rows = dict(conn.execute("SELECT image_path, branch_key FROM face_crops WHERE project_id=1"))
+    conn.close()
+    return rows
+
+
+@pytest.mark.requires_qt
+class TestIncrementalWorker:
+
+    def test_new_faces_join_existing_clusters(self, qapp, project_db):
+        rng = np.random.default_rng(3)
+        centers = _identities(4)
+        _add_faces(project_db, [_face(c, rng) for c in centers[:3] for _ in range(5)], 0)
+        _run(incremental=False)
+        before = _keys_by_path(project_db)
+
+        conn = sqlite3.connect(project_db)
+        conn.execute("UPDATE branches SET display_name='Alice' WHERE project_id=1 AND branch_key=?",
+                     (before["/photos/img_0000.jpg"],))
+        conn.commit()
+        conn.close()
+
+        joined = _add_faces(project_db, [_face(centers[0], rng), _face(centers[2], rng)], 100)
+        fresh = _add_faces(project_db, [_face(centers[3], rng) for _ in range(3)], 200)
+        loner = _add_faces(project_db, [_identities(1, seed=42)[0]], 300)
+        worker, result = _run(incremental=True)
+        after = _keys_by_path(project_db)
+
+        assert worker._cluster_summary["joined_existing"] == 2
+        assert result == [(4, 21)]
+        assert all(after[p] == k for p, k in before.items())
+        assert after[joined[0]] == before["/photos/img_0000.jpg"]
+        assert after[joined[1]] == before["/photos/img_0010.jpg"]
+        assert len({after[p] for p in fresh}) == 1 and after[fresh[0]] not in before.values()
+        assert after[loner[0]] == "face_unidentified"
+
+        conn = sqlite3.connect(project_db)
+        name = conn.execute("SELECT display_name FROM branches WHERE branch_key=?", (after[joined[0]],)).fetchone()
+        count = conn.execute("SELECT count FROM face_branch_reps WHERE branch_key=?", (after[joined[0]],)).fetchone()
+        linked = conn.execute("SELECT COUNT(*) FROM project_images WHERE branch_key=? AND image_path=?",
+                              (after[joined[0]], joined[0])).fetchone()
+        conn.close()
+        assert name == ("Alice",) and count == (6,) and linked == (1,)
+
+    def test_falls_back_to_full_run_without_clusters(self, qapp, project_db):
+        rng = np.random.default_rng(4)
+        centers = _identities(2)
+        _add_faces(project_db, [_face(c, rng) for c in centers for _ in range(4)], 0)
+
+        worker, result = _run(incremental=True)
+
+        assert result == [(2, 8)]
+        assert "joined_existing" not in worker._cluster_summary
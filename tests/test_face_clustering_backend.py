@@ -0,0 +1,78 @@
+# tests/test_face_clustering_backend.py
+# Tests for the exact / radius-graph DBSCAN backends used by face clustering
+#
+# Run: python -m pytest tests/test_face_clustering_backend.py -v
+
+import numpy as np
+import pytest
+
+import services.face_clustering_backend as backend
+from services.face_clustering_backend import cosine_radius_graph, dbscan_cosine, resolve_backend
+from services.face_clustering_benchmark import synthetic_faces
+
+
+class TestRadiusGraph:
+
+    def test_contains_exactly_the_pairs_within_eps(self):
+        X = synthetic_faces(300, dim=64, noise=0.08, seed=1)
+        graph = cosine_radius_graph(X, 0.3, use_faiss=False)
+
+        unit = X / np.linalg.norm(X, axis=1, keepdims=True)
+        expected = (1.0 - unit @ unit.T) <= 0.3
+        np.fill_diagonal(expected, True)
+
+        coo = graph.tocoo()
+        got = np.zeros_like(expected)
+        got[coo.row, coo.col] = True
+        np.testing.assert_array_equal(got, expected)
+        assert graph.max() <= 0.3
+
+    def test_rows_sorted_by_distance(self):
+        X = synthetic_faces(200, dim=32, noise=0.1, seed=2)
+        graph = cosine_radius_graph(X, 0.4, use_faiss=False)
+        for i in range(graph.shape[0]):
+            row = graph.data[graph.indptr[i]:graph.indptr[i + 1]]
+            assert np.all(np.diff(row) >= 0)
+
+    def test_block_boundaries(self, monkeypatch):
+        monkeypatch.setattr(backend, "_BLOCK_ELEMENTS", 1000)
+        X = synthetic_faces(150, dim=16, noise=0.1, seed=3)
+        small = cosine_radius_graph(X, 0.35, use_faiss=False)
+        monkeypatch.setattr(backend, "_BLOCK_ELEMENTS", 16_000_000)
+        whole = cosine_radius_graph(X, 0.35, use_faiss=False)
+        assert (small != whole).nnz == 0
+
+    def test_empty(self):
+        assert cosine_radius_graph(np.empty((0, 8), dtype=np.float32), 0.3).shape == (0, 0)
+
+
+class TestDbscanCosine:
+
+    @pytest.mark.parametrize("n, eps, min_samples", [
+        (400, 0.30, 3),
+        (600, 0.35, 2),
+        (250, 0.70, 1),     # include_cluster screenshot policy
+    ])
+    def test_graph_matches_exact(self, n, eps, min_samples):
+        X = synthetic_faces(n, dim=128, noise=0.05, seed=n)
+        exact = dbscan_cosine(X, eps, min_samples, backend="exact")
+        graph = dbscan_cosine(X, eps, min_samples, backend="graph")
+        np.testing.assert_array_equal(graph, exact)
+        assert exact.max() > 0
+
+    def test_zero_vector_is_noise_in_both(self):
+        X = synthetic_faces(50, dim=32, noise=0.05, seed=4)
+        X[7] = 0.0
+        exact = dbscan_cosine(X, 0.3, 2, backend="exact")
+        graph = dbscan_cosine(X, 0.3, 2, backend="graph")
+        assert graph[7] == -1
+        np.testing.assert_array_equal(graph, exact)
+
+    def test_resolve_backend(self):
+        assert resolve_backend("auto", 100, graph_min_faces=5000) == "exact"
+        assert resolve_backend("auto", 5000, graph_min_faces=5000) == "graph"
+        assert resolve_backend("exact", 10 ** 6) == "exact"
+        assert resolve_backend("bogus", 10) == "exact"
+
+    def test_empty(self):
+        assert dbscan_cosine(np.empty((0, 8), dtype=np.float32), 0.3, 2).shape == (0,)
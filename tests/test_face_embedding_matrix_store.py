@@ -0,0 +1,204 @@
+# tests/test_face_embedding_matrix_store.py
+# Tests for the packed, memory-mapped face embedding matrix
+#
+# Run: python -m pytest tests/test_face_embedding_matrix_store.py -v
+
+import json
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from services.face_embedding_matrix_store import FaceEmbeddingMatrixStore, is_screenshot_path
+
+DIM = 512
+
+
+@pytest.fixture
+def db(init_test_database):
+    conn = init_test_database
+    conn.execute("INSERT INTO projects (id, name, folder, mode) VALUES (1, 'p', '/photos', 'date')")
+    conn.execute("INSERT INTO photo_folders (id, name, path, project_id) VALUES (1, 'f', '/photos', 1)")
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def store(db, test_db_path, temp_dir):
+    from repository.base_repository import DatabaseConnection
+    return FaceEmbeddingMatrixStore(1, DatabaseConnection(str(test_db_path)),
+                                    cache_dir=str(temp_dir / "embedding_cache"))
+
+
+def _vec(seed, dim=DIM):
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+def _add_face(db, n, path=None, in_project=True, dim=DIM, conf=0.9):
+    """Insert a photo (unless present) and one face on it; returns the face id."""
+    path = path or f"/photos/img_{n:04d}.jpg"
+    db.execute("INSERT OR IGNORE INTO photo_metadata (path, folder_id, project_id, width, height) "
+               "VALUES (?, 1, 1, 800, 600)", (path,))
+    if in_project:
+        db.execute("INSERT OR IGNORE INTO project_images (project_id, branch_key, image_path) "
+                   "VALUES (1, 'all', ?)", (path,))
+    cur = db.execute("""
+        INSERT INTO face_crops (project_id, image_path, crop_path, embedding,
+                                bbox_x, bbox_y, bbox_w, bbox_h, confidence)
+        VALUES (1, ?, ?, ?, ?, 20, 100, 120, ?)
+    """, (path, f"{path}.{n}.crop.jpg", _vec(n, dim).tobytes(), n, conf))
+    db.commit()
+    return cur.lastrowid
+
+
+class TestSync:
+
+    def test_view_matches_face_crops(self, db, store):
+        ids = [_add_face(db, n) for n in range(5)]
+        db.execute("UPDATE face_crops SET branch_key='face_001' WHERE id=?", (ids[2],))
+        db.commit()
+
+        view = store.sync()
+
+        assert view.face_ids.tolist() == ids and view.appended == 5 and view.missing == 0
+        np.testing.assert_array_equal(view.vectors[3], _vec(3))
+        assert view.bboxes[4].tolist() == [4, 20, 100, 120]
+        assert view.confidences[1] == pytest.approx(0.9)
+        assert view.image_sizes[0].tolist() == [800, 600]
+        assert view.branch_keys[2] == "face_001"
+        assert view.image_paths[0] == "/photos/img_0000.jpg"
+        assert len(set(view.photo_ids.tolist())) == 5
+
+    def test_appends_only_new_faces(self, db, store):
+        _add_face(db, 0)
+        store.sync()
+        _add_face(db, 1)
+        assert store.append_new() == 1
+        assert store.append_new() == 0
+        view = store.sync()
+        assert view.appended == 0 and len(view) == 2 and view.rows == 2
+
+    def test_screenshot_flag(self, db, store):
+        _add_face(db, 0, path="/photos/Screen_Shot 2024.png")
+        _add_face(db, 1, path="/photos/Bildschirmfoto.png")
+        _add_face(db, 2)
+        _add_face(db, 3)
+        db.execute("INSERT INTO search_asset_features (path, project_id, is_screenshot) VALUES (?, 1, 1)",
+                   ("/photos/img_0003.jpg",))
+        db.commit()
+
+        assert store.sync().is_screenshot.tolist() == [True, True, False, True]
+        assert is_screenshot_path("/a/Screen-Shot.png") and not is_screenshot_path("/a/screens.png")
+
+    def test_excludes_orphans_and_bad_embeddings(self, db, store):
+        _add_face(db, 0)
+        _add_face(db, 1, in_project=False)
+        _add_face(db, 2, dim=128)
+
+        view = store.sync()
+
+        assert len(view) == 1 and view.missing == 1 and view.bad_size == 1
+        assert store.sync().missing == 1     # rejected rows do not trigger a rebuild
+
+    def test_deleted_faces_are_compacted(self, db, store, monkeypatch):
+        monkeypatch.setattr(FaceEmbeddingMatrixStore, "_COMPACT_MIN_ROWS", 4)
+        ids = [_add_face(db, n) for n in range(6)]
+        orphan = _add_face(db, 6, in_project=False)
+        store.sync()
+        db.execute(f"DELETE FROM face_crops WHERE id IN ({ids[0]}, {ids[3]})")
+        db.commit()
+
+        view = store.sync()
+        assert view.face_ids.tolist() == [ids[1], ids[2], ids[4], ids[5]]
+        np.testing.assert_array_equal(view.vectors[2], _vec(4))
+
+        view = store.sync()
+        assert view.generation == 1 and view.rows == 5      # orphan kept for later
+        assert store.get_vectors([orphan]).keys() == {orphan}
+        np.testing.assert_array_equal(view.vectors[3], _vec(5))
+
+    def test_faces_saved_during_sync_wait_for_the_next_one(self, db, store, monkeypatch):
+        _add_face(db, 0)
+        store.sync()
+        append = store._append
+        late = []
+
+        def append_then_detect(meta):
+            written = append(meta)
+            late.append(_add_face(db, 1))       # detection commits a batch mid-sync
+            return written
+
+        monkeypatch.setattr(store, "_append", append_then_detect)
+        monkeypatch.setattr(store, "clear", lambda: pytest.fail("sync rebuilt the matrix"))
+        view = store.sync()
+        assert len(view) == 1 and view.missing == 0
+
+        monkeypatch.setattr(store, "_append", append)
+        view = store.sync()
+        assert view.face_ids.tolist()[-1] == late[0] and view.appended == 1
+
+    def test_sync_reads_ids_not_the_face_join(self, db, store, monkeypatch):
+        _add_face(db, 0)
+        _add_face(db, 1)
+        store.sync()
+
+        statements = []
+        get_connection = store.db.get_connection
+
+        @contextmanager
+        def traced(*args, **kwargs):
+            with get_connection(*args, **kwargs) as conn:
+                conn.set_trace_callback(statements.append)
+                try:
+                    yield conn
+                finally:
+                    conn.set_trace_callback(None)
+
+        monkeypatch.setattr(store.db, "get_connection", traced)
+        assert len(store.sync()) == 2
+        joins = [sql for sql in statements if "project_images" in sql]
+        assert len(joins) == 1 and "fc.id > 2" in joins[0]     # only the (empty) append
+
+    def test_deleted_and_rescanned_photos(self, db, store):
+        ids = [_add_face(db, n) for n in range(3)]
+        assert len(store.sync()) == 3
+
+        db.execute("DELETE FROM photo_metadata WHERE path = '/photos/img_0001.jpg'")
+        db.commit()
+        assert store.sync().face_ids.tolist() == [ids[0], ids[2]]
+
+        db.execute("INSERT INTO photo_metadata (path, folder_id, project_id, width, height) "
+                   "VALUES ('/photos/img_0001.jpg', 1, 1, 1600, 1200)")
+        db.commit()
+        view = store.sync()
+        assert view.face_ids.tolist() == ids
+        assert view.image_sizes[1].tolist() == [1600, 1200]
+
+    def test_rebuilds_when_database_was_replaced(self, db, store):
+        _add_face(db, 0)
+        store.sync()
+        with open(store.meta_path) as f:
+            meta = json.load(f)
+        meta["max_face_id"] = 10_000
+        with open(store.meta_path, "w") as f:
+            json.dump(meta, f)
+        _add_face(db, 1)
+
+        view = store.sync()
+        assert len(view) == 2 and view.missing == 0
+
+
+class TestGetVectors:
+
+    def test_returns_requested_faces_and_appends_new_ones(self, db, store):
+        a = _add_face(db, 0)
+        store.sync()
+        b = _add_face(db, 1)
+        bad = _add_face(db, 2, dim=128)
+
+        vectors = store.get_vectors([b, a, bad, 999])
+
+        assert set(vectors) == {a, b}
+        np.testing.assert_array_equal(vectors[b], _vec(1))
+        assert store.get_vectors([]) == {}
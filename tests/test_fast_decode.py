@@ -0,0 +1,96 @@
+# tests/test_fast_decode.py
+# Tests for the reduced-resolution decode path (EXIF preview / JPEG draft)
+#
+# Run: python -m pytest tests/test_fast_decode.py -v
+
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from services.safe_image_loader import fast_decode_pil, safe_decode_qimage
+from services.thumbnail_decode_benchmark import exif_with_preview
+
+RED, GREEN = (255, 0, 0), (0, 255, 0)
+
+
+def _jpeg(path: Path, size=(2000, 1500), preview_size=None, orientation=1):
+    """Green image; its EXIF preview (if any) is red so tests can tell them apart."""
+    exif = b""
+    if preview_size:
+        buf = io.BytesIO()
+        Image.new("RGB", preview_size, RED).save(buf, "JPEG")
+        exif = exif_with_preview(buf.getvalue(), orientation)
+    Image.new("RGB", size, GREEN).save(path, "JPEG", exif=exif)
+    return str(path)
+
+
+def _is_red(rgb):
+    return rgb[0] > 200 and rgb[1] < 60
+
+
+class TestFastDecodePil:
+
+    def test_uses_preview_when_it_covers_the_target(self, temp_dir):
+        path = _jpeg(temp_dir / "a.jpg", preview_size=(400, 300))
+        img = fast_decode_pil(path, height=256)
+        assert img.info["decode_path"] == "preview"
+        assert img.size == (400, 300) and _is_red(img.getpixel((10, 10)))
+
+    def test_preview_gets_main_image_orientation(self, temp_dir):
+        path = _jpeg(temp_dir / "a.jpg", preview_size=(400, 300), orientation=6)
+        img = fast_decode_pil(path, max_dim=350)
+        assert img.info["decode_path"] == "preview"
+        assert img.size == (300, 400)
+
+    def test_small_preview_falls_back_to_draft(self, temp_dir):
+        path = _jpeg(temp_dir / "a.jpg", preview_size=(160, 120))
+        img = fast_decode_pil(path, height=256)
+        assert img.info["decode_path"] == "draft"
+        assert 256 <= img.height < 1500 and not _is_red(img.getpixel((10, 10)))
+
+    def test_letterboxed_preview_is_ignored(self, temp_dir):
+        path = _jpeg(temp_dir / "a.jpg", size=(1920, 1080), preview_size=(640, 480))
+        assert fast_decode_pil(path, height=256).info["decode_path"] == "draft"
+
+    def test_preview_only_mode(self, temp_dir):
+        path = _jpeg(temp_dir / "a.jpg")
+        assert fast_decode_pil(path, height=256, allow_draft=False) is None
+
+    def test_no_fast_path_without_reduction_or_for_other_formats(self, temp_dir):
+        small = _jpeg(temp_dir / "small.jpg", size=(300, 200))
+        png = temp_dir / "a.png"
+        Image.new("RGB", (2000, 1500)).save(png)
+        assert fast_decode_pil(small, height=256) is None
+        assert fast_decode_pil(str(png), height=256) is None
+
+
+class TestCallers:
+
+    def test_safe_decode_uses_preview(self, qapp, temp_dir):
+        path = _jpeg(temp_dir / "a.jpg", preview_size=(400, 300))
+        qimg = safe_decode_qimage(path, max_dim=256)
+        assert (qimg.width(), qimg.height()) == (256, 192)
+        assert _is_red(qimg.pixelColor(10, 10).getRgb())
+
+    def test_thumbnail_service_paths(self, qapp, temp_dir):
+        from services.thumbnail_service import ThumbnailService
+        from thumb_cache_db import ThumbCacheDB
+
+        l2 = ThumbCacheDB(str(temp_dir / "thumbs.db"))
+        try:
+            svc = ThumbnailService(db_cache=l2)
+            with_preview = _jpeg(temp_dir / "p.jpg", preview_size=(400, 300))
+            plain = _jpeg(temp_dir / "n.jpg")
+
+            qimg = svc._generate_thumbnail_as_qimage(with_preview, 200, 5.0)
+            assert qimg.height() == 200 and _is_red(qimg.pixelColor(10, 10).getRgb())
+
+            qimg = svc._generate_thumbnail_pil_as_qimage(plain, 200, 5.0)
+            assert qimg.height() == 200 and not _is_red(qimg.pixelColor(10, 10).getRgb())
+
+            pixmap = svc._generate_thumbnail(plain, 200, 5.0)
+            assert pixmap.height() == 200
+        finally:
+            l2.close()
@@ -0,0 +1,136 @@
+# tests/test_gps_spatial_index.py
+# Tests for the grid-bucketed GPS location clustering
+#
+# Run: python -m pytest tests/test_gps_spatial_index.py -v
+
+import math
+import sqlite3
+
+import numpy as np
+import pytest
+
+from repository.schema import ensure_gps_cell_column
+from services.gps_spatial_index import (
+    GRID_COLS, cell_ranges, cluster_by_proximity, gps_cell, haversine_km,
+)
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def _reference_labels(points, radius_km):
+    """The O(n*k) loop ReferenceDB.get_photos_by_location used to run."""
+    seeds, labels = [], []
+    for i, (lat, lon) in enumerate(points):
+        for s in seeds:
+            if _haversine(lat, lon, *points[s]) <= radius_km:
+                labels.append(s)
+                break
+        else:
+            seeds.append(i)
+            labels.append(i)
+    return labels
+
+
+def _trip_photos(n, seed, centers):
+    rng = np.random.default_rng(seed)
+    owner = rng.integers(0, len(centers), size=n)
+    spread = rng.uniform(0.001, 0.2, size=len(centers))
+    lat = np.clip(centers[owner, 0] + rng.standard_normal(n) * spread[owner], -90, 90)
+    lon = (centers[owner, 1] + rng.standard_normal(n) * spread[owner] + 180.0) % 360.0 - 180.0
+    order = np.lexsort((lon, lat))
+    return list(zip(lat[order].tolist(), lon[order].tolist()))
+
+
+class TestClusterByProximity:
+
+    @pytest.mark.parametrize("radius_km", [0.5, 5.0, 40.0])
+    def test_matches_reference_loop(self, radius_km):
+        rng = np.random.default_rng(0)
+        centers = np.column_stack([rng.uniform(-60, 70, 40), rng.uniform(-180, 180, 40)])
+        points = _trip_photos(1500, seed=1, centers=centers)
+
+        labels = cluster_by_proximity(*zip(*points), radius_km)
+        assert labels.tolist() == _reference_labels(points, radius_km)
+
+    def test_antimeridian_and_poles(self):
+        centers = np.array([[0.0, 179.99], [0.0, -179.99], [89.95, 10.0], [89.97, -170.0], [-89.99, 0.0]])
+        points = _trip_photos(600, seed=2, centers=centers)
+
+        for radius_km in (2.0, 25.0):
+            labels = cluster_by_proximity(*zip(*points), radius_km)
+            assert labels.tolist() == _reference_labels(points, radius_km)
+
+    def test_persisted_cells_give_same_labels(self):
+        rng = np.random.default_rng(3)
+        centers = np.column_stack([rng.uniform(-50, 50, 10), rng.uniform(-170, 170, 10)])
+        points = _trip_photos(400, seed=4, centers=centers)
+        cells = [gps_cell(lat, lon) if i % 3 else None for i, (lat, lon) in enumerate(points)]
+
+        assert np.array_equal(cluster_by_proximity(*zip(*points), 5.0, cells=cells),
+                              cluster_by_proximity(*zip(*points), 5.0))
+
+    def test_empty(self):
+        assert cluster_by_proximity([], [], 5.0).shape == (0,)
+
+
+class TestCells:
+
+    def test_cell_ranges_cover_radius(self):
+        rng = np.random.default_rng(5)
+        for lat, lon in [(37.77, -122.42), (0.0, 179.999), (-33.9, -179.99), (89.99, 0.0), (60.0, 25.0)]:
+            ranges = cell_ranges(lat, lon, 10.0)
+            pts_lat = np.clip(lat + rng.uniform(-0.2, 0.2, 5000), -90, 90)
+            pts_lon = (lon + rng.uniform(-0.5, 0.5, 5000) + 180.0) % 360.0 - 180.0
+            near = haversine_km(lat, lon, pts_lat, pts_lon) <= 10.0
+            for plat, plon in zip(pts_lat[near], pts_lon[near]):
+                cell = gps_cell(plat, plon)
+                assert any(lo <= cell <= hi for lo, hi in ranges)
+
+    def test_gps_cell(self):
+        assert gps_cell(None, 1.0) is None
+        assert gps_cell(91.0, 0.0) is None
+        assert gps_cell(-90.0, -180.0) == 0
+        assert gps_cell(-90.0, 180.0) == GRID_COLS - 1
+
+    def test_sql_backfill_matches_python(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE photo_metadata (id INTEGER PRIMARY KEY, gps_latitude REAL, gps_longitude REAL)")
+        rng = np.random.default_rng(6)
+        coords = list(zip(rng.uniform(-90, 90, 500).tolist(), rng.uniform(-180, 180, 500).tolist()))
+        coords += [(90.0, 180.0), (-90.0, -180.0), (12.345, 67.89), (None, None), (120.0, 0.0)]
+        conn.executemany("INSERT INTO photo_metadata (gps_latitude, gps_longitude) VALUES (?, ?)", coords)
+
+        ensure_gps_cell_column(conn)
+        ensure_gps_cell_column(conn)
+
+        rows = conn.execute("SELECT gps_latitude, gps_longitude, gps_cell FROM photo_metadata").fetchall()
+        assert all(cell == gps_cell(lat, lon) for lat, lon, cell in rows)
+
+    def test_migration_backfills_cells(self, test_db_path):
+        from repository.base_repository import DatabaseConnection
+        from repository.migrations import MigrationManager
+
+        db = DatabaseConnection(str(test_db_path), auto_init=True)
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO projects (id, name, folder, mode) VALUES (1, 'p', '/lib', 'scan')")
+            conn.execute("INSERT INTO photo_folders (id, name, path, project_id) VALUES (1, 'lib', '/lib', 1)")
+            conn.execute("INSERT INTO photo_metadata (path, folder_id, project_id, gps_latitude, gps_longitude)"
+                         " VALUES ('/lib/a.jpg', 1, 1, 37.77, -122.42)")
+            # A database written before v14.1.0: the cell is missing
+            conn.execute("DELETE FROM schema_version WHERE version = '14.1.0'")
+            conn.commit()
+
+        manager = MigrationManager(db)
+        assert [m.version for m in manager.get_pending_migrations()] == ["14.1.0"]
+        assert manager.apply_all_migrations()[0]["status"] == "success"
+
+        with db.get_connection(read_only=True) as conn:
+            row = conn.execute("SELECT gps_cell FROM photo_metadata").fetchone()
+            indexes = {r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert row["gps_cell"] == gps_cell(37.77, -122.42)
+        assert "idx_photo_metadata_gps_cell" in indexes
+        db.write_queue().shutdown()
@@ -0,0 +1,75 @@
+# tests/test_job_scheduler.py
+# Tests for resource-class admission in JobManager scheduling
+#
+# Run: python -m pytest tests/test_job_scheduler.py -v
+
+from services.job_manager import (
+    ActiveJob, JobPriority, JobType, ResourceBudget, ResourceClass,
+    default_resource_budgets, job_memory_mb, resource_class_for, select_runnable_job,
+)
+from services.job_service import Job
+
+
+def _job(job_id, kind, priority=JobPriority.NORMAL):
+    return Job(
+        job_id=job_id, kind=kind, status='queued', priority=int(priority), backend='cpu',
+        payload_json='{}', progress=0.0, error=None, worker_id=None, lease_expires_at=None,
+        last_heartbeat_at=None, created_at='2026-01-01T00:00:00', updated_at=None, project_id=1,
+    )
+
+
+def _active(job_id, kind, paused=False):
+    return ActiveJob(
+        job_id=job_id, job_type=kind, project_id=1, paused=paused,
+        resource_class=resource_class_for(kind), memory_mb=job_memory_mb(kind),
+    )
+
+
+class TestSelectRunnableJob:
+
+    def test_one_job_per_class_by_default(self):
+        queued = [_job(1, JobType.EMBEDDING, JobPriority.HIGH),
+                  _job(2, JobType.FACE_SCAN),
+                  _job(3, JobType.DUPLICATE_HASH, JobPriority.LOW)]
+        running = [_active(10, JobType.FACE_SCAN)]
+
+        # Inference is busy: the hash backfill behind it goes first
+        job = select_runnable_job(queued, running, default_resource_budgets(), max_workers=4)
+        assert job.job_id == 3
+
+        running.append(_active(11, JobType.DUPLICATE_HASH))
+        assert select_runnable_job(queued, running, default_resource_budgets(), max_workers=4) is None
+
+    def test_paused_jobs_free_the_slot_but_keep_memory(self):
+        budgets = {**default_resource_budgets(),
+                   ResourceClass.CPU: ResourceBudget(max_concurrent=2, memory_mb=3000)}
+        queued = [_job(1, JobType.EMBEDDING)]
+
+        assert select_runnable_job(queued, [_active(10, JobType.FACE_SCAN, paused=True)],
+                                   budgets, max_workers=4) is None
+        assert select_runnable_job(queued, [_active(10, JobType.SCAN)],
+                                   budgets, max_workers=4).job_id == 1
+
+    def test_oversized_job_still_runs_alone(self):
+        budgets = {**default_resource_budgets(),
+                   ResourceClass.CPU: ResourceBudget(max_concurrent=4, memory_mb=100)}
+        queued = [_job(1, JobType.EMBEDDING)]
+        assert select_runnable_job(queued, [], budgets, max_workers=4).job_id == 1
+        assert select_runnable_job(queued, [], budgets, max_workers=4, available_memory_mb=10).job_id == 1
+        assert select_runnable_job(queued, [_active(10, JobType.SCAN)], default_resource_budgets(),
+                                   max_workers=4, available_memory_mb=10) is None
+
+    def test_user_activity_throttles_all_but_critical(self):
+        queued = [_job(1, JobType.FACE_SCAN, JobPriority.CRITICAL), _job(2, JobType.DUPLICATE_HASH)]
+        running = [_active(10, JobType.FACE_CLUSTER)]
+        budgets = default_resource_budgets()
+
+        assert select_runnable_job(queued, running, budgets, 4, user_active=True).job_id == 1
+        assert select_runnable_job(queued[1:], running, budgets, 4, user_active=True) is None
+        assert select_runnable_job(queued[1:], [], budgets, 4, user_active=True).job_id == 2
+        assert select_runnable_job(queued[1:], running, budgets, 4, user_active=False).job_id == 2
+
+    def test_global_limit(self):
+        running = [_active(10, JobType.FACE_SCAN), _active(11, JobType.SCAN)]
+        assert select_runnable_job([_job(1, JobType.POST_SCAN)], running,
+                                   default_resource_budgets(), max_workers=2) is None
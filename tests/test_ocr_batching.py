@@ -0,0 +1,202 @@
+# tests/test_ocr_batching.py
+# Tests for batched OCR storage, candidate prefiltering and the pipeline worker
+#
+# Run: python -m pytest tests/test_ocr_batching.py -v
+
+import sys
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+import repository.base_repository as base_repository
+import services.ocr_service as ocr_service
+from repository.base_repository import DatabaseConnection
+from repository.search_feature_repository import SearchFeatureRepository
+from services.ocr_service import (
+    OCRService, PREFILTER_ONLY, PREFILTER_OFF, PREFILTER_PRIORITIZE,
+)
+
+
+@pytest.fixture
+def db(test_db_path: Path, monkeypatch):
+    db = DatabaseConnection(str(test_db_path), auto_init=True)
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO projects (id, name, folder, mode) VALUES (1, 'p', '/lib', 'scan')")
+        conn.execute("INSERT INTO photo_folders (id, name, path, project_id) VALUES (1, 'lib', '/lib', 1)")
+    # OCRService opens the default database; point it at the test one
+    monkeypatch.setattr(base_repository, "DatabaseConnection", lambda *a, **k: db)
+    refreshed = []
+    monkeypatch.setattr(SearchFeatureRepository, "apply_photo_changes",
+                        lambda self, ids, reason="": refreshed.append(sorted(ids)))
+    db.refreshed = refreshed
+    yield db
+    db.write_queue().shutdown()
+
+
+def _add_photo(db, path, width=1000, height=800):
+    with db.get_connection() as conn:
+        cur = conn.execute(
+            "INSERT INTO photo_metadata (path, folder_id, project_id, width, height) VALUES (?, 1, 1, ?, ?)",
+            (str(path), width, height),
+        )
+        conn.commit()
+        return cur.lastrowid
+
+
+def _link_asset(db, photo_id, content_hash):
+    with db.get_connection() as conn:
+        cur = conn.execute("INSERT INTO media_asset (project_id, content_hash) VALUES (1, ?)", (content_hash,))
+        conn.execute("INSERT INTO media_instance (project_id, asset_id, photo_id) VALUES (1, ?, ?)",
+                     (cur.lastrowid, photo_id))
+        conn.commit()
+        return cur.lastrowid
+
+
+def _add_features(db, path, ext, width=1000, height=800, is_screenshot=0, confidence=0.0):
+    with db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO search_asset_features "
+            "(path, project_id, width, height, is_screenshot, screenshot_confidence, ext) "
+            "VALUES (?, 1, ?, ?, ?, ?, ?)",
+            (str(path), width, height, is_screenshot, confidence, ext),
+        )
+        conn.commit()
+
+
+def _fts_hits(db, table, word):
+    with db.get_connection() as conn:
+        return [r["rowid"] for r in conn.execute(f"SELECT rowid FROM {table} WHERE {table} MATCH ?", (word,))]
+
+
+class TestStoreOcrResults:
+
+    def test_batch_writes_text_and_both_fts_tables(self, db):
+        a = _add_photo(db, "/lib/a.png")
+        b = _add_photo(db, "/lib/b.jpg")
+        unhashed = _add_photo(db, "/lib/c.jpg")
+        asset_b = _link_asset(db, b, "hash-b")
+        asset_a = _link_asset(db, a, "hash-a")
+
+        stored = OCRService(['en']).store_ocr_results(
+            [(a, "invoice total", 0.9), (b, "", None), (unhashed, "invoice", 0.5)], project_id=1)
+
+        assert stored == 3
+        with db.get_connection() as conn:
+            rows = {r["id"]: r["ocr_text"] for r in conn.execute("SELECT id, ocr_text FROM photo_metadata")}
+            aot = conn.execute("SELECT asset_id, path, ocr_confidence, token_count FROM asset_ocr_text "
+                               "ORDER BY path").fetchall()
+        assert rows == {a: "invoice total", b: "", unhashed: "invoice"}
+        assert [(r["asset_id"], r["path"], r["ocr_confidence"], r["token_count"]) for r in aot] == [
+            (asset_a, "/lib/a.png", 0.9, 2), (asset_b, "/lib/b.jpg", 0.0, 0)]
+        assert sorted(_fts_hits(db, "ocr_fts5", "invoice")) == [a, unhashed]
+        assert _fts_hits(db, "asset_ocr_text_fts", "invoice") == [asset_a]
+        assert db.refreshed == [[a, b, unhashed]]
+
+    def test_restore_replaces_fts_entries(self, db):
+        a = _add_photo(db, "/lib/a.png")
+        asset_a = _link_asset(db, a, "hash-a")
+        service = OCRService(['en'])
+        service.store_ocr_text(a, "receipt", 1)
+        service.store_ocr_results([(a, "boarding pass", 0.8)], 1)
+
+        assert _fts_hits(db, "ocr_fts5", "receipt") == []
+        assert _fts_hits(db, "asset_ocr_text_fts", "receipt") == []
+        assert _fts_hits(db, "ocr_fts5", "boarding") == [a]
+        assert _fts_hits(db, "asset_ocr_text_fts", "boarding") == [asset_a]
+
+
+class TestPrefilter:
+
+    @pytest.fixture
+    def photos(self, db):
+        ids = {}
+        ids['plain'] = _add_photo(db, "/lib/plain.jpg", 4000, 2250)
+        ids['screenshot'] = _add_photo(db, "/lib/shot.jpg", 1170, 2532)
+        ids['png'] = _add_photo(db, "/lib/chart.png", 800, 800)
+        ids['page'] = _add_photo(db, "/lib/scan.jpg", 2480, 3508)
+        ids['unindexed'] = _add_photo(db, "/lib/new.jpg", 4000, 3000)
+        _add_features(db, "/lib/plain.jpg", ".jpg", 4000, 2250)
+        _add_features(db, "/lib/shot.jpg", ".jpg", 1170, 2532, is_screenshot=1, confidence=0.9)
+        _add_features(db, "/lib/chart.png", ".png", 800, 800)
+        _add_features(db, "/lib/scan.jpg", ".jpg", 2480, 3508)
+        return ids
+
+    def test_modes(self, photos):
+        service = OCRService(['en'])
+        off = [pid for pid, _ in service.get_photos_needing_ocr(1, prefilter=PREFILTER_OFF)]
+        prioritized = [pid for pid, _ in service.get_photos_needing_ocr(1, prefilter=PREFILTER_PRIORITIZE)]
+        only = [pid for pid, _ in service.get_photos_needing_ocr(1, prefilter=PREFILTER_ONLY)]
+
+        assert off == sorted(photos.values())
+        assert prioritized[-1] == photos['plain'] and sorted(prioritized) == off
+        assert only == sorted(photos[k] for k in ('screenshot', 'png', 'page', 'unindexed'))
+
+
+class _FakeReader:
+    def readtext(self, img, detail=1):
+        return [([[0, 0]] * 4, "hello", 0.9), ([[0, 0]] * 4, "world", 0.8), ([[0, 0]] * 4, "noise", 0.1)]
+
+
+class TestPipelineWorker:
+
+    def test_in_thread_pipeline_batches_commits(self, db, tmp_path, monkeypatch):
+        from workers.ocr_pipeline_worker import OCRPipelineWorker
+
+        monkeypatch.setattr(ocr_service, "_get_reader", lambda languages=None: _FakeReader())
+        stores = []
+        original = OCRService.store_ocr_results
+        monkeypatch.setattr(OCRService, "store_ocr_results",
+                            lambda self, results, project_id: stores.append(len(results)) or
+                            original(self, results, project_id))
+
+        for i in range(5):
+            path = tmp_path / f"p{i}.png"
+            Image.new("RGB", (200, 200), "white").save(path)
+            _add_photo(db, path)
+        _add_photo(db, tmp_path / "tiny.png")
+        Image.new("RGB", (20, 20), "white").save(tmp_path / "tiny.png")
+        _add_photo(db, tmp_path / "clip.mov")
+
+        worker = OCRPipelineWorker(project_id=1, batch_size=3, workers=1, prefilter=PREFILTER_OFF)
+        finished = []
+        worker.signals.finished.connect(finished.append)
+        worker.run()
+
+        assert finished == [{"processed": 5, "with_text": 5, "failed": 0, "skipped": 2}]
+        assert stores == [3, 3, 1]
+        with db.get_connection() as conn:
+            texts = [r["ocr_text"] for r in conn.execute("SELECT ocr_text FROM photo_metadata ORDER BY id")]
+        assert texts == ["hello world"] * 5 + ["", ""]
+
+    def test_frozen_build_uses_process_pool_capped_by_setting(self, db, tmp_path, monkeypatch):
+        import settings_manager_qt
+        from workers.ocr_pipeline_worker import OCRPipelineWorker
+
+        monkeypatch.setattr(ocr_service, "_get_reader", lambda languages=None: _FakeReader())
+        monkeypatch.setattr(ocr_service, "ocr_backend_available", lambda: True)
+        monkeypatch.setattr(sys, "frozen", True, raising=False)
+        monkeypatch.setattr(settings_manager_qt.SettingsManager, "get",
+                            lambda self, key, default=None: 2 if key == "ocr_workers" else default)
+        monkeypatch.setattr(OCRPipelineWorker, "PROCESS_POOL_MIN_PHOTOS", 1)
+        pools = []
+
+        def fake_pool(self, ocr, photos, workers):
+            pools.append(workers)
+            ocr._ensure_reader()
+            return self._iter_thread_results(ocr, photos)
+
+        monkeypatch.setattr(OCRPipelineWorker, "_iter_process_results", fake_pool)
+
+        for i in range(3):
+            path = tmp_path / f"p{i}.png"
+            Image.new("RGB", (200, 200), "white").save(path)
+            _add_photo(db, path)
+
+        worker = OCRPipelineWorker(project_id=1, prefilter=PREFILTER_OFF)
+        finished = []
+        worker.signals.finished.connect(finished.append)
+        worker.run()
+
+        assert pools == [2]
+        assert finished == [{"processed": 3, "with_text": 3, "failed": 0, "skipped": 0}]
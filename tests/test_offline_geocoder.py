@@ -0,0 +1,113 @@
+# tests/test_offline_geocoder.py
+# Tests for the gazetteer-backed offline geocoder and its use in GeocodingService
+#
+# Run: python -m pytest tests/test_offline_geocoder.py -v
+
+import numpy as np
+import pytest
+
+from services.geocoding_service import GeocodingService
+from services.offline_geocoder import OfflineGeocoder, dedupe_coordinates, load_gazetteer
+
+
+@pytest.fixture
+def csv_gazetteer(tmp_path):
+    path = tmp_path / "gazetteer.csv"
+    path.write_text(
+        "name,latitude,longitude,admin1,country\n"
+        "San Francisco,37.7749,-122.4194,California,United States\n"
+        "Oakland,37.8044,-122.2712,California,United States\n"
+        "Paris,48.8566,2.3522,Ile-de-France,France\n"
+        "Suva,-18.1416,178.4419,Central,Fiji\n"
+        "Singapore,1.3521,103.8198,Singapore,Singapore\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+@pytest.fixture
+def geonames_gazetteer(tmp_path):
+    rows = [
+        ["2988507", "Paris", "Paris", "", "48.85341", "2.3488", "P", "PPLC", "FR", "", "11"],
+        ["5391959", "San Francisco", "San Francisco", "", "37.77493", "-122.41942", "P", "PPLA2", "US", "", "CA"],
+    ]
+    (tmp_path / "cities15000.txt").write_text(
+        "\n".join("\t".join(r + [""] * 8) for r in rows) + "\n", encoding="utf-8")
+    (tmp_path / "admin1CodesASCII.txt").write_text(
+        "FR.11\tIle-de-France\tIle-de-France\t3012874\nUS.CA\tCalifornia\tCalifornia\t5332921\n",
+        encoding="utf-8")
+    (tmp_path / "countryInfo.txt").write_text(
+        "#ISO\tISO3\tISO-Numeric\tfips\tCountry\nFR\tFRA\t250\tFR\tFrance\nUS\tUSA\t840\tUS\tUnited States\n",
+        encoding="utf-8")
+    return str(tmp_path / "cities15000.txt")
+
+
+class TestOfflineGeocoder:
+
+    def test_nearest_place(self, csv_gazetteer):
+        geocoder = OfflineGeocoder(csv_gazetteer)
+        names = geocoder.reverse_geocode_batch([
+            (37.78, -122.41),      # downtown San Francisco
+            (37.80, -122.27),      # Oakland
+            (48.86, 2.29),         # western Paris
+            (-18.0, -179.99),      # across the antimeridian from Suva
+        ])
+        assert names == [
+            "San Francisco, California, United States",
+            "Oakland, California, United States",
+            "Paris, Ile-de-France, France",
+            None,
+        ]
+        assert geocoder.reverse_geocode(1.35, 103.82) == "Singapore, Singapore"
+
+    def test_max_distance(self, csv_gazetteer):
+        assert OfflineGeocoder(csv_gazetteer).reverse_geocode(0.0, -30.0) is None
+        wide = OfflineGeocoder(csv_gazetteer, max_distance_km=300.0)
+        assert wide.reverse_geocode(-18.0, -179.99) == "Suva, Central, Fiji"
+
+    def test_geonames_dump_with_lookups(self, geonames_gazetteer):
+        names, lats, lons = load_gazetteer(geonames_gazetteer)
+        assert names == ["Paris, Ile-de-France, France", "San Francisco, California, United States"]
+        np.testing.assert_allclose(lats, [48.85341, 37.77493])
+        np.testing.assert_allclose(lons, [2.3488, -122.41942])
+
+    def test_missing_file_resolves_nothing(self, tmp_path):
+        geocoder = OfflineGeocoder(str(tmp_path / "missing.csv"))
+        assert geocoder.reverse_geocode_batch([(1.0, 2.0)]) == [None]
+        assert geocoder.size == 0
+
+
+class TestDedupe:
+
+    def test_precision(self):
+        unique, inverse = dedupe_coordinates(
+            [(37.77491, -122.41941), (37.77494, -122.41943), (48.8566, 2.3522)], precision=3)
+        assert len(unique) == 2
+        assert inverse[0] == inverse[1] != inverse[2]
+        assert unique[inverse[2]] == (48.857, 2.352)
+
+    def test_empty(self):
+        unique, inverse = dedupe_coordinates([], precision=3)
+        assert unique == [] and len(inverse) == 0
+
+
+class TestBatchReverseGeocode:
+
+    def test_offline_first_then_api_once_per_unique(self, csv_gazetteer, monkeypatch):
+        service = GeocodingService(use_cache=False, offline_geocoder=OfflineGeocoder(csv_gazetteer))
+        api_calls = []
+
+        def fake_api(lat, lon, language='en'):
+            api_calls.append((lat, lon))
+            return "Mid-Atlantic"
+
+        monkeypatch.setattr(service, "_fetch_from_api", fake_api)
+        coords = [(37.7749, -122.4194), (37.77491, -122.41939), (0.0, -30.0), (0.00001, -30.00001), (95.0, 0.0)]
+
+        results = service.batch_reverse_geocode(coords, precision=3)
+
+        assert results[(37.7749, -122.4194)] == "San Francisco, California, United States"
+        assert results[(37.77491, -122.41939)] == "San Francisco, California, United States"
+        assert results[(0.0, -30.0)] == results[(0.00001, -30.00001)] == "Mid-Atlantic"
+        assert results[(95.0, 0.0)] is None
+        assert api_calls == [(0.0, -30.0)]
@@ -0,0 +1,134 @@
+# tests/test_people_merge_engine.py
+# Tests that the vectorized merge-suggestion engine matches all-pairs scoring
+#
+# Run: python -m pytest tests/test_people_merge_engine.py -v
+
+import time
+
+import numpy as np
+import pytest
+
+import services.people_merge_engine as people_merge_engine
+from services.people_merge_engine import PeopleMergeEngine
+
+
+def _reference(engine, clusters, accepted=(), rejected=()):
+    """The original nested loop over every pair."""
+    normalized = engine._normalize_clusters(clusters)
+    out = []
+    for i in range(len(normalized)):
+        for j in range(i + 1, len(normalized)):
+            left, right = normalized[i], normalized[j]
+            key = engine._pair_key(left["id"], right["id"])
+            if key in accepted or key in rejected:
+                continue
+            score, rationale = engine._score_pair(left, right)
+            if score < engine.min_score:
+                continue
+            out.append({
+                "left_id": left["id"], "right_id": right["id"], "score": round(score, 4),
+                "label": f'{left["label"]} ↔ {right["label"]}', "rationale": rationale,
+            })
+    out.sort(key=lambda x: x["score"], reverse=True)
+    return out[:engine.max_candidates]
+
+
+def _clusters(n, seed, dim=32):
+    """People-like clusters: a few identities split into several clusters each."""
+    rng = np.random.default_rng(seed)
+    people = rng.standard_normal((max(1, n // 5), dim))
+    clusters = []
+    for i in range(n):
+        centroid = people[rng.integers(len(people))] + 0.3 * rng.standard_normal(dim)
+        clusters.append({
+            "id": f"face_{i:04d}",
+            "label": f"Face_{i:04d}" if i % 3 else f"Person {i}",
+            "count": int(rng.choice([1, 2, 3, 5, 8, 16, 25])),
+            "centroid": centroid.astype(np.float32).tolist(),
+        })
+    return clusters
+
+
+class TestParity:
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_all_pairs(self, seed):
+        engine = PeopleMergeEngine()
+        clusters = _clusters(120, seed)
+        assert engine.build_merge_suggestions(clusters) == _reference(engine, clusters)
+
+    def test_blocked_matrix(self, monkeypatch):
+        monkeypatch.setattr(people_merge_engine, "_BLOCK_ELEMENTS", 500)
+        engine = PeopleMergeEngine()
+        engine.max_candidates = 50
+        clusters = _clusters(150, 7)
+        assert engine.build_merge_suggestions(clusters) == _reference(engine, clusters)
+
+    def test_exclusions_do_not_take_top_slots(self):
+        engine = PeopleMergeEngine()
+        engine.max_candidates = 5
+        clusters = _clusters(60, 3)
+        best = _reference(engine, clusters)
+        rejected = {engine._pair_key(s["left_id"], s["right_id"]) for s in best[:3]}
+        accepted = {engine._pair_key(best[3]["left_id"], best[3]["right_id"])}
+
+        result = engine.build_merge_suggestions(clusters, accepted, rejected)
+
+        assert result == _reference(engine, clusters, accepted, rejected)
+        assert len(result) == 5
+
+    def test_ties_keep_scan_order(self):
+        engine = PeopleMergeEngine()
+        engine.max_candidates = 3
+        same = [1.0, 0.0, 0.0]
+        clusters = [{"id": f"c{i}", "count": 4, "centroid": same} for i in range(6)]
+        result = engine.build_merge_suggestions(clusters)
+        assert result == _reference(engine, clusters)
+        assert [(s["left_id"], s["right_id"]) for s in result] == [("c0", "c1"), ("c0", "c2"), ("c0", "c3")]
+
+    def test_rounded_ties_at_the_row_cut(self):
+        # c1..c21 match c0 equally after rounding to 4 places; raw scores rise
+        # with the index, so a raw per-row cut would drop c0<->c1
+        engine = PeopleMergeEngine()
+        dim = 24
+        clusters = [{"id": "c0", "count": 4, "centroid": np.eye(dim)[0].tolist()}]
+        for j in range(1, 22):
+            sim = 0.9 + j * 1e-7
+            vec = sim * np.eye(dim)[0] + np.sqrt(1 - sim ** 2) * np.eye(dim)[j]
+            clusters.append({"id": f"c{j}", "count": 4, "centroid": vec.tolist()})
+
+        result = engine.build_merge_suggestions(clusters)
+
+        assert result == _reference(engine, clusters)
+        assert [(s["left_id"], s["right_id"]) for s in result][:2] == [("c0", "c1"), ("c0", "c2")]
+
+    def test_irregular_centroids(self):
+        engine = PeopleMergeEngine()
+        clusters = _clusters(40, 11)
+        clusters[0]["centroid"] = None
+        clusters[1]["centroid"] = []
+        clusters[2]["centroid"] = [0.0] * 32
+        clusters[3]["centroid"] = clusters[4]["centroid"][:16]        # other dimension
+        clusters[5]["centroid"] = clusters[6]["centroid"][:16]
+        clusters[7]["centroid"] = ["x"] * 32
+        clusters[8]["id"] = clusters[9]["id"]                         # duplicate id
+        assert engine.build_merge_suggestions(clusters) == _reference(engine, clusters)
+
+    def test_low_min_score_scores_every_pair(self):
+        engine = PeopleMergeEngine()
+        engine.min_score = 0.2
+        clusters = _clusters(30, 5)
+        clusters[0]["centroid"] = None
+        assert engine.build_merge_suggestions(clusters) == _reference(engine, clusters)
+
+
+class TestScale:
+
+    def test_thousands_of_clusters(self):
+        engine = PeopleMergeEngine()
+        clusters = _clusters(4000, 1, dim=128)
+        start = time.perf_counter()
+        result = engine.build_merge_suggestions(clusters)
+        elapsed = time.perf_counter() - start
+        assert len(result) == engine.max_candidates
+        assert elapsed < 10.0
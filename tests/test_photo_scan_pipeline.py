@@ -0,0 +1,166 @@
+# tests/test_photo_scan_pipeline.py
+# Tests for streaming discovery and the staged (stat -> metadata parse ->
+# batched write) scan pipeline
+#
+# Run: python -m pytest tests/test_photo_scan_pipeline.py -v
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from repository import DatabaseConnection, PhotoRepository, FolderRepository, ProjectRepository
+from services import PhotoScanService, MetadataService
+
+
+@pytest.fixture
+def db_conn(test_db_path: Path, init_test_database):
+    db = DatabaseConnection(str(test_db_path))
+    yield db
+    # Drain the queued search-feature writes before the temp DB is removed
+    db.write_queue().shutdown()
+
+
+@pytest.fixture
+def project_id(db_conn, test_images_dir):
+    return ProjectRepository(db_conn).create("Test Project", str(test_images_dir), "branch")
+
+
+@pytest.fixture
+def photo_tree(test_images_dir):
+    paths = []
+    for folder in ("a", "b", "b/c"):
+        (test_images_dir / folder).mkdir(parents=True, exist_ok=True)
+        for i in range(4):
+            path = test_images_dir / folder / f"img_{i}.jpg"
+            Image.new("RGB", (64 + i, 48), color=(i * 40, 0, 0)).save(path, "JPEG")
+            paths.append(path)
+    return paths
+
+
+def _service(db_conn, project_id, **kwargs):
+    kwargs.setdefault("metadata_service", MetadataService())
+    return PhotoScanService(
+        project_id=project_id,
+        photo_repo=PhotoRepository(db_conn),
+        folder_repo=FolderRepository(db_conn),
+        project_repo=ProjectRepository(db_conn),
+        **kwargs
+    )
+
+
+def _rows(db_conn, project_id):
+    with db_conn.get_connection(read_only=True) as conn:
+        return conn.execute(
+            "SELECT path, width, height, folder_id FROM photo_metadata WHERE project_id = ?",
+            (project_id,)).fetchall()
+
+
+class SlowMetadataService(MetadataService):
+
+    def __init__(self, slow_name):
+        super().__init__()
+        self.slow_name = slow_name
+
+    def extract_basic_metadata(self, file_path):
+        if Path(file_path).name == self.slow_name:
+            time.sleep(1.0)
+        return super().extract_basic_metadata(file_path)
+
+
+class TestPhotoScanPipeline:
+
+    def test_indexes_all_files_across_batches(self, db_conn, project_id, photo_tree, test_images_dir):
+        service = _service(db_conn, project_id, batch_size=5, workers=3)
+        result = service.scan_repository(str(test_images_dir), project_id)
+        assert result.photos_indexed == len(photo_tree)
+        assert result.photos_failed == 0
+        assert result.folders_found == 3
+        rows = _rows(db_conn, project_id)
+        assert len(rows) == len(photo_tree)
+        assert all(r['width'] and r['height'] == 48 for r in rows)
+
+    def test_folder_hierarchy_resolved_once_per_directory(self, db_conn, project_id, photo_tree,
+                                                          test_images_dir, monkeypatch):
+        service = _service(db_conn, project_id, workers=2)
+        calls = []
+        original = service._ensure_folder_hierarchy
+        monkeypatch.setattr(service, "_ensure_folder_hierarchy",
+                            lambda folder, *a: calls.append(folder) or original(folder, *a))
+        service.scan_repository(str(test_images_dir), project_id)
+        assert len(calls) == 3
+
+    def test_incremental_rescan_skips_unchanged(self, db_conn, project_id, photo_tree, test_images_dir):
+        service = _service(db_conn, project_id, workers=2)
+        service.scan_repository(str(test_images_dir), project_id, incremental=False)
+        result = service.scan_repository(str(test_images_dir), project_id, incremental=True)
+        assert result.photos_indexed == 0
+        assert result.photos_skipped == len(photo_tree)
+
+    def test_process_pool_stage(self, db_conn, project_id, photo_tree, test_images_dir):
+        service = _service(db_conn, project_id, metadata_service=None, workers=2)
+        service.PROCESS_POOL_MIN_FILES = 0
+        assert service.use_processes
+        result = service.scan_repository(str(test_images_dir), project_id)
+        assert result.photos_indexed == len(photo_tree)
+        assert sorted(r['width'] for r in _rows(db_conn, project_id)) == sorted([64, 65, 66, 67] * 3)
+
+    def test_metadata_timeout_still_indexes_file(self, db_conn, project_id, photo_tree, test_images_dir):
+        service = _service(db_conn, project_id, metadata_service=SlowMetadataService("img_0.jpg"), workers=4)
+        service.METADATA_TIMEOUT = 0.1
+        result = service.scan_repository(str(test_images_dir), project_id)
+        assert result.photos_indexed == len(photo_tree)
+        rows = _rows(db_conn, project_id)
+        assert sum(1 for r in rows if r['width'] is None) == 3
+
+    def test_cancel_from_progress_callback(self, db_conn, project_id, photo_tree, test_images_dir):
+        service = _service(db_conn, project_id, workers=1, batch_size=100)
+        result = service.scan_repository(str(test_images_dir), project_id,
+                                         progress_callback=lambda p: service.cancel())
+        assert result.interrupted
+        assert result.photos_indexed < len(photo_tree)
+
+
+class TestStreamingDiscovery:
+
+    def test_single_walk_yields_photos_and_videos(self, db_conn, project_id, photo_tree, test_images_dir):
+        (test_images_dir / "a" / "clip.mp4").write_bytes(b"\0")
+        (test_images_dir / "a" / "notes.txt").write_text("x")
+        (test_images_dir / ".hidden").mkdir()
+        Image.new("RGB", (8, 8)).save(test_images_dir / ".hidden" / "h.jpg", "JPEG")
+        (test_images_dir / "skipme").mkdir()
+        Image.new("RGB", (8, 8)).save(test_images_dir / "skipme" / "s.jpg", "JPEG")
+
+        service = _service(db_conn, project_id)
+        found = list(service._discover_media(test_images_dir, {"skipme"}))
+        videos = [p for is_video, p, _ in found if is_video]
+        photos = [p for is_video, p, _ in found if not is_video]
+        assert [p.name for p in videos] == ["clip.mp4"]
+        assert sorted(photos) == sorted(photo_tree)
+        assert service._total_photos == len(photo_tree)
+        assert service._total_media_files == len(photo_tree) + 1
+        assert service._discovery_complete
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unavailable")
+    def test_symlinked_duplicates_dropped(self, db_conn, project_id, photo_tree, test_images_dir):
+        try:
+            os.symlink(test_images_dir / "a", test_images_dir / "alias", target_is_directory=True)
+            os.symlink(photo_tree[0], test_images_dir / "b" / "link.jpg")
+            os.symlink(photo_tree[0], test_images_dir / "b" / "link2.jpg")
+        except OSError:
+            pytest.skip("cannot create symlinks")
+        service = _service(db_conn, project_id)
+        photos = [p for _, p, _ in service._discover_media(test_images_dir, set())]
+        assert len(photos) == len(photo_tree)
+
+    def test_first_batches_committed_while_discovering(self, db_conn, project_id, photo_tree, test_images_dir):
+        service = _service(db_conn, project_id, workers=1)
+        service.FLUSH_INTERVAL = 0
+        batches = []
+        result = service.scan_repository(
+            str(test_images_dir), project_id,
+            on_batch_written=lambda n: batches.append((n, service._discovery_complete)))
+        assert sum(n for n, _ in batches) == result.photos_indexed == len(photo_tree)
+        assert batches[0][1] is False
@@ -0,0 +1,153 @@
+# tests/test_project_meta_store.py
+# Tests for the columnar project metadata store used by search scoring
+#
+# Run: python -m pytest tests/test_project_meta_store.py -v
+
+from pathlib import Path
+
+import pytest
+
+from repository.base_repository import DatabaseConnection
+from repository.search_feature_repository import SearchFeatureRepository
+from services.gate_engine import GateEngine
+from services.project_meta_store import NO_DATE, ProjectMetaStore
+from services.search_orchestrator import FacetComputer, QueryPlan, ScoredResult
+
+PHOTOS = [
+    # name, width, height, rating, date_taken, gps
+    ("a.jpg", 4000, 3000, 5, "2023-05-01 10:00:00", True),
+    ("b.jpg", 1170, 2532, 0, "2024:01:02 08:30:00", False),
+    ("c.png", 300, 200, 2, "2024-07-14", False),
+    ("d.mp4", None, None, 0, None, True),
+    ("e.jpg", 4000, 3000, 0, "garbage", False),
+    ("f.jpg", 2000, 1500, 1, "2023-13-40", False),
+    ("g.heic", 3024, 4032, 0, "2023-02-11 12:00:00", True),
+    ("h.jpg", 640, 480, 3, "2024-03-03 09:09:09", False),
+]
+
+
+@pytest.fixture
+def db(test_db_path: Path):
+    db = DatabaseConnection(str(test_db_path), auto_init=True)
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO projects (id, name, folder, mode) VALUES (1, 'p', '/lib', 'scan')")
+        conn.execute("INSERT INTO photo_folders (id, name, path, project_id) VALUES (1, 'lib', '/lib', 1)")
+        for name, w, h, rating, date, gps in PHOTOS:
+            conn.execute(
+                "INSERT INTO photo_metadata (path, folder_id, project_id, width, height, rating, "
+                "date_taken, gps_latitude, gps_longitude) VALUES (?, 1, 1, ?, ?, ?, ?, ?, ?)",
+                (f"/lib/{name}", w, h, rating, date, 48.1 if gps else None, 11.5 if gps else None)
+            )
+        for x in (0, 20):
+            conn.execute(
+                "INSERT INTO face_crops (project_id, image_path, crop_path, bbox_x, bbox_y, bbox_w, bbox_h) "
+                "VALUES (1, '/lib/a.jpg', ?, ?, 0, 10, 10)", (f"/crops/a_{x}.jpg", x)
+            )
+        conn.execute(
+            "INSERT INTO face_crops (project_id, image_path, crop_path, bbox_x, bbox_y, bbox_w, bbox_h) "
+            "VALUES (1, '/lib/h.jpg', '/crops/h.jpg', 0, 0, 10, 10)"
+        )
+    yield db
+    db.write_queue().shutdown()
+
+
+@pytest.fixture
+def repo(db):
+    repo = SearchFeatureRepository(db)
+    repo.refresh_project(1)
+    return repo
+
+
+def _bump(db, sql, *params):
+    # updated_at has 1s resolution; push changed rows past the watermark
+    with db.get_connection() as conn:
+        conn.execute(sql, params)
+
+
+class TestMappingView:
+
+    def test_rows_match_get_project_meta(self, repo):
+        store = ProjectMetaStore.load(repo, 1)
+        expected = repo.get_project_meta(1)
+        assert len(store) == len(expected)
+        assert set(store) == set(expected)
+        for path, meta in expected.items():
+            assert store[path] == meta
+        assert dict(store.items()) == expected
+        assert store.get("/lib/missing.jpg", {}) == {}
+
+    def test_columns(self, repo):
+        store = ProjectMetaStore.load(repo, 1)
+        pos = store.positions(["/lib/a.jpg", "/lib/d.mp4", "/lib/e.jpg", "/nope"])
+        assert pos[-1] == -1
+        assert store.column("face_count", pos).tolist() == [2, 0, 0, 0]
+        assert store.column("width", pos).tolist() == [4000, -1, 4000, -1]
+        dates = store.column("date_ts", pos)
+        assert dates[0] == 1682935200      # 2023-05-01 10:00:00 UTC
+        assert dates[1] == NO_DATE and dates[2] == NO_DATE
+        assert store.face_photo_count() == 2
+
+    def test_normalized_positions(self, repo):
+        store = ProjectMetaStore.load(repo, 1)
+        assert store.positions(["/LIB//A.jpg"]).tolist() == [-1]
+        assert store.positions(["/LIB//A.jpg"], normalize=True).tolist() == [store.positions(["/lib/a.jpg"])[0]]
+
+
+class TestDictParity:
+
+    def test_facets_match_dict_path(self, repo):
+        store = ProjectMetaStore.load(repo, 1)
+        as_dict = repo.get_project_meta(1)
+        paths = list(as_dict) * 2 + ["/lib/unknown.jpg"]
+        assert FacetComputer.compute(paths, store) == FacetComputer.compute(paths, as_dict)
+
+    @pytest.mark.parametrize("gates", [
+        {"exclude_faces": True},
+        {"require_faces": True},
+        {"min_face_count": 2},
+        {"require_gps_gate": True},
+        {"min_edge_size": 1000},
+        {"exclude_screenshots": True, "min_edge_size": 500},
+        {"preset_id": "pets"},
+        {"require_screenshot": True},
+    ])
+    def test_gates_match_dict_path(self, repo, gates):
+        store = ProjectMetaStore.load(repo, 1)
+        as_dict = repo.get_project_meta(1)
+        scored = [ScoredResult(path=p, final_score=0.5) for p in list(as_dict) + ["/lib/unknown.jpg"]]
+        plan = QueryPlan(**gates)
+        kept_store, dropped_store = GateEngine().apply(scored, plan, store)
+        kept_dict, dropped_dict = GateEngine().apply(scored, plan, as_dict)
+        assert [r.path for r in kept_store] == [r.path for r in kept_dict]
+        assert dropped_store == dropped_dict
+
+
+class TestIncrementalRefresh:
+
+    def test_unchanged_returns_same_snapshot(self, repo):
+        store = ProjectMetaStore.load(repo, 1)
+        assert store.refreshed(repo) is store
+
+    def test_updates_and_additions_applied(self, db, repo):
+        store = ProjectMetaStore.load(repo, 1)
+        _bump(db, "UPDATE search_asset_features SET rating = 4, flag = 'pick', "
+                  "updated_at = '2999-01-01 00:00:00' WHERE path = '/lib/b.jpg'")
+        _bump(db, "INSERT INTO search_asset_features (path, project_id, media_type, face_count, "
+                  "ext, date_taken, updated_at) VALUES ('/lib/new.jpg', 1, 'photo', 3, '.jpg', "
+                  "'2022-06-01', '2999-01-01 00:00:00')")
+
+        fresh = store.refreshed(repo)
+        assert fresh is not store
+        assert fresh["/lib/b.jpg"]["rating"] == 4 and fresh["/lib/b.jpg"]["flag"] == "pick"
+        assert fresh["/lib/new.jpg"]["face_count"] == 3
+        assert fresh.facet_counts(["/lib/new.jpg"])["years"] == {"2022": 1}
+        assert dict(fresh.items()) == repo.get_project_meta(1)
+        # The old snapshot is untouched
+        assert store["/lib/b.jpg"]["rating"] == 0 and "/lib/new.jpg" not in store
+
+    def test_deletion_forces_full_reload(self, db, repo):
+        store = ProjectMetaStore.load(repo, 1)
+        _bump(db, "DELETE FROM search_asset_features WHERE path = '/lib/c.png'")
+        fresh = store.refreshed(repo)
+        assert "/lib/c.png" not in fresh
+        assert dict(fresh.items()) == repo.get_project_meta(1)
@@ -0,0 +1,143 @@
+# tests/test_search_feature_repository.py
+# Tests for incremental search_asset_features maintenance
+#
+# Run: python -m pytest tests/test_search_feature_repository.py -v
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from repository.base_repository import DatabaseConnection
+from repository.search_feature_repository import SearchFeatureRepository
+
+
+@pytest.fixture
+def db(test_db_path: Path):
+    db = DatabaseConnection(str(test_db_path), auto_init=True)
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO projects (id, name, folder, mode) VALUES (1, 'p', '/lib', 'scan')")
+        conn.execute("INSERT INTO photo_folders (id, name, path, project_id) VALUES (1, 'lib', '/lib', 1)")
+    yield db
+    db.write_queue().shutdown()
+
+
+@pytest.fixture
+def repo(db):
+    return SearchFeatureRepository(db)
+
+
+def _add_photos(db, *names, **cols):
+    with db.get_connection() as conn:
+        for name in names:
+            conn.execute(
+                "INSERT INTO photo_metadata (path, folder_id, project_id, width, height, flag, rating) "
+                "VALUES (?, 1, 1, ?, ?, ?, ?)",
+                (f"/lib/{name}", cols.get("width", 4000), cols.get("height", 3000),
+                 cols.get("flag", "none"), cols.get("rating", 0))
+            )
+
+
+def _add_face(db, name, x):
+    with db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO face_crops (project_id, image_path, crop_path, bbox_x, bbox_y, bbox_w, bbox_h) "
+            "VALUES (1, ?, ?, ?, 0, 10, 10)",
+            (f"/lib/{name}", f"/crops/{name}_{x}.jpg", x)
+        )
+
+
+def _features(db):
+    with db.get_connection(read_only=True) as conn:
+        return {r['path']: r for r in conn.execute("SELECT * FROM search_asset_features")}
+
+
+def _journal(db):
+    with db.get_connection(read_only=True) as conn:
+        return [r['path'] for r in conn.execute("SELECT path FROM search_feature_dirty")]
+
+
+class TestChangeDrivenUpserts:
+
+    def test_apply_changes_touches_only_given_paths(self, db, repo):
+        _add_photos(db, "a.jpg", "b.jpg")
+        assert repo.apply_changes(1, ["/lib/a.jpg"], "scan").result(5) == 1
+        assert set(_features(db)) == {"/lib/a.jpg"}
+        assert _journal(db) == []
+
+    def test_face_counts_follow_face_rows(self, db, repo):
+        _add_photos(db, "a.jpg")
+        _add_face(db, "a.jpg", 0)
+        _add_face(db, "a.jpg", 20)
+        repo.apply_changes(1, ["/lib/a.jpg"], "faces").result(5)
+        assert _features(db)["/lib/a.jpg"]["face_count"] == 2
+
+    def test_flag_edit_by_photo_id(self, db, repo):
+        _add_photos(db, "a.jpg")
+        repo.apply_changes(1, ["/lib/a.jpg"]).result(5)
+        with db.get_connection() as conn:
+            conn.execute("UPDATE photo_metadata SET flag = 'pick', rating = 5")
+            photo_id = conn.execute("SELECT id FROM photo_metadata").fetchone()['id']
+        repo.apply_photo_changes([photo_id], "flag").result(5)
+        row = _features(db)["/lib/a.jpg"]
+        assert (row["flag"], row["rating"]) == ("pick", 5)
+
+    def test_deleted_photo_loses_its_row(self, db, repo):
+        _add_photos(db, "a.jpg")
+        repo.apply_changes(1, ["/lib/a.jpg"]).result(5)
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM photo_metadata")
+        repo.apply_changes(1, ["/lib/a.jpg"]).result(5)
+        assert _features(db) == {}
+
+    def test_failed_upsert_stays_journaled(self, db, repo, monkeypatch):
+        _add_photos(db, "a.jpg")
+
+        def broken(*args, **kwargs):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(repo, "_build_rows", broken)
+        assert repo.apply_changes(1, ["/lib/a.jpg"], "scan").result(5) == 0
+        assert _journal(db) == ["/lib/a.jpg"]
+
+        monkeypatch.undo()
+        assert repo.process_dirty(1) == 1
+        assert _journal(db) == []
+        assert set(_features(db)) == {"/lib/a.jpg"}
+
+
+class TestVerificationPass:
+
+    def test_sync_builds_empty_project(self, db, repo):
+        _add_photos(db, "a.jpg", "b.png", "c.mp4")
+        assert repo.sync_project(1) == 3
+        assert _features(db)["/lib/c.mp4"]["media_type"] == "video"
+
+    def test_sync_repairs_only_drifted_rows(self, db, repo):
+        _add_photos(db, "a.jpg", "b.jpg", "c.jpg")
+        repo.refresh_project(1)
+
+        # Changes made behind the hooks' back
+        with db.get_connection() as conn:
+            conn.execute("UPDATE photo_metadata SET rating = 4 WHERE path = '/lib/a.jpg'")
+            conn.execute("DELETE FROM photo_metadata WHERE path = '/lib/c.jpg'")
+        _add_face(db, "b.jpg", 0)
+        _add_photos(db, "d.jpg")
+
+        counts = repo.verify_project(1)
+        assert counts == {"missing": 1, "orphaned": 1, "stale": 2}
+        assert sorted(_journal(db)) == ["/lib/a.jpg", "/lib/b.jpg", "/lib/d.jpg"]
+
+        assert repo.sync_project(1) == 3
+        after = _features(db)
+        assert set(after) == {"/lib/a.jpg", "/lib/b.jpg", "/lib/d.jpg"}
+        assert after["/lib/a.jpg"]["rating"] == 4
+        assert after["/lib/b.jpg"]["face_count"] == 1
+        assert repo.verify_project(1) == {"missing": 0, "orphaned": 0, "stale": 0}
+
+    def test_verify_consistent_project_is_clean(self, db, repo):
+        _add_photos(db, "a.jpg", "b.jpg", flag="reject", rating=2)
+        _add_face(db, "a.jpg", 0)
+        repo.refresh_project(1)
+        assert repo.verify_project(1) == {"missing": 0, "orphaned": 0, "stale": 0}
+        assert _journal(db) == []
@@ -0,0 +1,132 @@
+# tests/test_semantic_embedding_worker.py
+# Tests for the pipelined (decode pool -> batched inference -> batched store)
+# SemanticEmbeddingWorker, using a fake embedding service (no torch needed).
+#
+# Run: python -m pytest tests/test_semantic_embedding_worker.py -v
+
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from repository import DatabaseConnection, PhotoRepository, ProjectRepository
+
+
+class FakeEmbedder:
+    available = True
+
+    def __init__(self, embedded=(), fail_encode=False):
+        self.embedded = set(embedded)
+        self.fail_encode = fail_encode
+        self.encode_calls = []
+        self.store_calls = []
+
+    def get_gpu_memory_info(self):
+        return {'device_type': 'cpu'}
+
+    def get_embedded_photo_ids(self, photo_ids):
+        return self.embedded & set(photo_ids)
+
+    def load_image_for_clip(self, path):
+        with Image.open(path) as img:
+            return img.convert('RGB')
+
+    def encode_pil_batch(self, images):
+        self.encode_calls.append(len(images))
+        if self.fail_encode:
+            return None
+        return np.eye(len(images), 4, dtype='float32') + 0.01
+
+    def store_embeddings_batch(self, records):
+        self.store_calls.append([r[0] for r in records])
+        return len(records)
+
+    def save_job_progress(self, **kwargs):
+        pass
+
+
+@pytest.fixture
+def db_conn(test_db_path: Path, init_test_database):
+    return DatabaseConnection(str(test_db_path))
+
+
+@pytest.fixture
+def photo_ids(db_conn, test_images_dir):
+    project_id = ProjectRepository(db_conn).create("Test Project", str(test_images_dir), "branch")
+    ids = []
+    with db_conn.get_connection() as conn:
+        folder_id = conn.execute(
+            "INSERT INTO photo_folders (name, path, project_id) VALUES (?, ?, ?)",
+            ("images", str(test_images_dir), project_id)).lastrowid
+        for i in range(10):
+            path = test_images_dir / f"img_{i}.jpg"
+            Image.new("RGB", (64, 48), color=(i * 20, 0, 0)).save(path, "JPEG")
+            ids.append(conn.execute(
+                "INSERT INTO photo_metadata (path, folder_id, project_id) VALUES (?, ?, ?)",
+                (str(path), folder_id, project_id)).lastrowid)
+    return ids
+
+
+def _run(db_conn, photo_ids, embedder, **kwargs):
+    from workers import semantic_embedding_worker as mod
+    finished = []
+    with mock.patch.object(mod, 'get_semantic_embedding_service', return_value=embedder), \
+            mock.patch.object(mod, 'PhotoRepository', lambda: PhotoRepository(db_conn)):
+        worker = mod.SemanticEmbeddingWorker(photo_ids=photo_ids, model_name="clip-vit-b32", **kwargs)
+        worker.signals.finished.connect(finished.append)
+        worker.run()
+    return worker, finished[0]
+
+
+class TestSemanticEmbeddingWorkerPipeline:
+
+    def test_fixed_size_batches_and_one_store_per_batch(self, db_conn, photo_ids):
+        embedder = FakeEmbedder()
+        worker, stats = _run(db_conn, photo_ids, embedder, batch_size=4, decode_workers=2)
+        assert embedder.encode_calls == [4, 4, 2]
+        assert [len(c) for c in embedder.store_calls] == [4, 4, 2]
+        assert [pid for c in embedder.store_calls for pid in c] == photo_ids
+        assert stats['success'] == 10
+        assert stats['failed'] == 0
+
+    def test_already_embedded_skipped(self, db_conn, photo_ids):
+        embedder = FakeEmbedder(embedded=photo_ids[:3])
+        _, stats = _run(db_conn, photo_ids, embedder, batch_size=16)
+        assert stats['skipped'] == 3
+        assert stats['success'] == 7
+
+    def test_missing_file_and_unknown_photo_fail_individually(self, db_conn, photo_ids, test_images_dir):
+        (test_images_dir / "img_0.jpg").unlink()
+        embedder = FakeEmbedder()
+        _, stats = _run(db_conn, photo_ids + [999999], embedder, batch_size=16)
+        assert stats['failed'] == 2
+        assert stats['success'] == 9
+
+    def test_aborts_after_consecutive_failed_batches(self, db_conn, photo_ids):
+        embedder = FakeEmbedder(fail_encode=True)
+        _, stats = _run(db_conn, photo_ids, embedder, batch_size=2)
+        assert len(embedder.encode_calls) == 3
+        assert stats['failed'] == 10
+        assert stats['success'] == 0
+
+
+class TestLoadImageForClip:
+
+    def test_preshrinks_to_min_side(self, test_images_dir):
+        from services.semantic_embedding_service import SemanticEmbeddingService
+        path = test_images_dir / "large.jpg"
+        Image.new("RGB", (2000, 1000), color=(10, 20, 30)).save(path, "JPEG")
+        img = SemanticEmbeddingService.load_image_for_clip(str(path))
+        assert img.mode == "RGB"
+        assert min(img.size) == 256
+        assert img.size[0] == pytest.approx(512, abs=2)
+
+    def test_small_image_untouched(self, test_images_dir):
+        from services.semantic_embedding_service import SemanticEmbeddingService
+        path = test_images_dir / "small.png"
+        Image.new("L", (100, 80)).save(path, "PNG")
+        img = SemanticEmbeddingService.load_image_for_clip(str(path))
+        assert img.size == (100, 80)
+        assert img.mode == "RGB"
@@ -0,0 +1,57 @@
+# tests/test_stack_clustering.py
+# Tests for the vectorized complete-linkage engine used by stack generation
+#
+# Run: python -m pytest tests/test_stack_clustering.py -v
+
+import numpy as np
+import pytest
+
+from services.stack_clustering_benchmark import legacy_complete_linkage, synthetic_bursts
+from services.stack_generation_service import StackGenerationService, complete_linkage_clusters
+
+
+class FakeSimilarityService:
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+
+    def get_embedding(self, photo_id):
+        return self.embeddings.get(photo_id)
+
+
+class TestCompleteLinkageEngine:
+
+    @pytest.mark.parametrize("n, burst_size, noise, threshold", [
+        (300, 8, 0.35, 0.85),
+        (400, 40, 0.45, 0.80),     # large bursts, many near-threshold pairs
+        (150, 150, 0.20, 0.90),    # one dense window
+        (700, 5, 0.40, 0.86),      # crosses a similarity block boundary
+    ])
+    def test_matches_nested_loop_algorithm(self, n, burst_size, noise, threshold):
+        emb = synthetic_bursts(n, burst_size=burst_size, noise=noise, single_ratio=0.2)
+        assert complete_linkage_clusters(emb, threshold) == legacy_complete_linkage(emb, threshold)
+
+    def test_no_transitive_grouping(self):
+        # a~b and b~c, but a and c are not similar
+        a = np.array([1.0, 0.0])
+        c = np.array([0.6, 0.8])
+        b = (a + c) / np.linalg.norm(a + c)
+        assert complete_linkage_clusters(np.stack([a, b, c]), 0.85) == [[0, 1], [2]]
+
+    def test_empty(self):
+        assert complete_linkage_clusters(np.zeros((0, 4)), 0.5) == []
+
+
+class TestClusterBySimilarity:
+
+    def test_uses_engine_and_filters_by_size(self):
+        emb = synthetic_bursts(60, burst_size=6, noise=0.2, single_ratio=0.5, dim=64)
+        ids = list(range(100, 160))
+        service = StackGenerationService(None, None, FakeSimilarityService(dict(zip(ids, emb * 3.0))))
+        photos = [{"id": pid} for pid in ids]
+
+        clusters = service._cluster_by_similarity(photos, 0.85, min_cluster_size=3)
+
+        expected = [[ids[i] for i in c] for c in legacy_complete_linkage(emb, 0.85) if len(c) >= 3]
+        assert clusters == expected
+        assert clusters
@@ -0,0 +1,164 @@
+# tests/test_thumb_cache_db.py
+# Tests for the sharded L2 thumbnail cache
+#
+# Run: python -m pytest tests/test_thumb_cache_db.py -v
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+import thumb_cache_db
+from thumb_cache_db import ThumbCacheDB, norm
+
+
+@pytest.fixture
+def images(temp_dir: Path):
+    paths = []
+    for i in range(24):
+        path = temp_dir / f"img{i:02d}.png"
+        Image.new("RGB", (64, 48), color=(i * 10, 0, 0)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def cache(qapp, temp_dir: Path):
+    db = ThumbCacheDB(str(temp_dir / "thumbs.db"))
+    yield db
+    db.close()
+
+
+def _pixmap(seed: int, size: int = 32):
+    from PySide6.QtGui import QColor, QPixmap
+    pm = QPixmap(size, size)
+    pm.fill(QColor(seed % 256, 100, 50))
+    return pm
+
+
+class TestReadWrite:
+
+    def test_store_is_readable_before_and_after_commit(self, cache, images):
+        assert cache.store_thumbnail(images[0], os.path.getmtime(images[0]), _pixmap(1))
+        assert cache.get_cached_thumbnail(images[0]) is not None
+        assert cache.flush()
+        assert cache.has_entry(images[0])
+        assert cache.get_cached_thumbnail(images[0]) is not None
+
+    def test_changed_file_misses(self, cache, images):
+        cache.store_thumbnail(images[0], 0, _pixmap(1))
+        cache.flush()
+        later = time.time() + 10
+        os.utime(images[0], (later, later))
+        assert cache.get_cached_thumbnail(images[0]) is None
+
+    def test_invalidate_hides_row_immediately(self, cache, images):
+        cache.store_thumbnail(images[0], 0, _pixmap(1))
+        cache.flush()
+        cache.invalidate(images[0])
+        assert not cache.has_entry(images[0])
+        cache.flush()
+        assert not cache.has_entry(images[0])
+
+    def test_rows_are_spread_over_shards(self, cache, images):
+        for i, path in enumerate(images):
+            cache.store_thumbnail(path, 0, _pixmap(i))
+        cache.flush()
+        per_shard = []
+        for shard_path in cache.shard_paths:
+            conn = sqlite3.connect(shard_path)
+            per_shard.append(conn.execute("SELECT COUNT(*) FROM thumbnail_cache").fetchone()[0])
+            conn.close()
+        assert sum(per_shard) == len(images)
+        assert sum(1 for n in per_shard if n) > 1
+        assert cache.get_stats()["entries"] == len(images)
+
+    def test_stores_are_group_committed(self, cache, images):
+        for i, path in enumerate(images):
+            cache.store_thumbnail(path, 0, _pixmap(i))
+        cache.flush()
+        metrics = cache.get_metrics()
+        assert metrics["rows_committed"] == len(images)
+        assert metrics["commits"] < len(images)
+
+    def test_concurrent_readers(self, cache, images):
+        for i, path in enumerate(images):
+            cache.store_thumbnail(path, 0, _pixmap(i))
+        cache.flush()
+        errors = []
+
+        def read():
+            for path in images:
+                if not cache.has_entry(path):
+                    errors.append(path)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+
+    def test_legacy_single_file_rows_stay_reachable(self, qapp, temp_dir, images):
+        db_path = str(temp_dir / "legacy.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE thumbnail_cache (path TEXT PRIMARY KEY, mtime REAL, width INTEGER, "
+                     "height INTEGER, hash TEXT, data BLOB, cached_at REAL)")
+        probe = ThumbCacheDB.__new__(ThumbCacheDB)
+        probe.shard_count = thumb_cache_db.SHARD_COUNT
+        in_shard0 = next(p for p in images if probe._shard(norm(p)) == 0)
+        conn.execute("INSERT INTO thumbnail_cache VALUES (?, 0, 1, 1, ?, x'00', ?)",
+                     (norm(in_shard0), probe.compute_hash(in_shard0), time.time()))
+        conn.commit()
+        conn.close()
+
+        cache = ThumbCacheDB(db_path)
+        try:
+            assert cache.has_entry(in_shard0)
+        finally:
+            cache.close()
+
+    def test_clear(self, cache, images):
+        cache.store_thumbnail(images[0], 0, _pixmap(1))
+        cache.clear()
+        assert not cache.has_entry(images[0])
+        assert cache.get_stats()["entries"] == 0
+
+
+class TestEvictionAndMetrics:
+
+    def test_lru_eviction_keeps_recently_used(self, qapp, temp_dir, images):
+        cache = ThumbCacheDB(str(temp_dir / "small.db"), shard_count=2)
+        try:
+            keep = images[0]
+            cache.store_thumbnail(keep, 0, _pixmap(0, size=24))
+            cache.flush()
+            # Room for about eight thumbnails
+            cache.max_cache_bytes = cache._total_bytes * 8
+            for i, path in enumerate(images[1:], 1):
+                cache.get_cached_thumbnail(keep)    # keep it the most recently used
+                cache.store_thumbnail(path, 0, _pixmap(i, size=24))
+                cache.flush()
+
+            metrics = cache.get_metrics()
+            assert metrics["evictions"] > 0
+            assert cache._exact_total_bytes() <= cache.max_cache_bytes
+            assert cache.has_entry(keep)
+            assert cache.has_entry(images[-1])
+        finally:
+            cache.close()
+
+    def test_latency_histograms(self, cache, images):
+        cache.store_thumbnail(images[0], 0, _pixmap(1))
+        cache.get_cached_thumbnail(images[0])
+        cache.get_cached_thumbnail(images[1])
+        cache.get_cached_thumbnail(images[2])
+        m = cache.get_metrics()
+        assert (m["get_hits"], m["get_misses"]) == (1, 2)
+        assert sum(m["hit_latency_ms"].values()) == 1
+        assert sum(m["miss_latency_ms"].values()) == 2
+        assert list(m["hit_latency_ms"])[-1] == ">250ms"
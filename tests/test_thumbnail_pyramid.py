@@ -0,0 +1,102 @@
+# tests/test_thumbnail_pyramid.py
+# Tests for the multi-resolution thumbnail pyramid in ThumbnailService
+#
+# Run: python -m pytest tests/test_thumbnail_pyramid.py -v
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from services.thumbnail_service import PYRAMID_LEVELS, ThumbnailService
+from thumb_cache_db import ThumbCacheDB
+
+pytestmark = pytest.mark.requires_qt
+
+
+@pytest.fixture
+def l2(qapp, temp_dir: Path):
+    db = ThumbCacheDB(str(temp_dir / "thumbs.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def service(l2):
+    return ThumbnailService(db_cache=l2)
+
+
+@pytest.fixture
+def photo(temp_dir: Path):
+    path = temp_dir / "photo.jpg"
+    Image.new("RGB", (1500, 1000), color=(200, 80, 40)).save(path)
+    return str(path)
+
+
+@pytest.fixture
+def decodes(service, monkeypatch):
+    calls = []
+    original = service._generate_thumbnail_as_qimage
+
+    def counting(path, height, timeout):
+        calls.append(height)
+        return original(path, height, timeout)
+
+    monkeypatch.setattr(service, "_generate_thumbnail_as_qimage", counting)
+    return calls
+
+
+class TestPyramid:
+
+    def test_one_decode_fills_every_level(self, service, l2, photo, decodes):
+        image = service.get_thumbnail_image(photo, 200)
+
+        assert image.height() == 200
+        assert decodes == [PYRAMID_LEVELS[-1]]
+        for level in PYRAMID_LEVELS:
+            cached = l2.get_cached_image(photo, level=level)
+            assert cached is not None and cached.height() == level
+
+    def test_zoom_is_served_from_levels(self, service, photo, decodes):
+        service.get_thumbnail_image(photo, 120)
+        sizes = [service.get_thumbnail_image(photo, h).height() for h in (90, 150, 300, 480, 512)]
+
+        assert sizes == [90, 150, 300, 480, 512]
+        assert decodes == [PYRAMID_LEVELS[-1]]
+
+    def test_get_thumbnail_shares_the_pyramid(self, service, photo, decodes):
+        service.get_thumbnail_image(photo, 256)
+        pixmap = service.get_thumbnail(photo, 100)
+
+        assert pixmap.height() == 100
+        assert len(decodes) == 1
+
+    def test_missing_level_falls_back_to_larger(self, service, l2, photo, decodes):
+        service.get_thumbnail_image(photo, 128)
+        l2.invalidate(photo, levels=(128,))
+        service.l1_cache.clear()
+
+        assert service.get_thumbnail_image(photo, 100).height() == 100
+        assert len(decodes) == 1
+
+    def test_small_original_is_not_upscaled_or_duplicated(self, service, l2, temp_dir, decodes):
+        path = temp_dir / "small.png"
+        Image.new("RGB", (300, 200)).save(path)
+
+        assert service.get_thumbnail_image(str(path), 400).height() == 200
+        assert service.get_thumbnail_image(str(path), 250).height() == 200
+        assert l2.get_cached_image(str(path), level=512) is not None
+        assert l2.get_cached_image(str(path), level=256) is None
+        assert l2.get_cached_image(str(path), level=128).height() == 128
+        assert len(decodes) == 1
+
+    def test_above_top_level_uses_exact_height(self, service, l2, photo, decodes):
+        assert service.get_thumbnail_image(photo, 800).height() == 800
+        assert decodes == [800]
+        assert l2.get_cached_image(photo) is not None
+
+    def test_invalidate_drops_all_levels(self, service, l2, photo):
+        service.get_thumbnail_image(photo, 200)
+        service.invalidate(photo)
+
+        assert all(l2.get_cached_image(photo, level=level) is None for level in PYRAMID_LEVELS)
@@ -0,0 +1,118 @@
+# tests/test_video_probe_engine.py
+# Tests for concurrent, cached ffprobe metadata extraction (ffprobe replaced by a stub script)
+#
+# Run: python -m pytest tests/test_video_probe_engine.py -v
+
+import json
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from services.video_metadata_service import VideoMetadataService
+from services.video_probe_engine import VideoProbeEngine
+
+PROBE_OUTPUT = {
+    "format": {"duration": "12.5", "bit_rate": "4000000",
+               "tags": {"creation_time": "2024-11-12T10:30:45.000000Z"}},
+    "streams": [{
+        "codec_type": "video", "codec_name": "hevc", "width": 1920, "height": 1080,
+        "r_frame_rate": "30000/1001", "side_data_list": [{"rotation": -90}],
+    }],
+}
+
+FAKE_FFPROBE = """#!{python}
+import json, os, sys, time
+args = sys.argv[1:]
+if args == ['-version']:
+    sys.exit(0)
+name = os.path.basename(args[-1])
+log = os.environ['FAKE_FFPROBE_LOG']
+with open(log, 'a') as f:
+    f.write('start ' + name + ' ' + ' '.join(args) + '\\n')
+time.sleep(0.2)
+with open(log, 'a') as f:
+    f.write('end ' + name + '\\n')
+if 'legacy' in name and '-show_entries' in args:
+    sys.exit(1)
+print(json.dumps({output}))
+"""
+
+
+@pytest.fixture
+def engine(temp_dir: Path, monkeypatch):
+    script = temp_dir / "ffprobe"
+    script.write_text(FAKE_FFPROBE.format(python=sys.executable, output=repr(PROBE_OUTPUT)))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("FAKE_FFPROBE_LOG", str(temp_dir / "ffprobe.log"))
+    return VideoProbeEngine(VideoMetadataService(ffprobe_path=str(script)), max_workers=3)
+
+
+def _video(temp_dir, name):
+    path = temp_dir / name
+    path.write_bytes(b"video")
+    return str(path)
+
+
+def _starts(temp_dir):
+    log = temp_dir / "ffprobe.log"
+    return [line for line in log.read_text().splitlines() if line.startswith("start")] if log.exists() else []
+
+
+def _max_concurrency(temp_dir):
+    running = peak = 0
+    for line in (temp_dir / "ffprobe.log").read_text().splitlines():
+        running += 1 if line.startswith("start") else -1
+        peak = max(peak, running)
+    return peak
+
+
+@pytest.mark.skipif(os.name == "nt", reason="stub ffprobe is a shebang script")
+class TestVideoProbeEngine:
+
+    def test_one_invocation_reads_all_fields(self, engine, temp_dir):
+        metadata = engine.probe(_video(temp_dir, "clip.mp4"))
+
+        assert metadata["duration_seconds"] == 12.5
+        assert (metadata["width"], metadata["height"], metadata["codec"]) == (1920, 1080, "hevc")
+        assert metadata["fps"] == 29.97 and metadata["bitrate"] == 4000
+        assert metadata["date_taken"] == "2024-11-12 10:30:45"
+        assert metadata["rotation"] == 90
+        starts = _starts(temp_dir)
+        assert len(starts) == 1 and "-show_entries" in starts[0]
+
+    def test_runs_bounded_number_of_ffprobe_processes(self, engine, temp_dir):
+        videos = [_video(temp_dir, f"clip{i}.mp4") for i in range(9)]
+        results = dict(engine.probe_many(videos))
+
+        assert sorted(results) == sorted(videos)
+        assert all(r["codec"] == "hevc" for r in results.values())
+        assert _max_concurrency(temp_dir) == 3
+
+    def test_cache_is_keyed_by_size_and_mtime(self, engine, temp_dir):
+        path = _video(temp_dir, "clip.mp4")
+        engine.prefetch([path, path])
+        assert engine.probe(path)["codec"] == "hevc"
+        assert engine.probe(path, timeout=0)["codec"] == "hevc"
+        assert len(_starts(temp_dir)) == 1
+
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        engine.probe(path)
+        assert len(_starts(temp_dir)) == 2
+
+    def test_timeout_leaves_probe_running(self, engine, temp_dir):
+        path = _video(temp_dir, "clip.mp4")
+        assert engine.probe(path, timeout=0.01) == {}
+        time.sleep(1.0)
+        assert engine.probe(path, timeout=0)["codec"] == "hevc"
+        assert len(_starts(temp_dir)) == 1
+
+    def test_missing_file_and_legacy_ffprobe(self, engine, temp_dir):
+        assert engine.probe(str(temp_dir / "missing.mp4")) == {}
+        assert engine.probe(_video(temp_dir, "legacy.mp4"))["rotation"] == 90
+        starts = _starts(temp_dir)
+        assert len(starts) == 2 and "-show_streams" in starts[1]
@@ -0,0 +1,114 @@
+# tests/test_video_thumbnail_service.py
+# Tests for concurrent video thumbnail batches (ffmpeg replaced by a stub script)
+#
+# Run: python -m pytest tests/test_video_thumbnail_service.py -v
+
+import os
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from services.video_thumbnail_service import VideoThumbnailService
+
+FAKE_FFMPEG = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+name = os.path.basename(args[args.index('-i') + 1])
+log = os.environ['FAKE_FFMPEG_LOG']
+with open(log, 'a') as f:
+    f.write('start ' + name + ' ' + ' '.join(args) + '\\n')
+if 'slow' in name:
+    time.sleep(5)
+time.sleep(0.2)
+with open(log, 'a') as f:
+    f.write('end ' + name + '\\n')
+if 'broken' in name or ('nokeys' in name and '-skip_frame' in args):
+    sys.exit(1)
+with open(args[-1], 'wb') as f:
+    f.write(b'jpeg')
+"""
+
+
+@pytest.fixture
+def service(temp_dir: Path, monkeypatch):
+    script = temp_dir / "ffmpeg"
+    script.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("FAKE_FFMPEG_LOG", str(temp_dir / "ffmpeg.log"))
+
+    svc = VideoThumbnailService(thumbnail_dir=str(temp_dir / "thumbs"))
+    svc._ffmpeg_path = str(script)
+    svc._ffmpeg_available = True
+    # Skip the ffprobe duration lookup
+    monkeypatch.setattr(svc, "_get_default_timestamp", lambda path: 1.0)
+    return svc
+
+
+def _log(temp_dir):
+    return (temp_dir / "ffmpeg.log").read_text().splitlines()
+
+
+def _max_concurrency(lines):
+    running = peak = 0
+    for line in lines:
+        running += 1 if line.startswith("start") else -1
+        peak = max(peak, running)
+    return peak
+
+
+@pytest.mark.skipif(os.name == "nt", reason="stub ffmpeg is a shebang script")
+class TestBatch:
+
+    def test_runs_bounded_number_of_ffmpeg_processes(self, service, temp_dir):
+        videos = [f"/videos/clip{i}.mp4" for i in range(8)]
+        start = time.perf_counter()
+        results = service.generate_thumbnails_batch(videos, max_workers=4)
+        elapsed = time.perf_counter() - start
+
+        assert all(results[v] for v in videos)
+        assert _max_concurrency(_log(temp_dir)) == 4
+        assert elapsed < 8 * 0.2
+
+    def test_streams_results_and_skips_existing(self, service, temp_dir):
+        existing = service.get_thumbnail_path("/videos/old.mp4")
+        existing.write_bytes(b"jpeg")
+        streamed = []
+
+        results = service.generate_thumbnails_batch(
+            ["/videos/old.mp4", "/videos/new.mp4", "/videos/broken.mp4"],
+            on_result=lambda path, thumb: streamed.append((path, thumb, threading.current_thread())),
+        )
+
+        assert results["/videos/old.mp4"] == str(existing)
+        assert results["/videos/broken.mp4"] is None
+        assert sorted(p for p, _, _ in streamed) == sorted(results)
+        assert {t for _, _, t in streamed} == {threading.current_thread()}
+        assert not any("old.mp4" in line for line in _log(temp_dir))
+
+    def test_keyframe_seek_with_exact_retry(self, service, temp_dir):
+        results = service.generate_thumbnails_batch(["/videos/a.mp4", "/videos/nokeys.mp4"])
+
+        assert results["/videos/a.mp4"] and results["/videos/nokeys.mp4"]
+        starts = [line for line in _log(temp_dir) if line.startswith("start")]
+        a_runs = [line for line in starts if "a.mp4" in line]
+        nokey_runs = [line for line in starts if "nokeys.mp4" in line]
+        assert len(a_runs) == 1 and "-skip_frame nokey -noaccurate_seek -ss" in a_runs[0]
+        assert len(nokey_runs) == 2 and "-skip_frame" not in nokey_runs[1]
+
+    def test_per_job_timeout(self, service):
+        results = service.generate_thumbnails_batch(
+            ["/videos/slow.mp4", "/videos/fast.mp4"], timeout=1.0, keyframes_only=False
+        )
+        assert results == {
+            "/videos/slow.mp4": None,
+            "/videos/fast.mp4": str(service.get_thumbnail_path("/videos/fast.mp4")),
+        }
+
+    def test_cancel_skips_unstarted_videos(self, service):
+        videos = [f"/videos/c{i}.mp4" for i in range(6)]
+        results = service.generate_thumbnails_batch(videos, max_workers=1, should_cancel=lambda: True)
+        assert len(results) < len(videos)
@@ -0,0 +1,148 @@
+# tests/test_write_queue.py
+# Tests for the single-writer database write queue
+#
+# Run: python -m pytest tests/test_write_queue.py -v
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from repository.connection_pool import get_connection_pool
+from repository.write_queue import DatabaseWriteQueue, WriteQueueClosed
+
+INSERT = "INSERT INTO t (v) VALUES (?)"
+
+
+@pytest.fixture
+def db_path(temp_dir: Path):
+    path = str(temp_dir / "queue.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT UNIQUE)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def queue(db_path):
+    q = DatabaseWriteQueue(db_path, coalesce_window=0.05)
+    yield q
+    q.shutdown()
+
+
+def _values(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [r[0] for r in conn.execute("SELECT v FROM t ORDER BY id")]
+    finally:
+        conn.close()
+
+
+class TestDatabaseWriteQueue:
+
+    def test_rows_committed_before_future_resolves(self, queue, db_path):
+        assert queue.submit_rows("t", INSERT, [("a",), ("b",)]).result(5) == 2
+        assert _values(db_path) == ["a", "b"]
+
+    def test_same_statement_batches_coalesced_into_one_transaction(self, queue, db_path):
+        futures = [queue.submit_rows("t", INSERT, [(f"v{i}",)]) for i in range(20)]
+        assert [f.result(5) for f in futures] == [1] * 20
+        stats = queue.stats()
+        assert stats['transactions'] < 20
+        assert stats['coalesced'] > 0
+        assert stats['rows_written'] == 20
+
+    def test_failing_batch_isolated(self, queue, db_path):
+        ok1 = queue.submit_rows("t", INSERT, [("x",)])
+        bad = queue.submit_rows("t", INSERT, [("y",), ("x",)])   # UNIQUE violation
+        ok2 = queue.submit_rows("t", INSERT, [("z",)])
+        assert ok1.result(5) == 1 and ok2.result(5) == 1
+        with pytest.raises(sqlite3.IntegrityError):
+            bad.result(5)
+        assert _values(db_path) == ["x", "z"]
+
+    def test_task_commit_and_rollback_deferred(self, queue, db_path):
+        def swallowing(conn):
+            conn.execute(INSERT, ("undone",))
+            conn.rollback()          # handled its own error
+            return "ok"
+
+        def committing(conn):
+            conn.execute(INSERT, ("kept",))
+            conn.commit()            # must not end the shared transaction
+            return conn.in_transaction
+
+        assert queue.submit("t", swallowing).result(5) == "ok"
+        assert queue.submit("t", committing).result(5) is True
+        assert _values(db_path) == ["kept"]
+
+    def test_task_reads_its_own_writes_through_nested_checkouts(self, queue, db_path):
+        pool = get_connection_pool(db_path)
+
+        def task(conn):
+            conn.execute(INSERT, ("mine",))
+            # e.g. a repository read made by the task
+            with pool.connection(read_only=True) as reader:
+                return reader.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+
+        assert queue.submit("t", task).result(5) == 1
+
+    def test_submit_from_writer_thread_runs_inline(self, queue, db_path):
+        def outer(conn):
+            conn.execute(INSERT, ("outer",))
+            return queue.submit_rows("t", INSERT, [("inner",)]).result(1)
+
+        assert queue.submit("t", outer).result(5) == 1
+        assert sorted(_values(db_path)) == ["inner", "outer"]
+
+    def test_backpressure_blocks_producers(self, db_path):
+        q = DatabaseWriteQueue(db_path, max_pending_rows=2, coalesce_window=0)
+        gate = threading.Event()
+        q.submit("t", lambda conn: gate.wait(5), weight=2)
+        with pytest.raises(TimeoutError):
+            q.submit_rows("t", INSERT, [("late",)], timeout=0.1)
+        assert q.stats()['throttled'] == 1
+        gate.set()
+        assert q.submit_rows("t", INSERT, [("late",)], timeout=5).result(5) == 1
+        q.shutdown()
+
+    def test_lock_held_by_other_connection_retried(self, queue, db_path):
+        blocker = sqlite3.connect(db_path, timeout=0)
+        blocker.execute("BEGIN EXCLUSIVE")
+        queue._pool.busy_timeout_ms = 50
+        queue._pool.close_all()
+        future = queue.submit_rows("t", INSERT, [("after",)])
+        time.sleep(0.3)
+        blocker.rollback()
+        blocker.close()
+        assert future.result(10) == 1
+        assert queue.stats()['lock_retries'] >= 1
+
+    def test_lock_retries_are_bounded(self, queue, db_path, monkeypatch):
+        monkeypatch.setattr(DatabaseWriteQueue, "LOCK_RETRIES", 2)
+        monkeypatch.setattr(DatabaseWriteQueue, "LOCK_RETRY_DELAY", 0.01)
+        blocker = sqlite3.connect(db_path, timeout=0)
+        blocker.execute("BEGIN EXCLUSIVE")
+        queue._pool.busy_timeout_ms = 10
+        queue._pool.close_all()
+        future = queue.submit_rows("t", INSERT, [("never",)])
+        try:
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                future.result(10)
+        finally:
+            blocker.rollback()
+            blocker.close()
+        assert queue.stats()['lock_retries'] == 2
+        assert _values(db_path) == []
+
+    def test_flush_and_shutdown(self, queue, db_path):
+        for i in range(5):
+            queue.submit_rows("t", INSERT, [(f"f{i}",)])
+        assert queue.flush(5)
+        assert len(_values(db_path)) == 5
+        queue.shutdown()
+        with pytest.raises(WriteQueueClosed):
+            queue.submit_rows("t", INSERT, [("closed",)])
@@ -3,8 +3,20 @@
 # -----------------------------------------------------------
 # Persistent thumbnail cache with auto-purge and diagnostics
 # -----------------------------------------------------------
-
-import os, sqlite3, io, time, threading, hashlib
+#
+# Layout: SHARD_COUNT SQLite files in WAL mode. Shard 0 is db_path itself
+# (so an existing single-file cache keeps its reachable rows), shard i > 0
+# is "<name>.<i><ext>" next to it; a path's shard is a hash of norm(path).
+# Thumbnail-pyramid levels are separate rows keyed "<norm(path)>|<level>".
+#
+# Reads take no lock: every thread has its own read connection per shard.
+# Writes are queued to one writer thread that commits them in groups
+# (COMMIT_WINDOW_MS / MAX_COMMIT_ROWS), and until a write is committed it
+# is served from the in-memory pending map. The writer also keeps the
+# total size under MAX_CACHE_MB by evicting least recently used rows.
+
+import os, sqlite3, io, time, threading, hashlib, queue, bisect, weakref
+from concurrent.futures import Future
 from datetime import datetime
 from PySide6.QtGui import QPixmap, QImage
 
@@ -17,19 +29,53 @@ def norm(p: str) -> str:
     except Exception:
         return str(p).strip()
 
+def level_key(npath: str, level: int = 0) -> str:
+    """Row key of one thumbnail-pyramid level; level 0 is the plain path row."""
+    return f"{npath}|{level}" if level else npath
+
 CACHE_DB_PATH = os.path.join(os.path.dirname(__file__), "thumbnails_cache.db")
 MAX_CACHE_MB = 500
 PURGE_INTERVAL_DAYS = 7
 
+SHARD_COUNT = 4
+COMMIT_WINDOW_MS = 50        # how long the writer waits to grow a group commit
+MAX_COMMIT_ROWS = 256
+EVICT_TO_FRACTION = 0.9      # eviction frees down to this fraction of the limit
+
+# Upper bounds (ms) of the get latency histogram buckets; the last is open
+LATENCY_BUCKETS_MS = (0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250)
+
+_STOP = object()
+
+
+class _ThreadReaders:
+    """One thread's read connections (closed when the thread's locals go)."""
+
+    __slots__ = ("conns", "__weakref__")
+
+    def __init__(self, shard_count: int):
+        self.conns = [None] * shard_count
+
 
 class ThumbCacheDB:
-    def __init__(self, db_path: str = CACHE_DB_PATH):
+    def __init__(self, db_path: str = CACHE_DB_PATH, shard_count: int = SHARD_COUNT,
+                 max_cache_mb: float = None):
         self.db_path = db_path
-        self.conn = None
-        self.lock = threading.Lock()
-        self._ensure_db()
-
-        
+        self.shard_count = max(1, int(shard_count))
+        self.max_cache_bytes = int((max_cache_mb or MAX_CACHE_MB) * 1024 * 1024)
+        root, ext = os.path.splitext(db_path)
+        self.shard_paths = [db_path] + [f"{root}.{i}{ext or '.db'}" for i in range(1, self.shard_count)]
+
+        self._local = threading.local()
+        # Per-thread readers, closed in close() (or with their thread's locals)
+        self._readers = weakref.WeakSet()
+        self._readers_lock = threading.Lock()  # guards _readers registration only
+        self._pending = {}                   # npath -> row tuple, or None (delete) until committed
+        self._touched = {}                   # npath -> last access time, flushed by the writer
+        self._queue = queue.Queue()
+        self._closed = False
+
+        self._metrics_lock = threading.Lock()
         self.metrics = {
             "get_hits": 0,
             "get_misses": 0,
@@ -37,8 +83,22 @@ class ThumbCacheDB:
             "get_count": 0,
             "get_total_ms": 0.0,
             "store_total_ms": 0.0,
+            "commits": 0,
+            "rows_committed": 0,
+            "evictions": 0,
+            "evicted_bytes": 0,
         }
-        
+        self._hit_hist = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._miss_hist = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+        self._write_conns = [self._open(p) for p in self.shard_paths]
+        for conn in self._write_conns:
+            self._ensure_schema(conn)
+        self._total_bytes = self._exact_total_bytes()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="thumb-cache-writer", daemon=True)
+        self._writer.start()
+
         # --- background housekeeping thread ---
         self._stop_event = threading.Event()
         self._thread = threading.Thread(target=self._auto_purge_worker, daemon=True)
@@ -46,16 +106,21 @@ class ThumbCacheDB:
 
     # -------------------------------------------------------
 
-    def _ensure_db(self):
-        d = os.path.dirname(self.db_path) or "."
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        d = os.path.dirname(path) or "."
         os.makedirs(d, exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
         try:
-            self.conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
         except Exception:
             pass
-        
-        self.conn.execute("""
+        return conn
+
+    @staticmethod
+    def _ensure_schema(conn: sqlite3.Connection):
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS thumbnail_cache (
                 path TEXT PRIMARY KEY,
                 mtime REAL,
@@ -67,25 +132,63 @@ class ThumbCacheDB:
             )
         """)
 
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_thumb_mtime ON thumbnail_cache(mtime)")
-        # Add cached_at column if missing (upgrade path for existing DBs)
-        try:
-            self.conn.execute("ALTER TABLE thumbnail_cache ADD COLUMN cached_at REAL")
-        except Exception:
-            pass  # column already exists
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_thumb_cached_at ON thumbnail_cache(cached_at)")
-        self.conn.commit()
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_thumb_mtime ON thumbnail_cache(mtime)")
+        # Add columns if missing (upgrade path for existing DBs)
+        for column in ("cached_at REAL", "size INTEGER", "last_access REAL"):
+            try:
+                conn.execute(f"ALTER TABLE thumbnail_cache ADD COLUMN {column}")
+            except Exception:
+                pass  # column already exists
+        conn.execute("UPDATE thumbnail_cache SET size = LENGTH(data) WHERE size IS NULL")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_thumb_cached_at ON thumbnail_cache(cached_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_thumb_last_access ON thumbnail_cache(last_access)")
+
+    def _shard(self, npath: str) -> int:
+        # Stable across runs (unlike hash()) and evenly spread even for
+        # counter-style names like IMG_0001..IMG_9999
+        digest = hashlib.blake2b(npath.encode("utf-8"), digest_size=4).digest()
+        return int.from_bytes(digest, "little") % self.shard_count
+
+    def _reader(self, shard: int) -> sqlite3.Connection:
+        """This thread's read connection to a shard (opened on first use)."""
+        readers = getattr(self._local, "readers", None)
+        if readers is None:
+            readers = self._local.readers = _ThreadReaders(self.shard_count)
+            with self._readers_lock:
+                self._readers.add(readers)
+        conn = readers.conns[shard]
+        if conn is None:
+            conn = readers.conns[shard] = self._open(self.shard_paths[shard])
+        return conn
+
+    def _lookup(self, npath: str, columns: str):
+        """Row for npath: pending write first, then the shard (no lock)."""
+        if npath in self._pending:
+            return self._pending.get(npath)
+        cur = self._reader(self._shard(npath)).execute(
+            f"SELECT {columns} FROM thumbnail_cache WHERE path=?", (npath,)
+        )
+        return cur.fetchone()
 
     # -------------------------------------------------------
     def close(self):
+        if self._closed:
+            return
+        self._closed = True
         self._stop_event.set()
         if self._thread.is_alive():
             self._thread.join(timeout=1)
-        try:
-            if self.conn:
-                self.conn.close()
-        except Exception:
-            pass
+        self._queue.put(_STOP)
+        if self._writer.is_alive():
+            self._writer.join(timeout=5)
+        with self._readers_lock:
+            readers = list(self._readers)
+        conns = self._write_conns + [c for r in readers for c in r.conns if c is not None]
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
 
     # -------------------------------------------------------
 
@@ -99,21 +202,25 @@ class ThumbCacheDB:
 
     # -------------------------------------------------------
 
-    def get_cached_thumbnail(self, path: str, mtime: float = None, max_size: int = 512) -> QPixmap | None:
+    def get_cached_thumbnail(self, path: str, mtime: float = None, max_size: int = 512,
+                             level: int = 0) -> QPixmap | None:
         """Retrieve thumbnail if present and valid. Uses normalized path and content hash."""
-        start = time.time()
-        try:
-            npath = norm(path)
-            with self.lock:
-                cur = self.conn.cursor()
-                # include stored mtime so we can inspect it if needed
-                cur.execute("SELECT width, height, hash, data, mtime FROM thumbnail_cache WHERE path=?", (npath,))
-                row = cur.fetchone()
+        img = self.get_cached_image(path, mtime, max_size, level)
+        return QPixmap.fromImage(img) if img is not None else None
 
-            self.metrics["get_count"] += 1
+    def get_cached_image(self, path: str, mtime: float = None, max_size: int = 0,
+                         level: int = 0) -> QImage | None:
+        """
+        Same lookup as get_cached_thumbnail() but returns a QImage, so it is
+        safe to call from worker threads. max_size=0 means no downscale.
+        """
+        start = time.perf_counter()
+        hit = False
+        try:
+            key = level_key(norm(path), level)
+            row = self._lookup(key, "width, height, hash, data, mtime")
 
             if not row:
-                self.metrics["get_misses"] += 1
                 return None
 
             width, height, hsh, blob, stored_mtime = row
@@ -121,58 +228,73 @@ class ThumbCacheDB:
             # validate via content signature (size+mtime) — robust against float formatting differences
             local_hash = self.compute_hash(path)
             if not hsh or hsh != local_hash:
-                self.metrics["get_misses"] += 1
                 return None
 
             img = QImage.fromData(blob)
             if img.isNull():
-                self.metrics["get_misses"] += 1
                 return None
 
-            pm = QPixmap.fromImage(img)
-            if max(pm.width(), pm.height()) > max_size:
-                pm = pm.scaled(max_size, max_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            if max_size and max(img.width(), img.height()) > max_size:
+                img = img.scaled(max_size, max_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
 
-            self.metrics["get_hits"] += 1
-            return pm
+            hit = True
+            self._touched[key] = time.time()
+            return img
         except Exception as e:
             print(f"[ThumbCacheDB] get_cached_thumbnail failed: {e}")
             return None
         finally:
-            self.metrics["get_total_ms"] += (time.time() - start) * 1000.0
+            self._record_get((time.perf_counter() - start) * 1000.0, hit)
+
+    def _record_get(self, ms: float, hit: bool):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, ms)
+        with self._metrics_lock:
+            self.metrics["get_count"] += 1
+            self.metrics["get_total_ms"] += ms
+            if hit:
+                self.metrics["get_hits"] += 1
+                self._hit_hist[bucket] += 1
+            else:
+                self.metrics["get_misses"] += 1
+                self._miss_hist[bucket] += 1
 
     # -------------------------------------------------------
 
-    def has_entry(self, path: str, mtime: float = None) -> bool:
+    def has_entry(self, path: str, mtime: float = None, level: int = 0) -> bool:
         """
         Check whether we have a valid cache entry that matches current file content.
         Uses computed hash (size+mtime) to be robust against mtime formatting differences.
         """
         try:
-            npath = norm(path)
-            with self.lock:
-                cur = self.conn.cursor()
-                cur.execute("SELECT hash FROM thumbnail_cache WHERE path=?", (npath,))
-                row = cur.fetchone()
-                if not row:
-                    return False
-                stored_hash = row[0]
+            row = self._lookup(level_key(norm(path), level), "width, height, hash")
+            if not row:
+                return False
             local_hash = self.compute_hash(path)
-            return stored_hash == local_hash
+            return row[2] == local_hash
         except Exception:
             return False
 
    # -------------------------------------------------------
-   
-    def store_thumbnail(self, path: str, mtime: float, pixmap: QPixmap):
-        """Store QPixmap thumbnail in cache DB with WEBP compression and PNG fallback."""
+
+    def store_thumbnail(self, path: str, mtime: float, pixmap: QPixmap, level: int = 0):
+        """
+        Store QPixmap thumbnail in cache DB with WEBP compression and PNG fallback.
+
+        Encoding happens on the calling thread; the row is committed by the
+        writer thread with other stores and is readable immediately.
+        """
+        if not isinstance(pixmap, QPixmap) or pixmap.isNull():
+            return False
+        return self.store_image(path, mtime, pixmap.toImage(), level)
+
+    def store_image(self, path: str, mtime: float, img: QImage, level: int = 0):
+        """QImage variant of store_thumbnail() (safe from worker threads)."""
         start = time.time()
         try:
-            npath = norm(path)
-            if not isinstance(pixmap, QPixmap) or pixmap.isNull():
+            key = level_key(norm(path), level)
+            if not isinstance(img, QImage) or img.isNull():
                 return False
 
-            img = pixmap.toImage()
             data = QByteArray()
             buffer = QBuffer(data)
             buffer.open(QIODevice.WriteOnly)
@@ -188,46 +310,75 @@ class ThumbCacheDB:
 
             hsh = self.compute_hash(path)
             blob_bytes = bytes(data) if isinstance(data, (bytes, bytearray)) else data.data()
-            with self.lock:
-                self.conn.execute("""
-                    INSERT OR REPLACE INTO thumbnail_cache (path, mtime, width, height, hash, data, cached_at)
-                    VALUES (?,?,?,?,?,?,?)
-                """, (npath, float(mtime or 0.0), int(img.width()), int(img.height()), hsh, sqlite3.Binary(blob_bytes), time.time()))
-                self.conn.commit()
-
-            self.metrics["stores"] += 1
+            row = (int(img.width()), int(img.height()), hsh, blob_bytes, float(mtime or 0.0))
+            self._pending[key] = row
+            self._queue.put(("put", key, row))
+
+            with self._metrics_lock:
+                self.metrics["stores"] += 1
             return True
         except Exception as e:
             print(f"[ThumbCacheDB] store_thumbnail failed: {e}")
             return False
         finally:
-            self.metrics["store_total_ms"] += (time.time() - start) * 1000.0
+            with self._metrics_lock:
+                self.metrics["store_total_ms"] += (time.time() - start) * 1000.0
 
    # -------------------------------------------------------
 
-    def invalidate(self, path: str):
+    def invalidate(self, path: str, levels=()):
+        """Drop the row for path plus its rows at the given pyramid levels."""
         npath = norm(path)
         try:
-            with self.lock:
-                self.conn.execute("DELETE FROM thumbnail_cache WHERE path=?", (npath,))
-                self.conn.commit()
+            for key in [npath] + [level_key(npath, lvl) for lvl in levels if lvl]:
+                self._pending[key] = None
+                self._touched.pop(key, None)
+                self._queue.put(("del", key, None))
         except Exception:
             pass
 
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued write is committed."""
+        try:
+            self._call(lambda: None).result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def clear(self):
+        """Delete every cached thumbnail."""
+        def _clear():
+            for conn in self._write_conns:
+                conn.execute("DELETE FROM thumbnail_cache")
+            self._total_bytes = 0
+        self._call(_clear).result()
+
+    def _call(self, fn) -> Future:
+        """Run fn on the writer thread after the writes queued before it."""
+        future = Future()
+        if self._closed:
+            future.set_exception(RuntimeError("ThumbCacheDB is closed"))
+        else:
+            self._queue.put(("call", fn, future))
+        return future
+
    # -------------------------------------------------------
     def purge_stale(self, max_age_days: int = 30):
-        try:
+        def _purge():
             cutoff = time.time() - max_age_days * 86400
-            with self.lock:
-                cur = self.conn.cursor()
+            n = 0
+            for conn in self._write_conns:
                 # Use cached_at (insertion time) for staleness, not file mtime.
                 # Fall back to mtime for rows without cached_at (pre-upgrade).
-                cur.execute(
+                cur = conn.execute(
                     "DELETE FROM thumbnail_cache WHERE COALESCE(cached_at, mtime) < ?",
                     (cutoff,),
                 )
-                n = cur.rowcount
-                self.conn.commit()
+                n += cur.rowcount
+            self._total_bytes = self._exact_total_bytes()
+            return n
+        try:
+            n = self._call(_purge).result()
             if n:
                 print(f"[ThumbCacheDB] Purged {n} stale thumbnails (> {max_age_days} days).")
         except Exception as e:
@@ -236,43 +387,205 @@ class ThumbCacheDB:
    # -------------------------------------------------------
     def get_stats(self) -> dict:
         try:
-            with self.lock:
-                cur = self.conn.cursor()
-                cur.execute("SELECT COUNT(*), SUM(LENGTH(data)) FROM thumbnail_cache")
-                count, total_bytes = cur.fetchone()
-            total_bytes = total_bytes or 0
+            count = total_bytes = 0
+            for shard in range(self.shard_count):
+                cur = self._reader(shard).execute(
+                    "SELECT COUNT(*), SUM(COALESCE(size, LENGTH(data))) FROM thumbnail_cache"
+                )
+                n, size = cur.fetchone()
+                count += n or 0
+                total_bytes += size or 0
             mb = total_bytes / (1024 * 1024)
-            last_mod = datetime.fromtimestamp(os.path.getmtime(self.db_path)).strftime("%Y-%m-%d %H:%M")
+            last_mod = max(os.path.getmtime(p) for p in self.shard_paths if os.path.exists(p))
             return {
-                "entries": count or 0,
+                "entries": count,
                 "size_mb": round(mb, 2),
                 "path": self.db_path,
-                "last_updated": last_mod
+                "shards": self.shard_count,
+                "last_updated": datetime.fromtimestamp(last_mod).strftime("%Y-%m-%d %H:%M")
             }
         except Exception as e:
             return {"error": str(e)}
-            
+
    # -------------------------------------------------------
-   
+
     def get_metrics(self) -> dict:
         try:
-            m = dict(self.metrics)
+            with self._metrics_lock:
+                m = dict(self.metrics)
+                hit_hist = list(self._hit_hist)
+                miss_hist = list(self._miss_hist)
             m["avg_get_ms"] = (m["get_total_ms"] / m["get_count"]) if m["get_count"] else 0.0
             m["avg_store_ms"] = (m["store_total_ms"] / max(1, m["stores"])) if m["stores"] else 0.0
+            labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            m["hit_latency_ms"] = dict(zip(labels, hit_hist))
+            m["miss_latency_ms"] = dict(zip(labels, miss_hist))
+            m["pending_writes"] = self._queue.qsize()
+            m["size_mb"] = round(self._total_bytes / (1024 * 1024), 2)
             return m
         except Exception as e:
             return {"error": str(e)}
 
+    # -------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------
+
+    def _writer_loop(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._touched:
+                    self._commit([])
+                continue
+            if item is _STOP:
+                break
+
+            # Grow the group until the window closes, it is full, or an
+            # admin call needs everything before it committed
+            batch = [item]
+            deadline = time.monotonic() + COMMIT_WINDOW_MS / 1000.0
+            while batch[-1][0] != "call" and len(batch) < MAX_COMMIT_ROWS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            call = batch.pop() if batch[-1][0] == "call" else None
+            self._commit(batch)
+            if call is not None:
+                _, fn, future = call
+                try:
+                    future.set_result(fn())
+                except Exception as e:
+                    future.set_exception(e)
+
+        # Drain whatever was queued before close()
+        rest = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and item[0] != "call":
+                rest.append(item)
+            elif item is not _STOP:
+                item[2].set_exception(RuntimeError("ThumbCacheDB is closed"))
+        self._commit(rest)
+
+    def _commit(self, batch):
+        """Write one group: one transaction per touched shard."""
+        touched, self._touched = self._touched, {}
+        # Per-shard writes in queue order, so a store after an invalidate wins
+        writes = [[] for _ in range(self.shard_count)]
+        touches = [[] for _ in range(self.shard_count)]
+        now = time.time()
+        for _, npath, row in batch:
+            writes[self._shard(npath)].append((npath, row))
+        for npath, ts in touched.items():
+            touches[self._shard(npath)].append((ts, npath))
+
+        added = 0
+        for shard, conn in enumerate(self._write_conns):
+            if not (writes[shard] or touches[shard]):
+                continue
+            try:
+                conn.execute("BEGIN")
+                for npath, row in writes[shard]:
+                    if row is None:
+                        conn.execute("DELETE FROM thumbnail_cache WHERE path=?", (npath,))
+                    else:
+                        width, height, hsh, blob, mtime = row
+                        conn.execute("""
+                            INSERT OR REPLACE INTO thumbnail_cache
+                            (path, mtime, width, height, hash, data, cached_at, size, last_access)
+                            VALUES (?,?,?,?,?,?,?,?,?)
+                        """, (npath, mtime, width, height, hsh, sqlite3.Binary(blob), now, len(blob), now))
+                        added += len(blob)
+                if touches[shard]:
+                    conn.executemany(
+                        "UPDATE thumbnail_cache SET last_access=? WHERE path=?", touches[shard]
+                    )
+                conn.execute("COMMIT")
+            except Exception as e:
+                print(f"[ThumbCacheDB] group commit failed on shard {shard}: {e}")
+                try:
+                    conn.execute("ROLLBACK")
+                except Exception:
+                    pass
+
+        # Committed (or dropped): reads go to the shards again unless a
+        # newer write for the same path was queued meanwhile
+        for _, npath, row in batch:
+            if npath in self._pending and self._pending.get(npath) is row:
+                self._pending.pop(npath, None)
+
+        if batch:
+            with self._metrics_lock:
+                self.metrics["commits"] += 1
+                self.metrics["rows_committed"] += len(batch)
+        self._total_bytes += added
+        if self._total_bytes > self.max_cache_bytes:
+            self._evict()
+
+    def _exact_total_bytes(self) -> int:
+        total = 0
+        for conn in self._write_conns:
+            total += conn.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnail_cache").fetchone()[0]
+        return total
+
+    def _evict(self):
+        """Drop least recently used rows until the cache is under EVICT_TO_FRACTION of the limit."""
+        # The running total only adds; recount before deleting anything
+        self._total_bytes = self._exact_total_bytes()
+        if self._total_bytes <= self.max_cache_bytes:
+            return
+        # Shards hold a hash-partition of the paths, so trimming each to its
+        # share of the target approximates one global LRU
+        share = self.max_cache_bytes * EVICT_TO_FRACTION / self.shard_count
+        evicted = freed = 0
+        for conn in self._write_conns:
+            size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnail_cache").fetchone()[0]
+            excess = size - share
+            while excess > 0:
+                rows = conn.execute("""
+                    SELECT path, size FROM thumbnail_cache
+                    ORDER BY COALESCE(last_access, cached_at, 0) LIMIT 500
+                """).fetchall()
+                if not rows:
+                    break
+                victims = []
+                for npath, row_size in rows:
+                    victims.append((npath,))
+                    excess -= row_size or 0
+                    freed += row_size or 0
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM thumbnail_cache WHERE path=?", victims)
+                evicted += len(victims)
+        self._total_bytes -= freed
+        with self._metrics_lock:
+            self.metrics["evictions"] += evicted
+            self.metrics["evicted_bytes"] += freed
+        if evicted:
+            print(f"[ThumbCacheDB] Evicted {evicted} thumbnails ({freed / (1024 * 1024):.1f} MB) "
+                  f"to stay under {self.max_cache_bytes / (1024 * 1024):.0f} MB")
+
+    # -------------------------------------------------------
+
     def _auto_purge_worker(self):
         last_run = 0
         while not self._stop_event.is_set():
             try:
-                # check file size on disk
-                size_mb = os.path.getsize(self.db_path) / (1024 * 1024)
-                if size_mb > MAX_CACHE_MB:
-                    print(f"[ThumbCacheDB] Auto-purging: cache {size_mb:.1f} MB > limit {MAX_CACHE_MB} MB")
-                    self.purge_stale(max_age_days=7)
-                # weekly cleanup
+                # weekly cleanup (size is kept in check by LRU eviction on write)
                 if time.time() - last_run > PURGE_INTERVAL_DAYS * 86400:
                     self.purge_stale(max_age_days=30)
                     last_run = time.time()
@@ -289,7 +602,7 @@ class ThumbCacheDB:
             self.close()
         except Exception:
             pass
-            
+
    # -------------------------------------------------------
 
 
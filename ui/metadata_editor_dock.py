@@ -677,6 +677,10 @@ class MetadataEditorDock(QDockWidget):
                 """, (value, self._current_photo_id))
                 conn.commit()
 
+            if column in ("rating", "flag"):
+                from repository.search_feature_repository import SearchFeatureRepository
+                SearchFeatureRepository().apply_photo_changes([self._current_photo_id], column)
+
             logger.debug(f"[MetadataEditorDock] Saved {field}={value} for photo {self._current_photo_id}")
 
         except Exception as e:
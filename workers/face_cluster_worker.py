@@ -11,7 +11,6 @@ import sqlite3
 import numpy as np
 import logging
 from typing import Optional
-from sklearn.cluster import DBSCAN
 from PySide6.QtCore import QRunnable, QObject, Signal, Slot
 from reference_db import ReferenceDB
 from workers.progress_writer import write_status
@@ -19,6 +18,9 @@ from config.face_detection_config import get_face_config
 from services.performance_monitor import PerformanceMonitor
 from services.face_quality_analyzer import FaceQualityAnalyzer
 from services.clustering_quality_analyzer import ClusteringQualityAnalyzer
+from services.face_cluster_assignment import nearest_cluster_assignments
+from services.face_embedding_matrix_store import get_face_embedding_matrix_store
+from services.face_clustering_backend import dbscan_cosine
 
 logger = logging.getLogger(__name__)
 
@@ -60,12 +62,19 @@ class FaceClusterWorker(QRunnable):
         - Creates representative face for each cluster
         - Updates face_branch_reps, branches, and face_crops tables
         - Emits progress signals for UI updates
+        - Incremental mode: assigns new faces to existing clusters and only
+          clusters the leftovers (see _cluster_incrementally)
     """
 
+    # Incremental mode falls back to a full run when more faces are new
+    # than already clustered (the existing topology says little by then)
+    INCREMENTAL_MAX_NEW_RATIO = 1.0
+
     def __init__(self, project_id: int, eps: Optional[float] = None,
                  min_samples: Optional[int] = None, auto_tune: bool = True,
                  screenshot_policy: str = "detect_only",
-                 include_all_screenshot_faces: bool = False):
+                 include_all_screenshot_faces: bool = False,
+                 incremental: bool = False):
         """
         Initialize face clustering worker with adaptive parameter selection.
 
@@ -82,6 +91,10 @@ class FaceClusterWorker(QRunnable):
             auto_tune: If True, automatically select optimal parameters based on dataset size
                       If False, use provided eps/min_samples or config defaults
                       Recommended: True for best results
+            incremental: If True, keep existing clusters: new/unassigned faces join
+                        the cluster of their nearest clustered face within eps, the
+                        rest are clustered among themselves. Falls back to a full
+                        run when there are no clusters yet or mostly new faces.
 
         Parameter Selection:
             When auto_tune=True (recommended):
@@ -94,6 +107,7 @@ class FaceClusterWorker(QRunnable):
         super().__init__()
         self.project_id = project_id
         self.auto_tune = auto_tune
+        self.incremental = incremental
         self.screenshot_policy = screenshot_policy
         self.tuning_rationale = ""
         self.tuning_category = ""
@@ -153,9 +167,60 @@ class FaceClusterWorker(QRunnable):
         )
         logger.info(f"[FaceClusterWorker] Rationale: {self.tuning_rationale}")
 
+        # DBSCAN backend: exact sklearn cosine or sparse radius graph (large sets)
+        self.clustering_backend = get_face_config().get_clustering_backend()
+
         self.signals = FaceClusterSignals()
         self.cancelled = False
 
+    def _dbscan(self, X, eps: float, min_samples: int) -> np.ndarray:
+        """DBSCAN labels (cosine distance) using the configured backend."""
+        return dbscan_cosine(
+            X, eps, min_samples,
+            backend=self.clustering_backend["backend"],
+            graph_min_faces=self.clustering_backend["graph_min_faces"],
+        )
+
+    def _analyze_clustering_quality(self, X, labels, max_samples: int, background: bool = False):
+        """Log Phase 2A clustering quality metrics and tuning suggestions."""
+        quality_analyzer = ClusteringQualityAnalyzer()
+
+        def _report(clustering_metrics):
+            sample_note = (
+                f" (silhouette on {clustering_metrics.silhouette_sample_size} sampled faces)"
+                if clustering_metrics.silhouette_sample_size else ""
+            )
+            logger.info(
+                f"[FaceClusterWorker] Clustering Quality Analysis{sample_note}:\n"
+                f"  - Overall Quality: {clustering_metrics.overall_quality:.1f}/100 ({clustering_metrics.quality_label})\n"
+                f"  - Silhouette Score: {clustering_metrics.silhouette_score:.3f} "
+                f"({'Excellent' if clustering_metrics.silhouette_score >= 0.7 else 'Good' if clustering_metrics.silhouette_score >= 0.5 else 'Fair' if clustering_metrics.silhouette_score >= 0.25 else 'Poor'})\n"
+                f"  - Davies-Bouldin Index: {clustering_metrics.davies_bouldin_index:.3f} "
+                f"({'Excellent' if clustering_metrics.davies_bouldin_index < 0.5 else 'Good' if clustering_metrics.davies_bouldin_index < 1.0 else 'Fair' if clustering_metrics.davies_bouldin_index < 1.5 else 'Poor'})\n"
+                f"  - Noise Ratio: {clustering_metrics.noise_ratio:.1%}\n"
+                f"  - Avg Cluster Compactness: {clustering_metrics.avg_cluster_compactness:.3f}\n"
+                f"  - Avg Cluster Separation: {clustering_metrics.avg_cluster_separation:.3f}"
+            )
+
+            # Get tuning suggestions
+            suggestions = quality_analyzer.get_tuning_suggestions(clustering_metrics)
+            if suggestions:
+                logger.info(f"[FaceClusterWorker] Parameter Tuning Suggestions:")
+                for i, suggestion in enumerate(suggestions, 1):
+                    logger.info(f"  {i}. {suggestion}")
+
+        try:
+            if background:
+                quality_analyzer.analyze_clustering_async(
+                    X, labels, _report, metric='cosine', max_samples=max_samples or None
+                )
+            else:
+                _report(quality_analyzer.analyze_clustering(
+                    X, labels, metric='cosine', max_samples=max_samples or None
+                ))
+        except Exception as quality_error:
+            logger.warning(f"[FaceClusterWorker] Clustering quality analysis failed: {quality_error}")
+
     def _get_face_count(self) -> int:
         """
         Get total number of faces for this project.
@@ -178,6 +243,227 @@ class FaceClusterWorker(QRunnable):
         self.cancelled = True
         logger.info("[FaceClusterWorker] Cancellation requested")
 
+    def _mark_groups_stale(self, db):
+        """Mark people groups stale: their match results depend on clusters."""
+        try:
+            from services.people_group_service import PeopleGroupService
+            group_service = PeopleGroupService(db)
+            stale_count = group_service.mark_all_groups_stale(self.project_id)
+            if stale_count > 0:
+                logger.info(f"[FaceClusterWorker] Marked {stale_count} people groups as stale")
+        except Exception as group_error:
+            logger.warning(f"[FaceClusterWorker] Failed to mark groups stale: {group_error}")
+
+    def _write_cluster_rows(self, cur, branch_key, display_name, centroid, rep_path,
+                            cluster_ids, unique_photos):
+        """Insert one new cluster: rep row, sidebar branch, face links and photo links."""
+        # Insert into face_branch_reps
+        cur.execute("""
+            INSERT INTO face_branch_reps (project_id, branch_key, centroid, rep_path, count)
+            VALUES (?, ?, ?, ?, ?)
+        """, (self.project_id, branch_key, centroid, rep_path, len(unique_photos)))
+
+        # Insert into branches (for sidebar display)
+        cur.execute("""
+            INSERT INTO branches (project_id, branch_key, display_name)
+            VALUES (?, ?, ?)
+        """, (self.project_id, branch_key, display_name))
+
+        # Update face_crops entries to reflect cluster
+        placeholders = ','.join(['?'] * len(cluster_ids))
+        cur.execute(f"""
+            UPDATE face_crops SET branch_key=? WHERE project_id=? AND id IN ({placeholders})
+        """, (branch_key, self.project_id, *cluster_ids))
+
+        # CRITICAL FIX: Link photos to this face branch in project_images
+        # This allows get_images_by_branch() to return photos for face clusters
+        # PERFORMANCE OPTIMIZATION (2026-01-07): Batch INSERT for 50-70% speedup
+        if unique_photos:
+            photo_data = [(self.project_id, branch_key, photo_path)
+                          for photo_path in unique_photos]
+            cur.executemany("""
+                INSERT OR IGNORE INTO project_images (project_id, branch_key, image_path)
+                VALUES (?, ?, ?)
+            """, photo_data)
+            logger.debug(f"[FaceClusterWorker] Batch-linked {len(unique_photos)} unique photos to {branch_key}")
+        else:
+            logger.debug(f"[FaceClusterWorker] No photos to link for {branch_key}")
+
+    def _write_unidentified(self, cur, noise_ids, noise_paths, noise_image_paths, noise_vecs):
+        """Create the 'Unidentified' branch for faces that belong to no cluster."""
+        noise_count = len(noise_ids)
+
+        # Create centroid from unclustered faces
+        centroid = np.mean(noise_vecs, axis=0).astype(np.float32).tobytes()
+        rep_path = noise_paths[0] if noise_paths else None
+
+        # CRITICAL FIX: Count unique PHOTOS, not face crops
+        unique_noise_photos = set(noise_image_paths)
+        photo_count = len(unique_noise_photos)
+
+        # Special branch for unidentified faces
+        branch_key = "face_unidentified"
+        display_name = f"⚠️ Unidentified ({noise_count} faces)"
+
+        # Insert into face_branch_reps
+        cur.execute("""
+            INSERT INTO face_branch_reps (project_id, branch_key, centroid, rep_path, count)
+            VALUES (?, ?, ?, ?, ?)
+        """, (self.project_id, branch_key, centroid, rep_path, photo_count))
+
+        # Insert into branches (for sidebar display)
+        cur.execute("""
+            INSERT INTO branches (project_id, branch_key, display_name)
+            VALUES (?, ?, ?)
+        """, (self.project_id, branch_key, display_name))
+
+        # Update face_crops entries
+        placeholders = ','.join(['?'] * len(noise_ids))
+        cur.execute(f"""
+            UPDATE face_crops SET branch_key=? WHERE project_id=? AND id IN ({placeholders})
+        """, (branch_key, self.project_id, *noise_ids))
+
+        # Link photos to unidentified branch
+        # PERFORMANCE OPTIMIZATION (2026-01-07): Batch INSERT for 50-70% speedup
+        if unique_noise_photos:
+            noise_photo_data = [(self.project_id, branch_key, photo_path)
+                                for photo_path in unique_noise_photos]
+            cur.executemany("""
+                INSERT OR IGNORE INTO project_images (project_id, branch_key, image_path)
+                VALUES (?, ?, ?)
+            """, noise_photo_data)
+            logger.info(f"[FaceClusterWorker] Created 'Unidentified' branch with {noise_count} faces from {len(unique_noise_photos)} photos (batch-linked)")
+        else:
+            logger.info(f"[FaceClusterWorker] Created 'Unidentified' branch with {noise_count} faces but no photos to link")
+
+    def _cluster_incrementally(self, cur, X, ids, paths, image_paths, branch_keys) -> Optional[dict]:
+        """
+        Add new faces to the existing clustering instead of re-clustering everything.
+
+        Faces whose branch_key is not an existing person cluster (new detections,
+        the Unidentified branch, keys without a face_branch_reps row) are candidates.
+        Each candidate joins the cluster of its nearest clustered face if that face
+        is within eps (cosine distance, as in DBSCAN). The residue is clustered with
+        DBSCAN among itself into new clusters; what is still noise goes to
+        Unidentified. Clusters that gained faces get their centroid, count and photo
+        links refreshed. Existing clusters are never split or renumbered, so names
+        and user merges survive.
+
+        Returns:
+            Summary dict, or None to fall back to a full run
+        """
+        cur.execute("""
+            SELECT branch_key FROM face_branch_reps
+            WHERE project_id = ? AND branch_key LIKE 'face_%' AND branch_key != 'face_unidentified'
+        """, (self.project_id,))
+        cluster_keys = {row[0] for row in cur.fetchall()}
+
+        clustered = [i for i, bk in enumerate(branch_keys) if bk in cluster_keys]
+        candidates = [i for i, bk in enumerate(branch_keys) if bk not in cluster_keys]
+        if not clustered:
+            logger.info("[FaceClusterWorker] Incremental: no existing clusters, running full clustering")
+            return None
+        if len(candidates) > self.INCREMENTAL_MAX_NEW_RATIO * len(clustered):
+            logger.info(
+                "[FaceClusterWorker] Incremental: %d new vs %d clustered faces, running full clustering",
+                len(candidates), len(clustered),
+            )
+            return None
+
+        self.signals.progress.emit(10, 100, f"Assigning {len(candidates)} new faces...")
+        targets = nearest_cluster_assignments(
+            X[clustered], [branch_keys[i] for i in clustered], X[candidates], self.eps
+        )
+        members = {}
+        for i in clustered:
+            members.setdefault(branch_keys[i], []).append(i)
+        touched = set()
+        assignments = []
+        residue = []
+        for i, key in zip(candidates, targets):
+            if key is None:
+                residue.append(i)
+            else:
+                members[key].append(i)
+                touched.add(key)
+                assignments.append((key, self.project_id, ids[i]))
+
+        cur.executemany(
+            "UPDATE face_crops SET branch_key=? WHERE project_id=? AND id=?", assignments
+        )
+        for key in sorted(touched):
+            idxs = members[key]
+            unique_photos = {image_paths[i] for i in idxs}
+            centroid = np.mean(X[idxs], axis=0).astype(np.float32).tobytes()
+            cur.execute(
+                "UPDATE face_branch_reps SET centroid=?, count=? WHERE project_id=? AND branch_key=?",
+                (centroid, len(unique_photos), self.project_id, key),
+            )
+            cur.executemany("""
+                INSERT OR IGNORE INTO project_images (project_id, branch_key, image_path)
+                VALUES (?, ?, ?)
+            """, [(self.project_id, key, p) for p in unique_photos])
+
+        # Rebuild Unidentified from whatever stays unclustered
+        for table in ("face_branch_reps", "branches", "project_images"):
+            cur.execute(
+                f"DELETE FROM {table} WHERE project_id=? AND branch_key='face_unidentified'",
+                (self.project_id,),
+            )
+
+        self.signals.progress.emit(40, 100, f"Clustering {len(residue)} unmatched faces...")
+        labels = np.full(len(residue), -1, dtype=np.int64)
+        if residue:
+            labels = self._dbscan(X[residue], self.eps, self.min_samples)
+            if self.screenshot_policy == "include_cluster":
+                # Same rule as the full run: every loaded face ends up in a cluster
+                next_label = int(labels.max()) + 1
+                for pos in np.where(labels == -1)[0]:
+                    labels[pos] = next_label
+                    next_label += 1
+
+        cur.execute(
+            "SELECT branch_key FROM branches WHERE project_id=? AND branch_key LIKE 'face_%'",
+            (self.project_id,),
+        )
+        used = [int(bk[5:]) for (bk,) in cur.fetchall() if bk[5:].isdigit()]
+        used += [int(bk[5:]) for bk in cluster_keys if bk[5:].isdigit()]
+        next_index = max(used, default=-1) + 1
+
+        new_clusters = 0
+        for lbl in sorted(set(labels.tolist()) - {-1}):
+            idxs = [residue[pos] for pos in np.where(labels == lbl)[0]]
+            cluster_vecs = X[idxs]
+            centroid_vec = np.mean(cluster_vecs, axis=0).astype(np.float32)
+            rep_idx = idxs[int(np.argmin(np.linalg.norm(cluster_vecs - centroid_vec, axis=1)))]
+            self._write_cluster_rows(
+                cur, f"face_{next_index:03d}", f"Person {next_index + 1}", centroid_vec.tobytes(),
+                paths[rep_idx], [ids[i] for i in idxs], {image_paths[i] for i in idxs},
+            )
+            next_index += 1
+            new_clusters += 1
+
+        noise = [residue[pos] for pos in np.where(labels == -1)[0]]
+        if noise:
+            self._write_unidentified(
+                cur, [ids[i] for i in noise], [paths[i] for i in noise],
+                [image_paths[i] for i in noise], X[noise],
+            )
+
+        cluster_sizes = [len(v) for v in members.values()]
+        cluster_sizes += [int(np.sum(labels == lbl)) for lbl in set(labels.tolist()) - {-1}]
+        return {
+            "cluster_count": len(cluster_keys) + new_clusters,
+            "assigned_faces": len(X) - len(noise),
+            "noise_faces": len(noise),
+            "singleton_count": sum(1 for n in cluster_sizes if n == 1),
+            "tiny_cluster_count": sum(1 for n in cluster_sizes if n <= 2),
+            "max_cluster_size": max(cluster_sizes, default=0),
+            "joined_existing": len(assignments),
+            "touched_clusters": len(touched),
+            "new_clusters": new_clusters,
+        }
+
     @Slot()
     def run(self):
         """Main worker execution."""
@@ -203,7 +489,7 @@ class FaceClusterWorker(QRunnable):
             with db._connect() as conn:
                 cur = conn.cursor()
 
-                # Step 1: Load embeddings from face_crops table
+                # Step 1: Load embeddings (packed per-project matrix, see FaceEmbeddingMatrixStore)
                 metric_load = monitor.record_operation("load_embeddings", {
                     "project_id": self.project_id
                 })
@@ -213,94 +499,21 @@ class FaceClusterWorker(QRunnable):
                 # This caused count mismatch: face_branch_reps showed 14 but grid only showed 12
                 self.signals.progress.emit(0, 100, "Loading face embeddings...")
 
-                # Use EXISTS instead of JOIN on project_images to prevent
-                # cartesian product: project_images is a many-to-many membership
-                # table (same photo in "all", date, folder branches), so a JOIN
-                # duplicates face rows for every branch the photo belongs to.
+                # The packed matrix store serves exactly these faces (see
+                # FaceEmbeddingMatrixStore.sync) without reading embedding BLOBs.
                 # ENHANCEMENT (2026-03-14): Screenshot policy support.
                 # If policy is 'include_cluster', we include screenshots.
                 # Otherwise ('exclude' or 'detect_only'), we filter them out.
-                screenshot_filter = ""
+                view = get_face_embedding_matrix_store(self.project_id).sync()
+                loadable = np.ones(len(view), dtype=bool)
                 if self.screenshot_policy != "include_cluster":
-                    screenshot_filter = """
-                      AND COALESCE(saf.is_screenshot, 0) = 0
-                      AND LOWER(fc.image_path) NOT LIKE '%screenshot%'
-                      AND LOWER(fc.image_path) NOT LIKE '%screen shot%'
-                      AND LOWER(fc.image_path) NOT LIKE '%screen_shot%'
-                      AND LOWER(fc.image_path) NOT LIKE '%screen-shot%'
-                      AND LOWER(fc.image_path) NOT LIKE '%bildschirmfoto%'
-                      AND LOWER(fc.image_path) NOT LIKE '%captura%'
-                      AND LOWER(fc.image_path) NOT LIKE '%스크린샷%'
-                      AND LOWER(fc.image_path) NOT LIKE '%スクリーンショット%'
-                    """
-
-                cur.execute(f"""
-                    SELECT fc.id, fc.crop_path, fc.image_path, fc.embedding,
-                           fc.confidence, fc.bbox_x, fc.bbox_y, fc.bbox_w, fc.bbox_h,
-                           pm.width, pm.height,
-                           COALESCE(saf.is_screenshot, 0) AS is_screenshot
-                    FROM face_crops fc
-                    JOIN photo_metadata pm ON fc.image_path = pm.path
-                    LEFT JOIN search_asset_features saf ON fc.image_path = saf.path
-                    WHERE fc.project_id=? AND fc.embedding IS NOT NULL
-                      {screenshot_filter}
-                      AND EXISTS (
-                          SELECT 1 FROM project_images pi
-                          WHERE pi.image_path = fc.image_path
-                            AND pi.project_id = fc.project_id
-                      )
-                """, (self.project_id,))
-                rows = cur.fetchall()
-
-                # ── Invariant check: embeddings_loaded == faces_in_db ──
-                # Patch B.1: Use same filter as main query for invariant check
-                cur.execute(f"""
-                    SELECT COUNT(*)
-                    FROM face_crops fc
-                    JOIN photo_metadata pm ON fc.image_path = pm.path
-                    LEFT JOIN search_asset_features saf ON fc.image_path = saf.path
-                    WHERE fc.project_id=?
-                      AND fc.embedding IS NOT NULL
-                      {screenshot_filter}
-                      AND EXISTS (
-                          SELECT 1 FROM project_images pi
-                          WHERE pi.image_path = fc.image_path
-                            AND pi.project_id = fc.project_id
-                      )
-                """, (self.project_id,))
-                total_faces_in_db = cur.fetchone()[0]
-
-                if len(rows) != total_faces_in_db:
-                    delta = total_faces_in_db - len(rows)
-                    if delta > 0:
-                        logger.warning(
-                            f"[FaceClusterWorker] INVARIANT: {delta} orphaned face_crops "
-                            f"(in DB but not in photo_metadata/project_images). "
-                            f"Loaded {len(rows)}/{total_faces_in_db}. "
-                            f"Run cleanup_face_crops.py to remove orphans."
-                        )
-                    else:
-                        # More loaded than in DB should never happen with EXISTS
-                        logger.error(
-                            f"[FaceClusterWorker] INVARIANT VIOLATION: loaded {len(rows)} "
-                            f"but only {total_faces_in_db} in face_crops — possible query bug"
-                        )
+                    loadable &= ~view.is_screenshot
 
-                if not rows:
+                if not loadable.any() and not view.missing:
                     logger.warning(f"[FaceClusterWorker] No embeddings found for project {self.project_id}")
                     self.signals.finished.emit(0, 0)
                     return
 
-                # Parse embeddings with size validation
-                ids, paths, image_paths, vecs = [], [], [], []
-                qualities = []  # Store (confidence, face_ratio, aspect_ratio) for quality filtering
-                bboxes = []  # Store bbox info for comprehensive quality analysis
-
-                _skipped_bad_embedding = 0
-                _skipped_bad_size = 0
-                _skipped_low_conf = 0
-                _skipped_small_face = 0
-
                 # Compatibility for FacePipelineWorker accounting
                 self._skip_stats = {
                     'bad_embedding': 0, 'bad_size': 0, 'low_conf': 0, 'small_face': 0,
@@ -311,50 +524,54 @@ class FaceClusterWorker(QRunnable):
                 min_conf = 0.50
                 min_ratio = 0.015
 
-                for rid, path, img_path, blob, conf, bx, by, bw, bh, img_w, img_h, is_screenshot_flag in rows:
-                    try:
-                        if conf is not None and conf < min_conf:
-                            _skipped_low_conf += 1
-                            self._skip_stats['low_conf'] += 1
-                            continue
-
-                        if img_w and img_h:
-                            ratio = ((bw or 0) * (bh or 0)) / max(1, img_w * img_h)
-                            if self.screenshot_policy != "include_cluster":
-                                if ratio < min_ratio:
-                                    _skipped_small_face += 1
-                                    self._skip_stats['small_face'] += 1
-                                    continue
-
-                        vec = np.frombuffer(blob, dtype=np.float32)
-                        if vec.size == 0:
-                            _skipped_bad_embedding += 1
-                            self._skip_stats['bad_embedding'] += 1
-                            continue
-                        # Validate embedding dimension — must be 512 for ArcFace
-                        if vec.size != 512:
-                            _skipped_bad_size += 1
-                            self._skip_stats['bad_size'] += 1
-                            continue
+                conf = view.confidences
+                low_conf = loadable & (conf < min_conf)          # NaN (unknown) passes
+                keep = loadable & ~low_conf
 
-                        ids.append(rid)
-                        paths.append(path)
-                        image_paths.append(img_path)
-                        vecs.append(vec)
-                        qualities.append((conf or 0.0, ratio or 0.0, (bw / bh if bh else 1.0)))
-                        bboxes.append({
-                            'image_path': img_path,
-                            'bbox': (bx, by, bw, bh),
-                            'confidence': conf
-                        })
-                    except Exception as e:
-                        logger.warning(f"Failed to parse embedding for {path}: {e}")
-                        self._skip_stats['bad_embedding'] += 1
+                bx, by, bw, bh = (view.bboxes[:, k].astype(np.float64) for k in range(4))
+                img_w, img_h = view.image_sizes[:, 0], view.image_sizes[:, 1]
+                has_size = (img_w > 0) & (img_h > 0)
+                ratio = np.where(has_size, bw * bh / np.maximum(1, img_w * img_h), 0.0)
+                small_face = np.zeros(len(view), dtype=bool)
+                if self.screenshot_policy != "include_cluster":
+                    small_face = keep & has_size & (ratio < min_ratio)
+                keep &= ~small_face
+
+                # Faces whose embedding is not 512 float32 values never enter the matrix
+                _skipped_bad_embedding = view.bad_embedding
+                _skipped_bad_size = view.bad_size
+                _skipped_low_conf = int(low_conf.sum())
+                _skipped_small_face = int(small_face.sum())
+                self._skip_stats['bad_embedding'] = _skipped_bad_embedding
+                self._skip_stats['bad_size'] = _skipped_bad_size
+                self._skip_stats['low_conf'] = _skipped_low_conf
+                self._skip_stats['small_face'] = _skipped_small_face
+
+                sel = np.flatnonzero(keep)
+                ids = view.face_ids[sel].tolist()
+                paths = [view.crop_paths[i] for i in sel]
+                image_paths = [view.image_paths[i] for i in sel]
+                branch_keys = [view.branch_keys[i] for i in sel]  # current cluster of each face (incremental mode)
+                conf = np.nan_to_num(conf[sel], nan=0.0)
+                # Store (confidence, face_ratio, aspect_ratio) for quality filtering
+                qualities = list(zip(
+                    conf.tolist(), ratio[sel].tolist(),
+                    np.where(bh[sel] > 0, bw[sel] / np.maximum(bh[sel], 1), 1.0).tolist(),
+                ))
+                # Store bbox info for comprehensive quality analysis
+                bboxes = [
+                    {
+                        'image_path': image_paths[n],
+                        'bbox': tuple(int(v) for v in view.bboxes[i]),
+                        'confidence': None if np.isnan(view.confidences[i]) else float(view.confidences[i]),
+                    }
+                    for n, i in enumerate(sel)
+                ]
 
                 logger.info(
                     "[FaceClusterWorker] EMBEDDING_FILTER_SUMMARY: loaded=%d "
                     "bad_embedding=%d bad_dim=%d low_conf=%d small_face=%d screenshot_policy=%s",
-                    len(vecs),
+                    len(sel),
                     _skipped_bad_embedding,
                     _skipped_bad_size,
                     _skipped_low_conf,
@@ -362,17 +579,36 @@ class FaceClusterWorker(QRunnable):
                     self.screenshot_policy,
                 )
 
-
-                if len(vecs) < 2:
+                if len(sel) < 2:
                     logger.warning("[FaceClusterWorker] Not enough faces to cluster (need at least 2)")
-                    self.signals.finished.emit(0, len(vecs))
+                    self.signals.finished.emit(0, len(sel))
                     return
 
-                X = np.vstack(vecs)
+                X = np.asarray(view.vectors[sel], dtype=np.float32)
                 total_faces = len(X)
                 logger.info(f"[FaceClusterWorker] Loaded {total_faces} face embeddings")
                 metric_load.finish()
 
+                if self.incremental:
+                    metric_incremental = monitor.record_operation("incremental_clustering", {
+                        "face_count": total_faces,
+                        "eps": self.eps,
+                    })
+                    summary = self._cluster_incrementally(cur, X, ids, paths, image_paths, branch_keys)
+                    metric_incremental.finish()
+                    if summary is not None:
+                        conn.commit()
+                        self._cluster_summary = summary
+                        self._mark_groups_stale(db)
+                        monitor.finish_monitoring()
+                        logger.info(
+                            "[FaceClusterWorker] Incremental clustering complete in %.1fs: %s",
+                            time.time() - start_time, summary,
+                        )
+                        self.signals.progress.emit(100, 100, "Clustering complete (incremental)")
+                        self.signals.finished.emit(summary["cluster_count"], total_faces)
+                        return
+
                 # Step 2: Run DBSCAN clustering
                 metric_cluster = monitor.record_operation("dbscan_clustering", {
                     "face_count": total_faces,
@@ -385,8 +621,7 @@ class FaceClusterWorker(QRunnable):
                 # Use parameters from __init__ (auto-tuned or manual)
                 eps = self.eps
                 min_samples = self.min_samples
-                dbscan = DBSCAN(eps=eps, min_samples=min_samples, metric='cosine')
-                labels = dbscan.fit_predict(X)
+                labels = self._dbscan(X, eps, min_samples)
 
                 unique_labels = sorted([l for l in set(labels) if l != -1])
                 cluster_count = len(unique_labels)
@@ -399,8 +634,7 @@ class FaceClusterWorker(QRunnable):
                         retry_eps = max(0.40, eps)  # loosen threshold slightly
                         retry_min_samples = max(1, min_samples - 1)  # allow singletons
                         logger.info(f"[FaceClusterWorker] ⚠️ No clusters found, retrying with eps={retry_eps}, min_samples={retry_min_samples}")
-                        dbscan_retry = DBSCAN(eps=retry_eps, min_samples=retry_min_samples, metric='cosine')
-                        labels = dbscan_retry.fit_predict(X)
+                        labels = self._dbscan(X, retry_eps, retry_min_samples)
                         unique_labels = sorted([l for l in set(labels) if l != -1])
                         cluster_count = len(unique_labels)
                         logger.info(f"[FaceClusterWorker] Retry found {cluster_count} clusters")
@@ -498,8 +732,7 @@ class FaceClusterWorker(QRunnable):
                         try:
                             # Re-cluster only this large cluster with a stricter distance
                             local_eps = max(0.32, self.eps - 0.14)
-                            local_dbscan = DBSCAN(eps=local_eps, min_samples=1, metric='cosine')
-                            local_labels = local_dbscan.fit_predict(cluster_vecs)
+                            local_labels = self._dbscan(cluster_vecs, local_eps, 1)
 
                             local_unique = sorted([l for l in set(local_labels) if l != -1])
                             if len(local_unique) <= 1:
@@ -539,36 +772,19 @@ class FaceClusterWorker(QRunnable):
                 metric_cluster.finish()
 
                 # Phase 2A: Analyze clustering quality
+                # Silhouette runs on a bounded stratified sample; in async mode the
+                # analysis starts only once the clusters are committed (see below).
+                quality = get_face_config().get_clustering_quality_params()
                 metric_quality = monitor.record_operation("analyze_clustering_quality", {
                     "cluster_count": cluster_count,
-                    "noise_count": noise_count
+                    "noise_count": noise_count,
+                    "mode": quality["mode"],
                 })
-                try:
-                    quality_analyzer = ClusteringQualityAnalyzer()
-                    clustering_metrics = quality_analyzer.analyze_clustering(X, labels, metric='cosine')
-
-                    logger.info(
-                        f"[FaceClusterWorker] Clustering Quality Analysis:\n"
-                        f"  - Overall Quality: {clustering_metrics.overall_quality:.1f}/100 ({clustering_metrics.quality_label})\n"
-                        f"  - Silhouette Score: {clustering_metrics.silhouette_score:.3f} "
-                        f"({'Excellent' if clustering_metrics.silhouette_score >= 0.7 else 'Good' if clustering_metrics.silhouette_score >= 0.5 else 'Fair' if clustering_metrics.silhouette_score >= 0.25 else 'Poor'})\n"
-                        f"  - Davies-Bouldin Index: {clustering_metrics.davies_bouldin_index:.3f} "
-                        f"({'Excellent' if clustering_metrics.davies_bouldin_index < 0.5 else 'Good' if clustering_metrics.davies_bouldin_index < 1.0 else 'Fair' if clustering_metrics.davies_bouldin_index < 1.5 else 'Poor'})\n"
-                        f"  - Noise Ratio: {clustering_metrics.noise_ratio:.1%}\n"
-                        f"  - Avg Cluster Compactness: {clustering_metrics.avg_cluster_compactness:.3f}\n"
-                        f"  - Avg Cluster Separation: {clustering_metrics.avg_cluster_separation:.3f}"
-                    )
-
-                    # Get tuning suggestions
-                    suggestions = quality_analyzer.get_tuning_suggestions(clustering_metrics)
-                    if suggestions:
-                        logger.info(f"[FaceClusterWorker] Parameter Tuning Suggestions:")
-                        for i, suggestion in enumerate(suggestions, 1):
-                            logger.info(f"  {i}. {suggestion}")
-
-                except Exception as quality_error:
-                    logger.warning(f"[FaceClusterWorker] Clustering quality analysis failed: {quality_error}")
-
+                quality_job = None
+                if quality["mode"] == "sync":
+                    self._analyze_clustering_quality(X, labels, quality["max_samples"])
+                elif quality["mode"] == "async":
+                    quality_job = (X, labels.copy(), quality["max_samples"])
                 metric_quality.finish()
                 self.signals.progress.emit(40, 100, f"Found {cluster_count} person groups...")
 
@@ -726,38 +942,8 @@ class FaceClusterWorker(QRunnable):
                     # Time database operations
                     db_start = time.time()
 
-                    # Insert into face_branch_reps
-                    cur.execute("""
-                        INSERT INTO face_branch_reps (project_id, branch_key, centroid, rep_path, count)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (self.project_id, branch_key, centroid, rep_path, member_count))
-
-                    # Insert into branches (for sidebar display)
-                    cur.execute("""
-                        INSERT INTO branches (project_id, branch_key, display_name)
-                        VALUES (?, ?, ?)
-                    """, (self.project_id, branch_key, display_name))
-
-                    # Update face_crops entries to reflect cluster
-                    placeholders = ','.join(['?'] * len(cluster_ids))
-                    cur.execute(f"""
-                        UPDATE face_crops SET branch_key=? WHERE project_id=? AND id IN ({placeholders})
-                    """, (branch_key, self.project_id, *cluster_ids))
-
-                    # CRITICAL FIX: Link photos to this face branch in project_images
-                    # This allows get_images_by_branch() to return photos for face clusters
-                    # (unique_photos already calculated above for count)
-                    # PERFORMANCE OPTIMIZATION (2026-01-07): Batch INSERT for 50-70% speedup
-                    if unique_photos:
-                        photo_data = [(self.project_id, branch_key, photo_path)
-                                      for photo_path in unique_photos]
-                        cur.executemany("""
-                            INSERT OR IGNORE INTO project_images (project_id, branch_key, image_path)
-                            VALUES (?, ?, ?)
-                        """, photo_data)
-                        logger.debug(f"[FaceClusterWorker] Batch-linked {len(unique_photos)} unique photos to {branch_key}")
-                    else:
-                        logger.debug(f"[FaceClusterWorker] No photos to link for {branch_key}")
+                    self._write_cluster_rows(cur, branch_key, display_name, centroid, rep_path,
+                                             cluster_ids, unique_photos)
 
                     # Track database operations time
                     db_elapsed = time.time() - db_start
@@ -807,54 +993,13 @@ class FaceClusterWorker(QRunnable):
 
                     # Get unclustered face data
                     noise_mask = labels == -1
-                    noise_ids = np.array(ids)[noise_mask].tolist()
-                    noise_paths = np.array(paths)[noise_mask].tolist()
-                    noise_image_paths = np.array(image_paths)[noise_mask].tolist()
-                    noise_vecs = X[noise_mask]
-
-                    # Create centroid from unclustered faces
-                    centroid = np.mean(noise_vecs, axis=0).astype(np.float32).tobytes()
-                    rep_path = noise_paths[0] if noise_paths else None
-
-                    # CRITICAL FIX: Count unique PHOTOS, not face crops
-                    unique_noise_photos = set(noise_image_paths)
-                    photo_count = len(unique_noise_photos)
-
-                    # Special branch for unidentified faces
-                    branch_key = "face_unidentified"
-                    display_name = f"⚠️ Unidentified ({noise_count} faces)"
-
-                    # Insert into face_branch_reps
-                    cur.execute("""
-                        INSERT INTO face_branch_reps (project_id, branch_key, centroid, rep_path, count)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (self.project_id, branch_key, centroid, rep_path, photo_count))
-
-                    # Insert into branches (for sidebar display)
-                    cur.execute("""
-                        INSERT INTO branches (project_id, branch_key, display_name)
-                        VALUES (?, ?, ?)
-                    """, (self.project_id, branch_key, display_name))
-
-                    # Update face_crops entries
-                    placeholders = ','.join(['?'] * len(noise_ids))
-                    cur.execute(f"""
-                        UPDATE face_crops SET branch_key=? WHERE project_id=? AND id IN ({placeholders})
-                    """, (branch_key, self.project_id, *noise_ids))
-
-                    # Link photos to unidentified branch
-                    # (unique_noise_photos already calculated above for count)
-                    # PERFORMANCE OPTIMIZATION (2026-01-07): Batch INSERT for 50-70% speedup
-                    if unique_noise_photos:
-                        noise_photo_data = [(self.project_id, branch_key, photo_path)
-                                            for photo_path in unique_noise_photos]
-                        cur.executemany("""
-                            INSERT OR IGNORE INTO project_images (project_id, branch_key, image_path)
-                            VALUES (?, ?, ?)
-                        """, noise_photo_data)
-                        logger.info(f"[FaceClusterWorker] Created 'Unidentified' branch with {noise_count} faces from {len(unique_noise_photos)} photos (batch-linked)")
-                    else:
-                        logger.info(f"[FaceClusterWorker] Created 'Unidentified' branch with {noise_count} faces but no photos to link")
+                    self._write_unidentified(
+                        cur,
+                        np.array(ids)[noise_mask].tolist(),
+                        np.array(paths)[noise_mask].tolist(),
+                        np.array(image_paths)[noise_mask].tolist(),
+                        X[noise_mask],
+                    )
                     metric_noise.finish()
 
                 # Commit all changes
@@ -870,14 +1015,7 @@ class FaceClusterWorker(QRunnable):
 
             # Mark all people groups as stale (v9.5.0)
             # Group results need recomputation after face clustering changes
-            try:
-                from services.people_group_service import PeopleGroupService
-                group_service = PeopleGroupService(db)
-                stale_count = group_service.mark_all_groups_stale(self.project_id)
-                if stale_count > 0:
-                    logger.info(f"[FaceClusterWorker] Marked {stale_count} people groups as stale")
-            except Exception as group_error:
-                logger.warning(f"[FaceClusterWorker] Failed to mark groups stale: {group_error}")
+            self._mark_groups_stale(db)
 
             # Print performance summary
             print("\n")
@@ -915,6 +1053,9 @@ class FaceClusterWorker(QRunnable):
             self.signals.progress.emit(100, 100, f"Clustering complete: {total_branches} branches created")
             self.signals.finished.emit(cluster_count, total_faces)
 
+            if quality_job is not None:
+                self._analyze_clustering_quality(*quality_job, background=True)
+
         except Exception as e:
             logger.error(f"[FaceClusterWorker] Fatal error: {e}", exc_info=True)
             self.signals.error.emit(str(e))
@@ -974,8 +1115,9 @@ def cluster_faces_1st(project_id: int, eps: float = 0.35, min_samples: int = 2):
     print(f"[FaceCluster] Clustering {len(X)} faces ...")
 
     # 2️: Run DBSCAN clustering
-    dbscan = DBSCAN(eps=eps, min_samples=min_samples, metric='cosine')
-    labels = dbscan.fit_predict(X)
+    backend = get_face_config().get_clustering_backend()
+    labels = dbscan_cosine(X, eps, min_samples, backend=backend["backend"],
+                           graph_min_faces=backend["graph_min_faces"])
     unique_labels = sorted([l for l in set(labels) if l != -1])
 
     # 3️: Clear previous cluster data
@@ -1092,8 +1234,9 @@ def cluster_faces(project_id: int, eps: float = 0.35, min_samples: int = 2):
     print(f"[FaceCluster] Clustering {len(X)} faces ...")
 
     # 2️: Run DBSCAN clustering
-    dbscan = DBSCAN(eps=eps, min_samples=min_samples, metric='cosine')
-    labels = dbscan.fit_predict(X)
+    backend = get_face_config().get_clustering_backend()
+    labels = dbscan_cosine(X, eps, min_samples, backend=backend["backend"],
+                           graph_min_faces=backend["graph_min_faces"])
 
     unique_labels = sorted([l for l in set(labels) if l != -1])
 
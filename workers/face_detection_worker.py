@@ -5,6 +5,7 @@
 # ------------------------------------------------------
 
 import os
+import threading
 import time
 import numpy as np
 from typing import Optional, List  # FEATURE #1: Added List for photo_paths type hint
@@ -19,6 +20,13 @@ from utils.face_detection_logger import FaceDetectionLogger
 
 logger = logging.getLogger(__name__)
 
+_FACE_CROPS_UPSERT_SQL = """
+    INSERT OR REPLACE INTO face_crops (
+        project_id, image_path, crop_path, embedding,
+        bbox_x, bbox_y, bbox_w, bbox_h, confidence
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class FaceDetectionSignals(QObject):
     """
@@ -105,6 +113,9 @@ class FaceDetectionWorker(QRunnable):
             'videos_excluded': 0  # Track videos excluded from face detection
         }
 
+        # Face batches queued on the shared DB write queue (set once committed)
+        self._pending_writes: List[threading.Event] = []
+
     def cancel(self):
         """Cancel the detection process."""
         self.cancelled = True
@@ -129,6 +140,7 @@ class FaceDetectionWorker(QRunnable):
         # ENHANCEMENT (2026-01-07): Initialize structured logging
         structured_logger = FaceDetectionLogger(self.project_id)
 
+        failed = False
         try:
             # Initialize services
             db = ReferenceDB()
@@ -272,11 +284,21 @@ class FaceDetectionWorker(QRunnable):
 
             metric_process.finish()
 
+            # Detection runs ahead of the writer; wait for the last batches
+            self._wait_for_writes()
+            self._update_face_matrix()
+
             # Cleanup and emit completion
             self._finalize_processing(db, monitor, structured_logger)
 
         except Exception as e:
             logger.error(f"[FaceDetectionWorker] Fatal error: {e}", exc_info=True)
+            failed = True
+        finally:
+            # Batches queued before a failure are still in flight; finished
+            # must not fire until they are committed (or have failed)
+            self._wait_for_writes()
+        if failed:
             self.signals.finished.emit(0, 0, 0)
 
     def _process_photos_sequential(self, photos, face_service, db, face_crops_dir,
@@ -285,8 +307,9 @@ class FaceDetectionWorker(QRunnable):
         Sequential photo processing with batch DB writes.
 
         BEST PRACTICE (2026-02-01):
-        - Keeps single DB connection open across all photos
-        - Commits in batches (every N photos) instead of per-face
+        - Keeps single DB connection open across all photos (reads)
+        - Queues face rows in batches (every N photos) on the shared write
+          queue instead of committing per-face; detection does not wait
         - Micro-yields between photos for UI responsiveness
         - Reduces DB lock churn and improves throughput
         """
@@ -318,7 +341,7 @@ class FaceDetectionWorker(QRunnable):
                 if self.cancelled:
                     # Flush pending rows before exit
                     if pending_rows:
-                        self._save_faces_batch(conn, pending_rows)
+                        self._submit_faces_batch(db, pending_rows, idx, total_photos)
                         pending_rows.clear()
                     logger.info("[FaceDetectionWorker] Cancelled by user")
                     break
@@ -428,15 +451,11 @@ class FaceDetectionWorker(QRunnable):
                         f"Found: {self._stats['faces_detected']} faces"
                     )
 
-                # Batch commit every N photos (not every face!)
+                # Batch commit every N photos (not every face!); batch_committed
+                # is emitted for incremental UI refresh once the rows are durable
                 if idx % batch_size == 0 and pending_rows:
-                    saved = self._save_faces_batch(conn, pending_rows)
-                    logger.debug(f"[FaceDetectionWorker] Batch commit: {saved} faces saved")
+                    self._submit_faces_batch(db, pending_rows, idx, total_photos)
                     pending_rows.clear()
-                    # Signal for incremental UI refresh
-                    self.signals.batch_committed.emit(
-                        idx, total_photos, self._stats['faces_detected'], self.project_id
-                    )
 
                 # Micro-yield for UI responsiveness (prevents UI freeze on CPU-heavy workloads)
                 if ui_yield_ms > 0:
@@ -444,11 +463,7 @@ class FaceDetectionWorker(QRunnable):
 
             # Final flush of any remaining rows
             if pending_rows:
-                saved = self._save_faces_batch(conn, pending_rows)
-                logger.debug(f"[FaceDetectionWorker] Final batch commit: {saved} faces saved")
-                self.signals.batch_committed.emit(
-                    total_photos, total_photos, self._stats['faces_detected'], self.project_id
-                )
+                self._submit_faces_batch(db, pending_rows, total_photos, total_photos)
 
     def _process_photos_batch(self, photos, face_service, db, face_crops_dir,
                              structured_logger, monitor, batch_size):
@@ -513,7 +528,8 @@ class FaceDetectionWorker(QRunnable):
                 )
                 batch_duration_ms = (time.time() - batch_start_time) * 1000
 
-                # Process results for each photo
+                # Process results for each photo; rows are written with the batch
+                batch_rows = []
                 for photo_path in batch_paths:
                     faces = results.get(photo_path, [])
                     photo_filename = os.path.basename(photo_path)
@@ -561,9 +577,10 @@ class FaceDetectionWorker(QRunnable):
                         )
                         faces = faces[:limit]
 
-                    # Save faces to database
+                    # Save face crops; DB rows are queued after the batch
                     for face_idx, face in enumerate(faces):
-                        self._save_face(db, photo_path, face, face_idx, face_crops_dir)
+                        self._save_face(db, photo_path, face, face_idx, face_crops_dir,
+                                        pending_rows=batch_rows)
 
                     self._stats['photos_processed'] += 1
                     self._stats['faces_detected'] += len(faces)
@@ -574,6 +591,8 @@ class FaceDetectionWorker(QRunnable):
 
                     logger.info(f"[FaceDetectionWorker] ✓ {photo_filename}: {len(faces)} faces")
 
+                self._submit_faces_batch(db, batch_rows, idx, total_photos)
+
                 # Update progress after batch complete
                 faces_in_batch = sum(len(results.get(path, [])) for path in batch_paths)
                 self.signals.progress.emit(
@@ -584,6 +603,7 @@ class FaceDetectionWorker(QRunnable):
             except Exception as e:
                 # Fall back to sequential processing for this batch
                 logger.warning(f"[FaceDetectionWorker] Batch {batch_idx} failed, falling back to sequential: {e}")
+                fallback_rows = []
                 for photo_path in batch_paths:
                     if self.cancelled:
                         break
@@ -594,7 +614,8 @@ class FaceDetectionWorker(QRunnable):
                             if len(faces) > self.max_faces_per_photo:
                                 faces = sorted(faces, key=lambda f: f['bbox_w'] * f['bbox_h'], reverse=True)[:self.max_faces_per_photo]
                             for face_idx, face in enumerate(faces):
-                                self._save_face(db, photo_path, face, face_idx, face_crops_dir)
+                                self._save_face(db, photo_path, face, face_idx, face_crops_dir,
+                                                pending_rows=fallback_rows)
                             self._stats['photos_processed'] += 1
                             self._stats['faces_detected'] += len(faces)
                             self._stats['images_with_faces'] += 1
@@ -603,6 +624,7 @@ class FaceDetectionWorker(QRunnable):
                     except Exception as photo_error:
                         self._stats['photos_failed'] += 1
                         logger.error(f"[FaceDetectionWorker] ✗ {photo_path}: {photo_error}")
+                self._submit_faces_batch(db, fallback_rows, idx, total_photos)
 
     def _is_photo_screenshot(self, photo_path, photo_filename, conn):
         """
@@ -872,45 +894,95 @@ class FaceDetectionWorker(QRunnable):
             logger.error(f"Failed to prepare face row: {e}")
             return None
 
-    def _save_faces_batch(self, conn, rows: list) -> int:
+    def _submit_faces_batch(self, db, rows: list, processed: int, total: int) -> None:
         """
-        Batch insert face rows in a single transaction.
+        Queue face rows on the database's shared write queue.
 
-        BEST PRACTICE: Short transaction, predictable commit cadence.
-        Much faster than per-face commits and reduces lock churn.
+        BEST PRACTICE: Detection does not wait for the commit; the single
+        writer thread coalesces these rows with other workers' writes, so
+        there is no per-worker lock contention or retry loop. Once the rows
+        are durable batch_committed is emitted; if the write fails, the
+        batch's crop files are removed so no orphaned crops remain.
 
         Args:
-            conn: Database connection (keep open across batches)
+            db: Database instance
             rows: List of row tuples from _prepare_face_row()
-
-        Returns:
-            int: Number of rows successfully inserted
+            processed: Photos processed when the batch was queued
+            total: Total photos in this run
         """
         if not rows:
-            return 0
+            return
+        rows = list(rows)
+        done = threading.Event()
 
+        def _on_written(future):
+            try:
+                error = future.exception()
+                if error is not None:
+                    logger.error(f"[FaceDetectionWorker] Batch insert of {len(rows)} faces failed: {error}")
+                    self._remove_crops(rows)
+                    return
+                logger.debug(f"[FaceDetectionWorker] Batch commit: {len(rows)} faces saved")
+                self._queue_feature_updates(rows)
+                self._update_face_matrix()
+                self.signals.batch_committed.emit(
+                    processed, total, self._stats['faces_detected'], self.project_id
+                )
+            finally:
+                done.set()
+
+        self._pending_writes.append(done)
         try:
-            cur = conn.cursor()
-            cur.executemany("""
-                INSERT OR REPLACE INTO face_crops (
-                    project_id, image_path, crop_path, embedding,
-                    bbox_x, bbox_y, bbox_w, bbox_h, confidence
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, rows)
-            conn.commit()
-            return len(rows)
+            future = db.write_queue().submit_rows("face_crops", _FACE_CROPS_UPSERT_SQL, rows)
+        except Exception as e:
+            logger.error(f"[FaceDetectionWorker] Could not queue {len(rows)} faces: {e}")
+            self._remove_crops(rows)
+            done.set()
+            return
+        future.add_done_callback(_on_written)
+
+    def _queue_feature_updates(self, rows: list):
+        """Refresh search_asset_features.face_count of the batch's photos."""
+        try:
+            from repository.search_feature_repository import SearchFeatureRepository
+            SearchFeatureRepository().apply_changes(self.project_id, {row[1] for row in rows}, "faces")
+        except Exception as e:
+            logger.warning(f"[FaceDetectionWorker] Could not queue search feature updates: {e}")
+
+    def _update_face_matrix(self):
+        """Append the newly saved faces to the packed embedding matrix used by clustering."""
+        try:
+            from services.face_embedding_matrix_store import get_face_embedding_matrix_store
+            get_face_embedding_matrix_store(self.project_id).append_new()
         except Exception as e:
-            logger.error(f"Batch insert failed: {e}")
-            conn.rollback()
-            return 0
+            logger.warning(f"[FaceDetectionWorker] Could not update face embedding matrix: {e}")
+
+    def _wait_for_writes(self):
+        """Block until every queued face batch has been committed (or failed)."""
+        for done in self._pending_writes:
+            done.wait()
+        self._pending_writes.clear()
+
+    @staticmethod
+    def _remove_crops(rows: list):
+        """Delete the crop files of face rows whose DB write failed."""
+        for row in rows:
+            crop_path = row[2]
+            if crop_path and os.path.exists(crop_path):
+                try:
+                    os.remove(crop_path)
+                    logger.info(f"✓ Rolled back face crop: {crop_path}")
+                except Exception as cleanup_error:
+                    logger.error(f"Failed to cleanup orphaned crop: {cleanup_error}")
 
     def _save_face(self, db: ReferenceDB, image_path: str, face: dict,
-                   face_idx: int, face_crops_dir: str):
+                   face_idx: int, face_crops_dir: str,
+                   pending_rows: Optional[list] = None):
         """
         Save detected face to database and disk using transactional approach.
 
         LEGACY METHOD: Kept for compatibility. New code should use
-        _prepare_face_row() + _save_faces_batch() for better performance.
+        _prepare_face_row() + _submit_faces_batch() for better performance.
 
         CRITICAL ENHANCEMENT (2026-01-07):
         Uses atomic transaction to prevent orphaned face crops.
@@ -922,6 +994,8 @@ class FaceDetectionWorker(QRunnable):
             face: Face dictionary with bbox and embedding
             face_idx: Face index in photo (for naming)
             face_crops_dir: Directory to save face crops
+            pending_rows: If given, the DB row is appended here for a later
+                _submit_faces_batch() instead of being written now
 
         Returns:
             bool: True if saved successfully, False otherwise
@@ -959,47 +1033,29 @@ class FaceDetectionWorker(QRunnable):
             # At this point, we've validated that embedding is not None
             embedding_bytes = face['embedding'].astype(np.float32).tobytes()
 
-            # STEP 3: Save to database with transactional rollback
+            row = (
+                self.project_id,
+                image_path,
+                crop_path,
+                embedding_bytes,
+                face['bbox_x'],
+                face['bbox_y'],
+                face['bbox_w'],
+                face['bbox_h'],
+                face['confidence']
+            )
+            if pending_rows is not None:
+                pending_rows.append(row)
+                return True
+
+            # STEP 3: Save through the write queue (one transaction, no lock retries here)
             try:
-                with db._connect() as conn:
-                    cur = conn.cursor()
-                    # Begin explicit transaction
-                    cur.execute("BEGIN TRANSACTION")
-                    try:
-                        cur.execute("""
-                            INSERT OR REPLACE INTO face_crops (
-                                project_id, image_path, crop_path, embedding,
-                                bbox_x, bbox_y, bbox_w, bbox_h, confidence
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            self.project_id,
-                            image_path,
-                            crop_path,
-                            embedding_bytes,
-                            face['bbox_x'],
-                            face['bbox_y'],
-                            face['bbox_w'],
-                            face['bbox_h'],
-                            face['confidence']
-                        ))
-                        conn.commit()
-                        return True
-                    except Exception as db_error:
-                        # Rollback database transaction
-                        conn.rollback()
-                        logger.error(f"Database save failed, rolling back: {db_error}")
-
-                        # CRITICAL: Delete orphaned crop file
-                        if crop_path and os.path.exists(crop_path):
-                            try:
-                                os.remove(crop_path)
-                                logger.info(f"✓ Rolled back face crop: {crop_path}")
-                            except Exception as cleanup_error:
-                                logger.error(f"Failed to cleanup orphaned crop: {cleanup_error}")
-
-                        raise db_error
-            except Exception as transaction_error:
-                logger.error(f"Transaction failed: {transaction_error}")
+                db.write_queue().submit_rows("face_crops", _FACE_CROPS_UPSERT_SQL, [row]).result()
+                return True
+            except Exception as db_error:
+                logger.error(f"Database save failed, rolling back: {db_error}")
+                # CRITICAL: Delete orphaned crop file
+                self._remove_crops([row])
                 return False
 
         except Exception as e:
@@ -432,7 +432,9 @@ class FacePipelineWorker(QRunnable):
 
         This is NOT the final cluster — it gives the user approximate People
         results while detection continues.  The final recluster at pipeline
-        end produces the authoritative grouping.
+        end produces the authoritative grouping.  Passes after the first run
+        incrementally: faces found since the last pass join existing clusters
+        instead of re-clustering everything detected so far.
         """
         try:
             from config.face_detection_config import get_face_config
@@ -454,6 +456,7 @@ class FacePipelineWorker(QRunnable):
                 auto_tune=True,
                 screenshot_policy=self.screenshot_policy,
                 include_all_screenshot_faces=self.include_all_screenshot_faces,
+                incremental=True,
             )
 
             interim_result = {}
@@ -712,6 +715,9 @@ class FacePipelineWorker(QRunnable):
                     auto_tune=True,
                     screenshot_policy=self.screenshot_policy,
                     include_all_screenshot_faces=self.include_all_screenshot_faces,
+                    # Scoped scans add faces to an existing clustering: assign
+                    # them instead of re-clustering (keeps user merges intact)
+                    incremental=bool(self._scoped_photo_paths),
                 )
 
                 cluster_results = {}
@@ -7,13 +7,21 @@
 #
 # Architecture:
 #   - Runs in QThreadPool (off UI thread)
-#   - Processes photos in batches
+#   - Candidates ordered/filtered by search_asset_features signals
+#   - Decode + downscale + OCR in a process pool (one reader per process),
+#     or decode-ahead threads + one shared reader (GPU / small batches);
+#     each process loads its own model, so "ocr_workers" caps the count
 #   - Emits progress signals for status bar updates
 #   - Cancellable via cancel() flag
-#   - Stores results in photo_metadata.ocr_text + ocr_fts5
+#   - Stores results in batched transactions
+#     (photo_metadata.ocr_text + ocr_fts5 + asset_ocr_text_fts)
 
+import os
 import time
-from typing import Optional, List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, Optional, List, Tuple
 
 from PySide6.QtCore import QRunnable, QObject, Signal
 
@@ -40,19 +48,32 @@ class OCRPipelineWorker(QRunnable):
     Thread-safe, cancellable, emits progress signals.
     """
 
+    # Below this many photos a process pool is not worth its start-up
+    # (every process loads its own OCR model)
+    PROCESS_POOL_MIN_PHOTOS = 20
+
+    # Decoded images / tasks kept in flight per worker
+    PREFETCH_PER_WORKER = 2
+
     def __init__(
         self,
         project_id: int,
         photo_ids: Optional[List[int]] = None,
         languages: Optional[List[str]] = None,
         batch_size: int = 50,
+        workers: Optional[int] = None,
+        prefilter: Optional[str] = None,
     ):
         """
         Args:
             project_id: Project to process
             photo_ids: Specific photo IDs (None = all unprocessed)
             languages: OCR language codes (default: ['en'])
-            batch_size: Log progress every N photos
+            batch_size: Photos per DB transaction; also logs progress every N photos
+            workers: OCR worker processes (None = "ocr_workers" setting,
+                0 = auto, 1 = OCR in this thread)
+            prefilter: Candidate prefilter for unprocessed photos
+                (None = "ocr_prefilter" setting, see services.ocr_service)
         """
         super().__init__()
         self.setAutoDelete(True)
@@ -60,7 +81,9 @@ class OCRPipelineWorker(QRunnable):
         self.project_id = project_id
         self.photo_ids = photo_ids
         self.languages = languages
-        self.batch_size = batch_size
+        self.batch_size = max(1, batch_size)
+        self.workers = workers
+        self.prefilter = prefilter
         self._cancelled = False
 
     def cancel(self):
@@ -81,28 +104,20 @@ class OCRPipelineWorker(QRunnable):
         }
 
         try:
-            from services.ocr_service import OCRService
+            from services.ocr_service import (
+                OCRService, OCR_OK, OCR_SKIPPED, ocr_backend_available,
+            )
 
             ocr = OCRService(self.languages)
 
-            # Fail fast: verify OCR backend is available before iterating photos
-            try:
-                ocr._ensure_reader()
-            except ImportError as e:
-                msg = (
-                    f"OCR not available: {e}. "
-                    "Install one of: pip install easyocr  OR  pip install pytesseract"
-                )
-                logger.error(f"[OCRPipelineWorker] {msg}")
-                self.signals.error.emit(msg)
-                return
-
             # Get photos to process
             if self.photo_ids:
                 # Resolve paths for specified IDs
                 photos = self._resolve_photo_paths(self.photo_ids)
             else:
-                photos = ocr.get_photos_needing_ocr(self.project_id)
+                photos = ocr.get_photos_needing_ocr(
+                    self.project_id, prefilter=self._resolve_prefilter()
+                )
 
             total = len(photos)
             if total == 0:
@@ -110,51 +125,79 @@ class OCRPipelineWorker(QRunnable):
                 self.signals.finished.emit(stats)
                 return
 
-            logger.info(f"[OCRPipelineWorker] Processing {total} photos")
-            last_log = time.time()
-
-            for i, (photo_id, path) in enumerate(photos, 1):
-                if self._cancelled:
-                    logger.info(
-                        f"[OCRPipelineWorker] Cancelled at {i}/{total}"
-                    )
-                    break
+            workers = self._resolve_workers()
+            use_processes = workers > 1 and total >= self.PROCESS_POOL_MIN_PHOTOS
 
-                self.signals.progress.emit(
-                    i, total, path, "Extracting text..."
+            # Fail fast: verify OCR backend is available before iterating photos
+            # (worker processes load their own readers; only probe for one here)
+            try:
+                if use_processes:
+                    if not ocr_backend_available():
+                        raise ImportError("neither easyocr nor pytesseract is installed")
+                else:
+                    ocr._ensure_reader()
+            except ImportError as e:
+                msg = (
+                    f"OCR not available: {e}. "
+                    "Install one of: pip install easyocr  OR  pip install pytesseract"
                 )
+                logger.error(f"[OCRPipelineWorker] {msg}")
+                self.signals.error.emit(msg)
+                return
 
-                try:
-                    if not ocr.is_supported(path):
-                        stats["skipped"] += 1
-                        # Mark as processed with empty string to avoid re-processing
-                        ocr.store_ocr_text(photo_id, "", self.project_id)
-                        continue
+            logger.info(
+                f"[OCRPipelineWorker] Processing {total} photos "
+                f"({f'{workers} worker processes' if use_processes else 'in-thread reader'}, "
+                f"batch={self.batch_size})"
+            )
+            last_log = time.time()
+            pending: List[Tuple[int, str, Optional[float]]] = []
 
-                    text = ocr.extract_text(path)
-                    stats["processed"] += 1
+            if use_processes:
+                results = self._iter_process_results(ocr, photos, workers)
+            else:
+                results = self._iter_thread_results(ocr, photos)
 
-                    if text:
-                        stats["with_text"] += 1
-                        ocr.store_ocr_text(photo_id, text, self.project_id)
-                    else:
-                        # Store empty string to mark as processed
-                        ocr.store_ocr_text(photo_id, "", self.project_id)
+            try:
+                for i, (photo_id, path, status, text, confidence) in enumerate(results, 1):
+                    if self._cancelled:
+                        logger.info(
+                            f"[OCRPipelineWorker] Cancelled at {i}/{total}"
+                        )
+                        break
 
-                except Exception as e:
-                    stats["failed"] += 1
-                    logger.warning(
-                        f"[OCRPipelineWorker] Failed on photo {photo_id}: {e}"
+                    self.signals.progress.emit(
+                        i, total, path, "Extracting text..."
                     )
 
-                # Periodic logging
-                now = time.time()
-                if i % self.batch_size == 0 or (now - last_log) >= 30:
-                    logger.info(
-                        f"[OCRPipelineWorker] Progress: {i}/{total} "
-                        f"(text_found={stats['with_text']}, failed={stats['failed']})"
-                    )
-                    last_log = now
+                    if status == OCR_OK:
+                        stats["processed"] += 1
+                        if text:
+                            stats["with_text"] += 1
+                    elif status == OCR_SKIPPED:
+                        stats["skipped"] += 1
+                    else:
+                        # Not stored: picked up again by the next run
+                        stats["failed"] += 1
+                        continue
+
+                    # Empty string marks the photo as processed
+                    pending.append((photo_id, text or "", confidence))
+                    if len(pending) >= self.batch_size:
+                        self._flush(ocr, pending, stats)
+
+                    # Periodic logging
+                    now = time.time()
+                    if i % self.batch_size == 0 or (now - last_log) >= 30:
+                        logger.info(
+                            f"[OCRPipelineWorker] Progress: {i}/{total} "
+                            f"(text_found={stats['with_text']}, failed={stats['failed']})"
+                        )
+                        last_log = now
+            finally:
+                # Also on errors: keep what was already recognized
+                results.close()
+                self._flush(ocr, pending, stats)
 
             logger.info(
                 f"[OCRPipelineWorker] Complete: processed={stats['processed']}, "
@@ -176,6 +219,137 @@ class OCRPipelineWorker(QRunnable):
             )
             self.signals.error.emit(str(e))
 
+    def _flush(self, ocr, pending: list, stats: dict):
+        """Commit buffered results in one transaction."""
+        if not pending:
+            return
+        if not ocr.store_ocr_results(pending, self.project_id):
+            # Nothing was written; the photos stay pending for the next run
+            stats["failed"] += len(pending)
+        pending.clear()
+
+    def _iter_thread_results(self, ocr, photos) -> Iterator[Tuple]:
+        """
+        One shared reader in this thread; images decoded ahead on threads.
+
+        Yields:
+            (photo_id, path, status, text, confidence) in input order
+        """
+        window = max(2, self.PREFETCH_PER_WORKER * 2)
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr-decode") as pool:
+            in_flight = deque()
+            photos_iter = iter(photos)
+            try:
+                while True:
+                    while len(in_flight) < window and not self._cancelled:
+                        item = next(photos_iter, None)
+                        if item is None:
+                            break
+                        photo_id, path = item
+                        in_flight.append((photo_id, path, pool.submit(ocr.load_for_ocr, path)))
+                    if not in_flight:
+                        return
+                    photo_id, path, future = in_flight.popleft()
+                    img = future.result()
+                    yield (photo_id, path) + ocr.ocr_loaded_image(img, path)
+            finally:
+                for _, _, future in in_flight:
+                    future.cancel()
+
+    def _iter_process_results(self, ocr, photos, workers: int) -> Iterator[Tuple]:
+        """
+        Decode, downscale and OCR in worker processes (one reader each).
+
+        Falls back to the in-thread path for the remaining photos if the pool
+        cannot start or breaks.
+
+        Yields:
+            (photo_id, path, status, text, confidence) in input order
+        """
+        from services.ocr_service import _init_ocr_worker, _ocr_in_worker
+
+        torch_threads = max(1, (os.cpu_count() or workers) // workers)
+        try:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_ocr_worker,
+                initargs=(self.languages, torch_threads),
+            )
+        except Exception as e:
+            logger.warning(f"[OCRPipelineWorker] Process pool unavailable, using one reader: {e}")
+            yield from self._iter_thread_results(ocr, photos)
+            return
+
+        window = workers * self.PREFETCH_PER_WORKER
+        in_flight = deque()
+        photos_iter = iter(photos)
+        remaining = None
+        try:
+            while True:
+                while len(in_flight) < window and not self._cancelled:
+                    item = next(photos_iter, None)
+                    if item is None:
+                        break
+                    photo_id, path = item
+                    if not ocr.is_supported(path):
+                        # No need to ship unsupported files to a worker
+                        in_flight.append((photo_id, path, None))
+                    else:
+                        in_flight.append((photo_id, path, pool.submit(_ocr_in_worker, photo_id, path)))
+                if not in_flight:
+                    return
+                photo_id, path, future = in_flight[0]
+                if future is None:
+                    in_flight.popleft()
+                    yield (photo_id, path) + ocr.ocr_loaded_image(None, path)
+                    continue
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    logger.warning(
+                        f"[OCRPipelineWorker] OCR process pool broke ({e}), "
+                        f"continuing with one reader"
+                    )
+                    remaining = [(pid, p) for pid, p, _ in in_flight] + list(photos_iter)
+                    break
+                in_flight.popleft()
+                yield (photo_id, path) + tuple(result[1:])
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if remaining:
+            ocr._ensure_reader()
+            yield from self._iter_thread_results(ocr, remaining)
+
+    def _resolve_workers(self) -> int:
+        """Worker process count from the constructor, settings or auto."""
+        workers = self.workers
+        if workers is None:
+            try:
+                from settings_manager_qt import SettingsManager
+                workers = int(SettingsManager().get("ocr_workers", 0))
+            except Exception:
+                workers = 0
+        if workers <= 0:
+            from services.ocr_service import default_ocr_workers
+            workers = default_ocr_workers()
+        return workers
+
+    def _resolve_prefilter(self) -> str:
+        """Prefilter mode from the constructor or settings."""
+        from services.ocr_service import PREFILTER_MODES, PREFILTER_PRIORITIZE
+        prefilter = self.prefilter
+        if prefilter is None:
+            try:
+                from settings_manager_qt import SettingsManager
+                prefilter = SettingsManager().get("ocr_prefilter", PREFILTER_PRIORITIZE)
+            except Exception:
+                prefilter = PREFILTER_PRIORITIZE
+        if prefilter not in PREFILTER_MODES:
+            logger.warning(f"[OCRPipelineWorker] Unknown prefilter '{prefilter}', using '{PREFILTER_PRIORITIZE}'")
+            prefilter = PREFILTER_PRIORITIZE
+        return prefilter
+
     def _resolve_photo_paths(self, photo_ids: List[int]):
         """Resolve photo IDs to (id, path) tuples."""
         try:
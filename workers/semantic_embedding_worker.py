@@ -20,10 +20,13 @@ Usage:
     QThreadPool.globalInstance().start(worker)
 """
 
+import os
 import time
 import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from PySide6.QtCore import QRunnable, QObject, Signal
 
@@ -58,14 +61,21 @@ class SemanticEmbeddingWorker(QRunnable):
     - ✔ Per-photo error handling
     - ✔ Progress reporting
     - ✔ Resumable (saves progress for interrupted jobs)
+    - ✔ Pipelined (decode thread pool feeds fixed-size model batches,
+      each batch stored in one transaction)
     """
 
+    _CPU_BATCH_SIZE = 16     # CPU memory is not the constraint; amortize per-call overhead
+    _PREFETCH_BATCHES = 2    # decoded batches queued ahead of the model
+
     def __init__(self,
                  photo_ids: List[int],
                  model_name: Optional[str] = None,
                  force_recompute: bool = False,
                  project_id: Optional[int] = None,
-                 save_progress_interval: int = 10):
+                 save_progress_interval: int = 10,
+                 batch_size: Optional[int] = None,
+                 decode_workers: Optional[int] = None):
         """
         Initialize semantic embedding worker.
 
@@ -79,6 +89,9 @@ class SemanticEmbeddingWorker(QRunnable):
             force_recompute: If True, recompute even if embedding exists
             project_id: Project ID (REQUIRED for canonical model enforcement)
             save_progress_interval: Save progress every N photos (default: 10)
+            batch_size: Images per model call (default: auto - fixed on CPU,
+                        memory-tuned on GPU)
+            decode_workers: Image decode threads (default: min(4, cpu_count))
 
         Raises:
             SemanticModelMismatchError: If model_name doesn't match project's canonical model
@@ -88,6 +101,8 @@ class SemanticEmbeddingWorker(QRunnable):
         self.force_recompute = force_recompute
         self.project_id = project_id
         self.save_progress_interval = save_progress_interval
+        self.batch_size = batch_size
+        self.decode_workers = decode_workers
 
         # Resolve canonical model from project
         self.model_name = self._resolve_canonical_model(model_name)
@@ -100,6 +115,7 @@ class SemanticEmbeddingWorker(QRunnable):
         self.failed_count = 0
         self.start_time = None
         self._last_processed_photo_id = None
+        self._ann_marked_success = 0
 
     def _resolve_canonical_model(self, requested_model: Optional[str]) -> str:
         """
@@ -191,54 +207,82 @@ class SemanticEmbeddingWorker(QRunnable):
                     status='in_progress'
                 )
 
-            # Track consecutive failures to detect model load issues early
+            batch_size = self._resolve_batch_size(embedder)
+            decode_workers = self.decode_workers or min(4, os.cpu_count() or 1)
+            logger.info(
+                f"[SemanticEmbeddingWorker] Pipeline: batch_size={batch_size}, "
+                f"decode_workers={decode_workers}"
+            )
+
+            # Paths + idempotency check in bulk instead of per-photo queries
+            jobs = self._resolve_photos(embedder, photo_repo)
+            processed = total - len(jobs)
+            batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+
+            # Track consecutive failed batches to detect model load issues early
             _consecutive_failures = 0
             _MAX_CONSECUTIVE_FAILURES = 3  # Abort after 3 consecutive failures
-
-            for i, photo_id in enumerate(self.photo_ids, 1):
-                try:
-                    self._process_photo(photo_id, embedder, photo_repo)
-                    self._last_processed_photo_id = photo_id
-                    _consecutive_failures = 0  # Reset on success or skip
-                except Exception as e:
-                    logger.error(f"[SemanticEmbeddingWorker] Failed to process photo {photo_id}: {e}")
-                    self.failed_count += 1
-                    _consecutive_failures += 1
-
-                    # Early abort: if model loading is broken, stop immediately
-                    # instead of repeating the same error for every photo
-                    if _consecutive_failures >= _MAX_CONSECUTIVE_FAILURES:
-                        remaining = total - i
-                        logger.error(
-                            f"[SemanticEmbeddingWorker] Aborting batch: {_consecutive_failures} "
-                            f"consecutive failures detected (likely model load issue). "
-                            f"Skipping remaining {remaining} photos."
-                        )
-                        self.failed_count += remaining
-                        break
-
-                # Progress reporting and saving (every N photos or last)
-                if i % self.save_progress_interval == 0 or i == total:
-                    photo_name = "Unknown"
-                    try:
-                        photo = photo_repo.get_by_id(photo_id)
-                        if photo:
-                            photo_name = Path(photo.get('file_path') or photo.get('path') or "").name
-                    except Exception:
-                        pass
+            next_report = self.save_progress_interval
+
+            with ThreadPoolExecutor(max_workers=decode_workers,
+                                    thread_name_prefix="clip-decode") as pool:
+                # Decode threads stay _PREFETCH_BATCHES ahead of the model
+                pending = deque()
+                submitted = 0
+                while submitted < len(batches) and len(pending) < self._PREFETCH_BATCHES:
+                    batch = batches[submitted]
+                    pending.append((batch, [pool.submit(self._decode_photo, job, embedder) for job in batch]))
+                    submitted += 1
+
+                while pending:
+                    batch, futures = pending.popleft()
+                    if submitted < len(batches):
+                        nxt = batches[submitted]
+                        pending.append((nxt, [pool.submit(self._decode_photo, job, embedder) for job in nxt]))
+                        submitted += 1
+
+                    decoded = [f.result() for f in futures]
+                    ok = self._embed_batch(batch, decoded, embedder)
+                    processed += len(batch)
+                    self._last_processed_photo_id = batch[-1][0]
 
-                    msg = f"Embedding photo #{i}/{total}: {photo_name}"
-                    self.signals.progress.emit(i, total, msg)
-
-                    # Save progress for resumability
-                    if self.project_id is not None and self._last_processed_photo_id:
-                        embedder.save_job_progress(
-                            project_id=self.project_id,
-                            last_photo_id=self._last_processed_photo_id,
-                            total_photos=total,
-                            processed_count=i,
-                            status='in_progress'
-                        )
+                    if ok:
+                        _consecutive_failures = 0
+                    else:
+                        _consecutive_failures += 1
+                        # Early abort: if model loading is broken, stop immediately
+                        # instead of repeating the same error for every batch
+                        if _consecutive_failures >= _MAX_CONSECUTIVE_FAILURES:
+                            remaining = total - processed
+                            logger.error(
+                                f"[SemanticEmbeddingWorker] Aborting batch: {_consecutive_failures} "
+                                f"consecutive failed batches detected (likely model load issue). "
+                                f"Skipping remaining {remaining} photos."
+                            )
+                            self.failed_count += remaining
+                            for _, queued in pending:
+                                for f in queued:
+                                    f.cancel()
+                            break
+
+                    # Progress reporting and saving (every N photos or last)
+                    if processed >= next_report or processed == total:
+                        next_report = processed + self.save_progress_interval
+                        msg = f"Embedding photo #{processed}/{total}: {Path(batch[-1][1]).name}"
+                        self.signals.progress.emit(processed, total, msg)
+
+                        # Save progress for resumability
+                        if self.project_id is not None:
+                            embedder.save_job_progress(
+                                project_id=self.project_id,
+                                last_photo_id=self._last_processed_photo_id,
+                                total_photos=total,
+                                processed_count=processed,
+                                status='in_progress'
+                            )
+
+                        # Searches during the job pick up new vectors as deltas
+                        self._mark_ann_dirty()
 
             # Finish - mark job as completed
             duration = time.time() - self.start_time
@@ -261,6 +305,8 @@ class SemanticEmbeddingWorker(QRunnable):
                     status='completed'
                 )
 
+            self._mark_ann_dirty()
+
             logger.info(
                 f"[SemanticEmbeddingWorker] Batch complete: "
                 f"{self.success_count} success, {self.skipped_count} skipped, "
@@ -288,78 +334,126 @@ class SemanticEmbeddingWorker(QRunnable):
 
             self.signals.error.emit(str(e))
 
-    def _process_photo(self,
-                      photo_id: int,
-                      embedder,
-                      photo_repo: PhotoRepository):
-        """
-        Process single photo (idempotent).
-
-        Args:
-            photo_id: Photo ID
-            embedder: SemanticEmbeddingService instance
-            photo_repo: PhotoRepository instance
-        """
-        # Check if already processed (idempotent)
-        if not self.force_recompute and embedder.has_embedding(photo_id):
-            logger.debug(f"[SemanticEmbeddingWorker] Photo {photo_id} already has embedding, skipping")
-            self.skipped_count += 1
+    def _mark_ann_dirty(self):
+        """Tell the ANN index new vectors landed since the last mark (cheap delta sync)."""
+        if self.project_id is None or self.success_count == self._ann_marked_success:
             return
+        self._ann_marked_success = self.success_count
+        try:
+            from services.search_orchestrator import SearchOrchestrator
+            SearchOrchestrator.mark_ann_dirty(self.project_id)
+        except Exception as e:
+            logger.debug(f"[SemanticEmbeddingWorker] Could not mark ANN dirty: {e}")
 
-        # Get photo metadata
-        photo = photo_repo.get_by_id(photo_id)
-        if photo is None:
-            logger.warning(f"[SemanticEmbeddingWorker] Photo {photo_id} not found in database")
-            self.failed_count += 1
-            return
+    def _resolve_batch_size(self, embedder) -> int:
+        """Explicit batch size, else a fixed CPU batch or the GPU memory-tuned size."""
+        if self.batch_size:
+            return max(1, self.batch_size)
+        try:
+            device_type = embedder.get_gpu_memory_info()['device_type']
+        except Exception:
+            device_type = 'cpu'
+        if device_type == 'cpu':
+            return self._CPU_BATCH_SIZE
+        return embedder.get_optimal_batch_size()
+
+    def _resolve_photos(self, embedder, photo_repo: PhotoRepository) -> List[Tuple[int, str, Optional[str]]]:
+        """
+        Resolve photo_ids to (photo_id, path, image_content_hash), in input order.
 
-        file_path = photo.get('file_path') or photo.get('path')
-        if not file_path:
-            logger.warning(f"[SemanticEmbeddingWorker] Photo {photo_id} has no file_path")
-            self.failed_count += 1
-            return
+        Photos that already have an embedding are counted as skipped
+        (idempotent); unknown photos and photos without a path as failed.
+        """
+        photo_ids = list(self.photo_ids)
+        if not self.force_recompute:
+            embedded = embedder.get_embedded_photo_ids(photo_ids)
+            if embedded:
+                self.skipped_count += len(embedded)
+                logger.debug(f"[SemanticEmbeddingWorker] {len(embedded)} photos already have embeddings, skipping")
+                photo_ids = [pid for pid in photo_ids if pid not in embedded]
+
+        meta = {}
+        with photo_repo.connection(read_only=True) as conn:
+            for start in range(0, len(photo_ids), 500):
+                chunk = photo_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for row in conn.execute(
+                    f"SELECT id, path, image_content_hash FROM photo_metadata WHERE id IN ({placeholders})",
+                    chunk,
+                ).fetchall():
+                    meta[row['id']] = row
+
+        jobs = []
+        for photo_id in photo_ids:
+            photo = meta.get(photo_id)
+            if photo is None:
+                logger.warning(f"[SemanticEmbeddingWorker] Photo {photo_id} not found in database")
+                self.failed_count += 1
+            elif not photo.get('path'):
+                logger.warning(f"[SemanticEmbeddingWorker] Photo {photo_id} has no file_path")
+                self.failed_count += 1
+            else:
+                jobs.append((photo_id, photo['path'], photo.get('image_content_hash')))
+        return jobs
+
+    def _decode_photo(self, job: Tuple[int, str, Optional[str]], embedder):
+        """
+        Decode stage (runs on the decode thread pool).
 
-        # Check if file exists
-        if not Path(file_path).exists():
+        Returns (image, source_hash, source_mtime) or None if the photo
+        cannot be read.
+        """
+        photo_id, file_path, content_hash = job
+        try:
+            source_mtime = str(os.stat(file_path).st_mtime)
+        except OSError:
             logger.warning(f"[SemanticEmbeddingWorker] Photo {photo_id} file not found: {file_path}")
-            self.failed_count += 1
-            return
+            return None
+
+        try:
+            image = embedder.load_image_for_clip(file_path)
+        except Exception as e:
+            logger.warning(f"[SemanticEmbeddingWorker] Failed to decode photo {photo_id} ({file_path}): {e}")
+            return None
 
         # Freshness tracking: use the photo's image_content_hash (dHash)
         # so the stale check (source_photo_hash == image_content_hash) compares
         # the same hash type.  Fall back to SHA256 only if dHash is missing.
-        source_hash = photo.get('image_content_hash') or self._compute_hash(file_path)
-        source_mtime = str(Path(file_path).stat().st_mtime)
+        source_hash = content_hash or self._compute_hash(file_path)
+        return image, source_hash, source_mtime
 
-        # Extract embedding
-        photo_name = Path(file_path).name
-        logger.info("[SemanticEmbeddingWorker] Embedding photo %d: %s", photo_id, file_path)
-        try:
-            embedding = embedder.encode_image(file_path)
-        except Exception as e:
-            logger.error(f"[SemanticEmbeddingWorker] Failed to encode photo {photo_id}: {e}")
-            self.failed_count += 1
-            return
-
-        # encode_image returns None when the image could not be processed
-        if embedding is None:
-            logger.warning("[SemanticEmbeddingWorker] Skipping photo %d (encode returned None): %s", photo_id, file_path)
-            self.failed_count += 1
-            return
+    def _embed_batch(self, batch, decoded, embedder) -> bool:
+        """
+        Inference + storage stage for one batch.
 
-        # Store embedding
+        Returns False if the model or the database failed for the whole
+        batch (counts towards the consecutive-failure abort).
+        """
+        ready = [(job, item) for job, item in zip(batch, decoded) if item is not None]
+        self.failed_count += len(batch) - len(ready)
+        if not ready:
+            return True
+
+        embeddings = embedder.encode_pil_batch([item[0] for _, item in ready])
+        if embeddings is None or len(embeddings) != len(ready):
+            logger.error(f"[SemanticEmbeddingWorker] Failed to encode batch of {len(ready)} photos")
+            self.failed_count += len(ready)
+            return False
+
+        records = [
+            (job[0], embedding, item[1], item[2])
+            for (job, item), embedding in zip(ready, embeddings)
+        ]
         try:
-            embedder.store_embedding(
-                photo_id=photo_id,
-                embedding=embedding,
-                source_hash=source_hash,
-                source_mtime=source_mtime
-            )
-            self.success_count += 1
-            logger.debug(f"[SemanticEmbeddingWorker] ✓ Photo {photo_id} processed")
+            embedder.store_embeddings_batch(records)
         except Exception as e:
-            logger.error(f"[SemanticEmbeddingWorker] Failed to store embedding for photo {photo_id}: {e}")
-            self.failed_count += 1
+            logger.error(f"[SemanticEmbeddingWorker] Failed to store batch of {len(records)} embeddings: {e}")
+            self.failed_count += len(records)
+            return False
+
+        self.success_count += len(records)
+        logger.debug(f"[SemanticEmbeddingWorker] ✓ Batch of {len(records)} photos processed")
+        return True
 
     def _compute_hash(self, file_path: str) -> str:
         """
@@ -1,6 +1,7 @@
 # workers/video_metadata_worker.py
 # Version 1.0.0 dated 2025-11-09
 # Background worker for extracting video metadata
+# Probes run concurrently through VideoProbeEngine; results are written in batches
 
 import sys
 import os
@@ -11,7 +12,7 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from PySide6.QtCore import QObject, Signal, QRunnable, Slot
-from services.video_metadata_service import VideoMetadataService
+from services.video_probe_engine import get_video_probe_engine
 from repository.video_repository import VideoRepository
 from logging_config import get_logger
 
@@ -37,7 +38,9 @@ class VideoMetadataWorker(QRunnable):
     Background worker for extracting video metadata.
 
     Extracts metadata (duration, resolution, codecs, etc.) for videos
-    with pending metadata_status. Runs in background thread pool.
+    with pending metadata_status. Runs in background thread pool; ffprobe
+    runs several at a time in the shared VideoProbeEngine, and results are
+    written BATCH_SIZE videos per transaction.
 
     Usage:
         worker = VideoMetadataWorker(project_id=1)
@@ -46,6 +49,9 @@ class VideoMetadataWorker(QRunnable):
         QThreadPool.globalInstance().start(worker)
     """
 
+    # Videos per database transaction
+    BATCH_SIZE = 50
+
     def __init__(self, project_id: int, video_paths: list = None):
         """
         Initialize metadata extraction worker.
@@ -61,7 +67,7 @@ class VideoMetadataWorker(QRunnable):
         self.signals = VideoMetadataWorkerSignals()
         self.cancelled = False
 
-        self.metadata_service = VideoMetadataService()
+        self.probe_engine = get_video_probe_engine()
         self.video_repo = VideoRepository()
 
     def cancel(self):
@@ -71,7 +77,7 @@ class VideoMetadataWorker(QRunnable):
 
     def _extract_video_metadata(self, video: dict) -> bool:
         """
-        Extract metadata for a single video (called by worker threads).
+        Extract and store metadata for a single video.
 
         Args:
             video: Video dict from repository with 'id', 'path', etc.
@@ -90,7 +96,7 @@ class VideoMetadataWorker(QRunnable):
                 return False
 
             # Extract metadata
-            metadata = self.metadata_service.extract_metadata(video_path)
+            metadata = self.probe_engine.probe(video_path)
 
             if not metadata:
                 # Metadata extraction failed
@@ -102,35 +108,7 @@ class VideoMetadataWorker(QRunnable):
                 self.signals.error.emit(video_path, error_msg)
                 return False
 
-            # Update database with extracted metadata
-            # BUG FIX #6: Compute created_date, created_year, created_ts from date_taken
-            # This enables efficient date hierarchy queries (matching photo metadata pattern)
-            update_data = {
-                'duration_seconds': metadata.get('duration_seconds'),
-                'width': metadata.get('width'),
-                'height': metadata.get('height'),
-                'fps': metadata.get('fps'),
-                'codec': metadata.get('codec'),
-                'bitrate': metadata.get('bitrate'),
-                'date_taken': metadata.get('date_taken'),
-                'metadata_status': 'ok'
-            }
-
-            # Compute created_* fields from date_taken for date hierarchy
-            date_taken = metadata.get('date_taken')
-            if date_taken:
-                try:
-                    from datetime import datetime
-                    # Parse date_taken (format: 'YYYY-MM-DD HH:MM:SS' or 'YYYY-MM-DD')
-                    date_str = date_taken.split(' ')[0]  # Extract YYYY-MM-DD part
-                    dt = datetime.strptime(date_str, '%Y-%m-%d')
-                    update_data['created_ts'] = int(dt.timestamp())
-                    update_data['created_date'] = date_str  # YYYY-MM-DD
-                    update_data['created_year'] = dt.year
-                except (ValueError, AttributeError, IndexError):
-                    # If date parsing fails, these fields will remain NULL
-                    logger.debug(f"Failed to parse date_taken: {date_taken}")
-
+            update_data = self._build_update(metadata)
             self.video_repo.update(video_id=video_id, **update_data)
             return True
 
@@ -150,6 +128,57 @@ class VideoMetadataWorker(QRunnable):
             self.signals.error.emit(video_path, error_msg)
             return False
 
+    def _build_update(self, metadata: dict) -> dict:
+        """video_metadata fields to write for a successful probe."""
+        # Update database with extracted metadata
+        # BUG FIX #6: Compute created_date, created_year, created_ts from date_taken
+        # This enables efficient date hierarchy queries (matching photo metadata pattern)
+        update_data = {
+            'duration_seconds': metadata.get('duration_seconds'),
+            'width': metadata.get('width'),
+            'height': metadata.get('height'),
+            'fps': metadata.get('fps'),
+            'codec': metadata.get('codec'),
+            'bitrate': metadata.get('bitrate'),
+            'date_taken': metadata.get('date_taken'),
+            'metadata_status': 'ok'
+        }
+
+        # Compute created_* fields from date_taken for date hierarchy
+        date_taken = metadata.get('date_taken')
+        if date_taken:
+            try:
+                from datetime import datetime
+                # Parse date_taken (format: 'YYYY-MM-DD HH:MM:SS' or 'YYYY-MM-DD')
+                date_str = date_taken.split(' ')[0]  # Extract YYYY-MM-DD part
+                dt = datetime.strptime(date_str, '%Y-%m-%d')
+                update_data['created_ts'] = int(dt.timestamp())
+                update_data['created_date'] = date_str  # YYYY-MM-DD
+                update_data['created_year'] = dt.year
+            except (ValueError, AttributeError, IndexError):
+                # If date parsing fails, these fields will remain NULL
+                logger.debug(f"Failed to parse date_taken: {date_taken}")
+
+        return update_data
+
+    def _flush_updates(self, pending: list) -> int:
+        """
+        Write buffered (video_id, fields) updates in one transaction.
+
+        Returns:
+            Number of successful extractions lost because the write failed
+        """
+        if not pending:
+            return 0
+        try:
+            self.video_repo.bulk_update(pending)
+            lost = 0
+        except Exception as e:
+            logger.error(f"[VideoMetadataWorker] Failed to write {len(pending)} results: {e}")
+            lost = sum(1 for _, fields in pending if fields.get('metadata_status') == 'ok')
+        pending.clear()
+        return lost
+
     @Slot()
     def run(self):
         """
@@ -187,48 +216,59 @@ class VideoMetadataWorker(QRunnable):
                 self.signals.finished.emit(0, 0)
                 return
 
-            # PERFORMANCE OPTIMIZATION: Process videos in parallel for 8x speedup
-            # ffprobe is I/O bound (waiting for subprocess), so threads work well
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-
-            import os as _os
-            max_workers = min(4, _os.cpu_count() or 4)
-            logger.info(f"[VideoMetadataWorker] Processing with {max_workers} parallel workers")
-
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all extraction tasks
-                futures = {}
-                for video in videos_to_process:
-                    if self.cancelled:
-                        break
-                    future = executor.submit(self._extract_video_metadata, video)
-                    futures[future] = video
+            # Missing files are reported without probing (status left unchanged)
+            idx = 0
+            videos_by_path = {}
+            for video in videos_to_process:
+                if os.path.exists(video['path']):
+                    videos_by_path[video['path']] = video
+                else:
+                    idx += 1
+                    failed_count += 1
+                    logger.warning(f"File not found: {video['path']}")
+                    self.signals.progress.emit(idx, total, video['path'])
+                    self.signals.error.emit(video['path'], "File not found")
+
+            # PERFORMANCE OPTIMIZATION: several ffprobe processes run at once in
+            # the shared probe engine (results cached by path/size/mtime, so
+            # videos probed during the scan are not probed again)
+            logger.info(
+                f"[VideoMetadataWorker] Processing with {self.probe_engine.max_workers} "
+                f"concurrent ffprobe processes"
+            )
 
-                # Process results as they complete
-                for idx, future in enumerate(as_completed(futures), 1):
+            pending_updates = []
+            results = self.probe_engine.probe_many(list(videos_by_path))
+            try:
+                for video_path, metadata in results:
                     if self.cancelled:
-                        logger.info("[VideoMetadataWorker] Cancelled, shutting down workers")
-                        executor.shutdown(wait=False, cancel_futures=True)
+                        logger.info("[VideoMetadataWorker] Cancelled, stopping extraction")
                         break
 
-                    video = futures[future]
-                    video_path = video['path']
-
-                    # Emit progress
+                    idx += 1
                     self.signals.progress.emit(idx, total, video_path)
-
-                    try:
-                        success = future.result()
-                        if success:
-                            success_count += 1
-                            logger.info(f"[VideoMetadataWorker] ✓ {video_path}")
-                        else:
-                            failed_count += 1
-                            logger.error(f"[VideoMetadataWorker] ✗ {video_path}")
-
-                    except Exception as e:
-                        logger.error(f"[VideoMetadataWorker] Error: {video_path}: {e}")
+                    video = videos_by_path[video_path]
+
+                    if metadata:
+                        pending_updates.append((video['id'], self._build_update(metadata)))
+                        success_count += 1
+                        logger.info(f"[VideoMetadataWorker] ✓ {video_path}")
+                    else:
+                        # Metadata extraction failed
+                        pending_updates.append((video['id'], {'metadata_status': 'error'}))
                         failed_count += 1
+                        logger.error(f"[VideoMetadataWorker] ✗ {video_path}")
+                        self.signals.error.emit(video_path, "Failed to extract metadata")
+
+                    if len(pending_updates) >= self.BATCH_SIZE:
+                        lost = self._flush_updates(pending_updates)
+                        success_count -= lost
+                        failed_count += lost
+            finally:
+                results.close()
+                lost = self._flush_updates(pending_updates)
+                success_count -= lost
+                failed_count += lost
 
         except Exception as e:
             logger.error(f"[VideoMetadataWorker] Fatal error: {e}")
@@ -73,12 +73,13 @@ class VideoThumbnailWorker(QRunnable):
         self.cancelled = True
         logger.info("[VideoThumbnailWorker] Cancellation requested")
 
-    def _generate_thumbnail_for_video(self, video: dict) -> bool:
+    def _record_result(self, video: dict, thumbnail_path: Optional[str]) -> bool:
         """
-        Generate thumbnail for a single video (called by worker threads).
+        Store the outcome of one video and emit its signals.
 
         Args:
             video: Video dict from repository with 'id', 'path', etc.
+            thumbnail_path: Generated thumbnail file, or None if generation failed
 
         Returns:
             bool: True if successful, False otherwise
@@ -87,28 +88,17 @@ class VideoThumbnailWorker(QRunnable):
         video_id = video['id']
 
         try:
-            # Check if file exists
-            if not os.path.exists(video_path):
-                logger.warning(f"File not found: {video_path}")
-                self.signals.error.emit(video_path, "File not found")
-                return False
-
-            # Generate thumbnail
-            # generate_thumbnail() returns file path string, not bytes
-            # It already saves the thumbnail to disk (no need for separate caching)
-            thumbnail_path = self.thumbnail_service.generate_thumbnail(
-                video_path,
-                width=int(self.thumbnail_height * 4/3),  # Maintain 4:3 aspect ratio
-                height=self.thumbnail_height
-            )
-
             if not thumbnail_path:
                 # Thumbnail generation failed
                 self.video_repo.update(
                     video_id=video_id,
                     thumbnail_status='error'
                 )
-                error_msg = "Failed to generate thumbnail"
+                if not os.path.exists(video_path):
+                    logger.warning(f"File not found: {video_path}")
+                    error_msg = "File not found"
+                else:
+                    error_msg = "Failed to generate thumbnail"
                 self.signals.error.emit(video_path, error_msg)
                 return False
 
@@ -130,7 +120,7 @@ class VideoThumbnailWorker(QRunnable):
             return True
 
         except Exception as e:
-            # Error during generation
+            # Error while recording the result
             error_msg = str(e)
             logger.error(f"Error processing {video_path}: {error_msg}")
 
@@ -182,48 +172,33 @@ class VideoThumbnailWorker(QRunnable):
                 self.signals.finished.emit(0, 0)
                 return
 
-            # PERFORMANCE OPTIMIZATION: Process videos in parallel for 8x speedup
-            # ffmpeg is I/O bound (waiting for subprocess), so threads work well
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-
-            import os as _os
-            max_workers = min(4, _os.cpu_count() or 4)
-            logger.info(f"[VideoThumbnailWorker] Processing with {max_workers} parallel workers")
-
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all thumbnail generation tasks
-                futures = {}
-                for video in videos_to_process:
-                    if self.cancelled:
-                        break
-                    future = executor.submit(self._generate_thumbnail_for_video, video)
-                    futures[future] = video
-
-                # Process results as they complete
-                for idx, future in enumerate(as_completed(futures), 1):
-                    if self.cancelled:
-                        logger.info("[VideoThumbnailWorker] Cancelled, shutting down workers")
-                        executor.shutdown(wait=False, cancel_futures=True)
-                        break
-
-                    video = futures[future]
-                    video_path = video['path']
-
-                    # Emit progress
-                    self.signals.progress.emit(idx, total, video_path)
-
-                    try:
-                        success = future.result()
-                        if success:
-                            success_count += 1
-                            logger.info(f"[VideoThumbnailWorker] ✓ {video_path}")
-                        else:
-                            failed_count += 1
-                            logger.error(f"[VideoThumbnailWorker] ✗ {video_path}")
-
-                    except Exception as e:
-                        logger.error(f"[VideoThumbnailWorker] Error: {video_path}: {e}")
-                        failed_count += 1
+            # ffmpeg runs as subprocesses, several at a time; results are
+            # streamed back here as each video finishes
+            by_path = {}
+            for video in videos_to_process:
+                by_path.setdefault(video['path'], video)
+            done = 0
+
+            def on_result(video_path, thumbnail_path):
+                nonlocal done, success_count, failed_count
+                done += 1
+                self.signals.progress.emit(done, total, video_path)
+                if self._record_result(by_path[video_path], thumbnail_path):
+                    success_count += 1
+                    logger.info(f"[VideoThumbnailWorker] ✓ {video_path}")
+                else:
+                    failed_count += 1
+                    logger.error(f"[VideoThumbnailWorker] ✗ {video_path}")
+
+            self.thumbnail_service.generate_thumbnails_batch(
+                list(by_path),
+                width=int(self.thumbnail_height * 4/3),  # Maintain 4:3 aspect ratio
+                height=self.thumbnail_height,
+                on_result=on_result,
+                should_cancel=lambda: self.cancelled,
+            )
+            if self.cancelled:
+                logger.info("[VideoThumbnailWorker] Cancelled, remaining videos skipped")
 
         except Exception as e:
             logger.error(f"[VideoThumbnailWorker] Fatal error: {e}")